@@ -1,6 +1,7 @@
 from game.ai_personality import (
     DISRUPTOR,
     EXPANSION,
+    ROLLOUT,
     STANDARD,
     TRADER,
     get_ai_personality_profile,
@@ -15,6 +16,8 @@ from game.forecast_events import (
 )
 from game.hex_tile import get_token_pip_count
 from game.resources import BUILD_COSTS, ResourceType
+from game.rollout_ai import HEURISTIC, RolloutSearch, apply_candidate
+from game.runtime_metrics import metric_timer
 
 
 AI_ACTION_DELAY_MS = 1250
@@ -29,7 +32,88 @@ AI_SPEED_OPTIONS = (
 class SimpleAI:
     """A small, deterministic heuristic player that only chooses legal actions."""
 
+    def __init__(self, rollout_config=None):
+        self._evaluation_cache = None
+        self.evaluation_cache_hits = 0
+        self.evaluation_cache_misses = 0
+        # Budget for ``rollout`` seats; the searcher is built on first use.
+        self.rollout_config = rollout_config
+        self.rollout_search = None
+
     def step(self, game):
+        # Candidate scoring re-derives the same per-player tables for every
+        # node and lookahead node, so memoize them for one decision only.
+        self._evaluation_cache = {}
+        try:
+            with metric_timer(
+                "catan_ai_decision_seconds",
+                phase=getattr(game, "phase", None),
+            ) as timing:
+                changed = self._step(game)
+                if not changed:
+                    timing.label(outcome="idle")
+                return changed
+        finally:
+            self._evaluation_cache = None
+
+    def get_evaluation_cache_stats(self):
+        return {
+            "hits": self.evaluation_cache_hits,
+            "misses": self.evaluation_cache_misses,
+        }
+
+    def _evaluation_state_key(self, game, player):
+        """Identify the position facts that the cached tables depend on.
+
+        ``None`` disables caching for boards without a revision counter.
+        """
+        revision = getattr(getattr(game, "board", None), "revision", None)
+        if revision is None:
+            return None
+        active_event = getattr(
+            game,
+            "is_forecast_event_active",
+            lambda _event: False,
+        )
+        return (
+            id(game.board),
+            revision,
+            self._profile(player).key,
+            game.get_player_public_victory_points(player),
+            getattr(game, "get_next_forecast_event_id", lambda: None)(),
+            getattr(game, "get_next_forecast_turns_remaining", lambda: None)(),
+            tuple(
+                active_event(event_id)
+                for event_id in (
+                    SHEEP_DROUGHT_EVENT_ID,
+                    WHEAT_HARVEST_EVENT_ID,
+                    CONSTRUCTION_BOOM_EVENT_ID,
+                )
+            ),
+        )
+
+    def _cached_evaluation(self, name, game, player):
+        """Return ``getattr(self, name)(game, player)`` memoized per decision.
+
+        Cached tables are shared between callers and must be treated as
+        read-only.
+        """
+        compute = getattr(self, name)
+        cache = getattr(self, "_evaluation_cache", None)
+        if cache is None:
+            return compute(game, player)
+        state_key = self._evaluation_state_key(game, player)
+        if state_key is None:
+            return compute(game, player)
+        key = (name, player, state_key)
+        if key in cache:
+            self.evaluation_cache_hits += 1
+            return cache[key]
+        self.evaluation_cache_misses += 1
+        value = cache[key] = compute(game, player)
+        return value
+
+    def _step(self, game):
         if game.winner is not None or game.has_active_dice_animation():
             return False
 
@@ -111,6 +195,18 @@ class SimpleAI:
                 game.build_road(self._edge_midpoint(edge))
                 return True
 
+        if profile.key == ROLLOUT:
+            choice = self._get_rollout_search().choose(game, player, self)
+            if choice != HEURISTIC:
+                self._set_status(
+                    game,
+                    player,
+                    "試行で行動を選択",
+                    "候補ごとに数手先まで試行し、最も有利な結果の行動を選びました",
+                )
+                apply_candidate(game, choice, self)
+                return True
+
         buildable_node_getters = {
             "city": game.get_buildable_city_nodes,
             "settlement": game.get_buildable_settlement_nodes,
@@ -406,7 +502,7 @@ class SimpleAI:
 
     def _step_special(self, game, player):
         if game.special_phase == "move_robber":
-            profile_key = self._profile(player).key
+            profile_key = self._heuristic_key(player)
             tile = max(
                 game.robber_tile_candidates,
                 key=lambda candidate: self._robber_score(game, candidate, player),
@@ -422,7 +518,7 @@ class SimpleAI:
             return True
 
         if game.special_phase == "steal":
-            profile_key = self._profile(player).key
+            profile_key = self._heuristic_key(player)
             victim = max(
                 game.robber_target_players,
                 key=lambda candidate: self._steal_target_score(
@@ -926,7 +1022,9 @@ class SimpleAI:
         requester=None,
     ):
         """Estimate supply from public facts, never from the partner's hand types."""
-        production = self._player_production_scores(game, partner).get(
+        production = self._cached_evaluation(
+            "_player_production_scores", game, partner
+        ).get(
             resource_type,
             0,
         )
@@ -1131,7 +1229,7 @@ class SimpleAI:
         value = 10
         if available == 0:
             value += 3
-        profile_key = self._profile(player).key
+        profile_key = self._heuristic_key(player)
         goal_weights = {
             STANDARD: ((6, "city"), (5, "settlement"), (3, "development"), (2, "road")),
             EXPANSION: ((7, "settlement"), (5, "road"), (4, "city"), (1, "development")),
@@ -1224,7 +1322,7 @@ class SimpleAI:
 
     def _resource_need_weights(self, game, player):
         public_points = game.get_player_public_victory_points(player)
-        profile_key = self._profile(player).key
+        profile_key = self._heuristic_key(player)
         if public_points < 5:
             weights = {
                 STANDARD: {
@@ -1325,7 +1423,9 @@ class SimpleAI:
         elif next_event == CONSTRUCTION_BOOM_EVENT_ID:
             weights[ResourceType.WOOD] *= 1.0 - 0.12 * urgency
             weights[ResourceType.BRICK] *= 1.0 - 0.12 * urgency
-        production = self._player_production_scores(game, player)
+        production = self._cached_evaluation(
+            "_player_production_scores", game, player
+        )
         strongest = max(production.values(), default=0)
         for resource_type in weights:
             if strongest <= 0:
@@ -1337,7 +1437,7 @@ class SimpleAI:
 
     def _node_score(self, game, node, player):
         profile = self._profile(player)
-        need_weights = self._resource_need_weights(game, player)
+        need_weights = self._cached_evaluation("_resource_need_weights", game, player)
         raid_parameters = getattr(
             game,
             "get_forecast_event_parameters",
@@ -1357,7 +1457,9 @@ class SimpleAI:
             for tile in game.get_public_node_tiles(node)
             if tile.resource_type != ResourceType.DESERT
         }
-        production = self._player_production_scores(game, player)
+        production = self._cached_evaluation(
+            "_player_production_scores", game, player
+        )
         harbor_bonus = 0
         for harbor in game.get_public_node_harbors(node):
             if getattr(
@@ -1486,10 +1588,26 @@ class SimpleAI:
             if player.available_resource_count(resource_type) < amount
         }
 
+    def _get_rollout_search(self):
+        if self.rollout_search is None:
+            self.rollout_search = RolloutSearch(self.rollout_config)
+        return self.rollout_search
+
+    def close(self):
+        """Shut down the rollout search's worker pool, if it started one."""
+        if self.rollout_search is not None:
+            self.rollout_search.close()
+
     def _edge_midpoint(self, edge):
         node1, node2 = edge
         return ((node1.x + node2.x) / 2, (node1.y + node2.y) / 2)
 
+    @classmethod
+    def _heuristic_key(cls, player):
+        """Key of the heuristic tables to use; search seats use standard's."""
+        key = cls._profile(player).key
+        return STANDARD if key == ROLLOUT else key
+
     @staticmethod
     def _profile(player):
         return get_ai_personality_profile(
@@ -5,6 +5,7 @@ STANDARD = "standard"
 EXPANSION = "expansion"
 TRADER = "trader"
 DISRUPTOR = "disruptor"
+ROLLOUT = "rollout"
 MIXED = "mixed"
 
 
@@ -173,6 +174,40 @@ AI_PERSONALITY_PROFILES = {
         robber_leader_bonus=12,
         robber_hand_weight=1,
     ),
+    # Searches build choices with simulated futures (``game.rollout_ai``);
+    # everything it does not search uses the standard tuning.
+    ROLLOUT: AIPersonalityProfile(
+        key=ROLLOUT,
+        label="探索型",
+        description="建設候補ごとに数手先まで試行し、結果の良い手を選ぶ型",
+        build_order=("city", "settlement"),
+        goal_order=("city", "settlement", "development", "road"),
+        road_score_threshold=48,
+        minimum_road_length=2,
+        development_before_road=False,
+        domestic_trade_max_missing=2,
+        trade_reserve_relaxation=0,
+        trade_complete_ratio=0.65,
+        trade_improve_ratio=0.78,
+        trade_fair_ratio=0.95,
+        trade_counter_ratio=0.62,
+        monopoly_threshold=6,
+        knight_leader_threshold=7,
+        road_building_min_options=2,
+        pip_weight=4,
+        diversity_weight=5,
+        generic_harbor_bonus=5,
+        specific_harbor_bonus=4,
+        edge_spacing_bonus=10,
+        edge_lookahead_weight=0.18,
+        longest_road_bonus=6,
+        opponent_contact_bonus=0,
+        robber_self_penalty=8,
+        robber_production_weight=4,
+        robber_point_weight=2,
+        robber_leader_bonus=5,
+        robber_hand_weight=1,
+    ),
 }
 
 AI_PERSONALITY_KEYS = tuple(AI_PERSONALITY_PROFILES)
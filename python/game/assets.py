@@ -1,8 +1,7 @@
 from functools import lru_cache
 from pathlib import Path
 
-import pygame
-
+from game.lazy_modules import pygame
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 FONT_PATH = (PROJECT_ROOT / "Noto_Sans_JP" / "NotoSansJP-VariableFont_wght.ttf").resolve()
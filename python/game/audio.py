@@ -1,7 +1,7 @@
 import math
 from array import array
 
-import pygame
+from game.lazy_modules import pygame
 
 
 class GameAudio:
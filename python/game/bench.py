@@ -0,0 +1,523 @@
+"""Fixed-seed benchmarks for the engine, AI, protocol and persistence paths.
+
+``python -m game.bench`` times each hot path on the same seeded positions
+every run and prints a JSON document of per-benchmark latency percentiles.
+A previous document can be saved as a baseline; later runs report every
+benchmark whose median slowed down by more than the tolerance, and
+``--fail-on-regression`` turns that report into a non-zero exit status.
+
+Timings include interpreter noise, so compare runs from the same machine
+and keep the tolerance generous.
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import io
+import json
+import math
+import os
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Iterable
+import uuid
+
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.game import CatanGame
+from game.network_protocol import (
+    FrameDecoder,
+    build_state_delta,
+    build_state_snapshot,
+    encode_frame,
+)
+from game.network_replay_store import SQLiteNetworkReplayStore
+from game.persistence import restore_game, serialize_game
+from game.self_play import _prepare_game, run_match
+from game.websocket_transport import (
+    WebSocketOpcode,
+    _apply_mask,
+    encode_websocket_frame,
+    read_websocket_frame,
+)
+
+
+BENCH_FORMAT = "catan-bench"
+BENCH_VERSION = 1
+BENCH_SEED = 7
+MIDGAME_STEPS = 250
+DEFAULT_TOLERANCE = 0.25
+REPORTED_PERCENTILES = (50, 90, 99)
+FRAME_CHUNK_BYTES = 4096
+_MASKING_KEY = b"\x1f\x8b\x3c\x52"
+# Payload sizes for the unmasking comparison, with samples per unit of scale.
+UNMASK_PAYLOADS = (
+    ("1kb", 1024, 200),
+    ("64kb", 64 * 1024, 20),
+    ("1mb", 1024 * 1024, 3),
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Latency samples, in milliseconds, for one benchmark."""
+
+    name: str
+    samples: tuple[float, ...]
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.samples)
+        mean = sum(ordered) / len(ordered)
+        document = {
+            "samples": len(ordered),
+            "mean_ms": round(mean, 6),
+            "min_ms": round(ordered[0], 6),
+            "max_ms": round(ordered[-1], 6),
+        }
+        for percent in REPORTED_PERCENTILES:
+            document[f"p{percent}_ms"] = round(percentile(ordered, percent), 6)
+        document["ops_per_second"] = round(1000 / mean, 3) if mean > 0 else None
+        return document
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark whose median exceeded its baseline by the tolerance."""
+
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms
+
+    def describe(self) -> str:
+        return (
+            f"{self.name}: p50 {self.baseline_ms:.3f}ms -> "
+            f"{self.current_ms:.3f}ms ({self.ratio:.2f}x)"
+        )
+
+
+def percentile(ordered: list[float], percent: float) -> float:
+    """Return the linearly interpolated ``percent`` point of sorted values."""
+    if not ordered:
+        raise ValueError("percentile requires at least one sample")
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    weight = position - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+def _timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter_ns()
+    action()
+    return (time.perf_counter_ns() - started) / 1_000_000
+
+
+def _midgame(seed: int = BENCH_SEED) -> CatanGame:
+    game = _prepare_game(
+        match_seed=seed,
+        board_seed=seed,
+        board_mode="constrained",
+        player_count=4,
+        victory_target=10,
+    )
+    for _ in range(MIDGAME_STEPS):
+        if game.winner is not None or not game.ai.step(game):
+            break
+    return game
+
+
+def _restorable_midgame() -> CatanGame:
+    game = _midgame()
+    # Saves require at least one human seat, as in a real match.
+    game.players[0].is_ai = False
+    game.ai_player_count = len(game.players) - 1
+    return game
+
+
+def _snapshot_payload(game: CatanGame) -> bytes:
+    snapshot = build_state_snapshot(game, viewer_player_index=0, revision=1)
+    return json.dumps(snapshot, ensure_ascii=False).encode("utf-8")
+
+
+def bench_ai_step(scale: int) -> dict[str, list[float]]:
+    samples: dict[str, list[float]] = {}
+    for seed in range(BENCH_SEED, BENCH_SEED + scale):
+        game = _prepare_game(
+            match_seed=seed,
+            board_seed=seed,
+            board_mode="constrained",
+            player_count=4,
+            victory_target=10,
+        )
+        for _ in range(3000):
+            if game.winner is not None:
+                break
+            phase = game.special_phase or game.phase
+            started = time.perf_counter_ns()
+            acted = game.ai.step(game)
+            elapsed = (time.perf_counter_ns() - started) / 1_000_000
+            samples.setdefault(f"ai_step.{phase}", []).append(elapsed)
+            if not acted:
+                break
+    return samples
+
+
+def bench_run_match(scale: int) -> dict[str, list[float]]:
+    return {
+        "run_match": [
+            _timed(lambda seed=seed: run_match(match_seed=seed))
+            for seed in range(BENCH_SEED, BENCH_SEED + 3 * scale)
+        ]
+    }
+
+
+def bench_distribute_resources(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    state = game.capture_state()
+    samples = []
+    for _ in range(20 * scale):
+        for roll in (2, 3, 4, 5, 6, 8, 9, 10, 11, 12):
+            game.restore_state(state)
+            samples.append(_timed(lambda: game.distribute_resources(roll)))
+    game.restore_state(state)
+    return {"distribute_resources": samples}
+
+
+def bench_buildable_queries(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    queries = {
+        "get_buildable_settlement_nodes": game.get_buildable_settlement_nodes,
+        "get_buildable_city_nodes": game.get_buildable_city_nodes,
+        "get_buildable_road_edges": game.get_buildable_road_edges,
+    }
+    samples: dict[str, list[float]] = {name: [] for name in queries}
+    for _ in range(50 * scale):
+        for player in game.players:
+            for name, query in queries.items():
+                samples[name].append(_timed(lambda: query(player)))
+    return samples
+
+
+def bench_persistence(scale: int) -> dict[str, list[float]]:
+    game = _restorable_midgame()
+    text = json.dumps(serialize_game(game))
+    target = CatanGame(headless=True, ai_action_delay_ms=0)
+    # The first restore builds and caches the board; time the steady state.
+    restore_game(target, json.loads(text), runtime_side_effects=False)
+    serialize_samples = []
+    restore_samples = []
+    for _ in range(10 * scale):
+        serialize_samples.append(_timed(lambda: serialize_game(game)))
+        document = json.loads(text)
+        restore_samples.append(
+            _timed(
+                lambda: restore_game(target, document, runtime_side_effects=False)
+            )
+        )
+    return {"serialize_game": serialize_samples, "restore_game": restore_samples}
+
+
+def bench_state_snapshots(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    viewers = [None, *range(len(game.players))]
+    samples = []
+    for revision in range(10 * scale):
+        for viewer in viewers:
+            samples.append(
+                _timed(
+                    lambda: build_state_snapshot(
+                        game, viewer_player_index=viewer, revision=revision
+                    )
+                )
+            )
+    return {"build_state_snapshot": samples}
+
+
+def bench_state_deltas(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    viewers = [None, *range(len(game.players))]
+    previous = [
+        build_state_snapshot(game, viewer_player_index=viewer, revision=1)
+        for viewer in viewers
+    ]
+    game.ai.step(game)
+    current = [
+        build_state_snapshot(game, viewer_player_index=viewer, revision=2)
+        for viewer in viewers
+    ]
+    samples = []
+    for _ in range(20 * scale):
+        for baseline, snapshot in zip(previous, current):
+            samples.append(_timed(lambda: build_state_delta(baseline, snapshot)))
+    return {"build_state_delta": samples}
+
+
+def bench_frame_decoder(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    snapshot = build_state_snapshot(game, viewer_player_index=0, revision=1)
+    frame = encode_frame(snapshot)
+    chunks = [
+        frame[offset:offset + FRAME_CHUNK_BYTES]
+        for offset in range(0, len(frame), FRAME_CHUNK_BYTES)
+    ]
+    decoder = FrameDecoder()
+
+    def feed_all():
+        for chunk in chunks:
+            decoder.feed(chunk)
+
+    return {
+        "encode_frame": [_timed(lambda: encode_frame(snapshot)) for _ in range(50 * scale)],
+        "frame_decoder_feed": [_timed(feed_all) for _ in range(50 * scale)],
+    }
+
+
+def bench_websocket_frames(scale: int) -> dict[str, list[float]]:
+    payload = _snapshot_payload(_midgame())
+    client_frame = encode_websocket_frame(
+        payload, opcode=WebSocketOpcode.TEXT, masking_key=_MASKING_KEY
+    )
+    return {
+        "websocket_encode": [
+            _timed(lambda: encode_websocket_frame(payload, opcode=WebSocketOpcode.TEXT))
+            for _ in range(50 * scale)
+        ],
+        "websocket_decode_masked": [
+            _timed(
+                lambda: read_websocket_frame(
+                    io.BytesIO(client_frame), require_mask=True
+                )
+            )
+            for _ in range(10 * scale)
+        ],
+    }
+
+
+def _apply_mask_per_byte(payload: bytes, masking_key: bytes) -> bytes:
+    # The generator the transport used before word-wide masking; kept here
+    # only as the comparison point for ``websocket_unmask``.
+    return bytes(byte ^ masking_key[index % 4] for index, byte in enumerate(payload))
+
+
+def bench_websocket_unmask(scale: int) -> dict[str, list[float]]:
+    results = {}
+    for label, size, samples in UNMASK_PAYLOADS:
+        payload = bytes(range(256)) * (size // 256)
+        expected = _apply_mask_per_byte(payload, _MASKING_KEY)
+        if _apply_mask(payload, _MASKING_KEY) != expected:
+            raise AssertionError("word-wide masking differs from the reference")
+        results[f"websocket_unmask_{label}"] = [
+            _timed(lambda: _apply_mask(payload, _MASKING_KEY))
+            for _ in range(samples * scale)
+        ]
+        results[f"websocket_unmask_{label}_per_byte"] = [
+            _timed(lambda: _apply_mask_per_byte(payload, _MASKING_KEY))
+            for _ in range(samples * scale)
+        ]
+    return results
+
+
+def bench_replay_store(scale: int) -> dict[str, list[float]]:
+    game = _midgame()
+    samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteNetworkReplayStore(Path(directory) / "bench-replays.sqlite3")
+        try:
+            store.bind_room("BENCH1", str(uuid.UUID(int=BENCH_SEED, version=4)))
+            for revision in range(3 * scale):
+                samples.append(
+                    _timed(
+                        lambda: store.capture_game("BENCH1", game, revision=revision)
+                    )
+                )
+        finally:
+            store.close()
+    return {"replay_store_capture": samples}
+
+
+BENCHMARKS: dict[str, Callable[[int], dict[str, list[float]]]] = {
+    "ai_step": bench_ai_step,
+    "run_match": bench_run_match,
+    "distribute_resources": bench_distribute_resources,
+    "buildable_queries": bench_buildable_queries,
+    "persistence": bench_persistence,
+    "state_snapshots": bench_state_snapshots,
+    "state_deltas": bench_state_deltas,
+    "frame_decoder": bench_frame_decoder,
+    "websocket_frames": bench_websocket_frames,
+    "websocket_unmask": bench_websocket_unmask,
+    "replay_store": bench_replay_store,
+}
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    *,
+    scale: int = 1,
+) -> dict:
+    """Run the named benchmark groups (all by default) and return a document."""
+    if isinstance(scale, bool) or not isinstance(scale, int):
+        raise TypeError("scale must be an int")
+    if scale < 1:
+        raise ValueError("scale must be positive")
+    selected = list(BENCHMARKS) if names is None else list(names)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(
+            f"unknown benchmark: {unknown[0]} (choose from {', '.join(BENCHMARKS)})"
+        )
+    results = {}
+    for group in selected:
+        for name, samples in BENCHMARKS[group](scale).items():
+            results[name] = BenchmarkResult(name, tuple(samples)).to_dict()
+    return {
+        "format": BENCH_FORMAT,
+        "version": BENCH_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def load_results(path: Path) -> dict:
+    """Read a benchmark document written by this module."""
+    try:
+        document = json.loads(Path(path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"benchmark file is not JSON: {path}") from exc
+    if (
+        not isinstance(document, dict)
+        or document.get("format") != BENCH_FORMAT
+        or document.get("version") != BENCH_VERSION
+        or not isinstance(document.get("results"), dict)
+    ):
+        raise ValueError(f"not a {BENCH_FORMAT} v{BENCH_VERSION} document: {path}")
+    return document
+
+
+def compare_results(
+    current: dict,
+    baseline: dict,
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """Return benchmarks whose median grew by more than ``tolerance``.
+
+    Benchmarks present in only one document are ignored.
+    """
+    if isinstance(tolerance, bool) or not isinstance(tolerance, (int, float)):
+        raise TypeError("tolerance must be a number")
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative")
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        baseline_ms = reference["p50_ms"]
+        current_ms = result["p50_ms"]
+        if baseline_ms > 0 and current_ms > baseline_ms * (1 + tolerance):
+            regressions.append(Regression(name, baseline_ms, current_ms))
+    return regressions
+
+
+def _parse_names(value: str) -> list[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("benchmark names must be comma-separated")
+    return names
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="カタン風ゲーム 性能ベンチマーク")
+    parser.add_argument(
+        "--only",
+        type=_parse_names,
+        default=None,
+        help=f"カンマ区切りで実行対象を指定: {','.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--scale", type=int, default=1, help="試行回数の倍率")
+    parser.add_argument("--output", type=Path, default=None, help="結果JSONの保存先")
+    parser.add_argument("--baseline", type=Path, default=None, help="比較する基準JSON")
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        default=None,
+        help="今回の結果を基準JSONとして保存",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="中央値が基準から何割遅くなったら劣化とみなすか（既定0.25）",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="劣化があれば終了コード1で失敗",
+    )
+    parser.add_argument("--pretty", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        baseline = None if args.baseline is None else load_results(args.baseline)
+        document = run_benchmarks(args.only, scale=args.scale)
+        regressions = (
+            []
+            if baseline is None
+            else compare_results(document, baseline, tolerance=args.tolerance)
+        )
+    except (OSError, TypeError, ValueError) as exc:
+        parser.error(str(exc))
+    if baseline is not None:
+        document["regressions"] = [
+            {
+                "name": regression.name,
+                "baseline_p50_ms": regression.baseline_ms,
+                "current_p50_ms": regression.current_ms,
+                "ratio": round(regression.ratio, 3),
+            }
+            for regression in regressions
+        ]
+    text = json.dumps(
+        document,
+        ensure_ascii=False,
+        indent=2 if args.pretty else None,
+        sort_keys=args.pretty,
+    )
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    if regressions:
+        print(
+            f"PERFORMANCE REGRESSION: {len(regressions)} benchmark(s) slower than "
+            f"baseline by more than {args.tolerance:.0%}",
+            file=sys.stderr,
+        )
+        for regression in regressions:
+            print(f"  {regression.describe()}", file=sys.stderr)
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
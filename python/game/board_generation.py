@@ -0,0 +1,271 @@
+"""Index-table search for constrained number and harbor assignment.
+
+``GameBoard`` generation shuffles the number tokens thousands of times and
+keeps the lowest-scoring layout.  The scorers here compile a board's tile
+adjacency and per-resource groups into plain index tables once per board,
+so each candidate is scored with integer list lookups instead of dicts keyed
+by tiles.  Both searches consume the generator exactly like the original
+loops did, so a seed keeps producing the layout it always has; that layout
+contract is ``BOARD_GENERATOR_VERSION``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+
+from game.hex_tile import TOKEN_PIP_COUNTS
+from game.resources import ResourceType
+
+
+__all__ = (
+    "BOARD_GENERATOR_VERSION",
+    "BoardLayout",
+    "HarborAssignmentScorer",
+    "NumberAssignmentScorer",
+    "search_harbor_assignment",
+    "search_number_assignment",
+)
+
+
+# Bump when a change alters which layout a (mode, seed, topology) produces.
+BOARD_GENERATOR_VERSION = 1
+
+RED_PIPS = TOKEN_PIP_COUNTS[6]
+ADJACENT_RED_PENALTY = 1000
+CROWDED_RED_PENALTY = 1800
+PIP_BALANCE_WEIGHT = 5
+STRONGEST_PIP_WEIGHT = 36
+PAIR_PIP_LIMIT = 8
+PAIR_PIP_WEIGHT = 4
+GENERIC_HARBOR_PIP_LIMIT = 8
+GENERIC_HARBOR_PIP_WEIGHT = 2
+MATCHING_HARBOR_PIP_WEIGHT = 24
+MATCHING_HARBOR_RED_PENALTY = 900
+
+
+@dataclass(frozen=True)
+class BoardLayout:
+    """The generated content of one board, without any geometry.
+
+    ``resources`` and ``numbers`` follow the board's tile order (axial
+    coordinates sorted by row, then column); ``harbors`` follows the
+    board's harbor order, with ``None`` for generic 3:1 harbors.
+    """
+
+    seed: object
+    mode: str
+    topology_id: str
+    resources: tuple[ResourceType, ...]
+    numbers: tuple[int | None, ...]
+    harbors: tuple[ResourceType | None, ...]
+    version: int = BOARD_GENERATOR_VERSION
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "seed": self.seed,
+            "mode": self.mode,
+            "topology_id": self.topology_id,
+            "resources": [resource.name for resource in self.resources],
+            "numbers": list(self.numbers),
+            "harbors": [
+                None if resource is None else resource.name
+                for resource in self.harbors
+            ],
+        }
+
+
+class NumberAssignmentScorer:
+    """Score number-token layouts for one board's land tiles.
+
+    ``land_resources`` lists the resource of each land tile in the order the
+    tokens are dealt, and ``adjacent_pairs`` holds each pair of adjacent land
+    tiles once, as indexes into that order.
+    """
+
+    __slots__ = (
+        "adjacent_pairs",
+        "resource_groups",
+        "average_pips",
+        "high_number_limit",
+        "strongest_count",
+        "strongest_limit",
+        "red_token_limit",
+    )
+
+    def __init__(self, land_resources, adjacent_pairs, *, total_pips, outer_ring):
+        self.adjacent_pairs = tuple(adjacent_pairs)
+        groups = {}
+        for index, resource in enumerate(land_resources):
+            groups.setdefault(resource, []).append(index)
+        self.resource_groups = tuple(tuple(group) for group in groups.values())
+        self.average_pips = total_pips / max(1, len(land_resources))
+        if outer_ring:
+            self.high_number_limit = 2
+            self.strongest_count = 4
+            self.strongest_limit = 16
+            self.red_token_limit = 2
+        else:
+            self.high_number_limit = 1
+            self.strongest_count = 2
+            self.strongest_limit = 8
+            self.red_token_limit = 1
+
+    def has_adjacent_red(self, pips):
+        return any(
+            pips[first] == RED_PIPS and pips[second] == RED_PIPS
+            for first, second in self.adjacent_pairs
+        )
+
+    def score(self, pips, bound=None):
+        """Return the layout penalty for per-tile ``pips``; ``0`` is ideal.
+
+        Every term is non-negative, so once the running total reaches
+        ``bound`` the partial total is returned as soon as it is known.
+        """
+        score = 0
+        for first, second in self.adjacent_pairs:
+            first_pips = pips[first]
+            second_pips = pips[second]
+            if first_pips == RED_PIPS and second_pips == RED_PIPS:
+                score += ADJACENT_RED_PENALTY
+            combined = first_pips + second_pips
+            if combined > PAIR_PIP_LIMIT:
+                score += (combined - PAIR_PIP_LIMIT) * PAIR_PIP_WEIGHT
+        if bound is not None and score >= bound:
+            return score
+
+        average = self.average_pips
+        for group in self.resource_groups:
+            values = [pips[index] for index in group]
+            reds = values.count(RED_PIPS)
+            if reds > self.high_number_limit:
+                score += (reds - self.high_number_limit) * CROWDED_RED_PENALTY
+            if reds > self.red_token_limit:
+                score += (reds - self.red_token_limit) * CROWDED_RED_PENALTY
+            expected_total = len(values) * average
+            score += int((sum(values) - expected_total) ** 2 * PIP_BALANCE_WEIGHT)
+            values.sort(reverse=True)
+            strongest = sum(values[:self.strongest_count])
+            if strongest > self.strongest_limit:
+                score += (strongest - self.strongest_limit) * STRONGEST_PIP_WEIGHT
+            if bound is not None and score >= bound:
+                return score
+        return score
+
+
+def _shuffler(rng, size):
+    """Return an in-place shuffle for ``size`` items that matches ``rng.shuffle``.
+
+    This is ``random.Random.shuffle`` with the bounded draws inlined, which
+    is what dominates a search over short lists.  Generators that override
+    ``random()`` draw differently, so they keep their own ``shuffle``.
+    """
+    if type(rng).random is not random.Random.random:
+        return rng.shuffle
+    getrandbits = rng.getrandbits
+    bounds = [(index, (index + 1).bit_length()) for index in range(size - 1, 0, -1)]
+
+    def shuffle(items):
+        for index, bits in bounds:
+            other = getrandbits(bits)
+            while other > index:
+                other = getrandbits(bits)
+            items[index], items[other] = items[other], items[index]
+
+    return shuffle
+
+
+def search_number_assignment(rng, numbers, scorer, *, mode, attempts):
+    """Return the number tokens in land-tile order for ``mode``.
+
+    ``fully_random`` reshuffles one list until no red numbers touch;
+    ``constrained`` keeps the lowest-scoring of fresh shuffles and stops at
+    a perfect score.
+    """
+    pip_counts = TOKEN_PIP_COUNTS
+    shuffle = _shuffler(rng, len(numbers))
+    if mode == "fully_random":
+        candidate = list(numbers)
+        for _ in range(attempts):
+            shuffle(candidate)
+            if not scorer.has_adjacent_red([pip_counts[number] for number in candidate]):
+                break
+        return candidate
+
+    best_numbers = None
+    best_score = None
+    for _ in range(attempts):
+        candidate = list(numbers)
+        shuffle(candidate)
+        score = scorer.score(
+            [pip_counts[number] for number in candidate], best_score
+        )
+        if best_score is None or score < best_score:
+            best_score = score
+            best_numbers = candidate
+        if score == 0:
+            break
+    return best_numbers
+
+
+class HarborAssignmentScorer:
+    """Score harbor-type layouts over a fixed list of harbor edges.
+
+    ``edge_tiles`` gives, for each harbor edge, the ``(resource, number)``
+    of the land tiles on that edge.  Each edge's penalty for every harbor
+    type is computed once, so a layout is scored with one lookup per edge.
+    """
+
+    __slots__ = ("penalties",)
+
+    def __init__(self, edge_tiles):
+        penalties = []
+        for tiles in edge_tiles:
+            numbered = [
+                (resource, TOKEN_PIP_COUNTS[number])
+                for resource, number in tiles
+                if number is not None
+            ]
+            generic_pips = sum(pips for _resource, pips in numbered)
+            by_type = {
+                None: max(0, generic_pips - GENERIC_HARBOR_PIP_LIMIT)
+                * GENERIC_HARBOR_PIP_WEIGHT
+            }
+            for resource, pips in numbered:
+                by_type[resource] = (
+                    by_type.get(resource, 0)
+                    + pips * MATCHING_HARBOR_PIP_WEIGHT
+                    + (MATCHING_HARBOR_RED_PENALTY if pips == RED_PIPS else 0)
+                )
+            penalties.append(by_type)
+        self.penalties = tuple(penalties)
+
+    def score(self, harbor_types):
+        return sum(
+            penalty.get(harbor_type, 0)
+            for harbor_type, penalty in zip(harbor_types, self.penalties)
+        )
+
+
+def search_harbor_assignment(rng, harbor_types, scorer, *, mode, attempts):
+    """Return harbor types in harbor-edge order for ``mode``."""
+    if mode == "fully_random":
+        layout = list(harbor_types)
+        rng.shuffle(layout)
+        return layout
+
+    shuffle = _shuffler(rng, len(harbor_types))
+    best_layout = None
+    best_score = None
+    for _ in range(attempts):
+        candidate = list(harbor_types)
+        shuffle(candidate)
+        score = scorer.score(candidate)
+        if best_score is None or score < best_score:
+            best_score = score
+            best_layout = candidate
+        if score == 0:
+            break
+    return best_layout
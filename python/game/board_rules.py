@@ -68,7 +68,15 @@ class BoardRules:
                 closest_tile = tile
         return closest_tile, min_dist
 
+    def _topology(self):
+        return getattr(self.board, "topology", None)
+
     def get_adjacent_nodes(self, node):
+        topology = self._topology()
+        if topology is not None:
+            adjacent_nodes = topology.adjacent_nodes(node)
+            if adjacent_nodes is not None:
+                return list(adjacent_nodes)
         adjacent = set()
         for tile in node.tiles:
             if node not in tile.corners:
@@ -82,14 +90,19 @@ class BoardRules:
         return sorted(adjacent, key=lambda candidate: (candidate.y, candidate.x))
 
     def road_exists_between(self, node1, node2):
+        topology = self._topology()
+        if topology is not None:
+            return topology.road_between(node1, node2) is not None
         return any({road.node1, road.node2} == {node1, node2} for road in self.board.roads)
 
     def player_has_road_touching_node(self, player, node):
+        topology = self._topology()
+        roads = topology.roads_at(node) if topology is not None else self.board.roads
         return any(
             road.owner == player
             and road.touches(node)
             and self.road_is_usable(road)
-            for road in self.board.roads
+            for road in roads
         )
 
     def is_spacing_rule_satisfied(self, node):
@@ -143,9 +156,19 @@ class BoardRules:
             return []
         if require_affordability and not player.can_afford(BUILD_COSTS["road"]):
             return []
+        topology = self._topology()
+        if topology is None:
+            edges = self.board.edges
+        else:
+            # Only edges touching the player's own pieces can connect, so
+            # the candidate set is bounded by the player's network size.
+            edges = [
+                topology.edges[edge_id]
+                for edge_id in topology.player_network_edge_ids(player)
+            ]
         return [
             (node1, node2)
-            for node1, node2 in self.board.edges
+            for node1, node2 in edges
             if self.can_place_road(player, node1, node2)[0]
         ]
 
@@ -154,9 +177,17 @@ class BoardRules:
             return []
         if not player.can_afford(BUILD_COSTS["settlement"]):
             return []
+        topology = self._topology()
+        if topology is None:
+            nodes = self.board.nodes
+        else:
+            nodes = [
+                topology.nodes[node_id]
+                for node_id in topology.player_road_node_ids(player)
+            ]
         return [
             node
-            for node in self.board.nodes
+            for node in nodes
             if self.can_place_main_settlement(player, node)[0]
         ]
 
@@ -165,9 +196,15 @@ class BoardRules:
             return []
         if not player.can_afford(BUILD_COSTS["city"]):
             return []
+        topology = self._topology()
+        nodes = (
+            topology.player_building_nodes(player)
+            if topology is not None
+            else self.board.nodes
+        )
         return [
             node
-            for node in self.board.nodes
+            for node in nodes
             if self.can_upgrade_to_city(player, node)[0]
         ]
 
@@ -0,0 +1,284 @@
+"""Integer-indexed board topology and piece incidence for rule queries.
+
+The board geometry is fixed once ``GameBoard.setup_board`` has run, so node,
+edge and tile IDs are assigned once and never change for that board.  Road
+and building incidence is kept in sync through ``RoadList`` and the
+``Node.building`` setter, so legality checks no longer scan every road.
+"""
+
+
+def node_pair_key(node1, node2):
+    first = id(node1)
+    second = id(node2)
+    return (first, second) if first < second else (second, first)
+
+
+class RoadList(list):
+    """A list of roads that reports mutations to its board.
+
+    Appends are the common gameplay mutation and are applied incrementally.
+    Every other mutation (restores, tests clearing the board, ``pop``) asks
+    the board to rebuild its road incidence from scratch.
+    """
+
+    def __init__(self, roads=(), *, on_append=None, on_reset=None):
+        super().__init__(roads)
+        self._on_append = on_append
+        self._on_reset = on_reset
+
+    def __reduce__(self):
+        # Rebuild the items before the callbacks exist, so unpickling never
+        # notifies a board whose own state has not been loaded yet.
+        return (type(self), (list(self),), self.__dict__)
+
+    def _reset(self):
+        if self._on_reset is not None:
+            self._on_reset()
+
+    def append(self, road):
+        super().append(road)
+        if self._on_append is not None:
+            self._on_append(road)
+
+    def extend(self, roads):
+        super().extend(roads)
+        self._reset()
+
+    def __iadd__(self, roads):
+        result = super().__iadd__(roads)
+        self._reset()
+        return result
+
+    def insert(self, index, road):
+        super().insert(index, road)
+        self._reset()
+
+    def remove(self, road):
+        super().remove(road)
+        self._reset()
+
+    def pop(self, *args):
+        road = super().pop(*args)
+        self._reset()
+        return road
+
+    def clear(self):
+        super().clear()
+        self._reset()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reset()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reset()
+
+
+class BoardTopology:
+    """Immutable board geometry plus mutable per-player piece incidence."""
+
+    def __init__(self, nodes, edges, tiles):
+        self.node_list = nodes
+        self.edge_list = edges
+        self.nodes = tuple(nodes)
+        self.edges = tuple(edges)
+        self.tiles = tuple(tiles)
+        self.node_ids = {node: index for index, node in enumerate(self.nodes)}
+        self.tile_ids = {tile: index for index, tile in enumerate(self.tiles)}
+        self.edge_ids = {}
+        self.edge_node_ids = []
+        self.node_edge_ids = [[] for _ in self.nodes]
+        for edge_id, (node1, node2) in enumerate(self.edges):
+            self.edge_ids[node_pair_key(node1, node2)] = edge_id
+            first = self.node_ids[node1]
+            second = self.node_ids[node2]
+            self.edge_node_ids.append((first, second))
+            self.node_edge_ids[first].append(edge_id)
+            self.node_edge_ids[second].append(edge_id)
+        self.node_edge_ids = tuple(tuple(ids) for ids in self.node_edge_ids)
+
+        # Neighbor order follows BoardRules' historical (y, x) sort so AI
+        # tie-breaks stay reproducible across processes and hash seeds.
+        self.neighbor_ids = tuple(
+            tuple(
+                sorted(
+                    (
+                        second if first == node_id else first
+                        for first, second in (
+                            self.edge_node_ids[edge_id]
+                            for edge_id in self.node_edge_ids[node_id]
+                        )
+                    ),
+                    key=lambda neighbor_id: (
+                        self.nodes[neighbor_id].y,
+                        self.nodes[neighbor_id].x,
+                    ),
+                )
+            )
+            for node_id in range(len(self.nodes))
+        )
+        self.neighbors = tuple(
+            tuple(self.nodes[neighbor_id] for neighbor_id in neighbor_ids)
+            for neighbor_ids in self.neighbor_ids
+        )
+
+        self.roads_by_pair = {}
+        self.roads_by_node = {}
+        self.roads_by_owner = {}
+        self.building_nodes_by_owner = {}
+        # Generations tell incremental consumers (such as the longest-road
+        # tracker) when appended roads or the building log can no longer be
+        # replayed and a full rebuild is required.
+        self.road_generation = 0
+        self.building_generation = 0
+        self.building_log = []
+        self._tiles_by_number = None
+        self._production_by_number = {}
+
+    def is_current_for(self, board):
+        return self.node_list is board.nodes and self.edge_list is board.edges
+
+    def node_id(self, node):
+        return self.node_ids.get(node)
+
+    def edge_id(self, node1, node2):
+        return self.edge_ids.get(node_pair_key(node1, node2))
+
+    def tile_id(self, tile):
+        return self.tile_ids.get(tile)
+
+    def has_edge(self, node1, node2):
+        return node_pair_key(node1, node2) in self.edge_ids
+
+    def adjacent_nodes(self, node):
+        node_id = self.node_ids.get(node)
+        if node_id is None:
+            return None
+        return self.neighbors[node_id]
+
+    def incident_edges(self, node):
+        node_id = self.node_ids.get(node)
+        if node_id is None:
+            return ()
+        return tuple(self.edges[edge_id] for edge_id in self.node_edge_ids[node_id])
+
+    # Piece incidence -----------------------------------------------------
+
+    def rebuild_roads(self, roads):
+        self.road_generation += 1
+        self.roads_by_pair = {}
+        self.roads_by_node = {}
+        self.roads_by_owner = {}
+        for road in roads:
+            self.add_road(road)
+
+    def add_road(self, road):
+        self.roads_by_pair.setdefault(node_pair_key(road.node1, road.node2), road)
+        self.roads_by_node.setdefault(road.node1, []).append(road)
+        if road.node2 is not road.node1:
+            self.roads_by_node.setdefault(road.node2, []).append(road)
+        self.roads_by_owner.setdefault(road.owner, []).append(road)
+
+    def road_between(self, node1, node2):
+        return self.roads_by_pair.get(node_pair_key(node1, node2))
+
+    def roads_at(self, node):
+        return self.roads_by_node.get(node, ())
+
+    def player_roads(self, player):
+        return self.roads_by_owner.get(player, ())
+
+    def rebuild_buildings(self):
+        self.building_generation += 1
+        self.building_log = []
+        self._production_by_number = {}
+        self.building_nodes_by_owner = {}
+        for node in self.nodes:
+            if node.building is not None:
+                self.building_nodes_by_owner.setdefault(
+                    node.building.owner, set()
+                ).add(node)
+
+    def building_changed(self, node, previous, building):
+        self.building_log.append(node)
+        for tile in node.tiles:
+            self._production_by_number.pop(tile.number, None)
+        if previous is not None:
+            owned = self.building_nodes_by_owner.get(previous.owner)
+            if owned is not None:
+                owned.discard(node)
+        if building is not None:
+            self.building_nodes_by_owner.setdefault(building.owner, set()).add(node)
+
+    def player_building_nodes(self, player):
+        """Return the player's building nodes in board order."""
+        owned = self.building_nodes_by_owner.get(player)
+        if not owned:
+            return []
+        return sorted(
+            (node for node in owned if node in self.node_ids),
+            key=self.node_ids.__getitem__,
+        )
+
+    def player_network_edge_ids(self, player):
+        """Edge IDs touching any node the player's pieces reach, in board order."""
+        edge_ids = set()
+        for node in self.player_building_nodes(player):
+            edge_ids.update(self.node_edge_ids[self.node_ids[node]])
+        for road in self.player_roads(player):
+            for node in (road.node1, road.node2):
+                node_id = self.node_ids.get(node)
+                if node_id is not None:
+                    edge_ids.update(self.node_edge_ids[node_id])
+        return sorted(edge_ids)
+
+    def player_road_node_ids(self, player):
+        node_ids = set()
+        for road in self.player_roads(player):
+            for node in (road.node1, road.node2):
+                node_id = self.node_ids.get(node)
+                if node_id is not None:
+                    node_ids.add(node_id)
+        return sorted(node_ids)
+
+    # Production ------------------------------------------------------------
+
+    def numbers_changed(self):
+        self._tiles_by_number = None
+        self._production_by_number = {}
+
+    def tiles_with_number(self, number):
+        if self._tiles_by_number is None:
+            tiles_by_number = {}
+            for tile in self.tiles:
+                tiles_by_number.setdefault(tile.number, []).append(tile)
+            self._tiles_by_number = {
+                tile_number: tuple(tiles)
+                for tile_number, tiles in tiles_by_number.items()
+            }
+        return self._tiles_by_number.get(number, ())
+
+    def production_for(self, number):
+        """Return ``(tile, buildings)`` pairs producing on a dice total.
+
+        Entries keep tile order and corner order so bank arbitration and log
+        output match a full scan.  Building objects are stored rather than
+        their multipliers because a city upgrade mutates the building in
+        place; robber and frontier visibility are per-roll filters.
+        """
+        entries = self._production_by_number.get(number)
+        if entries is None:
+            entries = tuple(
+                (
+                    tile,
+                    tuple(
+                        node.building
+                        for node in tile.corners
+                        if node.building is not None
+                    ),
+                )
+                for tile in self.tiles_with_number(number)
+            )
+            self._production_by_number[number] = entries
+        return entries
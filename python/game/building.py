@@ -1,7 +1,6 @@
 from enum import Enum
 
-import pygame
-
+from game.lazy_modules import pygame
 
 PIECE_OUTLINE_COLOR = (25, 28, 32)
 PIECE_SHADOW_COLOR = (24, 26, 28)
@@ -43,6 +42,7 @@ class Building:
     def __init__(self, owner, building_type=BuildingType.SETTLEMENT):
         self.owner = owner
         self.building_type = building_type
+        self.node = None  # 配置先の Node (都市化を盤面の索引へ通知)
 
     @property
     def victory_points(self):
@@ -58,6 +58,9 @@ class Building:
 
     def upgrade_to_city(self):
         self.building_type = BuildingType.CITY
+        node = self.node
+        if node is not None and node.board is not None and node.building is self:
+            node.board.building_changed(node, self, self)
 
     def draw(self, surface, center):
         """Render a settlement or city as a small dimensional wooden token."""
@@ -19,7 +19,7 @@ DEVELOPMENT_CARD_LABELS = {
 }
 
 
-def create_development_deck(*, disabled_cards=()):
+def create_development_deck(*, disabled_cards=(), rng=None):
     """Build the standard deck, omitting explicitly disabled card types."""
 
     try:
@@ -36,5 +36,6 @@ def create_development_deck(*, disabled_cards=()):
         + [DevelopmentCardType.MONOPOLY] * 2
     )
     deck = [card_type for card_type in deck if card_type not in disabled]
-    random.shuffle(deck)
+    rng = rng or random
+    rng.shuffle(deck)
     return deck
@@ -1,7 +1,6 @@
-import pygame
-
 from game.assets import get_font
 from game.constants import BOARD_CENTER_X, BOARD_CENTER_Y, COLORS, SCREEN_HEIGHT, SCREEN_WIDTH
+from game.lazy_modules import pygame
 
 
 DIE_SIZE = 96
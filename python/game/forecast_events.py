@@ -226,6 +226,19 @@ def canonical_forecast_options(options: Mapping[str, Any]) -> dict[str, Any]:
     }
 
 
+def forecast_deck_seed(rng: Any = None) -> str:
+    """Derive a deck seed from ``rng``'s state without drawing from it.
+
+    Headless simulations that seed their generator therefore remain exactly
+    reproducible, while the unrevealed event order stays server-only.
+    """
+
+    random_state = repr((random if rng is None else rng).getstate()).encode("utf-8")
+    return hashlib.sha256(
+        b"catan:forecast-events:core-v1\0" + random_state
+    ).hexdigest()
+
+
 def create_initial_forecast_documents(
     options: Mapping[str, Any],
     *,
@@ -236,14 +249,7 @@ def create_initial_forecast_documents(
 
     canonical = canonical_forecast_options(options)
     if deck_seed is None:
-        # Derive an independent deterministic seed without consuming the
-        # shared RNG used by dice, robber theft and the development deck.
-        # Headless simulations that seed ``random`` therefore remain exactly
-        # reproducible, while the unrevealed event order stays server-only.
-        random_state = repr(random.getstate()).encode("utf-8")
-        deck_seed = hashlib.sha256(
-            b"catan:forecast-events:core-v1\0" + random_state
-        ).hexdigest()
+        deck_seed = forecast_deck_seed()
     _validate_seed(deck_seed)
     catalog = canonical["catalog"]
     if catalog == CAMPAIGN_FORECAST_CATALOG_ID:
@@ -941,6 +947,7 @@ __all__ = (
     "consume_active_effect",
     "create_initial_forecast_documents",
     "event_definition",
+    "forecast_deck_seed",
     "forecast_event_id",
     "validate_forecast_documents",
     "validate_forecast_public",
@@ -4,8 +4,6 @@ import math
 import random
 import secrets
 
-import pygame
-
 from game.ai import AI_ACTION_DELAY_MS, AI_SPEED_OPTIONS, SimpleAI
 from game.ai_personality import (
     AI_PERSONALITY_MODES,
@@ -64,10 +62,15 @@ from game.forecast_events import (
     SHEEP_DROUGHT_EVENT_ID,
     WHEAT_HARVEST_EVENT_ID,
     event_definition,
+    forecast_deck_seed,
 )
 from game.frontier import FRONTIER_KIND
 from game.grand_campaign import GrandCampaignError, HarborBlockadePlan
-from game.game_board import GameBoard
+from game.game_board import build_board
+from game.game_state import (
+    capture_state as capture_compact_state,
+    restore_state as restore_compact_state,
+)
 from game.house_rules import HouseRules
 from game.guidance import (
     GuidanceState,
@@ -77,21 +80,8 @@ from game.guidance import (
 )
 from game.hex_tile import get_token_pip_count
 from game.log_display import draw_log, draw_resource_counts
-from game.lan_lobby_display import (
-    ACTION_BACK,
-    ACTION_CLOSE,
-    ACTION_LEAVE_ROOM,
-    ACTION_START_MATCH,
-    LanLobbyDisplayState,
-    draw_lan_lobby_display,
-    hit_test_lan_lobby_display,
-)
+from game.longest_road import LongestRoadTracker
 from game.lan_lobby_flow import LanLobbyFlow
-from game.lan_match_display import (
-    LanMatchDisplayState,
-    draw_lan_match_display,
-    hit_test_lan_match_display,
-)
 from game.match_metrics import MatchMetrics
 from game.match_result import build_match_result
 from game.persistence import (
@@ -103,25 +93,7 @@ from game.persistence import (
     serialize_game,
 )
 from game.player import Player
-from game.pre_game_settings_display import (
-    ACTION_APPLY as PRE_GAME_SETTINGS_APPLY,
-    ACTION_CANCEL as PRE_GAME_SETTINGS_CANCEL,
-    ACTION_EDIT_HARBORS,
-    ACTION_EDIT_NUMBERS,
-    ACTION_EDIT_TERRAIN,
-    ACTION_RESET as PRE_GAME_SETTINGS_RESET,
-    ACTION_SHUFFLE_HARBORS,
-    ACTION_SHUFFLE_NUMBERS,
-    ACTION_SHUFFLE_TERRAIN,
-    ACTION_TAB_MAP,
-    ACTION_TAB_RULES,
-    ACTION_TOGGLE_BANK_3_TO_1,
-    ACTION_TOGGLE_SKIP_DISCARD,
-    PreGameSettingsDisplayState,
-    development_toggle_action,
-    draw_pre_game_settings_display,
-    hit_test_pre_game_settings,
-)
+from game.lazy_modules import lazy_import, pygame
 from game.resources import BUILD_COSTS, ResourceType
 from game.resource_credit import (
     BANK_TO_PLAYER,
@@ -164,16 +136,6 @@ from game.replay import (
     load_replay,
     restore_replay_frame,
 )
-from game.result_display import (
-    NEW_BOARD_ACTION,
-    REPLAY_SELECTED_ACTION,
-    RESTART_SAME_BOARD_ACTION,
-    build_result_display_layout,
-    draw_result_display,
-    hit_test_result_display,
-    normalise_match_result,
-    selected_replay_frame,
-)
 from game.ui import (
     RESOURCE_LABELS,
     PhaseStep,
@@ -188,6 +150,13 @@ from game.ui import (
 )
 
 
+# Screen-only components load on first use, keeping headless engines light.
+lan_lobby_display = lazy_import("game.lan_lobby_display")
+lan_match_display = lazy_import("game.lan_match_display")
+pre_game_settings_display = lazy_import("game.pre_game_settings_display")
+result_display = lazy_import("game.result_display")
+
+
 class _SilentAudio:
     """No-op audio backend used by deterministic headless simulations."""
 
@@ -234,7 +203,14 @@ class CatanGame:
         ai_action_delay_ms=AI_ACTION_DELAY_MS,
         ai_personality_mode=STANDARD,
         headless=False,
+        rng=None,
+        board=None,
+        variant_state=None,
     ):
+        # Dice, theft, festival grants and the development deck draw from
+        # ``rng``.  The desktop game keeps the module-level generator; hosted
+        # rooms and simulations pass their own ``random.Random`` instance.
+        self.rng = random if rng is None else rng
         self.headless = bool(headless)
         if self.headless:
             self.screen = None
@@ -265,12 +241,21 @@ class CatanGame:
             raise ValueError("custom_map is only valid in custom board mode")
         if variant_uses_hidden_board(self.variant_config) and self.board_mode == "custom":
             raise ValueError("frontier variant is available only on generated boards")
-        self.board = self.create_board_from_settings()
+        # ``board`` lets ``fork`` reuse a copied layout for the same settings
+        # instead of searching for a constrained number layout again.
+        self.board = self.create_board_from_settings() if board is None else board
         self.board_rules = BoardRules(
             self.board,
             road_is_usable=self.is_road_usable,
         )
-        self.variant_state = self.create_initial_variant_state()
+        self.longest_road_tracker = LongestRoadTracker()
+        # ``fork`` hands over the current variant state: fresh frontier state
+        # can only be created while the robber is still on the centre tile.
+        self.variant_state = (
+            self.create_initial_variant_state()
+            if variant_state is None
+            else variant_state
+        )
         self.running = True
         self.audio = _SilentAudio() if self.headless else GameAudio()
         self.dice_overlay = (
@@ -369,7 +354,8 @@ class CatanGame:
         self.action_mode = None
         self.development_card_used_this_turn = False
         self.development_deck = create_development_deck(
-            disabled_cards=self.house_rules.disabled_development_cards
+            disabled_cards=self.house_rules.disabled_development_cards,
+            rng=self.rng,
         )
         self.special_phase = None
         self.discard_queue = []
@@ -653,7 +639,7 @@ class CatanGame:
             "available": replay_frame_count > 0,
             "frame_count": replay_frame_count,
         }
-        result = normalise_match_result(self.match_result)
+        result = result_display.normalise_match_result(self.match_result)
         if result.important_events:
             self.result_selected_event_index = max(
                 0,
@@ -670,12 +656,12 @@ class CatanGame:
     def build_match_result_layout(self):
         if self.match_result is None or self.screen is None:
             return None
-        result = normalise_match_result(self.match_result)
-        replay_frame = selected_replay_frame(
+        result = result_display.normalise_match_result(self.match_result)
+        replay_frame = result_display.selected_replay_frame(
             self.match_result,
             self.result_selected_event_index,
         )
-        return build_result_display_layout(
+        return result_display.build_result_display_layout(
             self.screen.get_size(),
             len(result.players),
             len(result.important_events),
@@ -688,7 +674,7 @@ class CatanGame:
             self.refresh_match_result()
         if self.match_result is None:
             return False
-        events = normalise_match_result(self.match_result).important_events
+        events = result_display.normalise_match_result(self.match_result).important_events
         if not events:
             return False
         self.result_selected_event_index = max(
@@ -702,10 +688,10 @@ class CatanGame:
         return True
 
     def handle_match_result_action(self, action):
-        if action == REPLAY_SELECTED_ACTION:
+        if action == result_display.REPLAY_SELECTED_ACTION:
             if self.match_result is None:
                 self.refresh_match_result()
-            frame_index = selected_replay_frame(
+            frame_index = result_display.selected_replay_frame(
                 self.match_result,
                 self.result_selected_event_index,
             )
@@ -721,10 +707,10 @@ class CatanGame:
             if not self.start_replay(archive):
                 return False
             return self.show_replay_frame(frame_index)
-        if action == RESTART_SAME_BOARD_ACTION:
+        if action == result_display.RESTART_SAME_BOARD_ACTION:
             self.restart_game(randomize_seed=False)
             return True
-        if action == NEW_BOARD_ACTION:
+        if action == result_display.NEW_BOARD_ACTION:
             self.restart_game(randomize_seed=True)
             return True
         return False
@@ -788,7 +774,7 @@ class CatanGame:
         now = pygame.time.get_ticks()
         self.replay_exit_snapshot = origin
         self.replay_runtime_state = {
-            "random_state": random.getstate(),
+            "random_state": self.rng.getstate(),
             "ai_remaining_ms": max(0, self.ai_next_action_at - now),
         }
         self.replay_archive = archive
@@ -824,7 +810,7 @@ class CatanGame:
             return False
         random_state = runtime_state.get("random_state")
         if random_state is not None:
-            random.setstate(random_state)
+            self.rng.setstate(random_state)
         self.ai_next_action_at = pygame.time.get_ticks() + int(
             runtime_state.get("ai_remaining_ms", 0)
         )
@@ -1082,7 +1068,7 @@ class CatanGame:
         )
 
     def generate_board_seed(self):
-        return random.randint(10000, 99999999)
+        return self.rng.randint(10000, 99999999)
 
     def normalize_board_seed(self, value):
         if value is None:
@@ -1093,7 +1079,7 @@ class CatanGame:
         """Build the board described by the portable pre-game settings."""
 
         topology_id = variant_board_topology(self.variant_config)
-        return GameBoard(
+        return build_board(
             mode=self.board_mode,
             seed=self.board_seed,
             custom_map=(self.custom_map_spec if self.board_mode == "custom" else None),
@@ -1131,6 +1117,9 @@ class CatanGame:
             )
         return VariantState.initial(
             self.variant_config,
+            deck_seed=(
+                forecast_deck_seed(self.rng) if forecast_config is not None else None
+            ),
             frontier_robber_axial=robber_axial,
             forecast_harbor_ids=forecast_harbor_ids,
         )
@@ -1225,6 +1214,56 @@ class CatanGame:
         self.notify(f"ゲームを読み込みました: {path.name}", level="success")
         return True
 
+    def capture_state(self, *, include_rng=False):
+        """Return a compact copy of the position for search and rollouts."""
+        return capture_compact_state(self, include_rng=include_rng)
+
+    def restore_state(self, state):
+        """Jump to a position from ``capture_state`` without validation."""
+        restore_compact_state(self, state)
+
+    def fork(self, *, rng=None):
+        """Return an independent headless game at the current position.
+
+        The fork shares no mutable state with this game and draws from its
+        own generator, a copy of this game's unless ``rng`` is given.  Building
+        it costs a board construction; searches fork once and then move the
+        fork between positions with ``capture_state``/``restore_state``.
+        """
+        clone = CatanGame(
+            self.board_mode,
+            self.board_seed,
+            custom_map=self.custom_map_spec,
+            house_rules=self.house_rules,
+            variant_config=self.variant_config,
+            ai_action_delay_ms=0,
+            ai_personality_mode=self.ai_personality_mode,
+            headless=True,
+            rng=random.Random() if rng is None else rng,
+            board=self.board.copy_layout(),
+            variant_state=self.variant_state,
+        )
+        clone.ai_player_count = self.ai_player_count
+        clone.configure_players(
+            len(self.players),
+            reset_logs=False,
+            schedule_ai=False,
+            reset_replay=False,
+        )
+        clone.ai_player_count = self.ai_player_count
+        for source, player in zip(self.players, clone.players):
+            player.name = source.name
+            player.color = source.color
+            player.is_ai = source.is_ai
+            player.ai_personality = source.ai_personality
+            player.piece_pattern = source.piece_pattern
+            player.marker = source.marker
+        clone.public_gain_history = {player.name: [] for player in clone.players}
+        clone.reset_match_metrics()
+        state = self.capture_state(include_rng=rng is None)
+        clone.restore_state(state)
+        return clone
+
     def toggle_log_panel(self):
         self.show_log_panel = not self.show_log_panel
         if not self.show_log_panel:
@@ -1446,7 +1485,7 @@ class CatanGame:
     def get_pre_game_settings_display_state(self):
         if self.pre_game_draft_map is None or self.pre_game_draft_house_rules is None:
             raise RuntimeError("詳細設定のdraftがありません。")
-        return PreGameSettingsDisplayState(
+        return pre_game_settings_display.PreGameSettingsDisplayState(
             map_spec=self.pre_game_draft_map,
             house_rules=self.pre_game_draft_house_rules,
             tab=self.pre_game_settings_tab,
@@ -1476,7 +1515,7 @@ class CatanGame:
         self.refresh_pre_game_map_warning()
 
     def reset_pre_game_settings_draft(self):
-        generated = GameBoard(mode="constrained", seed=self.board_seed)
+        generated = build_board(mode="constrained", seed=self.board_seed)
         self.pre_game_draft_map = CustomMapSpec.from_board(
             generated,
             name="カスタムマップ",
@@ -1510,7 +1549,7 @@ class CatanGame:
         # Validate and build before mutating the live match.  This keeps Cancel
         # and failed Apply operations genuinely transactional.
         try:
-            candidate_board = GameBoard(
+            candidate_board = build_board(
                 mode=draft_mode,
                 seed=self.board_seed,
                 custom_map=draft_map,
@@ -1543,25 +1582,25 @@ class CatanGame:
     def handle_pre_game_settings_action(self, action):
         if not self.pre_game_settings_open:
             return False
-        if action == PRE_GAME_SETTINGS_CANCEL:
+        if action == pre_game_settings_display.ACTION_CANCEL:
             return self.close_pre_game_settings()
-        if action == PRE_GAME_SETTINGS_APPLY:
+        if action == pre_game_settings_display.ACTION_APPLY:
             return self.apply_pre_game_settings_draft()
-        if action == PRE_GAME_SETTINGS_RESET:
+        if action == pre_game_settings_display.ACTION_RESET:
             self.reset_pre_game_settings_draft()
             return True
-        if action == ACTION_TAB_MAP:
+        if action == pre_game_settings_display.ACTION_TAB_MAP:
             self.pre_game_settings_tab = "map"
             return True
-        if action == ACTION_TAB_RULES:
+        if action == pre_game_settings_display.ACTION_TAB_RULES:
             self.pre_game_settings_tab = "rules"
             self.pre_game_selected_tile = None
             self.pre_game_selected_harbor = None
             return True
         layer_by_action = {
-            ACTION_EDIT_TERRAIN: "terrain",
-            ACTION_EDIT_NUMBERS: "numbers",
-            ACTION_EDIT_HARBORS: "harbors",
+            pre_game_settings_display.ACTION_EDIT_TERRAIN: "terrain",
+            pre_game_settings_display.ACTION_EDIT_NUMBERS: "numbers",
+            pre_game_settings_display.ACTION_EDIT_HARBORS: "harbors",
         }
         if action in layer_by_action:
             self.pre_game_edit_layer = layer_by_action[action]
@@ -1571,9 +1610,9 @@ class CatanGame:
             return True
         if self.pre_game_draft_map is not None:
             shuffle_by_action = {
-                ACTION_SHUFFLE_TERRAIN: "shuffle_tiles",
-                ACTION_SHUFFLE_NUMBERS: "shuffle_numbers",
-                ACTION_SHUFFLE_HARBORS: "shuffle_harbors",
+                pre_game_settings_display.ACTION_SHUFFLE_TERRAIN: "shuffle_tiles",
+                pre_game_settings_display.ACTION_SHUFFLE_NUMBERS: "shuffle_numbers",
+                pre_game_settings_display.ACTION_SHUFFLE_HARBORS: "shuffle_harbors",
             }
             method_name = shuffle_by_action.get(action)
             if method_name is not None:
@@ -1583,20 +1622,20 @@ class CatanGame:
                 return True
         if self.pre_game_draft_house_rules is not None:
             rules = self.pre_game_draft_house_rules
-            if action == ACTION_TOGGLE_BANK_3_TO_1:
+            if action == pre_game_settings_display.ACTION_TOGGLE_BANK_3_TO_1:
                 self.pre_game_draft_house_rules = replace(
                     rules,
                     bank_trade_3_to_1=not rules.bank_trade_3_to_1,
                 )
                 return True
-            if action == ACTION_TOGGLE_SKIP_DISCARD:
+            if action == pre_game_settings_display.ACTION_TOGGLE_SKIP_DISCARD:
                 self.pre_game_draft_house_rules = replace(
                     rules,
                     skip_discard_on_seven=not rules.skip_discard_on_seven,
                 )
                 return True
             for card_type in DevelopmentCardType:
-                if action == development_toggle_action(card_type):
+                if action == pre_game_settings_display.development_toggle_action(card_type):
                     self.pre_game_draft_house_rules = rules.toggle_development_card(
                         card_type
                     )
@@ -1674,7 +1713,7 @@ class CatanGame:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.pre_game_settings_layout is None:
                 return True
-            target = hit_test_pre_game_settings(
+            target = pre_game_settings_display.hit_test_pre_game_settings(
                 self.pre_game_settings_layout,
                 event.pos,
             )
@@ -1763,7 +1802,9 @@ class CatanGame:
     def get_lan_lobby_display_state(self):
         if self.lan_lobby_flow is None:
             raise RuntimeError("LANロビーが初期化されていません。")
-        return LanLobbyDisplayState(**asdict(self.lan_lobby_flow.display_state))
+        return lan_lobby_display.LanLobbyDisplayState(
+            **asdict(self.lan_lobby_flow.display_state)
+        )
 
     def sync_lan_build_selection(self):
         flow = self.lan_lobby_flow
@@ -1785,7 +1826,7 @@ class CatanGame:
             return None
         self.sync_lan_build_selection()
         flow_state = flow.display_state
-        return LanMatchDisplayState(
+        return lan_match_display.LanMatchDisplayState(
             view=flow.latest_game_view,
             command_options=(
                 () if flow.command_pending else flow.latest_command_options
@@ -1814,7 +1855,7 @@ class CatanGame:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if flow.command_pending or self.lan_match_layout is None:
                     return True
-                target = hit_test_lan_match_display(
+                target = lan_match_display.hit_test_lan_match_display(
                     self.lan_match_layout,
                     event.pos,
                 )
@@ -1831,10 +1872,12 @@ class CatanGame:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.lan_lobby_layout is None:
                 return True
-            target = hit_test_lan_lobby_display(self.lan_lobby_layout, event.pos)
+            target = lan_lobby_display.hit_test_lan_lobby_display(
+                self.lan_lobby_layout, event.pos
+            )
             if target is None:
                 return True
-            if target.action == ACTION_START_MATCH and flow.match_active:
+            if target.action == lan_lobby_display.ACTION_START_MATCH and flow.match_active:
                 self.lan_match_visible = True
                 return True
             flow.handle_action(target.action)
@@ -1848,11 +1891,11 @@ class CatanGame:
             return True
         if event.key == pygame.K_ESCAPE:
             if flow.mode == "home":
-                flow.handle_action(ACTION_CLOSE)
+                flow.handle_action(lan_lobby_display.ACTION_CLOSE)
             elif flow.mode == "connected":
-                flow.handle_action(ACTION_LEAVE_ROOM)
+                flow.handle_action(lan_lobby_display.ACTION_LEAVE_ROOM)
             else:
-                flow.handle_action(ACTION_BACK)
+                flow.handle_action(lan_lobby_display.ACTION_BACK)
             return True
         if event.key == pygame.K_BACKSPACE:
             flow.backspace()
@@ -2327,6 +2370,39 @@ class CatanGame:
         sector = effect.get("parameters", {}).get("sector")
         return self.get_forecast_edge_sector(edge) == sector
 
+    def get_board_manifest_key(self):
+        """Return a key that changes whenever the public board manifest may.
+
+        Board geometry is immutable, so only piece placement (tracked by the
+        board revision), the robber, frontier reveals and the active
+        earthquake/harbor blockade effects can change the manifest.
+        """
+
+        earthquake = self.get_active_forecast_effect(EARTHQUAKE_EVENT_ID)
+        blockade = self.get_active_forecast_effect(HARBOR_BLOCKADE_EVENT_ID)
+        frontier = self.is_frontier_variant()
+        return (
+            self.board.revision,
+            self.board.robber_tile,
+            self.board.mode,
+            self.board.seed,
+            getattr(self.board, "custom_map", None),
+            tuple(self.players),
+            frontier,
+            frontier
+            and tuple(
+                self.is_frontier_tile_revealed(tile) for tile in self.board.tiles
+            ),
+            None
+            if earthquake is None
+            else earthquake.get("parameters", {}).get("sector"),
+            None
+            if blockade is None
+            else self._forecast_harbor_id_from_parameters(
+                blockade.get("parameters", {})
+            ),
+        )
+
     def is_forecast_edge_announced(self, edge):
         parameters = self.get_forecast_event_parameters(EARTHQUAKE_EVENT_ID)
         if not parameters:
@@ -2383,7 +2459,7 @@ class CatanGame:
 
         grants = {}
         for player in players:
-            resource_type = random.choice(available_cards)
+            resource_type = self.rng.choice(available_cards)
             available_cards.remove(resource_type)
             if self.give_resource_from_bank(player, resource_type, 1) != 1:
                 raise RuntimeError("商人祭ボーナスの銀行在庫が一致しません。")
@@ -3723,7 +3799,8 @@ class CatanGame:
         self.reset_pending_dice_state()
         self.phase = "initial"
         self.development_deck = create_development_deck(
-            disabled_cards=self.house_rules.disabled_development_cards
+            disabled_cards=self.house_rules.disabled_development_cards,
+            rng=self.rng,
         )
         if schedule_ai:
             self.schedule_ai_action()
@@ -3775,10 +3852,10 @@ class CatanGame:
         return amount
 
     def get_player_victory_points(self, player):
-        points = 0
-        for node in self.board.nodes:
-            if node.building is not None and node.building.owner == player:
-                points += node.building.victory_points
+        points = sum(
+            node.building.victory_points
+            for node in self.board.topology.player_building_nodes(player)
+        )
         points += player.victory_point_cards
         if self.longest_road_owner == player:
             points += 2
@@ -6449,7 +6526,7 @@ class CatanGame:
             )
             return None
 
-        stolen_resource = random.choice(available_resources)
+        stolen_resource = self.rng.choice(available_resources)
         removal = victim.remove_owned_resource(stolen_resource)
         if removal is None:  # Defensive: selection was built from total ownership.
             return None
@@ -6827,7 +6904,7 @@ class CatanGame:
         ):
             return
         current_player = self.initial_dice_contenders[self.initial_player_index]
-        dice_values = roll_two_dice()
+        dice_values = roll_two_dice(self.rng)
         self.start_dice_animation(
             "initial", dice_values, current_player.name, "初期ダイス"
         )
@@ -6909,7 +6986,7 @@ class CatanGame:
             self.notify_invalid("このターンはすでにダイスを振っています。")
             return
         self.feedback.clear()
-        dice_values = roll_two_dice()
+        dice_values = roll_two_dice(self.rng)
         current_player = self.get_current_player()
         player_name = current_player.name if current_player is not None else ""
         self.start_dice_animation("main", dice_values, player_name, "ダイスロール")
@@ -7412,41 +7489,23 @@ class CatanGame:
         elif self.action_mode == "road":
             self.build_road(pos)
 
-    def get_player_longest_road_length(self, player):
-        player_roads = [
-            road
-            for road in self.board.roads
-            if road.owner == player and self.is_road_usable(road)
-        ]
-        if not player_roads:
-            return 0
-
-        adjacency = {}
-        for road in player_roads:
-            adjacency.setdefault(road.node1, []).append(road)
-            adjacency.setdefault(road.node2, []).append(road)
+    def get_longest_road_tracker(self):
+        tracker = getattr(self, "longest_road_tracker", None)
+        if tracker is None:
+            tracker = self.longest_road_tracker = LongestRoadTracker()
+        return tracker
 
-        def dfs(node, used_road_ids):
-            if node.building is not None and node.building.owner != player:
-                return 0
-
-            best = 0
-            for road in adjacency.get(node, []):
-                road_id = id(road)
-                if road_id in used_road_ids:
-                    continue
-                next_node = road.other_node(node)
-                if next_node is None:
-                    continue
-                best = max(best, 1 + dfs(next_node, used_road_ids | {road_id}))
-            return best
-
-        best_length = 0
-        for road in player_roads:
-            road_id = id(road)
-            best_length = max(best_length, 1 + dfs(road.node1, {road_id}))
-            best_length = max(best_length, 1 + dfs(road.node2, {road_id}))
-        return best_length
+    def get_player_longest_road_length(self, player):
+        effect = self.get_active_forecast_effect(EARTHQUAKE_EVENT_ID)
+        usability_key = (
+            None if effect is None else effect.get("parameters", {}).get("sector")
+        )
+        return self.get_longest_road_tracker().get_length(
+            self.board,
+            player,
+            self.is_road_usable,
+            usability_key,
+        )
 
     def update_longest_road(self):
         previous_owner = self.longest_road_owner
@@ -7589,18 +7648,18 @@ class CatanGame:
                     pygame.K_RETURN,
                     pygame.K_SPACE,
                 ):
-                    self.handle_match_result_action(REPLAY_SELECTED_ACTION)
+                    self.handle_match_result_action(result_display.REPLAY_SELECTED_ACTION)
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                    self.handle_match_result_action(RESTART_SAME_BOARD_ACTION)
+                    self.handle_match_result_action(result_display.RESTART_SAME_BOARD_ACTION)
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_n:
-                    self.handle_match_result_action(NEW_BOARD_ACTION)
+                    self.handle_match_result_action(result_display.NEW_BOARD_ACTION)
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.match_result is None:
                         self.refresh_match_result()
                     if self.result_display_layout is None:
                         self.result_display_layout = self.build_match_result_layout()
                     if self.result_display_layout is not None:
-                        target = hit_test_result_display(
+                        target = result_display.hit_test_result_display(
                             self.result_display_layout,
                             event.pos,
                         )
@@ -7747,24 +7806,20 @@ class CatanGame:
         gains_by_player = {}
         self.last_resource_distribution = {}
         demands = {resource_type: {} for resource_type in RESOURCE_TYPES}
-        tiles = [
-            tile
-            for tile in self.board.get_tiles_with_number(dice_roll)
-            if self.is_frontier_tile_revealed(tile)
-        ]
-        for tile in tiles:
+        for tile, buildings in self.board.get_production_entries(dice_roll):
+            if not self.is_frontier_tile_revealed(tile):
+                continue
             if tile == self.board.robber_tile:
                 self.add_log(
                     f"盗賊がいるタイル({tile.resource_type.name})は資源を生産しません。"
                 )
                 continue
-            for node in tile.corners:
-                if node.building is not None:
-                    owner = node.building.owner
-                    current = demands[tile.resource_type].get(owner, 0)
-                    demands[tile.resource_type][owner] = (
-                        current + node.building.resource_multiplier
-                    )
+            resource_demands = demands[tile.resource_type]
+            for building in buildings:
+                owner = building.owner
+                resource_demands[owner] = (
+                    resource_demands.get(owner, 0) + building.resource_multiplier
+                )
 
         for resource_type, player_demands in demands.items():
             if not player_demands:
@@ -7885,9 +7940,11 @@ class CatanGame:
             raise RuntimeError("ヘッドレスゲームは描画できません。")
         if self.is_pre_game_settings_open():
             self.buttons = []
-            self.pre_game_settings_layout = draw_pre_game_settings_display(
-                self.screen,
-                self.get_pre_game_settings_display_state(),
+            self.pre_game_settings_layout = (
+                pre_game_settings_display.draw_pre_game_settings_display(
+                    self.screen,
+                    self.get_pre_game_settings_display_state(),
+                )
             )
             pygame.display.flip()
             return
@@ -7901,7 +7958,7 @@ class CatanGame:
             ):
                 state = self.get_lan_match_display_state()
                 if state is not None:
-                    self.lan_match_layout = draw_lan_match_display(
+                    self.lan_match_layout = lan_match_display.draw_lan_match_display(
                         self.screen,
                         state,
                     )
@@ -7909,7 +7966,7 @@ class CatanGame:
                 else:
                     self.lan_match_layout = None
             else:
-                self.lan_lobby_layout = draw_lan_lobby_display(
+                self.lan_lobby_layout = lan_lobby_display.draw_lan_lobby_display(
                     self.screen,
                     self.get_lan_lobby_display_state(),
                 )
@@ -7920,7 +7977,7 @@ class CatanGame:
         if self.phase == "finished" and not self.replay_mode:
             if self.match_result is None:
                 self.refresh_match_result()
-            self.result_display_layout = draw_result_display(
+            self.result_display_layout = result_display.draw_result_display(
                 self.screen,
                 self.match_result,
                 self.result_selected_event_index,
@@ -1,9 +1,18 @@
+from collections import OrderedDict
+from functools import lru_cache
 import math
 import random
-
-import pygame
+import threading
 
 from game.assets import get_font
+from game.board_generation import (
+    BoardLayout,
+    HarborAssignmentScorer,
+    NumberAssignmentScorer,
+    search_harbor_assignment,
+    search_number_assignment,
+)
+from game.board_topology import BoardTopology, RoadList
 from game.constants import (
     BOARD_CENTER_X,
     BOARD_CENTER_Y,
@@ -17,6 +26,7 @@ from game.custom_map import CustomMapSpec
 from game.harbor import Harbor
 from game.hex_tile import HexTile, get_token_pip_count
 from game.node import Node
+from game.lazy_modules import pygame
 from game.resources import RESOURCE_COLORS, ResourceType
 
 
@@ -55,12 +65,39 @@ SUPPORTED_TOPOLOGY_IDS = frozenset(
     {STANDARD_TOPOLOGY_ID, OUTER_RING_TOPOLOGY_ID}
 )
 OUTER_RING_HEX_RADIUS = 35
+# Hex corners closer than this many pixels are the same board node.
+NODE_MERGE_DISTANCE = 4
+# Pristine boards kept by ``build_board`` for reuse, most recent last.
+BOARD_TEMPLATE_CACHE_SIZE = 32
 
 
 def _load_font(size):
     return get_font(size)
 
 
+def _clone(item):
+    """Return a shallow copy of a plain board object without ``copy``'s overhead."""
+    clone = object.__new__(type(item))
+    clone.__dict__.update(item.__dict__)
+    return clone
+
+
+def _build_number_scorer(land_axials, land_resources, numbers, topology_id):
+    positions = {axial: index for index, axial in enumerate(land_axials)}
+    adjacent_pairs = []
+    for index, (q, r) in enumerate(land_axials):
+        for dq, dr in HEX_DIRECTIONS:
+            neighbor = positions.get((q + dq, r + dr))
+            if neighbor is not None and index < neighbor:
+                adjacent_pairs.append((index, neighbor))
+    return NumberAssignmentScorer(
+        land_resources,
+        adjacent_pairs,
+        total_pips=sum(get_token_pip_count(number) for number in numbers),
+        outer_ring=topology_id == OUTER_RING_TOPOLOGY_ID,
+    )
+
+
 class GameBoard:
     def __init__(
         self,
@@ -97,9 +134,12 @@ class GameBoard:
             else HEX_RADIUS
         )
         self.rng = random.Random(seed)
+        self.revision = 0
+        self._topology = None
         self.roads = []
         self.tiles = []
         self.nodes = []
+        self._node_grid = {}
         self.edges = []
         self.perimeter_edges = []
         self.harbors = []
@@ -141,6 +181,7 @@ class GameBoard:
             number = custom_tile.number if custom_tile is not None else None
             tile = HexTile(x, y, resource, number, radius=self.hex_radius)
             tile.axial = (q, r)
+            tile.board = self
             self.tiles.append(tile)
             if resource == ResourceType.DESERT:
                 self.robber_tile = tile
@@ -177,47 +218,22 @@ class GameBoard:
             tile for tile in self.tiles if tile.resource_type != ResourceType.DESERT
         ]
         numbers = self._build_number_pool()
-        adjacency = self._get_tile_adjacency()
-
-        if self.mode == "fully_random":
-            candidate = numbers[:]
-            for _ in range(CONSTRAINED_NUMBER_ATTEMPTS):
-                self.rng.shuffle(candidate)
-                assignment = {
-                    tile: number for tile, number in zip(land_tiles, candidate)
-                }
-                if not self._has_adjacent_red_numbers(assignment, adjacency):
-                    break
-            for tile, number in zip(land_tiles, candidate):
-                tile.number = number
-            return
-
-        best_numbers = None
-        best_score = None
-
-        for _ in range(CONSTRAINED_NUMBER_ATTEMPTS):
-            candidate = numbers[:]
-            self.rng.shuffle(candidate)
-            assignment = {tile: number for tile, number in zip(land_tiles, candidate)}
-            score = self._score_number_assignment(assignment, adjacency)
-            if best_score is None or score < best_score:
-                best_score = score
-                best_numbers = candidate[:]
-            if score == 0:
-                best_numbers = candidate[:]
-                break
-
-        for tile, number in zip(land_tiles, best_numbers):
+        scorer = _build_number_scorer(
+            [tile.axial for tile in land_tiles],
+            [tile.resource_type for tile in land_tiles],
+            numbers,
+            self.topology_id,
+        )
+        assigned = search_number_assignment(
+            self.rng,
+            numbers,
+            scorer,
+            mode=self.mode,
+            attempts=CONSTRAINED_NUMBER_ATTEMPTS,
+        )
+        for tile, number in zip(land_tiles, assigned):
             tile.number = number
 
-    def _has_adjacent_red_numbers(self, assignment, adjacency):
-        for tile, number in assignment.items():
-            if number not in (6, 8):
-                continue
-            if any(assignment.get(neighbor) in (6, 8) for neighbor in adjacency[tile]):
-                return True
-        return False
-
     def _get_tile_adjacency(self):
         by_coord = {tile.axial: tile for tile in self.tiles}
         adjacency = {tile: [] for tile in self.tiles}
@@ -229,67 +245,6 @@ class GameBoard:
                     adjacency[tile].append(neighbor)
         return adjacency
 
-    def _score_number_assignment(self, assignment, adjacency):
-        high_numbers = {6, 8}
-        score = 0
-
-        for tile, number in assignment.items():
-            if number not in high_numbers:
-                continue
-            for neighbor in adjacency[tile]:
-                neighbor_number = assignment.get(neighbor)
-                if neighbor_number in high_numbers and tile.axial < neighbor.axial:
-                    score += 1000
-
-        high_number_resources = {}
-        for tile, number in assignment.items():
-            if number in high_numbers:
-                high_number_resources[tile.resource_type] = (
-                    high_number_resources.get(tile.resource_type, 0) + 1
-                )
-        high_number_limit = 2 if self.topology_id == OUTER_RING_TOPOLOGY_ID else 1
-        for count in high_number_resources.values():
-            if count > high_number_limit:
-                score += (count - high_number_limit) * 1800
-
-        resource_pips = {}
-        for tile, number in assignment.items():
-            resource_pips.setdefault(tile.resource_type, []).append(
-                get_token_pip_count(number)
-            )
-
-        total_pips = sum(get_token_pip_count(number) for number in assignment.values())
-        average_pips_per_tile = total_pips / max(1, len(assignment))
-        for resource_type, pip_values in resource_pips.items():
-            expected_total = len(pip_values) * average_pips_per_tile
-            actual_total = sum(pip_values)
-            score += int((actual_total - expected_total) ** 2 * 5)
-
-            if self.topology_id == OUTER_RING_TOPOLOGY_ID:
-                strongest = sorted(pip_values, reverse=True)[:4]
-                strongest_limit = 16
-                red_token_limit = 2
-            else:
-                strongest = sorted(pip_values, reverse=True)[:2]
-                strongest_limit = 8
-                red_token_limit = 1
-            if sum(strongest) > strongest_limit:
-                score += (sum(strongest) - strongest_limit) * 36
-            if pip_values.count(5) > red_token_limit:
-                score += (pip_values.count(5) - red_token_limit) * 1800
-
-        for tile, number in assignment.items():
-            for neighbor in adjacency[tile]:
-                if tile.axial >= neighbor.axial or neighbor not in assignment:
-                    continue
-                combined_pips = get_token_pip_count(number) + get_token_pip_count(
-                    assignment[neighbor]
-                )
-                if combined_pips > 8:
-                    score += (combined_pips - 8) * 4
-
-        return score
-
     def axial_to_pixel(self, q, r):
         x = BOARD_CENTER_X + math.sqrt(3) * self.hex_radius * (q + r / 2)
         y = BOARD_CENTER_Y + 1.5 * self.hex_radius * r
@@ -315,12 +270,27 @@ class GameBoard:
                 if tile not in node.tiles:
                     node.tiles.append(tile)
 
-    def find_or_create_node(self, x, y, threshold=4):
-        for node in self.nodes:
-            dist = math.hypot(node.x - x, node.y - y)
-            if dist < threshold:
-                return node
+    def find_or_create_node(self, x, y, threshold=NODE_MERGE_DISTANCE):
+        # Nodes are bucketed on a grid of NODE_MERGE_DISTANCE cells, so only
+        # the cells within ``threshold`` are compared.  The earliest matching
+        # node wins, exactly as a scan of ``self.nodes`` would return.
+        column = math.floor(x / NODE_MERGE_DISTANCE)
+        row = math.floor(y / NODE_MERGE_DISTANCE)
+        reach = max(1, math.ceil(threshold / NODE_MERGE_DISTANCE))
+        match = None
+        for cell_column in range(column - reach, column + reach + 1):
+            for cell_row in range(row - reach, row + reach + 1):
+                for index in self._node_grid.get((cell_column, cell_row), ()):
+                    if match is not None and index > match:
+                        continue
+                    node = self.nodes[index]
+                    if math.hypot(node.x - x, node.y - y) < threshold:
+                        match = index
+        if match is not None:
+            return self.nodes[match]
         new_node = Node(x, y)
+        new_node.board = self
+        self._node_grid.setdefault((column, row), []).append(len(self.nodes))
         self.nodes.append(new_node)
         return new_node
 
@@ -338,11 +308,9 @@ class GameBoard:
             unique_edges[key] for key, count in edge_counts.items() if count == 1
         ]
 
-    def _create_harbors(self):
-        if self.custom_map is not None:
-            harbor_types = list(self.custom_map.harbors)
-        elif self.topology_id == OUTER_RING_TOPOLOGY_ID:
-            harbor_types = [
+    def _build_harbor_pool(self):
+        if self.topology_id == OUTER_RING_TOPOLOGY_ID:
+            return [
                 None,
                 None,
                 None,
@@ -356,18 +324,23 @@ class GameBoard:
                 ResourceType.BRICK,
                 ResourceType.ORE,
             ]
+        return [
+            None,
+            None,
+            None,
+            None,
+            ResourceType.WOOD,
+            ResourceType.SHEEP,
+            ResourceType.WHEAT,
+            ResourceType.BRICK,
+            ResourceType.ORE,
+        ]
+
+    def _create_harbors(self):
+        if self.custom_map is not None:
+            harbor_types = list(self.custom_map.harbors)
         else:
-            harbor_types = [
-                None,
-                None,
-                None,
-                None,
-                ResourceType.WOOD,
-                ResourceType.SHEEP,
-                ResourceType.WHEAT,
-                ResourceType.BRICK,
-                ResourceType.ORE,
-            ]
+            harbor_types = self._build_harbor_pool()
 
         sorted_edges = sorted(
             self.perimeter_edges,
@@ -399,49 +372,22 @@ class GameBoard:
     def _select_harbor_types(self, harbor_types, selected_edges):
         if self.mode == "custom":
             return harbor_types
-        if self.mode == "fully_random":
-            self.rng.shuffle(harbor_types)
-            return harbor_types
-
-        best_layout = None
-        best_score = None
-        for _ in range(CONSTRAINED_HARBOR_ATTEMPTS):
-            candidate = harbor_types[:]
-            self.rng.shuffle(candidate)
-            score = self._score_harbor_assignment(candidate, selected_edges)
-            if best_score is None or score < best_score:
-                best_score = score
-                best_layout = candidate[:]
-            if score == 0:
-                break
-        return best_layout
-
-    def _score_harbor_assignment(self, harbor_types, selected_edges):
-        score = 0
-        for harbor_type, edge in zip(harbor_types, selected_edges):
-            adjacent_tiles = self.get_edge_adjacent_tiles(edge)
-            if harbor_type is None:
-                generic_pips = sum(
-                    get_token_pip_count(tile.number)
-                    for tile in adjacent_tiles
-                    if tile.number is not None
-                )
-                if generic_pips > 8:
-                    score += (generic_pips - 8) * 2
-                continue
-
-            matching_tiles = [
-                tile
-                for tile in adjacent_tiles
-                if tile.resource_type == harbor_type and tile.number is not None
+        scorer = HarborAssignmentScorer(
+            [
+                [
+                    (tile.resource_type, tile.number)
+                    for tile in self.get_edge_adjacent_tiles(edge)
+                ]
+                for edge in selected_edges
             ]
-            match_pips = sum(
-                get_token_pip_count(tile.number) for tile in matching_tiles
-            )
-            score += match_pips * 24
-            score += sum(900 for tile in matching_tiles if tile.number in (6, 8))
-
-        return score
+        )
+        return search_harbor_assignment(
+            self.rng,
+            harbor_types,
+            scorer,
+            mode=self.mode,
+            attempts=CONSTRAINED_HARBOR_ATTEMPTS,
+        )
 
     def get_edge_adjacent_tiles(self, edge):
         node1, node2 = edge
@@ -451,6 +397,17 @@ class GameBoard:
                 adjacent_tiles.append(tile)
         return adjacent_tiles
 
+    def get_layout(self):
+        """Return the generated tiles, numbers and harbors as a ``BoardLayout``."""
+        return BoardLayout(
+            seed=self.seed,
+            mode=self.mode,
+            topology_id=self.topology_id,
+            resources=tuple(tile.resource_type for tile in self.tiles),
+            numbers=tuple(tile.number for tile in self.tiles),
+            harbors=tuple(harbor.resource_type for harbor in self.harbors),
+        )
+
     def get_resource_high_number_counts(self):
         counts = {
             ResourceType.WOOD: 0,
@@ -496,9 +453,7 @@ class GameBoard:
             ResourceType.ORE: 4,
         }
         seen_harbors = set()
-        for node in self.nodes:
-            if node.building is None or node.building.owner != player:
-                continue
+        for node in self.topology.player_building_nodes(player):
             for harbor in node.harbors:
                 harbor_id = id(harbor)
                 if harbor_id in seen_harbors:
@@ -516,11 +471,123 @@ class GameBoard:
         return rates
 
     def has_edge(self, node1, node2):
-        target_key = tuple(sorted((id(node1), id(node2))))
-        return any(
-            tuple(sorted((id(edge_node1), id(edge_node2)))) == target_key
-            for edge_node1, edge_node2 in self.edges
+        return self.topology.has_edge(node1, node2)
+
+    @property
+    def roads(self):
+        return self._roads
+
+    @roads.setter
+    def roads(self, roads):
+        self._roads = RoadList(
+            roads,
+            on_append=self._road_appended,
+            on_reset=self._roads_reset,
+        )
+        self._roads_reset()
+
+    @property
+    def topology(self):
+        """Return the integer-indexed topology, building it on first use."""
+        topology = self._topology
+        if topology is None or not topology.is_current_for(self):
+            topology = BoardTopology(self.nodes, self.edges, self.tiles)
+            topology.rebuild_roads(self._roads)
+            topology.rebuild_buildings()
+            self._topology = topology
+        return topology
+
+    def _road_appended(self, road):
+        self.revision += 1
+        if self._topology is not None:
+            self._topology.add_road(road)
+
+    def _roads_reset(self):
+        self.revision += 1
+        if self._topology is not None:
+            self._topology.rebuild_roads(self._roads)
+
+    def building_changed(self, node, previous, building):
+        self.revision += 1
+        if self._topology is not None:
+            self._topology.building_changed(node, previous, building)
+
+    def copy_layout(self):
+        """Return an independent board with this layout and no pieces.
+
+        Tiles, numbers, harbors and the robber position are copied, so a
+        constrained board's number search is not repeated.  Pieces and the
+        index caches are left out; the copy rebuilds its topology on use.
+        The custom map is immutable and is shared.
+        """
+        board = _clone(self)
+        board.rng = random.Random()
+        board.rng.setstate(self.rng.getstate())
+        board._topology = None
+        board._harbor_badge_layout_cache = None
+        board.roads = []
+        board._node_grid = {
+            cell: list(indices) for cell, indices in self._node_grid.items()
+        }
+        nodes = {}
+        for node in self.nodes:
+            clone = nodes[id(node)] = _clone(node)
+            clone._building = None
+            clone.board = board
+        tiles = {}
+        for tile in self.tiles:
+            clone = tiles[id(tile)] = _clone(tile)
+            clone.board = board
+            clone.corners = [nodes[id(node)] for node in tile.corners]
+        harbors = {}
+        for harbor in self.harbors:
+            clone = harbors[id(harbor)] = _clone(harbor)
+            clone.node1 = nodes[id(harbor.node1)]
+            clone.node2 = nodes[id(harbor.node2)]
+        for node in self.nodes:
+            clone = nodes[id(node)]
+            clone.tiles = [tiles[id(tile)] for tile in node.tiles]
+            clone.harbors = [harbors[id(harbor)] for harbor in node.harbors]
+        board.nodes = list(nodes.values())
+        board.tiles = list(tiles.values())
+        board.harbors = list(harbors.values())
+        board.edges = [
+            (nodes[id(node1)], nodes[id(node2)]) for node1, node2 in self.edges
+        ]
+        board.perimeter_edges = [
+            (nodes[id(node1)], nodes[id(node2)])
+            for node1, node2 in self.perimeter_edges
+        ]
+        board.robber_tile = (
+            None if self.robber_tile is None else tiles[id(self.robber_tile)]
         )
+        return board
+
+    def replace_pieces(self, buildings, roads):
+        """Swap in a whole position's pieces and re-index them once.
+
+        ``buildings`` holds one building or ``None`` per node in board order.
+        Going through ``Node.building`` would log every node as a change, so
+        the nodes are assigned directly and the topology is rebuilt instead.
+        """
+        for node, building in zip(self.nodes, buildings):
+            node._building = building
+            if building is not None:
+                building.node = node
+        self._roads = RoadList(
+            roads,
+            on_append=self._road_appended,
+            on_reset=self._roads_reset,
+        )
+        self.revision += 1
+        if self._topology is not None:
+            self._topology.rebuild_roads(self._roads)
+            self._topology.rebuild_buildings()
+
+    def tile_number_changed(self, tile):
+        self.revision += 1
+        if self._topology is not None:
+            self._topology.numbers_changed()
 
     @staticmethod
     def _get_harbor_safe_badge_area():
@@ -1342,4 +1409,176 @@ class GameBoard:
         self.robber_tile = tile
 
     def get_tiles_with_number(self, dice_number):
-        return [tile for tile in self.tiles if tile.number == dice_number]
+        return list(self.topology.tiles_with_number(dice_number))
+
+    def get_production_entries(self, dice_number):
+        """Return ``(tile, buildings)`` pairs for a dice total from the index."""
+        return self.topology.production_for(dice_number)
+
+
+class _BoardLayoutTemplate:
+    """Fixed geometry of one topology, for generating layouts without boards."""
+
+    def __init__(self, topology_id):
+        # Geometry never depends on the seed; only the pools are dealt.
+        board = GameBoard("fully_random", 0, topology_id=topology_id)
+        self.topology_id = topology_id
+        self.axials = tuple(tile.axial for tile in board.tiles)
+        self.fixed_desert = (
+            self.axials.index((0, 0))
+            if topology_id == OUTER_RING_TOPOLOGY_ID
+            else None
+        )
+        self.resource_pool = tuple(board._build_resource_pool())
+        self.number_pool = tuple(board._build_number_pool())
+        self.harbor_pool = tuple(board._build_harbor_pool())
+        tile_indices = {id(tile): index for index, tile in enumerate(board.tiles)}
+        self.harbor_tiles = tuple(
+            tuple(
+                tile_indices[id(tile)]
+                for tile in harbor.node1.tiles
+                if tile in harbor.node2.tiles
+            )
+            for harbor in board.harbors
+        )
+
+    def generate(self, seed, mode):
+        rng = random.Random(seed)
+        pool = list(self.resource_pool)
+        rng.shuffle(pool)
+        dealt = iter(pool)
+        resources = [
+            ResourceType.DESERT if index == self.fixed_desert else next(dealt)
+            for index in range(len(self.axials))
+        ]
+        land = [
+            index
+            for index, resource in enumerate(resources)
+            if resource != ResourceType.DESERT
+        ]
+        scorer = _build_number_scorer(
+            [self.axials[index] for index in land],
+            [resources[index] for index in land],
+            self.number_pool,
+            self.topology_id,
+        )
+        numbers = [None] * len(resources)
+        assigned = search_number_assignment(
+            rng,
+            self.number_pool,
+            scorer,
+            mode=mode,
+            attempts=CONSTRAINED_NUMBER_ATTEMPTS,
+        )
+        for index, number in zip(land, assigned):
+            numbers[index] = number
+        harbor_scorer = HarborAssignmentScorer(
+            [
+                [
+                    (resources[index], numbers[index])
+                    for index in indices
+                    if resources[index] != ResourceType.DESERT
+                ]
+                for indices in self.harbor_tiles
+            ]
+        )
+        harbors = search_harbor_assignment(
+            rng,
+            self.harbor_pool,
+            harbor_scorer,
+            mode=mode,
+            attempts=CONSTRAINED_HARBOR_ATTEMPTS,
+        )
+        return BoardLayout(
+            seed=seed,
+            mode=mode,
+            topology_id=self.topology_id,
+            resources=tuple(resources),
+            numbers=tuple(numbers),
+            harbors=tuple(harbors),
+        )
+
+
+@lru_cache(maxsize=len(SUPPORTED_TOPOLOGY_IDS))
+def _layout_template(topology_id):
+    return _BoardLayoutTemplate(topology_id)
+
+
+def generate_board_layouts(
+    seeds,
+    *,
+    mode="constrained",
+    topology_id=STANDARD_TOPOLOGY_ID,
+):
+    """Yield the ``BoardLayout`` that ``GameBoard`` would build for each seed.
+
+    Only the tiles, numbers and harbors are generated; nodes, edges and
+    harbor badges are skipped, so fairness studies can sweep many seeds.
+    Each layout equals ``GameBoard(mode, seed, topology_id=...).get_layout()``.
+    """
+    if mode == "balanced":
+        mode = "constrained"
+    if mode not in ("constrained", "fully_random"):
+        raise ValueError(f"Unsupported board mode for bulk generation: {mode}")
+    if topology_id not in SUPPORTED_TOPOLOGY_IDS:
+        raise ValueError(f"Unsupported board topology: {topology_id}")
+    template = _layout_template(topology_id)
+    for seed in seeds:
+        yield template.generate(seed, mode)
+
+
+_BOARD_TEMPLATES = OrderedDict()
+_BOARD_TEMPLATES_LOCK = threading.Lock()
+
+
+def build_board(
+    mode="constrained",
+    seed=None,
+    *,
+    custom_map=None,
+    topology_id=STANDARD_TOPOLOGY_ID,
+):
+    """Return a new board like ``GameBoard(...)``, reusing a cached template.
+
+    Seeded boards are generated once and kept, without pieces, in a
+    ``BOARD_TEMPLATE_CACHE_SIZE`` LRU keyed by mode, seed, topology and the
+    custom map's fingerprint; each call returns an independent
+    ``copy_layout`` of the template.  Unseeded boards are never cached.
+    Concurrent rooms share the cache: a miss generates the board outside the
+    lock, and the first template stored for a key is the one every caller
+    copies.
+    """
+    if mode == "balanced":
+        mode = "constrained"
+    if seed is None or (
+        custom_map is not None and not isinstance(custom_map, CustomMapSpec)
+    ):
+        return GameBoard(
+            mode, seed, custom_map=custom_map, topology_id=topology_id
+        )
+    key = (
+        mode,
+        seed,
+        topology_id,
+        None if custom_map is None else custom_map.fingerprint,
+    )
+    with _BOARD_TEMPLATES_LOCK:
+        template = _BOARD_TEMPLATES.get(key)
+        if template is not None:
+            _BOARD_TEMPLATES.move_to_end(key)
+    if template is None:
+        generated = GameBoard(
+            mode, seed, custom_map=custom_map, topology_id=topology_id
+        )
+        with _BOARD_TEMPLATES_LOCK:
+            template = _BOARD_TEMPLATES.setdefault(key, generated)
+            _BOARD_TEMPLATES.move_to_end(key)
+            while len(_BOARD_TEMPLATES) > BOARD_TEMPLATE_CACHE_SIZE:
+                _BOARD_TEMPLATES.popitem(last=False)
+    return template.copy_layout()
+
+
+def clear_board_templates():
+    """Forget every cached board template."""
+    with _BOARD_TEMPLATES_LOCK:
+        _BOARD_TEMPLATES.clear()
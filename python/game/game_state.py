@@ -0,0 +1,395 @@
+"""Compact, copyable game positions for search-based AI.
+
+``persistence.serialize_game`` and ``restore_game`` build and validate a full
+JSON document, which is right for saves and replays but far too slow for a
+search that explores hundreds of futures per decision.  A
+:class:`CompactGameState` stores only the rules-relevant position in flat
+arrays: hands and development cards per seat, building owner and kind per
+node, and roads as node-index pairs in placement order.  Copying one is a
+handful of ``array`` copies, and :func:`restore_state` writes it back into a
+game of the same seat count and board without any validation.
+
+Presentation history (event log, latest event, turn summaries, public gain
+texts, match metrics, AI status text) is not part of the position.  A game
+restored from a compact state keeps whatever history it already had.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+from game.bank import RESOURCE_TYPES
+from game.building import Building, BuildingType
+from game.development_cards import DevelopmentCardType
+from game.resource_ledger import ResourceLedger
+from game.road import Road
+
+
+__all__ = ("CompactGameState", "capture_state", "restore_state")
+
+
+DEVELOPMENT_CARD_TYPES = (
+    DevelopmentCardType.KNIGHT,
+    DevelopmentCardType.ROAD_BUILDING,
+    DevelopmentCardType.YEAR_OF_PLENTY,
+    DevelopmentCardType.MONOPOLY,
+)
+PIECE_FIELDS = (
+    "roads_remaining",
+    "settlements_remaining",
+    "cities_remaining",
+    "played_knights",
+    "victory_point_cards",
+)
+NO_OWNER = -1
+SETTLEMENT_KIND = 1
+CITY_KIND = 2
+
+# Game attributes holding immutable values that are shared between copies.
+_VALUE_FIELDS = (
+    "victory_point_target",
+    "variant_state",
+    "phase",
+    "current_player_index",
+    "dice_rolled",
+    "last_dice_pair",
+    "action_mode",
+    "development_card_used_this_turn",
+    "credit_action_taken_this_turn",
+    "special_phase",
+    "longest_road_length",
+    "largest_army_size",
+    "initial_dice_phase",
+    "initial_round",
+    "initial_player_index",
+    "waiting_for_road",
+    "discard_remaining",
+    "resource_selection_remaining",
+    "free_roads_remaining",
+    "bank_trade_give_resource",
+    "handoff_return_phase",
+    "handoff_context",
+    "domestic_trade_receive_operator",
+    "domestic_trade_edit_side",
+    "domestic_trade_is_counter",
+    "domestic_trade_is_broadcast",
+    "domestic_trade_broadcast_index",
+    "domestic_trade_broadcast_receive_operator",
+    "ai_domestic_trade_attempted",
+    "ai_market_action_attempted",
+    "ai_auction_action_attempted",
+)
+# Game attributes referring to one player, stored as a seat index or None.
+_PLAYER_FIELDS = (
+    "winner",
+    "longest_road_owner",
+    "largest_army_owner",
+    "discard_player",
+    "handoff_player",
+    "domestic_trade_partner",
+    "domestic_trade_editor",
+    "domestic_trade_broadcast_viewer",
+)
+# Game attributes holding lists of players, stored as tuples of seat indices.
+_PLAYER_LIST_FIELDS = (
+    "turn_order",
+    "initial_dice_contenders",
+    "initial_placement_order",
+    "discard_queue",
+    "robber_target_players",
+    "domestic_trade_broadcast_responders",
+)
+# Five-resource maps, stored as tuples in ``RESOURCE_TYPES`` order.
+_RESOURCE_MAP_FIELDS = (
+    "domestic_trade_give",
+    "domestic_trade_receive",
+    "domestic_trade_broadcast_give",
+    "domestic_trade_broadcast_receive",
+)
+
+
+class CompactGameState:
+    """One game position in flat arrays and shared immutable values.
+
+    Per-seat arrays use a fixed stride: ``hands`` holds five counts per seat
+    in ``RESOURCE_TYPES`` order, ``development_cards`` and
+    ``new_development_cards`` four counts in ``DEVELOPMENT_CARD_TYPES``
+    order, and ``pieces`` the five ``PIECE_FIELDS``.  ``building_owner`` is
+    the owning seat per node (``NO_OWNER`` when empty) and ``building_kind``
+    is ``SETTLEMENT_KIND`` or ``CITY_KIND``.  ``road_nodes`` holds two node
+    indices per road and ``road_owners`` one seat per road, both in placement
+    order because rule tie-breaks follow road order.
+    """
+
+    __slots__ = (
+        "player_count",
+        "hands",
+        "development_cards",
+        "new_development_cards",
+        "pieces",
+        "reservations",
+        "bank",
+        "building_owner",
+        "building_kind",
+        "road_nodes",
+        "road_owners",
+        "robber_tile",
+        "last_settlement_node",
+        "robber_tile_candidates",
+        "development_deck",
+        "values",
+        "players",
+        "player_lists",
+        "resource_maps",
+        "initial_dice_results",
+        "initial_dice_histories",
+        "initial_placement_counts",
+        "last_resource_distribution",
+        "rng_state",
+    )
+
+    def copy(self) -> CompactGameState:
+        """Return an independent copy; only the arrays are duplicated."""
+        clone = CompactGameState.__new__(CompactGameState)
+        clone.player_count = self.player_count
+        clone.hands = self.hands[:]
+        clone.development_cards = self.development_cards[:]
+        clone.new_development_cards = self.new_development_cards[:]
+        clone.pieces = self.pieces[:]
+        clone.reservations = self.reservations
+        clone.bank = self.bank[:]
+        clone.building_owner = self.building_owner[:]
+        clone.building_kind = self.building_kind[:]
+        clone.road_nodes = self.road_nodes[:]
+        clone.road_owners = self.road_owners[:]
+        clone.robber_tile = self.robber_tile
+        clone.last_settlement_node = self.last_settlement_node
+        clone.robber_tile_candidates = self.robber_tile_candidates
+        clone.development_deck = self.development_deck
+        clone.values = self.values
+        clone.players = self.players
+        clone.player_lists = self.player_lists
+        clone.resource_maps = self.resource_maps
+        clone.initial_dice_results = self.initial_dice_results
+        clone.initial_dice_histories = self.initial_dice_histories
+        clone.initial_placement_counts = self.initial_placement_counts
+        clone.last_resource_distribution = self.last_resource_distribution
+        clone.rng_state = self.rng_state
+        return clone
+
+    __copy__ = copy
+
+    def hand(self, seat: int) -> dict:
+        """Return one seat's total resource counts keyed by resource type."""
+        start = seat * len(RESOURCE_TYPES)
+        counts = self.hands[start:start + len(RESOURCE_TYPES)]
+        return dict(zip(RESOURCE_TYPES, counts))
+
+    def road_mask(self, seat: int, board) -> int:
+        """Return the seat's roads as a bitset over ``board.topology`` edge IDs."""
+        topology = board.topology
+        nodes = topology.nodes
+        road_nodes = self.road_nodes
+        mask = 0
+        for road, owner in enumerate(self.road_owners):
+            if owner == seat:
+                edge_id = topology.edge_id(
+                    nodes[road_nodes[road * 2]],
+                    nodes[road_nodes[road * 2 + 1]],
+                )
+                mask |= 1 << edge_id
+        return mask
+
+
+def _seat(player, seats):
+    return None if player is None else seats[player]
+
+
+def capture_state(game, *, include_rng: bool = False) -> CompactGameState:
+    """Record the current position of ``game`` without validating it.
+
+    ``include_rng`` also records the game's generator state, so restoring
+    replays the same dice and draws; searches that sample different futures
+    leave it off and seed the scratch game themselves.
+    """
+    players = game.players
+    seats = {player: seat for seat, player in enumerate(players)}
+    board = game.board
+    topology = board.topology
+    node_ids = topology.node_ids
+    tile_ids = topology.tile_ids
+
+    state = CompactGameState.__new__(CompactGameState)
+    state.player_count = len(players)
+    hands = array("H")
+    development_cards = array("H")
+    new_development_cards = array("H")
+    pieces = array("H")
+    reservations = []
+    for player in players:
+        resources = player.resources
+        hands.extend([resources[resource] for resource in RESOURCE_TYPES])
+        cards = player.development_cards
+        development_cards.extend([cards[card] for card in DEVELOPMENT_CARD_TYPES])
+        cards = player.new_development_cards
+        new_development_cards.extend(
+            [cards[card] for card in DEVELOPMENT_CARD_TYPES]
+        )
+        pieces.extend([getattr(player, name) for name in PIECE_FIELDS])
+        ledger = player.resource_ledger
+        reservations.append(
+            tuple(ledger.reservations_map().items())
+            if ledger.has_reservations
+            else ()
+        )
+    state.hands = hands
+    state.development_cards = development_cards
+    state.new_development_cards = new_development_cards
+    state.pieces = pieces
+    state.reservations = tuple(reservations) if any(reservations) else None
+    bank = game.bank.resources
+    state.bank = array("H", [bank[resource] for resource in RESOURCE_TYPES])
+
+    owners = array("b", [NO_OWNER]) * len(board.nodes)
+    kinds = array("b", [0]) * len(board.nodes)
+    for index, node in enumerate(board.nodes):
+        building = node.building
+        if building is not None:
+            owners[index] = seats[building.owner]
+            kinds[index] = (
+                CITY_KIND
+                if building.building_type == BuildingType.CITY
+                else SETTLEMENT_KIND
+            )
+    state.building_owner = owners
+    state.building_kind = kinds
+    road_nodes = array("H")
+    road_owners = array("b")
+    for road in board.roads:
+        road_nodes.append(node_ids[road.node1])
+        road_nodes.append(node_ids[road.node2])
+        road_owners.append(seats[road.owner])
+    state.road_nodes = road_nodes
+    state.road_owners = road_owners
+    state.robber_tile = tile_ids.get(board.robber_tile)
+    state.last_settlement_node = (
+        None
+        if game.last_settlement_node is None
+        else node_ids[game.last_settlement_node]
+    )
+    state.robber_tile_candidates = tuple(
+        tile_ids[tile] for tile in game.robber_tile_candidates
+    )
+    state.development_deck = tuple(game.development_deck)
+
+    state.values = tuple(getattr(game, name) for name in _VALUE_FIELDS)
+    state.players = tuple(
+        _seat(getattr(game, name), seats) for name in _PLAYER_FIELDS
+    )
+    state.player_lists = tuple(
+        tuple(seats[player] for player in getattr(game, name))
+        for name in _PLAYER_LIST_FIELDS
+    )
+    state.resource_maps = tuple(
+        tuple(getattr(game, name)[resource] for resource in RESOURCE_TYPES)
+        for name in _RESOURCE_MAP_FIELDS
+    )
+    state.initial_dice_results = tuple(game.initial_dice_results.items())
+    state.initial_dice_histories = tuple(
+        (name, tuple(values))
+        for name, values in game.initial_dice_histories.items()
+    )
+    state.initial_placement_counts = tuple(game.initial_placement_counts.items())
+    state.last_resource_distribution = tuple(
+        (name, tuple(bundle.items()))
+        for name, bundle in game.last_resource_distribution.items()
+    )
+    state.rng_state = game.rng.getstate() if include_rng else None
+    return state
+
+
+def restore_state(game, state: CompactGameState) -> None:
+    """Write ``state`` back into ``game`` without validating it.
+
+    ``game`` must have the same seat count and board layout as the game the
+    state was captured from.  Existing resource dictionaries are updated in
+    place, so resource ledgers stay bound to them.
+    """
+    players = game.players
+    board = game.board
+    nodes = board.nodes
+    resource_count = len(RESOURCE_TYPES)
+    card_count = len(DEVELOPMENT_CARD_TYPES)
+    for seat, player in enumerate(players):
+        resources = player.resources
+        start = seat * resource_count
+        for offset, resource in enumerate(RESOURCE_TYPES):
+            resources[resource] = state.hands[start + offset]
+        start = seat * card_count
+        cards = player.development_cards
+        new_cards = player.new_development_cards
+        for offset, card in enumerate(DEVELOPMENT_CARD_TYPES):
+            cards[card] = state.development_cards[start + offset]
+            new_cards[card] = state.new_development_cards[start + offset]
+        start = seat * len(PIECE_FIELDS)
+        for offset, name in enumerate(PIECE_FIELDS):
+            setattr(player, name, state.pieces[start + offset])
+        reserved = () if state.reservations is None else state.reservations[seat]
+        if reserved or player.resource_ledger.has_reservations:
+            player.resource_ledger = ResourceLedger(resources)
+            for reservation_id, bundle in reserved:
+                player.resource_ledger.reserve(reservation_id, bundle)
+    bank = game.bank.resources
+    for offset, resource in enumerate(RESOURCE_TYPES):
+        bank[resource] = state.bank[offset]
+
+    buildings = [None] * len(nodes)
+    for index, owner in enumerate(state.building_owner):
+        if owner != NO_OWNER:
+            buildings[index] = Building(
+                players[owner],
+                BuildingType.CITY
+                if state.building_kind[index] == CITY_KIND
+                else BuildingType.SETTLEMENT,
+            )
+    road_nodes = state.road_nodes
+    roads = [
+        Road(
+            players[owner],
+            nodes[road_nodes[road * 2]],
+            nodes[road_nodes[road * 2 + 1]],
+        )
+        for road, owner in enumerate(state.road_owners)
+    ]
+    board.replace_pieces(buildings, roads)
+    board.robber_tile = (
+        None if state.robber_tile is None else board.tiles[state.robber_tile]
+    )
+    game.last_settlement_node = (
+        None
+        if state.last_settlement_node is None
+        else nodes[state.last_settlement_node]
+    )
+    game.robber_tile_candidates = [
+        board.tiles[index] for index in state.robber_tile_candidates
+    ]
+    game.development_deck = list(state.development_deck)
+
+    for name, value in zip(_VALUE_FIELDS, state.values):
+        setattr(game, name, value)
+    for name, seat in zip(_PLAYER_FIELDS, state.players):
+        setattr(game, name, None if seat is None else players[seat])
+    for name, seat_list in zip(_PLAYER_LIST_FIELDS, state.player_lists):
+        setattr(game, name, [players[seat] for seat in seat_list])
+    for name, counts in zip(_RESOURCE_MAP_FIELDS, state.resource_maps):
+        setattr(game, name, dict(zip(RESOURCE_TYPES, counts)))
+    game.initial_dice_results = dict(state.initial_dice_results)
+    game.initial_dice_histories = {
+        name: list(values) for name, values in state.initial_dice_histories
+    }
+    game.initial_placement_counts = dict(state.initial_placement_counts)
+    game.last_resource_distribution = {
+        name: dict(bundle) for name, bundle in state.last_resource_distribution
+    }
+    if state.rng_state is not None:
+        game.rng.setstate(state.rng_state)
@@ -1,8 +1,8 @@
-import pygame
 import math
 
 from game.assets import get_font
 from game.constants import HEX_RADIUS, COLORS
+from game.lazy_modules import pygame
 from game.resources import RESOURCE_COLORS, ResourceType
 from game.tile_art import get_tile_surface
 
@@ -143,10 +143,21 @@ class HexTile:
         self.x = x
         self.y = y
         self.resource_type = resource_type
-        self.number = number
+        self.board = None  # 所属する GameBoard (数字の変更を索引へ通知)
+        self._number = number
         self.radius = radius
         self.corners = []  # このタイルを囲むノード(Node)を保持
 
+    @property
+    def number(self):
+        return self._number
+
+    @number.setter
+    def number(self, number):
+        self._number = number
+        if self.board is not None:
+            self.board.tile_number_changed(self)
+
     def draw(self, screen, robber_tile=None):
         # 六角形の頂点座標を計算
         vertices = []
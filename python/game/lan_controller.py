@@ -69,10 +69,13 @@ from game.network_protocol import (
     NETWORK_PROTOCOL_VERSION,
     NetworkProtocolError,
     build_game_command,
+    build_state_delta,
     build_state_snapshot,
+    build_state_snapshots,
 )
 from game.persistence import restore_game, serialize_game
 from game.room_access import RoomAccessError
+from game.runtime_metrics import increment_metric, metric_timer
 from game.server_state import (
     RoomAuthorityRecord,
     SQLiteRoomAuthorityStore,
@@ -89,8 +92,13 @@ DEFAULT_WAITING_ROOM_TTL_MS = 24 * 60 * 60 * 1000
 DEFAULT_LIVE_ROOM_TTL_MS = 7 * 24 * 60 * 60 * 1000
 MAX_ROOM_TTL_MS = 30 * 24 * 60 * 60 * 1000
 MAX_WALL_CLOCK_MS = 253_402_300_799_999
+# Game factories may draw from the module-level ``random`` generator, so it is
+# seeded under this lock while a room's game is built or restored.  Live steps
+# use the room's own ``game.rng`` and never take it.
 _RANDOM_LOCK = threading.RLock()
 _MIXED_AI_PERSONALITIES = (EXPANSION, TRADER, DISRUPTOR)
+# Enough draws for a room-code filter that accepts 1/32 of all codes.
+_ROOM_CODE_ATTEMPTS = 1024
 _MIXED_AI_SEED_SALT = 0x4D49584544
 _STATE_STORE_METHODS = (
     "create_room",
@@ -109,6 +117,9 @@ class LanControllerError(ValueError):
         super().__init__(message)
         self.code = code
 
+    def __reduce__(self):
+        return (LanControllerError, (self.code, str(self)))
+
 
 class ControllerPersistenceError(RuntimeError):
     """Raised when durable room authority cannot be trusted or restored."""
@@ -141,6 +152,10 @@ class _Session:
     member_id: str
     role: MemberRole
     seat_index: int | None
+    # The last snapshot sent to this connection.  Clients that opted in via
+    # ``state_sync`` receive later revisions as deltas against it.
+    state_deltas: bool = False
+    snapshot_baseline: dict[str, Any] | None = field(default=None, repr=False)
 
 
 @dataclass
@@ -163,6 +178,21 @@ class _RoomContext:
     authority_expires_at_ms: int | None = None
     replay_readable: bool = False
     replay_blocked: bool = False
+    checkpoint: _GameCheckpoint | None = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class _GameCheckpoint:
+    """The save document of one committed game revision.
+
+    The document serialized for a revision's snapshots doubles as the
+    rollback point for the next command or AI step, so a step no longer
+    serializes the whole game up front just in case it fails.
+    """
+
+    game: Any
+    revision: int
+    state: dict[str, Any]
 
 
 def _default_game_factory(
@@ -223,6 +253,18 @@ def _assign_private_mixed_ai_personalities(
         player.ai_personality = personality
 
 
+def _attach_room_rng(game: Any, random_state: object) -> None:
+    """Give ``game`` a private generator resuming from ``random_state``.
+
+    Steps draw dice, theft and deck order from ``game.rng`` only, so rooms
+    advance without touching the module-level ``random`` state.
+    """
+
+    rng = random.Random()
+    rng.setstate(random_state)
+    game.rng = rng
+
+
 def _default_ai_stepper(game: Any) -> bool:
     ai = getattr(game, "ai", None)
     step = getattr(ai, "step", None)
@@ -256,6 +298,7 @@ class LanServerController:
         waiting_room_ttl_ms: int = DEFAULT_WAITING_ROOM_TTL_MS,
         live_room_ttl_ms: int = DEFAULT_LIVE_ROOM_TTL_MS,
         restart_grace_seconds: float = DEFAULT_RESTART_GRACE_SECONDS,
+        room_code_filter: Callable[[str], bool] | None = None,
     ) -> None:
         if (
             not callable(game_factory)
@@ -300,6 +343,8 @@ class LanServerController:
             or not 0 < float(restart_grace_seconds) <= 7 * 24 * 60 * 60
         ):
             raise ValueError("restart_grace_seconds must be a bounded duration")
+        if room_code_filter is not None and not callable(room_code_filter):
+            raise ValueError("room_code_filter must be callable")
         self._game_factory = game_factory
         self._command_applier = command_applier
         self._snapshot_builder = snapshot_builder
@@ -315,6 +360,7 @@ class LanServerController:
         self._waiting_room_ttl_ms = waiting_room_ttl_ms
         self._live_room_ttl_ms = live_room_ttl_ms
         self._restart_grace_seconds = float(restart_grace_seconds)
+        self._room_code_filter = room_code_filter
         self._persistence_failed = False
         self._rooms: dict[str, _RoomContext] = {}
         self._sessions: dict[str, _Session] = {}
@@ -325,6 +371,14 @@ class LanServerController:
     def room_codes(self) -> tuple[str, ...]:
         return tuple(sorted(self._rooms))
 
+    def has_session(self, connection_id: object) -> bool:
+        """Return whether ``connection_id`` is currently seated in a room."""
+
+        return type(connection_id) in (str, int) and str(connection_id) in self._sessions
+
+    def _owns_room_code(self, room_code: str) -> bool:
+        return self._room_code_filter is None or self._room_code_filter(room_code)
+
     def _now_ms(self) -> int:
         value = self._wall_clock_ms()
         if type(value) is not int or not 0 <= value <= MAX_WALL_CLOCK_MS:
@@ -368,7 +422,7 @@ class LanServerController:
                 match_seed=context.match_seed,
                 game_revision=context.game_revision,
                 random_state=context.random_state,
-                game=serialize_game(context.game),
+                game=self._committed_game_state(context),
                 command_states=self._command_authorities(context.command_states),
             )
         elif context.command_states:
@@ -437,22 +491,23 @@ class LanServerController:
                 ControllerPersistenceError("room authority identity is missing")
             )
         try:
-            now_ms = self._now_ms()
-            expires_at_ms = (
-                self._room_expiry_ms(context, now_ms)
-                if preserve_expires_at_ms is None
-                else preserve_expires_at_ms
-            )
-            record = self._state_store.update_room(
-                room_id,
-                expected_generation=generation,
-                authority=self._authority_document(
-                    context,
-                    wall_clock_ms=now_ms,
-                ),
-                updated_at_ms=now_ms,
-                expires_at_ms=expires_at_ms,
-            )
+            with metric_timer("catan_room_persist_seconds"):
+                now_ms = self._now_ms()
+                expires_at_ms = (
+                    self._room_expiry_ms(context, now_ms)
+                    if preserve_expires_at_ms is None
+                    else preserve_expires_at_ms
+                )
+                record = self._state_store.update_room(
+                    room_id,
+                    expected_generation=generation,
+                    authority=self._authority_document(
+                        context,
+                        wall_clock_ms=now_ms,
+                    ),
+                    updated_at_ms=now_ms,
+                    expires_at_ms=expires_at_ms,
+                )
         except Exception as exc:
             raise self._fail_persistence(exc) from exc
         context.authority_generation = record.generation
@@ -482,7 +537,12 @@ class LanServerController:
         try:
             now_ms = self._now_ms()
             self._state_store.delete_expired(now_ms)
-            metadata = self._state_store.list_rooms()
+            # Rooms owned by another shard of the same store stay untouched.
+            metadata = tuple(
+                item
+                for item in self._state_store.list_rooms()
+                if self._owns_room_code(item.room_code)
+            )
             if len(metadata) > self._room_limit:
                 raise ControllerPersistenceError(
                     "persisted room count exceeds the configured limit"
@@ -586,6 +646,7 @@ class LanServerController:
                     lobby.settings,
                     match.match_seed,
                 )
+                _attach_room_rng(game, match.random_state)
                 restore_game(game, match.game, runtime_side_effects=False)
             finally:
                 random.setstate(caller_state)
@@ -712,6 +773,8 @@ class LanServerController:
                 return self._start_game(connection_key, message)
             if message_type == "game_command":
                 return self._game_command(connection_key, message)
+            if message_type == "state_sync":
+                return self._state_sync(connection_key, message)
             if message_type == "ping":
                 self._expect_fields(message, "type", "protocol_version", "nonce")
                 return (
@@ -815,7 +878,7 @@ class LanServerController:
                     )
                     for session in sessions:
                         self._sessions.pop(session.connection_id, None)
-                    self._rooms.pop(room_code, None)
+                    self._pop_room(room_code)
                     self._discard_replay(room_code)
                     continue
                 lobby_before = deepcopy(context.lobby)
@@ -823,7 +886,7 @@ class LanServerController:
                 if pruned:
                     if not context.lobby.has_members:
                         self._delete_persisted_context(context)
-                        self._rooms.pop(room_code, None)
+                        self._pop_room(room_code)
                         for session in self._room_sessions(room_code):
                             self._sessions.pop(session.connection_id, None)
                         self._discard_replay(room_code)
@@ -849,7 +912,11 @@ class LanServerController:
             raise LanControllerError(
                 "game_not_started", "対局はまだ開始されていません。"
             )
-        return self._snapshot_for(context, session)
+        return self._build_snapshot_for_session(
+            context.game,
+            session,
+            revision=context.game_revision,
+        )
 
     def replay_frame_for_connection(
         self,
@@ -1417,7 +1484,7 @@ class LanServerController:
             return outbound
         except Exception:
             self._sessions.pop(connection_id, None)
-            self._rooms.pop(code, None)
+            self._pop_room(code)
             raise
 
     def _join_room(
@@ -1610,7 +1677,7 @@ class LanServerController:
             self._delete_persisted_context(context)
             for room_session in sessions:
                 self._sessions.pop(room_session.connection_id, None)
-            self._rooms.pop(session.room_code, None)
+            self._pop_room(session.room_code)
             self._discard_replay(session.room_code)
             return tuple(
                 OutboundMessage(room_session.connection_id, closed)
@@ -1630,7 +1697,7 @@ class LanServerController:
             raise
         self._sessions.pop(connection_id, None)
         if not context.lobby.has_members:
-            self._rooms.pop(session.room_code, None)
+            self._pop_room(session.room_code)
             self._discard_replay(session.room_code)
         return outbound
 
@@ -1658,6 +1725,7 @@ class LanServerController:
                     match_random_state = random.getstate()
                 finally:
                     random.setstate(caller_state)
+            _attach_room_rng(game, match_random_state)
             game_snapshots = self._snapshot_messages_for_game(
                 context,
                 game,
@@ -1799,7 +1867,7 @@ class LanServerController:
         random_state_before = context.random_state
         revision_before = context.game_revision
         try:
-            game_state_before = serialize_game(context.game)
+            game_state_before = self._committed_game_state(context)
         except Exception as exc:
             if self._state_store is not None:
                 restore_command_cursor()
@@ -1818,26 +1886,19 @@ class LanServerController:
         action_error: NetworkActionError | None = None
         internal_error = False
         applied_random_state = random_state_before
-        with _RANDOM_LOCK:
-            caller_state = random.getstate()
-            try:
-                if random_state_before is not None:
-                    random.setstate(random_state_before)
-                try:
-                    self._command_applier(
-                        context.game,
-                        seat,
-                        canonical["command"],
-                        canonical["args"],
-                    )
-                except NetworkActionError as exc:
-                    action_error = exc
-                except Exception:
-                    internal_error = True
-                else:
-                    applied_random_state = random.getstate()
-            finally:
-                random.setstate(caller_state)
+        try:
+            self._command_applier(
+                context.game,
+                seat,
+                canonical["command"],
+                canonical["args"],
+            )
+        except NetworkActionError as exc:
+            action_error = exc
+        except Exception:
+            internal_error = True
+        else:
+            applied_random_state = context.game.rng.getstate()
 
         if action_error is not None or internal_error:
             rollback_ok = self._rollback_game(
@@ -1876,10 +1937,12 @@ class LanServerController:
 
         next_revision = context.game_revision + 1
         try:
+            game_state_after = serialize_game(context.game)
             game_snapshots = self._snapshot_messages_for_game(
                 context,
                 context.game,
                 revision=next_revision,
+                game_state=game_state_after,
             )
         except Exception as exc:
             rollback_ok = self._rollback_game(
@@ -1908,6 +1971,11 @@ class LanServerController:
 
         context.random_state = applied_random_state
         context.game_revision = next_revision
+        context.checkpoint = _GameCheckpoint(
+            context.game,
+            next_revision,
+            game_state_after,
+        )
         response = self._command_result(
             sequence,
             accepted=True,
@@ -1984,6 +2052,13 @@ class LanServerController:
         and future accelerated spectator modes.
         """
 
+        with metric_timer("catan_controller_ai_advance_seconds"):
+            return self._advance_ai_slice(context)
+
+    def _advance_ai_slice(
+        self,
+        context: _RoomContext,
+    ) -> tuple[OutboundMessage, ...]:
         outbound: list[OutboundMessage] = []
         for _step_index in range(self._ai_steps_per_tick):
             game = context.game
@@ -1992,7 +2067,7 @@ class LanServerController:
             random_state_before = context.random_state
             revision_before = context.game_revision
             try:
-                game_state_before = serialize_game(game)
+                game_state_before = self._committed_game_state(context)
             except Exception as exc:
                 if self._state_store is not None:
                     self._persistence_failed = True
@@ -2001,20 +2076,13 @@ class LanServerController:
 
             changed = False
             applied_random_state = random_state_before
-            with _RANDOM_LOCK:
-                caller_state = random.getstate()
-                try:
-                    if random_state_before is not None:
-                        random.setstate(random_state_before)
-                    try:
-                        changed = self._ai_stepper(game) is True
-                    except Exception:
-                        changed = False
-                    else:
-                        if changed:
-                            applied_random_state = random.getstate()
-                finally:
-                    random.setstate(caller_state)
+            try:
+                changed = self._ai_stepper(game) is True
+            except Exception:
+                changed = False
+            else:
+                if changed:
+                    applied_random_state = game.rng.getstate()
 
             if not changed:
                 rollback_ok = self._rollback_game(
@@ -2029,10 +2097,12 @@ class LanServerController:
 
             next_revision = context.game_revision + 1
             try:
+                game_state_after = serialize_game(game)
                 snapshots = self._snapshot_messages_for_game(
                     context,
                     game,
                     revision=next_revision,
+                    game_state=game_state_after,
                 )
             except Exception as exc:
                 rollback_ok = self._rollback_game(
@@ -2046,6 +2116,7 @@ class LanServerController:
                 break
             context.random_state = applied_random_state
             context.game_revision = next_revision
+            context.checkpoint = _GameCheckpoint(game, next_revision, game_state_after)
             try:
                 self._persist_existing_context(context)
             except Exception:
@@ -2058,6 +2129,7 @@ class LanServerController:
                 if not rollback_ok:
                     self._persistence_failed = True
                 raise
+            increment_metric("catan_controller_ai_decisions_total")
             self._capture_replay(context)
             outbound.extend(snapshots)
         return tuple(outbound)
@@ -2081,12 +2153,14 @@ class LanServerController:
             )
             if not callable(capture):
                 return False
-            capture(
-                context.lobby.room_code,
-                context.game,
-                revision=context.game_revision,
-            )
+            with metric_timer("catan_replay_capture_seconds"):
+                capture(
+                    context.lobby.room_code,
+                    context.game,
+                    revision=context.game_revision,
+                )
         except Exception:
+            increment_metric("catan_replay_capture_failures_total")
             # If this room has never established a replay that matches its
             # current authority, later revisions must not be appended to a
             # stale same-code archive and accidentally make it readable.
@@ -2171,6 +2245,14 @@ class LanServerController:
                 "リプレイを安全に読み込めませんでした。",
             ) from exc
 
+    def _pop_room(self, room_code: str) -> None:
+        context = self._rooms.pop(room_code, None)
+        ai = getattr(getattr(context, "game", None), "ai", None)
+        close = getattr(ai, "close", None)
+        if callable(close):
+            # A rollout seat may own a worker pool; release it with the room.
+            close()
+
     def _discard_replay(self, room_code: str) -> None:
         try:
             self._replay_store.discard_room(room_code)
@@ -2192,8 +2274,8 @@ class LanServerController:
         )
         room_codes = tuple(self._rooms)
         self._sessions.clear()
-        self._rooms.clear()
         for room_code in room_codes:
+            self._pop_room(room_code)
             self._discard_replay(room_code)
         return tuple(
             OutboundMessage(session.connection_id, closed) for session in sessions
@@ -2215,18 +2297,54 @@ class LanServerController:
         game: Any,
         *,
         revision: int,
+        game_state: dict[str, Any] | None = None,
     ) -> tuple[OutboundMessage, ...]:
-        return tuple(
-            OutboundMessage(
-                session.connection_id,
-                self._build_snapshot_for_session(
+        sessions = self._room_sessions(context.lobby.room_code)
+        if self._snapshot_builder is not build_state_snapshot:
+            snapshots = [
+                self._build_snapshot_for_session(game, session, revision=revision)
+                for session in sessions
+            ]
+        else:
+            # Serialize the authority once per revision and overlay each
+            # seat's private hand.  Sessions sharing a seat (or spectating)
+            # also share their snapshot and command options.
+            viewer_snapshots = build_state_snapshots(
+                game,
+                viewer_player_indices=[session.seat_index for session in sessions],
+                revision=revision,
+                game_state=game_state,
+            )
+            seat_snapshots: dict[int | None, dict[str, Any]] = {}
+            for seat_index, snapshot in viewer_snapshots.items():
+                result = dict(snapshot)
+                result["command_options"] = build_game_command_options(
                     game,
-                    session,
-                    revision=revision,
-                ),
-            )
-            for session in self._room_sessions(context.lobby.room_code)
-        )
+                    seat_index,
+                )
+                seat_snapshots[seat_index] = result
+            snapshots = [seat_snapshots[session.seat_index] for session in sessions]
+
+        deltas: dict[tuple[int, int], dict[str, Any] | None] = {}
+        outbound = []
+        for session, snapshot in zip(sessions, snapshots):
+            message = snapshot
+            baseline = session.snapshot_baseline
+            # A baseline newer than the committed revision was built for an
+            # attempt that rolled back and was never sent.
+            if (
+                session.state_deltas
+                and baseline is not None
+                and baseline.get("revision", revision) <= context.game_revision
+            ):
+                # Sessions in sync on the same seat share one delta.
+                delta_key = (id(baseline), id(snapshot))
+                if delta_key not in deltas:
+                    deltas[delta_key] = build_state_delta(baseline, snapshot)
+                message = deltas[delta_key] or snapshot
+            session.snapshot_baseline = snapshot
+            outbound.append(OutboundMessage(session.connection_id, message))
+        return tuple(outbound)
 
     def _result_with_latest_snapshot(
         self,
@@ -2249,6 +2367,31 @@ class LanServerController:
                 pass
         return tuple(outbound)
 
+    @staticmethod
+    def _committed_game_state(context: _RoomContext) -> dict[str, Any]:
+        """Return the save document of the committed game revision.
+
+        Every mutation of the authoritative game goes through a command or
+        AI step that either commits a new checkpoint or rolls back to this
+        one, so a checkpoint for the current game and revision is exact.
+        Only a miss (first step after start or restore) serializes.
+        """
+
+        checkpoint = context.checkpoint
+        if (
+            checkpoint is not None
+            and checkpoint.game is context.game
+            and checkpoint.revision == context.game_revision
+        ):
+            return checkpoint.state
+        state = serialize_game(context.game)
+        context.checkpoint = _GameCheckpoint(
+            context.game,
+            context.game_revision,
+            state,
+        )
+        return state
+
     @staticmethod
     def _rollback_game(
         context: _RoomContext,
@@ -2256,16 +2399,13 @@ class LanServerController:
         random_state: object | None,
     ) -> bool:
         try:
-            with _RANDOM_LOCK:
-                caller_state = random.getstate()
-                try:
-                    restore_game(
-                        context.game,
-                        game_state,
-                        runtime_side_effects=False,
-                    )
-                finally:
-                    random.setstate(caller_state)
+            restore_game(
+                context.game,
+                game_state,
+                runtime_side_effects=False,
+            )
+            if random_state is not None:
+                context.game.rng.setstate(random_state)
         except Exception:
             # Never continue serving a partially restored authority object.
             context.game = None
@@ -2275,11 +2415,56 @@ class LanServerController:
         return True
 
     def _snapshot_for(self, context: _RoomContext, session: _Session) -> dict[str, Any]:
-        return self._build_snapshot_for_session(
+        snapshot = self._build_snapshot_for_session(
             context.game,
             session,
             revision=context.game_revision,
         )
+        session.snapshot_baseline = snapshot
+        return snapshot
+
+    def _state_sync(
+        self,
+        connection_id: str,
+        message: Mapping[str, Any],
+    ) -> tuple[OutboundMessage, ...]:
+        """Record a client's delta preference and repair a revision gap.
+
+        A client reports the revision it last applied.  When that is not the
+        snapshot this connection was last sent (a missed or undecodable
+        delta), a full snapshot becomes the new delta baseline.
+        """
+
+        self._expect_fields(
+            message,
+            "type",
+            "protocol_version",
+            "known_revision",
+            "accept_deltas",
+        )
+        accept_deltas = message["accept_deltas"]
+        known_revision = message["known_revision"]
+        if type(accept_deltas) is not bool or (
+            known_revision is not None
+            and (
+                type(known_revision) is not int
+                or not 0 <= known_revision <= 9_007_199_254_740_991
+            )
+        ):
+            raise LanControllerError("invalid_request", "同期要求が不正です。")
+        session = self._require_session(connection_id)
+        session.state_deltas = accept_deltas
+        context = self._rooms[session.room_code]
+        if context.game is None:
+            return ()
+        baseline = session.snapshot_baseline
+        if (
+            known_revision is not None
+            and baseline is not None
+            and baseline.get("revision") == known_revision
+        ):
+            return ()
+        return (OutboundMessage(connection_id, self._snapshot_for(context, session)),)
 
     def _build_snapshot_for_session(
         self,
@@ -2329,11 +2514,11 @@ class LanServerController:
         )
 
     def _new_room_code(self) -> str:
-        for _ in range(32):
+        for _ in range(_ROOM_CODE_ATTEMPTS):
             code = "".join(
                 secrets.choice(ROOM_CODE_ALPHABET) for _ in range(ROOM_CODE_LENGTH)
             )
-            if code not in self._rooms:
+            if code not in self._rooms and self._owns_room_code(code):
                 return code
         raise LanControllerError("server_busy", "ルームコードを生成できませんでした。")
 
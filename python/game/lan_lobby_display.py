@@ -6,10 +6,9 @@ from dataclasses import dataclass
 from functools import lru_cache
 from typing import Any, Mapping, Sequence
 
-import pygame
-
 from game.assets import get_font
 from game.constants import COLORS
+from game.lazy_modules import pygame
 
 
 DEFAULT_LAN_LOBBY_SIZE = (1920, 1280)
@@ -1423,7 +1423,7 @@ def _safe_stop(runtime: _ServerRuntime | None) -> None:
 def _default_session_factory() -> _ClientSession:
     from game.lan_runtime import LanClientSession
 
-    return LanClientSession()
+    return LanClientSession(state_deltas=True)
 
 
 def _default_runtime_factory(host: str, port: int) -> _ServerRuntime:
@@ -18,11 +18,10 @@ import math
 from types import MappingProxyType
 from typing import Any
 
-import pygame
-
 from game.assets import get_font
 from game.constants import COLORS
 from game.network_view import NetworkGameView, PointView
+from game.lazy_modules import pygame
 from game.resources import ResourceType
 from game.tile_art import get_tile_surface
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import deque
+from dataclasses import replace
 import ipaddress
 import threading
 import time
@@ -23,6 +24,7 @@ from game.lan_transport import (
 from game.network_protocol import (
     NETWORK_PROTOCOL_VERSION,
     NetworkProtocolError,
+    apply_state_delta,
     build_game_command,
 )
 from game.variant import VariantConfig
@@ -141,8 +143,16 @@ class LanServerRuntime:
 class LanClientSession:
     """Stateful client facade for lobby, reconnect, and exactly-once commands."""
 
-    def __init__(self, *, transport: LanClientTransport | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        transport: LanClientTransport | None = None,
+        state_deltas: bool = False,
+    ) -> None:
+        if type(state_deltas) is not bool:
+            raise ValueError("state_deltas must be boolean")
         self.transport = transport or LanClientTransport()
+        self.state_deltas = state_deltas
         self.room_code: str | None = None
         self.role: str | None = None
         self.seat_index: int | None = None
@@ -157,6 +167,7 @@ class LanClientSession:
         self._session_welcome_received = False
         self._session_synchronized = False
         self._required_snapshot_revision: int | None = None
+        self._state_sync_sent = False
 
     @property
     def is_connected(self) -> bool:
@@ -308,7 +319,7 @@ class LanClientSession:
 
     def poll(self, *, limit: int = 100) -> list[LanTransportEvent]:
         events = self.transport.poll(limit=limit)
-        for event in events:
+        for position, event in enumerate(events):
             if event.kind == "disconnected":
                 self._begin_session_sync()
                 continue
@@ -316,6 +327,14 @@ class LanClientSession:
                 continue
             message = event.message
             message_type = message.get("type")
+            if message_type == "state_delta":
+                snapshot = self._apply_state_delta(message)
+                if snapshot is None:
+                    continue
+                # Callers only ever observe complete snapshots.
+                message = snapshot
+                message_type = "state_snapshot"
+                events[position] = replace(event, message=snapshot)
             if message_type == "session_welcome":
                 self._session_synchronized = False
                 self._session_welcome_received = True
@@ -345,6 +364,8 @@ class LanClientSession:
                     if accepted_snapshot:
                         self.game_revision = revision
                         self.game_snapshot = message
+                        if self.state_deltas and not self._state_sync_sent:
+                            self._request_state_sync(revision)
                     required = self._required_snapshot_revision
                     if (
                         accepted_snapshot
@@ -402,6 +423,31 @@ class LanClientSession:
         self._session_welcome_received = False
         self._session_synchronized = False
         self._required_snapshot_revision = None
+        self._state_sync_sent = False
+
+    def _apply_state_delta(self, message: Mapping[str, Any]) -> dict[str, Any] | None:
+        """Rebuild the next snapshot, or ask for a full one after a gap."""
+
+        if isinstance(self.game_snapshot, dict):
+            try:
+                return apply_state_delta(self.game_snapshot, message)
+            except NetworkProtocolError:
+                pass
+        self._session_synchronized = False
+        self._request_state_sync(None)
+        return None
+
+    def _request_state_sync(self, known_revision: int | None) -> None:
+        self._state_sync_sent = True
+        try:
+            self._send(
+                "state_sync",
+                known_revision=known_revision,
+                accept_deltas=self.state_deltas,
+            )
+        except LanTransportError:
+            # The queued disconnect event restarts session sync.
+            pass
 
     def _sync_role_from_lobby(self, lobby: Mapping[str, Any]) -> None:
         """Keep the public session role aligned after host promotion."""
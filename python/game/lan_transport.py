@@ -1,32 +1,58 @@
 """Small framed-TCP transports for trusted local-area-network play.
 
 The transport deliberately knows nothing about rooms, players, or game rules.
-It only moves versioned messages from :mod:`game.network_protocol` between a
-background socket thread and a bounded queue owned by the application.  This
+It only moves versioned messages from :mod:`game.network_protocol` between
+background socket I/O and a bounded queue owned by the application.  This
 keeps socket callbacks away from the Pygame/rules thread and also makes the
 same lobby/authority layer usable from a future WebSocket adapter.
 
+The server multiplexes its listener and every client on one ``selectors``
+thread.  Sends never block the caller: each frame is written as far as the
+socket accepts and the rest waits in a bounded per-connection buffer, so a
+client that stops reading is dropped instead of stalling broadcasts to the
+other players and spectators.
+
 This module is for a trusted LAN.  It does not provide encryption, Internet
 authentication, NAT traversal, or public matchmaking.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+import logging
 import queue
+import selectors
 import socket
 import threading
+import time
 from typing import Any, Mapping
 
-from game.network_protocol import FrameDecoder, NetworkProtocolError, encode_frame
+from game.network_protocol import (
+    MAX_FRAME_BYTES,
+    FrameDecoder,
+    NetworkProtocolError,
+    encode_frame,
+)
 
 
 DEFAULT_LAN_HOST = "0.0.0.0"
 DEFAULT_LAN_PORT = 0
 MAX_LAN_CONNECTIONS = 16
+MAX_LAN_CONNECTION_LIMIT = 512
 MAX_PENDING_EVENTS = 1_024
+# Unsent bytes allowed per client: two of the largest frames.
+MAX_OUTBOUND_BYTES = 2 * MAX_FRAME_BYTES
 RECEIVE_CHUNK_BYTES = 64 * 1024
+# Chunks read from one ready client before the selector serves the others.
+RECEIVE_BATCH_CHUNKS = 4
 SOCKET_POLL_SECONDS = 0.25
+# Pause before accepting again after a resource error such as EMFILE.
+ACCEPT_RETRY_SECONDS = 0.5
+# How long a closed client may take to receive its queued frames.
+CLOSE_LINGER_SECONDS = 2.0
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class LanTransportError(RuntimeError):
@@ -46,10 +72,23 @@ class LanTransportEvent:
 
 @dataclass
 class _ServerConnection:
+    connection_id: int
     sock: socket.socket
     peer: tuple[str, int]
-    send_lock: threading.Lock
-    thread: threading.Thread | None = None
+    decoder: FrameDecoder = field(default_factory=FrameDecoder)
+    # ``send_lock`` guards the outbound buffer, the socket writes and
+    # ``closed``; the selector thread alone changes registrations.
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    outbound: deque[memoryview] = field(default_factory=deque)
+    outbound_bytes: int = 0
+    closed: bool = False
+    connected_emitted: bool = False
+    writing: bool = False
+    # Set by ``close_connection``: no new frames, flush the buffer, then
+    # shut the write side down and wait for the peer until the deadline.
+    closing: bool = False
+    close_deadline: float = 0.0
+    write_shut: bool = False
 
 
 def _validated_endpoint(host: str, port: int) -> tuple[str, int]:
@@ -68,7 +107,7 @@ def _copy_message(message: Mapping[str, Any]) -> dict[str, Any]:
 
 
 class LanServerTransport:
-    """Threaded IPv4 TCP listener with queue-based message delivery."""
+    """Single-threaded ``selectors`` IPv4 TCP listener with queued delivery."""
 
     def __init__(
         self,
@@ -77,30 +116,52 @@ class LanServerTransport:
         *,
         max_connections: int = MAX_LAN_CONNECTIONS,
         event_queue_size: int = MAX_PENDING_EVENTS,
+        max_outbound_bytes: int = MAX_OUTBOUND_BYTES,
     ) -> None:
         self._host, self._port = _validated_endpoint(host, port)
         if (
             isinstance(max_connections, bool)
             or not isinstance(max_connections, int)
-            or not 1 <= max_connections <= 128
+            or not 1 <= max_connections <= MAX_LAN_CONNECTION_LIMIT
         ):
-            raise ValueError("max_connections must be between 1 and 128")
+            raise ValueError(
+                f"max_connections must be between 1 and {MAX_LAN_CONNECTION_LIMIT}"
+            )
         if (
             isinstance(event_queue_size, bool)
             or not isinstance(event_queue_size, int)
             or event_queue_size <= 0
         ):
             raise ValueError("event_queue_size must be positive")
+        if (
+            isinstance(max_outbound_bytes, bool)
+            or not isinstance(max_outbound_bytes, int)
+            or max_outbound_bytes < MAX_FRAME_BYTES + 4
+        ):
+            raise ValueError("max_outbound_bytes must hold at least one full frame")
         self._max_connections = max_connections
         self._regular_event_limit = event_queue_size
+        self._max_outbound_bytes = max_outbound_bytes
         self.events: queue.Queue[LanTransportEvent] = queue.Queue(
             maxsize=event_queue_size + max_connections
         )
         self._event_lock = threading.Lock()
         self._listener: socket.socket | None = None
-        self._accept_thread: threading.Thread | None = None
+        self._selector: selectors.BaseSelector | None = None
+        self._wake_reader: socket.socket | None = None
+        self._wake_writer: socket.socket | None = None
+        self._io_thread: threading.Thread | None = None
         self._connections: dict[int, _ServerConnection] = {}
         self._connections_lock = threading.RLock()
+        # Connections whose buffered bytes need the selector to watch writes.
+        self._write_requests: set[int] = set()
+        # Closed connections handed to the selector thread, which alone
+        # owns ``_closing`` until they finish flushing.
+        self._close_requests: list[_ServerConnection] = []
+        self._closing: dict[int, _ServerConnection] = {}
+        # Monotonic time at which a listener paused by an accept error is
+        # registered again; owned by the selector thread.
+        self._accept_resume_at: float | None = None
         self._next_connection_id = 1
         self._running = threading.Event()
 
@@ -133,18 +194,28 @@ class LanServerTransport:
             listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             listener.bind((self._host, self._port))
             listener.listen(self._max_connections)
-            listener.settimeout(SOCKET_POLL_SECONDS)
+            listener.setblocking(False)
+            wake_reader, wake_writer = socket.socketpair()
         except OSError as exc:
             listener.close()
             raise LanTransportError(f"LAN server could not start: {exc}") from exc
+        wake_reader.setblocking(False)
+        wake_writer.setblocking(False)
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ, None)
+        selector.register(wake_reader, selectors.EVENT_READ, None)
         self._listener = listener
+        self._selector = selector
+        self._wake_reader, self._wake_writer = wake_reader, wake_writer
+        self._accept_resume_at = None
         self._running.set()
-        self._accept_thread = threading.Thread(
-            target=self._accept_loop,
-            name="catan-lan-accept",
+        self._io_thread = threading.Thread(
+            target=self._io_loop,
+            args=(selector, listener, wake_reader),
+            name="catan-lan-io",
             daemon=True,
         )
-        self._accept_thread.start()
+        self._io_thread.start()
         return self.address
 
     def poll(self, *, limit: int = 100) -> list[LanTransportEvent]:
@@ -161,19 +232,9 @@ class LanServerTransport:
         return result
 
     def send(self, connection_id: int, message: Mapping[str, Any]) -> None:
-        """Send one complete frame to a connected client."""
+        """Queue one complete frame for a connected client without blocking."""
 
-        payload = encode_frame(_copy_message(message))
-        with self._connections_lock:
-            connection = self._connections.get(connection_id)
-        if connection is None:
-            raise LanTransportError("LAN connection is no longer available")
-        try:
-            with connection.send_lock:
-                connection.sock.sendall(payload)
-        except OSError as exc:
-            self.close_connection(connection_id)
-            raise LanTransportError(f"LAN send failed: {exc}") from exc
+        self._send_frame(connection_id, encode_frame(_copy_message(message)))
 
     def broadcast(
         self,
@@ -183,21 +244,41 @@ class LanServerTransport:
     ) -> tuple[int, ...]:
         """Send to a stable connection snapshot and return failed ids."""
 
+        payload = encode_frame(_copy_message(message))
         targets = tuple(connection_ids) if connection_ids is not None else self.connection_ids
         failed = []
         for connection_id in targets:
             try:
-                self.send(connection_id, message)
+                self._send_frame(connection_id, payload)
             except LanTransportError:
                 failed.append(connection_id)
         return tuple(failed)
 
     def close_connection(self, connection_id: int) -> bool:
+        """Close a client once the frames already sent to it are written.
+
+        The selector thread flushes the buffer and shuts the write side
+        down; a client that has not taken everything within
+        ``CLOSE_LINGER_SECONDS`` is dropped regardless.
+        """
+
+        return self._close_connection(connection_id, flush=True)
+
+    def _close_connection(self, connection_id: int, *, flush: bool) -> bool:
         with self._connections_lock:
             connection = self._connections.pop(connection_id, None)
-        if connection is None:
-            return False
-        _close_socket(connection.sock)
+            if connection is None:
+                return False
+            with connection.send_lock:
+                connection.closing = True
+                connection.close_deadline = time.monotonic()
+                if flush:
+                    connection.close_deadline += CLOSE_LINGER_SECONDS
+                else:
+                    connection.outbound.clear()
+                    connection.outbound_bytes = 0
+            self._close_requests.append(connection)
+        self._wake()
         return True
 
     def stop(self) -> None:
@@ -206,21 +287,66 @@ class LanServerTransport:
         if not self._running.is_set() and self._listener is None:
             return
         self._running.clear()
-        listener, self._listener = self._listener, None
-        if listener is not None:
-            _close_socket(listener)
+        self._wake()
+        thread, self._io_thread = self._io_thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.5)
         with self._connections_lock:
             connections = list(self._connections.values())
             self._connections.clear()
+        # Only reached if the selector thread did not finish in time.
         for connection in connections:
             _close_socket(connection.sock)
-        current = threading.current_thread()
-        if self._accept_thread is not None and self._accept_thread is not current:
-            self._accept_thread.join(timeout=1.5)
-        for connection in connections:
-            if connection.thread is not None and connection.thread is not current:
-                connection.thread.join(timeout=1.5)
-        self._accept_thread = None
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            _close_socket(listener)
+        for sock in (self._wake_reader, self._wake_writer):
+            if sock is not None:
+                sock.close()
+        self._wake_reader = self._wake_writer = None
+        self._selector = None
+
+    def _send_frame(self, connection_id: int, payload: bytes) -> None:
+        with self._connections_lock:
+            connection = self._connections.get(connection_id)
+        if connection is None:
+            raise LanTransportError("LAN connection is no longer available")
+        detail = ""
+        needs_selector = False
+        with connection.send_lock:
+            if connection.closed or connection.closing:
+                raise LanTransportError("LAN connection is no longer available")
+            if connection.outbound_bytes + len(payload) > self._max_outbound_bytes:
+                detail = "LAN client is not reading its messages"
+            else:
+                connection.outbound.append(memoryview(payload))
+                connection.outbound_bytes += len(payload)
+                # Write immediately when nothing is queued ahead; only a
+                # remainder the socket could not take waits for the selector.
+                if connection.outbound_bytes == len(payload):
+                    try:
+                        _flush_outbound(connection)
+                    except OSError as exc:
+                        detail = f"LAN send failed: {exc}"
+                needs_selector = connection.outbound_bytes > 0 and not detail
+        if detail:
+            # An overfull or failed buffer cannot be flushed; drop it now.
+            self._close_connection(connection_id, flush=False)
+            raise LanTransportError(detail)
+        if needs_selector:
+            with self._connections_lock:
+                self._write_requests.add(connection_id)
+            self._wake()
+
+    def _wake(self) -> None:
+        writer = self._wake_writer
+        if writer is None:
+            return
+        try:
+            writer.send(b"\0")
+        except OSError:
+            # A full wake pipe already guarantees a pending wake-up.
+            pass
 
     def _emit(self, event: LanTransportEvent) -> bool:
         with self._event_lock:
@@ -232,6 +358,19 @@ class LanServerTransport:
             except queue.Full:
                 return False
 
+    def _emit_many(self, events: list[LanTransportEvent]) -> bool:
+        """Queue a decoded batch under one lock; ``False`` if any was dropped."""
+
+        with self._event_lock:
+            for event in events:
+                if self.events.qsize() >= self._regular_event_limit:
+                    return False
+                try:
+                    self.events.put_nowait(event)
+                except queue.Full:
+                    return False
+        return True
+
     def _emit_terminal(self, event: LanTransportEvent) -> bool:
         """Use the per-connection reserve for a terminal event."""
 
@@ -242,110 +381,231 @@ class LanServerTransport:
             except queue.Full:
                 return False
 
-    def _accept_loop(self) -> None:
-        listener = self._listener
-        if listener is None:
-            return
-        while self._running.is_set():
+    def _io_loop(
+        self,
+        selector: selectors.BaseSelector,
+        listener: socket.socket,
+        wake_reader: socket.socket,
+    ) -> None:
+        try:
+            while self._running.is_set():
+                for key, mask in selector.select(SOCKET_POLL_SECONDS):
+                    if key.fileobj is listener:
+                        self._accept_ready(selector, listener)
+                    elif key.fileobj is wake_reader:
+                        _drain_wake_socket(wake_reader)
+                    else:
+                        connection = key.data
+                        if mask & selectors.EVENT_WRITE:
+                            self._write_ready(selector, connection)
+                        if mask & selectors.EVENT_READ and not connection.closed:
+                            self._read_ready(selector, connection)
+                self._watch_requested_writes(selector)
+                self._service_closing(selector)
+                if (
+                    self._accept_resume_at is not None
+                    and time.monotonic() >= self._accept_resume_at
+                ):
+                    self._accept_resume_at = None
+                    selector.register(listener, selectors.EVENT_READ, None)
+        finally:
+            for key in list(selector.get_map().values()):
+                if isinstance(key.data, _ServerConnection):
+                    self._drop(selector, key.data, "")
+            selector.close()
+
+    def _accept_ready(
+        self,
+        selector: selectors.BaseSelector,
+        listener: socket.socket,
+    ) -> None:
+        while True:
             try:
                 client, peer = listener.accept()
-            except socket.timeout:
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionAbortedError:
+                # The client gave up while waiting in the backlog.
                 continue
-            except OSError:
-                break
-            if not self._running.is_set():
-                _close_socket(client)
-                break
-            client.settimeout(SOCKET_POLL_SECONDS)
+            except OSError as exc:
+                # EMFILE/ENFILE and similar leave the listener readable, so
+                # stop watching it for a moment instead of spinning.
+                _LOGGER.warning(
+                    "LAN server could not accept a client, retrying in %.1fs: %s",
+                    ACCEPT_RETRY_SECONDS,
+                    exc,
+                )
+                selector.unregister(listener)
+                self._accept_resume_at = time.monotonic() + ACCEPT_RETRY_SECONDS
+                return
+            client.setblocking(False)
             client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             with self._connections_lock:
-                if not self._running.is_set():
-                    _close_socket(client)
-                    break
                 if len(self._connections) >= self._max_connections:
                     _close_socket(client)
                     continue
-                connection_id = self._next_connection_id
-                self._next_connection_id += 1
                 connection = _ServerConnection(
+                    connection_id=self._next_connection_id,
                     sock=client,
                     peer=(str(peer[0]), int(peer[1])),
-                    send_lock=threading.Lock(),
                 )
-                self._connections[connection_id] = connection
-            thread = threading.Thread(
-                target=self._receive_loop,
-                args=(connection_id, connection),
-                name=f"catan-lan-peer-{connection_id}",
-                daemon=True,
+                self._next_connection_id += 1
+                self._connections[connection.connection_id] = connection
+            selector.register(client, selectors.EVENT_READ, connection)
+            connection.connected_emitted = self._emit(
+                LanTransportEvent(
+                    "connected",
+                    connection_id=connection.connection_id,
+                    peer=connection.peer,
+                )
             )
-            connection.thread = thread
-            thread.start()
+            if not connection.connected_emitted:
+                self._drop(selector, connection, "application event queue is full")
 
-    def _receive_loop(
+    def _read_ready(
         self,
-        connection_id: int,
+        selector: selectors.BaseSelector,
         connection: _ServerConnection,
     ) -> None:
-        decoder = FrameDecoder()
-        connected_emitted = self._emit(
-            LanTransportEvent(
-                "connected",
-                connection_id=connection_id,
-                peer=connection.peer,
-            )
-        )
+        chunks = []
+        at_eof = False
         detail = ""
-        if connected_emitted:
-            while self._running.is_set():
-                try:
-                    data = connection.sock.recv(RECEIVE_CHUNK_BYTES)
-                except socket.timeout:
-                    continue
-                except OSError as exc:
-                    detail = str(exc)
-                    break
-                if not data:
-                    break
+        for _ in range(RECEIVE_BATCH_CHUNKS):
+            try:
+                data = connection.sock.recv(RECEIVE_CHUNK_BYTES)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                detail = str(exc)
+                at_eof = True
+                break
+            if not data:
+                at_eof = True
+                break
+            chunks.append(data)
+            if len(data) < RECEIVE_CHUNK_BYTES:
+                break
+        # A closing connection only waits for the peer's EOF; anything it
+        # still sends is discarded.
+        if chunks and not connection.closing:
+            messages = []
+            protocol_error = ""
+            # Feed each chunk separately so that frames completed before a
+            # malformed one are still delivered ahead of the protocol error.
+            for data in chunks:
                 try:
-                    messages = decoder.feed(data)
+                    messages.extend(connection.decoder.feed(data))
                 except NetworkProtocolError as exc:
-                    detail = str(exc)
-                    self._emit(
-                        LanTransportEvent(
-                            "protocol_error",
-                            connection_id=connection_id,
-                            peer=connection.peer,
-                            detail=detail,
-                        )
-                    )
-                    break
-                for message in messages:
-                    if not self._emit(
-                        LanTransportEvent(
-                            "message",
-                            connection_id=connection_id,
-                            message=message,
-                            peer=connection.peer,
-                        )
-                    ):
-                        detail = "application event queue is full"
-                        break
-                if detail:
+                    protocol_error = str(exc)
                     break
-        elif not detail:
-            detail = "application event queue is full"
+            if messages and not self._emit_many(
+                [
+                    LanTransportEvent(
+                        "message",
+                        connection_id=connection.connection_id,
+                        message=message,
+                        peer=connection.peer,
+                    )
+                    for message in messages
+                ]
+            ):
+                self._drop(selector, connection, "application event queue is full")
+                return
+            if protocol_error:
+                self._emit(
+                    LanTransportEvent(
+                        "protocol_error",
+                        connection_id=connection.connection_id,
+                        peer=connection.peer,
+                        detail=protocol_error,
+                    )
+                )
+                self._drop(selector, connection, protocol_error)
+                return
+        if at_eof:
+            self._drop(selector, connection, detail)
+
+    def _write_ready(
+        self,
+        selector: selectors.BaseSelector,
+        connection: _ServerConnection,
+    ) -> None:
+        with connection.send_lock:
+            if connection.closed:
+                return
+            try:
+                _flush_outbound(connection)
+            except OSError as exc:
+                detail = str(exc)
+            else:
+                if not connection.outbound_bytes:
+                    _finish_writes(selector, connection)
+                return
+        self._drop(selector, connection, detail)
+
+    def _watch_requested_writes(self, selector: selectors.BaseSelector) -> None:
+        with self._connections_lock:
+            requested, self._write_requests = self._write_requests, set()
+            connections = [
+                self._connections[connection_id]
+                for connection_id in requested
+                if connection_id in self._connections
+            ]
+        for connection in connections:
+            with connection.send_lock:
+                if (
+                    connection.closed
+                    or connection.writing
+                    or not connection.outbound_bytes
+                ):
+                    continue
+                _watch_writes(selector, connection)
+
+    def _service_closing(self, selector: selectors.BaseSelector) -> None:
+        with self._connections_lock:
+            requested, self._close_requests = self._close_requests, []
+        for connection in requested:
+            self._closing[connection.connection_id] = connection
+        if not self._closing:
+            return
+        now = time.monotonic()
+        for connection in list(self._closing.values()):
+            if now >= connection.close_deadline:
+                self._drop(selector, connection, "")
+                continue
+            with connection.send_lock:
+                if connection.outbound_bytes:
+                    if not connection.writing:
+                        _watch_writes(selector, connection)
+                else:
+                    _finish_writes(selector, connection)
 
+    def _drop(
+        self,
+        selector: selectors.BaseSelector,
+        connection: _ServerConnection,
+        detail: str,
+    ) -> None:
+        with connection.send_lock:
+            if connection.closed:
+                return
+            connection.closed = True
+            connection.outbound.clear()
+            connection.outbound_bytes = 0
+        self._closing.pop(connection.connection_id, None)
         with self._connections_lock:
-            current = self._connections.get(connection_id)
-            if current is connection:
-                del self._connections[connection_id]
+            if self._connections.get(connection.connection_id) is connection:
+                del self._connections[connection.connection_id]
+        try:
+            selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
         _close_socket(connection.sock)
-        if connected_emitted:
+        if connection.connected_emitted:
             self._emit_terminal(
                 LanTransportEvent(
                     "disconnected",
-                    connection_id=connection_id,
+                    connection_id=connection.connection_id,
                     peer=connection.peer,
                     detail=detail,
                 )
@@ -542,6 +802,64 @@ class LanClientTransport:
         self.close()
 
 
+def _flush_outbound(connection: _ServerConnection) -> None:
+    """Write buffered frames until the socket would block; caller holds the lock."""
+
+    outbound = connection.outbound
+    while outbound:
+        chunk = outbound[0]
+        try:
+            sent = connection.sock.send(chunk)
+        except (BlockingIOError, InterruptedError):
+            return
+        connection.outbound_bytes -= sent
+        if sent < len(chunk):
+            outbound[0] = chunk[sent:]
+            return
+        outbound.popleft()
+
+
+def _watch_writes(
+    selector: selectors.BaseSelector,
+    connection: _ServerConnection,
+) -> None:
+    """Ask the selector for writability; caller holds the send lock."""
+
+    selector.modify(
+        connection.sock,
+        selectors.EVENT_READ | selectors.EVENT_WRITE,
+        connection,
+    )
+    connection.writing = True
+
+
+def _finish_writes(
+    selector: selectors.BaseSelector,
+    connection: _ServerConnection,
+) -> None:
+    """Stop watching an empty buffer and end a closing connection's writes."""
+
+    if connection.writing:
+        selector.modify(connection.sock, selectors.EVENT_READ, connection)
+        connection.writing = False
+    if connection.closing and not connection.write_shut:
+        # The peer sees EOF after the last frame; its own EOF (or the
+        # linger deadline) then lets the selector drop the connection.
+        connection.write_shut = True
+        try:
+            connection.sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def _drain_wake_socket(sock: socket.socket) -> None:
+    try:
+        while sock.recv(4096):
+            pass
+    except (BlockingIOError, InterruptedError):
+        pass
+
+
 def _close_socket(sock: socket.socket) -> None:
     try:
         sock.shutdown(socket.SHUT_RDWR)
@@ -560,5 +878,7 @@ __all__ = (
     "LanServerTransport",
     "LanTransportError",
     "LanTransportEvent",
+    "MAX_LAN_CONNECTION_LIMIT",
     "MAX_LAN_CONNECTIONS",
+    "MAX_OUTBOUND_BYTES",
 )
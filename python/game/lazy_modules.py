@@ -0,0 +1,71 @@
+"""Deferred imports for pygame and the windowed presentation modules.
+
+Modules that draw import ``pygame`` from here instead of importing it
+directly.  The real package is loaded on the first attribute access, so the
+headless rules engine, self-play workers, and the LAN/web servers never pay
+pygame's startup cost, and they keep working where pygame is not installed.
+Windowed code sees the ordinary pygame module once anything touches it.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+
+
+__all__ = ("lazy_import", "pygame", "pygame_available")
+
+
+class _MissingPygame(types.ModuleType):
+    """Placeholder that fails only when a display feature is actually used."""
+
+    def __getattr__(self, name):
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        raise ModuleNotFoundError(
+            "pygame is required for the windowed game; "
+            "headless simulations and servers do not need it",
+            name="pygame",
+        )
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return ``name`` as a module that executes on first attribute access.
+
+    An already imported module is returned unchanged.  A module that cannot
+    be found raises :class:`ModuleNotFoundError` immediately, exactly like a
+    normal import.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent_name, _, child_name = name.rpartition(".")
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, module)
+    return module
+
+
+def _optional_pygame() -> types.ModuleType:
+    try:
+        return lazy_import("pygame")
+    except (ImportError, ValueError):
+        # ValueError comes from ``find_spec`` when a stand-in module without
+        # a spec has been placed in ``sys.modules``.
+        return _MissingPygame("pygame")
+
+
+def pygame_available() -> bool:
+    """Return whether pygame can be imported, without importing it."""
+    return not isinstance(pygame, _MissingPygame)
+
+
+pygame = _optional_pygame()
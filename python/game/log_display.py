@@ -1,8 +1,7 @@
-import pygame
-
 from game.assets import get_font
 from game.ai_personality import get_ai_personality_profile
 from game.constants import COLORS, LOG_PANEL_HEIGHT, LOG_PANEL_WIDTH, SIDE_PANEL_X
+from game.lazy_modules import pygame
 from game.resources import ResourceType
 
 RESOURCE_LABELS = {
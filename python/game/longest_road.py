@@ -0,0 +1,167 @@
+"""Incremental longest-road bookkeeping.
+
+Each player's roads are grouped into node-connected components.  A placed
+road only merges the components it touches, and a building placed on a
+node only dirties the component containing that node, so the trail search
+reruns for the affected network while every other cached length is reused.
+"""
+
+
+class _RoadComponent:
+    __slots__ = ("roads", "nodes", "length")
+
+    def __init__(self):
+        self.roads = []
+        self.nodes = set()
+        self.length = None
+
+
+def longest_trail_length(roads, player, road_is_usable):
+    """Return the longest trail through ``roads`` that ``player`` may claim.
+
+    A trail may start at any node but cannot pass through a node occupied
+    by another player's building.  Roads are indexed into a bitmask so the
+    search shares one integer per frame instead of copying ``set`` objects.
+    """
+    adjacency = {}
+    usable_count = 0
+    for road in roads:
+        if not road_is_usable(road):
+            continue
+        bit = 1 << usable_count
+        usable_count += 1
+        adjacency.setdefault(road.node1, []).append((bit, road.node2))
+        adjacency.setdefault(road.node2, []).append((bit, road.node1))
+    if not usable_count:
+        return 0
+
+    def blocked(node):
+        building = node.building
+        return building is not None and building.owner != player
+
+    def extend(node, used):
+        if blocked(node):
+            return 0
+        best = 0
+        for bit, next_node in adjacency[node]:
+            if used & bit:
+                continue
+            length = 1 + extend(next_node, used | bit)
+            if length > best:
+                best = length
+                if best == usable_count:
+                    break
+        return best
+
+    best_length = 0
+    for start, links in adjacency.items():
+        for bit, next_node in links:
+            length = 1 + extend(next_node, bit)
+            if length > best_length:
+                best_length = length
+                if best_length == usable_count:
+                    return best_length
+    return best_length
+
+
+class _PlayerRoadNetwork:
+    def __init__(self):
+        self.components = []
+        self.component_by_node = {}
+        self.road_count = 0
+
+    def add_road(self, road):
+        touching = []
+        for node in (road.node1, road.node2):
+            component = self.component_by_node.get(node)
+            if component is not None and component not in touching:
+                touching.append(component)
+        if touching:
+            merged = max(touching, key=lambda component: len(component.roads))
+            for component in touching:
+                if component is merged:
+                    continue
+                merged.roads.extend(component.roads)
+                merged.nodes.update(component.nodes)
+                self.components.remove(component)
+        else:
+            merged = _RoadComponent()
+            self.components.append(merged)
+        merged.roads.append(road)
+        merged.nodes.update((road.node1, road.node2))
+        merged.length = None
+        for node in merged.nodes:
+            self.component_by_node[node] = merged
+        self.road_count += 1
+
+    def node_changed(self, node):
+        component = self.component_by_node.get(node)
+        if component is not None:
+            component.length = None
+
+    def invalidate(self):
+        for component in self.components:
+            component.length = None
+
+
+class LongestRoadTracker:
+    """Cache per-player longest-road lengths until a relevant board change."""
+
+    def __init__(self):
+        self.topology = None
+        self.road_generation = None
+        self.building_generation = None
+        self.building_log_position = 0
+        self.usability_key = None
+        self.networks = {}
+        self.trail_searches = 0
+
+    def _sync(self, topology, usability_key):
+        if (
+            topology is not self.topology
+            or topology.road_generation != self.road_generation
+            or topology.building_generation != self.building_generation
+        ):
+            self.topology = topology
+            self.road_generation = topology.road_generation
+            self.building_generation = topology.building_generation
+            self.building_log_position = len(topology.building_log)
+            self.usability_key = usability_key
+            self.networks = {}
+            return
+
+        log = topology.building_log
+        if self.building_log_position < len(log):
+            changed_nodes = log[self.building_log_position:]
+            self.building_log_position = len(log)
+            for network in self.networks.values():
+                for node in changed_nodes:
+                    network.node_changed(node)
+
+        if usability_key != self.usability_key:
+            self.usability_key = usability_key
+            for network in self.networks.values():
+                network.invalidate()
+
+    def get_length(self, board, player, road_is_usable, usability_key=None):
+        topology = board.topology
+        self._sync(topology, usability_key)
+
+        network = self.networks.get(player)
+        if network is None:
+            network = self.networks[player] = _PlayerRoadNetwork()
+        player_roads = topology.player_roads(player)
+        for road in player_roads[network.road_count:]:
+            network.add_road(road)
+
+        best_length = 0
+        for component in network.components:
+            if component.length is None:
+                self.trail_searches += 1
+                component.length = longest_trail_length(
+                    component.roads,
+                    player,
+                    road_is_usable,
+                )
+            best_length = max(best_length, component.length)
+        return best_length
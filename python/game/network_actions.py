@@ -16,6 +16,7 @@ from game.development_cards import DevelopmentCardType
 from game.network_protocol import build_board_reference_index
 from game.persistence import serialize_game
 from game.resources import BUILD_COSTS, ResourceType
+from game.runtime_metrics import metric_timer
 
 
 SUPPORTED_GAME_COMMANDS = frozenset(
@@ -813,6 +814,27 @@ def apply_game_command(
     ``True``; every rejection raises :class:`NetworkActionError`.
     """
 
+    with metric_timer(
+        "catan_game_command_seconds",
+        command=(
+            command
+            if type(command) is str and command in SUPPORTED_GAME_COMMANDS
+            else "unsupported"
+        ),
+    ) as timing:
+        try:
+            return _apply_game_command(game, seat_index, command, args)
+        except NetworkActionError:
+            timing.label(outcome="rejected")
+            raise
+
+
+def _apply_game_command(
+    game: Any,
+    seat_index: int | None,
+    command: str,
+    args: dict[str, Any] | None,
+) -> bool:
     players = list(getattr(game, "players", ()))
     _validate_session_seat(players, seat_index)
     if type(command) is not str or command not in SUPPORTED_GAME_COMMANDS:
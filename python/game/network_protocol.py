@@ -1,9 +1,12 @@
+from collections import OrderedDict
 from collections.abc import Mapping
 from copy import deepcopy
 import json
 import math
 import re
 import struct
+import threading
+import weakref
 
 from game.ai_personality import AI_PERSONALITY_PROFILES, MIXED
 from game.custom_map import CustomMapError, CustomMapSpec
@@ -26,6 +29,8 @@ MAX_GAME_COMMAND_NAME_LENGTH = 64
 MAX_SNAPSHOT_LOG_MESSAGES = 200
 MAX_LIVE_MATCH_EVENTS = 200
 MAX_FINISHED_MATCH_EVENTS = 1_000
+MAX_STATE_DELTA_OPERATIONS = 2_048
+MAX_STATE_DELTA_PATH_DEPTH = 32
 
 _PUBLIC_VARIANT_STATE_FIELDS = (
     "format",
@@ -117,15 +122,77 @@ def _owner_player_index(owner, player_indices):
         raise NetworkProtocolError("盤面の駒所有者が参加者に存在しません。") from exc
 
 
+class _BoardGeometry:
+    """Validated public IDs for one board plus lazily built manifest parts.
+
+    Board geometry never changes after ``setup_board``; only the piece,
+    robber, frontier and forecast overlays do.  The geometry is therefore
+    derived once per board and checked against the identity and length of
+    the board's geometry lists on every lookup.
+    """
+
+    __slots__ = ("sources", "lengths", "references", "manifest_parts")
+
+    def __init__(self, sources, lengths, references):
+        self.sources = sources
+        self.lengths = lengths
+        self.references = references
+        self.manifest_parts = None
+
+    def is_current(self, sources, lengths):
+        return lengths == self.lengths and all(
+            current is cached for current, cached in zip(sources, self.sources)
+        )
+
+
+_BOARD_GEOMETRY_FIELDS = ("nodes", "edges", "tiles", "harbors", "perimeter_edges")
+_BOARD_GEOMETRIES = weakref.WeakKeyDictionary()
+_BOARD_MANIFESTS = weakref.WeakKeyDictionary()
+_ENCODED_BOARD_MANIFESTS = OrderedDict()
+_ENCODED_BOARD_MANIFEST_LIMIT = 256
+_BOARD_CACHE_LOCK = threading.Lock()
+
+
+def _weak_cache_get(cache, owner):
+    try:
+        return cache.get(owner)
+    except TypeError:
+        # Lightweight test doubles may not support weak references; they are
+        # simply rebuilt on every call.
+        return None
+
+
+def _weak_cache_set(cache, owner, value):
+    try:
+        cache[owner] = value
+    except TypeError:
+        pass
+
+
+def _board_geometry(board):
+    sources = tuple(getattr(board, field, None) for field in _BOARD_GEOMETRY_FIELDS)
+    lengths = tuple(None if source is None else len(source) for source in sources)
+    geometry = _weak_cache_get(_BOARD_GEOMETRIES, board)
+    if geometry is not None and geometry.is_current(sources, lengths):
+        return geometry
+    geometry = _BoardGeometry(sources, lengths, _build_board_references(board))
+    _weak_cache_set(_BOARD_GEOMETRIES, board, geometry)
+    return geometry
+
+
 def build_board_reference_index(game):
     """Map public stable target IDs to the authoritative board objects.
 
     The semantic command router and the public manifest must both use this
     function.  Numeric IDs intentionally follow sorted geometry/topology, not
-    mutable list insertion order.
+    mutable list insertion order.  The index is cached per board and shared
+    between callers, so it must be treated as read-only.
     """
 
-    board = game.board
+    return _board_geometry(game.board).references
+
+
+def _build_board_references(board):
     sorted_nodes = sorted(
         board.nodes,
         key=lambda node: (
@@ -214,19 +281,9 @@ def build_board_reference_index(game):
     }
 
 
-def build_board_manifest(game):
-    """Return a complete public board description for non-Python clients.
-
-    IDs are derived from stable board geometry rather than object identity or
-    container insertion order.  A browser can therefore draw the current
-    board directly without reproducing Python's random number generator.
-    """
-
-    board = game.board
-    players = list(game.players)
-    player_indices = {player: index for index, player in enumerate(players)}
+def _board_manifest_parts(board, references):
+    """Derive the overlay-independent parts of the public manifest."""
 
-    references = build_board_reference_index(game)
     node_by_id = references["node"]
     edge_by_id = references["edge"]
     tile_by_id = references["tile"]
@@ -256,6 +313,158 @@ def build_board_manifest(game):
         ],
         key=lambda item: item[0],
     )
+    perimeter_edges = {
+        frozenset((node1, node2)) for node1, node2 in board.perimeter_edges
+    }
+
+    edge_ids_by_node = {node: [] for node in sorted_nodes}
+    adjacent_nodes = {node: [] for node in sorted_nodes}
+    for _, node1, node2 in canonical_edges:
+        edge_id = edge_ids[frozenset((node1, node2))]
+        edge_ids_by_node[node1].append(edge_id)
+        edge_ids_by_node[node2].append(edge_id)
+        adjacent_nodes[node1].append(node_ids[node2])
+        adjacent_nodes[node2].append(node_ids[node1])
+
+    tiles = [
+        (
+            tile,
+            {
+                "id": tile_ids[tile],
+                "axial": {"q": int(tile.axial[0]), "r": int(tile.axial[1])},
+                "center": {
+                    "x": _validated_coordinate(tile.x),
+                    "y": _validated_coordinate(tile.y),
+                },
+            },
+            [node_ids[node] for node in tile.corners],
+        )
+        for tile in sorted_tiles
+    ]
+    nodes = [
+        (
+            node,
+            {
+                "id": node_ids[node],
+                "position": {
+                    "x": _validated_coordinate(node.x),
+                    "y": _validated_coordinate(node.y),
+                },
+                "adjacent_tile_ids": sorted(tile_ids[tile] for tile in node.tiles),
+                "adjacent_node_ids": sorted(adjacent_nodes[node]),
+                "edge_ids": sorted(edge_ids_by_node[node]),
+            },
+        )
+        for node in sorted_nodes
+    ]
+    edges = []
+    for _, node1, node2 in canonical_edges:
+        edge_key = frozenset((node1, node2))
+        edges.append(
+            (
+                node1,
+                node2,
+                edge_key,
+                {
+                    "id": edge_ids[edge_key],
+                    "node_ids": sorted((node_ids[node1], node_ids[node2])),
+                    "adjacent_tile_ids": sorted(
+                        tile_ids[tile]
+                        for tile in sorted_tiles
+                        if node1 in tile.corners and node2 in tile.corners
+                    ),
+                    "perimeter": edge_key in perimeter_edges,
+                },
+            )
+        )
+
+    positions = [entry["position"] for _, entry in nodes]
+    return {
+        "edge_ids": edge_ids,
+        "harbor_ids": harbor_ids,
+        "harbor_edges": harbor_edges,
+        "node_ids": node_ids,
+        "tiles": tiles,
+        "nodes": nodes,
+        "edges": edges,
+        "bounds": {
+            "min_x": min(position["x"] for position in positions),
+            "max_x": max(position["x"] for position in positions),
+            "min_y": min(position["y"] for position in positions),
+            "max_y": max(position["y"] for position in positions),
+        },
+    }
+
+
+class _BoardManifestEntry:
+    __slots__ = ("key", "manifest", "encoded")
+
+    def __init__(self, key, manifest):
+        self.key = key
+        self.manifest = manifest
+        self.encoded = None
+
+
+def build_board_manifest(game):
+    """Return a complete public board description for non-Python clients.
+
+    IDs are derived from stable board geometry rather than object identity or
+    container insertion order.  A browser can therefore draw the current
+    board directly without reproducing Python's random number generator.
+
+    Games exposing ``get_board_manifest_key`` get the manifest cached until
+    that key changes, and the cached manifest is shared between sessions and
+    revisions; callers must treat it as read-only.
+    """
+
+    geometry = _board_geometry(game.board)
+    manifest_key = getattr(game, "get_board_manifest_key", None)
+    if not callable(manifest_key):
+        return _build_board_manifest(game, geometry)
+    key = (geometry, manifest_key())
+    entry = _weak_cache_get(_BOARD_MANIFESTS, game)
+    if entry is not None and entry.key == key:
+        return entry.manifest
+    manifest = _build_board_manifest(game, geometry)
+    new_entry = _BoardManifestEntry(key, manifest)
+    with _BOARD_CACHE_LOCK:
+        if entry is not None:
+            _ENCODED_BOARD_MANIFESTS.pop(id(entry.manifest), None)
+        _ENCODED_BOARD_MANIFESTS[id(manifest)] = new_entry
+        while len(_ENCODED_BOARD_MANIFESTS) > _ENCODED_BOARD_MANIFEST_LIMIT:
+            _ENCODED_BOARD_MANIFESTS.popitem(last=False)
+    _weak_cache_set(_BOARD_MANIFESTS, game, new_entry)
+    return manifest
+
+
+def _encoded_board_manifest(manifest):
+    """Return the cached JSON bytes of a manifest built by this module."""
+
+    with _BOARD_CACHE_LOCK:
+        entry = _ENCODED_BOARD_MANIFESTS.get(id(manifest))
+    if entry is None or entry.manifest is not manifest:
+        return None
+    if entry.encoded is None:
+        entry.encoded = _encode_json(manifest)
+    return entry.encoded
+
+
+def _build_board_manifest(game, geometry):
+    board = game.board
+    players = list(game.players)
+    player_indices = {player: index for index, player in enumerate(players)}
+
+    parts = geometry.manifest_parts
+    if parts is None:
+        parts = geometry.manifest_parts = _board_manifest_parts(
+            board,
+            geometry.references,
+        )
+    edge_ids = parts["edge_ids"]
+    harbor_ids = parts["harbor_ids"]
+    harbor_edges = parts["harbor_edges"]
+    node_ids = parts["node_ids"]
+
     tile_is_revealed = getattr(game, "is_frontier_tile_revealed", lambda _tile: True)
     harbor_is_revealed = getattr(
         game,
@@ -290,21 +499,9 @@ def build_board_manifest(game):
         for _, harbor in harbor_edges
         if harbor in public_harbors
     }
-    perimeter_edges = {
-        frozenset((node1, node2)) for node1, node2 in board.perimeter_edges
-    }
-
-    edge_ids_by_node = {node: [] for node in sorted_nodes}
-    adjacent_nodes = {node: [] for node in sorted_nodes}
-    for _, node1, node2 in canonical_edges:
-        edge_id = edge_ids[frozenset((node1, node2))]
-        edge_ids_by_node[node1].append(edge_id)
-        edge_ids_by_node[node2].append(edge_id)
-        adjacent_nodes[node1].append(node_ids[node2])
-        adjacent_nodes[node2].append(node_ids[node1])
 
     tiles = []
-    for tile in sorted_tiles:
+    for tile, static, corner_node_ids in parts["tiles"]:
         revealed = bool(tile_is_revealed(tile))
         number = tile.number if revealed else None
         if number is not None and (
@@ -313,22 +510,17 @@ def build_board_manifest(game):
             raise NetworkProtocolError("タイルの数字が不正です。")
         tiles.append(
             {
-                "id": tile_ids[tile],
-                "axial": {"q": int(tile.axial[0]), "r": int(tile.axial[1])},
-                "center": {
-                    "x": _validated_coordinate(tile.x),
-                    "y": _validated_coordinate(tile.y),
-                },
+                **static,
                 "revealed": revealed,
                 "resource": tile.resource_type.name if revealed else "UNKNOWN",
                 "number": number,
-                "corner_node_ids": [node_ids[node] for node in tile.corners],
+                "corner_node_ids": corner_node_ids,
                 "robber": revealed and tile is board.robber_tile,
             }
         )
 
     nodes = []
-    for node in sorted_nodes:
+    for node, static in parts["nodes"]:
         building = None
         if node.building is not None:
             building = {
@@ -340,14 +532,7 @@ def build_board_manifest(game):
             }
         nodes.append(
             {
-                "id": node_ids[node],
-                "position": {
-                    "x": _validated_coordinate(node.x),
-                    "y": _validated_coordinate(node.y),
-                },
-                "adjacent_tile_ids": sorted(tile_ids[tile] for tile in node.tiles),
-                "adjacent_node_ids": sorted(adjacent_nodes[node]),
-                "edge_ids": sorted(edge_ids_by_node[node]),
+                **static,
                 "harbor_ids": sorted(
                     harbor_ids[harbor]
                     for harbor in node.harbors
@@ -358,21 +543,12 @@ def build_board_manifest(game):
         )
 
     edges = []
-    for _, node1, node2 in canonical_edges:
-        edge_key = frozenset((node1, node2))
+    for node1, node2, edge_key, static in parts["edges"]:
         road = road_by_edge.get(edge_key)
         harbor = harbor_by_edge.get(edge_key)
-        adjacent_tile_ids = sorted(
-            tile_ids[tile]
-            for tile in sorted_tiles
-            if node1 in tile.corners and node2 in tile.corners
-        )
         edges.append(
             {
-                "id": edge_ids[edge_key],
-                "node_ids": sorted((node_ids[node1], node_ids[node2])),
-                "adjacent_tile_ids": adjacent_tile_ids,
-                "perimeter": edge_key in perimeter_edges,
+                **static,
                 "forecast_blocked": bool(edge_is_blocked((node1, node2))),
                 "road": (
                     None
@@ -410,13 +586,6 @@ def build_board_manifest(game):
             }
         )
 
-    positions = [node["position"] for node in nodes]
-    bounds = {
-        "min_x": min(position["x"] for position in positions),
-        "max_x": max(position["x"] for position in positions),
-        "min_y": min(position["y"] for position in positions),
-        "max_y": max(position["y"] for position in positions),
-    }
     manifest = {
         "format": "catan-board-manifest",
         "version": 1,
@@ -424,7 +593,7 @@ def build_board_manifest(game):
         "seed": 0 if getattr(game, "is_frontier_variant", lambda: False)() else board.seed,
         "coordinate_space": {
             "kind": "board-pixels",
-            "bounds": bounds,
+            "bounds": dict(parts["bounds"]),
         },
         "tiles": tiles,
         "nodes": nodes,
@@ -451,9 +620,35 @@ def build_board_manifest(game):
     return manifest
 
 
-def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
-    """Build a viewer-specific state without leaking other players' private cards."""
-    state = deepcopy(serialize_game(game))
+_PRIVATE_PLAYER_FIELDS = (
+    "resources",
+    "development_cards",
+    "new_development_cards",
+    "victory_point_cards",
+)
+
+
+def _copy_document(value):
+    """Copy the dict/list tree of a save document; scalars are shared."""
+    if type(value) is dict:
+        return {key: _copy_document(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_document(item) for item in value]
+    return value
+
+
+def _build_public_state(game, game_state=None):
+    """Serialize once and apply every viewer-independent projection.
+
+    Returns the fully masked public state plus the per-seat private overlays
+    that :func:`_viewer_state` layers back on for the matching viewer.
+    """
+    # Save documents are plain JSON trees, so a structural copy is enough to
+    # keep the projections below from touching the caller's document.
+    state = _copy_document(
+        serialize_game(game) if game_state is None else game_state
+    )
+    variant_config = None
     if "variant_state" in state:
         rules = state.get("rules")
         try:
@@ -475,18 +670,6 @@ def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
         board_state.pop("custom_map", None)
         if getattr(game, "is_frontier_variant", lambda: False)():
             board_state["seed"] = 0
-    player_count = len(state["players"])
-    if viewer_player_index is not None and (
-        isinstance(viewer_player_index, bool)
-        or not isinstance(viewer_player_index, int)
-        or not 0 <= viewer_player_index < player_count
-    ):
-        raise NetworkProtocolError("閲覧プレイヤー番号が不正です。")
-    _validated_nonnegative_integer(
-        revision,
-        label="同期revision",
-        maximum=MAX_SAFE_JSON_INTEGER,
-    )
 
     ai_state = state.get("ai")
     hide_mixed_personalities = (
@@ -494,7 +677,8 @@ def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
         and ai_state.get("personality_mode") == MIXED
     )
 
-    for index, player in enumerate(state["players"]):
+    private_players = []
+    for player in state["players"]:
         # Reservation IDs and bundles are authority-only until the public
         # standing-market state is introduced.  The existing resources map
         # remains the viewer's total owned hand, so live/replay clients retain
@@ -514,18 +698,11 @@ def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
             # projection is redacted, including finished/replay snapshots; the
             # completed match result is the sole reveal boundary.
             player["ai_personality"] = None
-        if index == viewer_player_index:
-            if variant_config.has_component(TRADE2_VARIANT_KIND):
-                available = game.players[index].resource_ledger.available_map()
-                player["resources"] = {
-                    resource.name: amount
-                    for resource, amount in available.items()
-                }
-            continue
-        player["resources"] = None
-        player["development_cards"] = None
-        player["new_development_cards"] = None
-        player["victory_point_cards"] = None
+        private_players.append(
+            {field: player[field] for field in _PRIVATE_PLAYER_FIELDS}
+        )
+        for field in _PRIVATE_PLAYER_FIELDS:
+            player[field] = None
 
     if hide_mixed_personalities:
         ai_status = ai_state.get("status")
@@ -542,19 +719,22 @@ def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
 
     phase = state.get("phase", {})
     domestic_trade = state.get("domestic_trade")
+    trade_draft = None
     if (
         isinstance(phase, dict)
         and phase.get("special_phase") == "domestic_trade_edit"
         and isinstance(domestic_trade, dict)
-        and viewer_player_index != domestic_trade.get("editor")
     ):
         # Draft terms have not been offered yet.  Other players and spectators
         # may know that somebody is editing a proposal, but not its contents.
+        trade_draft = (domestic_trade.get("editor"), domestic_trade)
+        masked_trade = dict(domestic_trade)
         for field in ("give", "receive"):
-            bundle = domestic_trade.get(field)
+            bundle = masked_trade.get(field)
             if isinstance(bundle, dict):
-                domestic_trade[field] = {key: 0 for key in bundle}
-        domestic_trade["receive_operator"] = "and"
+                masked_trade[field] = {key: 0 for key in bundle}
+        masked_trade["receive_operator"] = "and"
+        state["domestic_trade"] = masked_trade
 
     # Checkpoints use true VP totals for the local post-game graph.  Those
     # totals include unrevealed VP development cards, and historic checkpoints
@@ -594,16 +774,446 @@ def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
     state["development_deck"] = {
         "remaining": len(state["development_deck"]),
     }
+    return state, private_players, variant_config, trade_draft
+
+
+def _viewer_state(
+    game,
+    public_state,
+    private_players,
+    variant_config,
+    trade_draft,
+    viewer_player_index,
+):
+    """Layer one seat's private overlay onto the shared public state.
+
+    Only the top-level state, the players list and the viewer's own player
+    entry are copied; every other branch is shared with the public base.
+    """
+    state = dict(public_state)
+    if viewer_player_index is not None:
+        players = list(state["players"])
+        player = dict(players[viewer_player_index])
+        player.update(private_players[viewer_player_index])
+        if variant_config is not None and variant_config.has_component(
+            TRADE2_VARIANT_KIND
+        ):
+            available = game.players[
+                viewer_player_index
+            ].resource_ledger.available_map()
+            player["resources"] = {
+                resource.name: amount
+                for resource, amount in available.items()
+            }
+        players[viewer_player_index] = player
+        state["players"] = players
+    if trade_draft is not None and viewer_player_index == trade_draft[0]:
+        state["domestic_trade"] = trade_draft[1]
+    return state
+
+
+def _validated_viewer_player_index(viewer_player_index, player_count):
+    if viewer_player_index is not None and (
+        isinstance(viewer_player_index, bool)
+        or not isinstance(viewer_player_index, int)
+        or not 0 <= viewer_player_index < player_count
+    ):
+        raise NetworkProtocolError("閲覧プレイヤー番号が不正です。")
+    return viewer_player_index
+
+
+def build_state_snapshots(
+    game,
+    *,
+    viewer_player_indices,
+    revision=0,
+    game_state=None,
+):
+    """Build snapshots for several viewers from a single serialization.
+
+    The authority is serialized and projected to its public form once, and
+    the board manifest is built once.  Each viewer then receives a shallow
+    overlay holding only its own private hand, so the cost per extra viewer
+    is a few small dict copies.  Returned snapshots share their public
+    branches and must be treated as read-only.
+
+    ``game_state`` may carry a ``serialize_game`` document the caller has
+    already built for ``game``; it is copied, never mutated.
+    """
+    viewer_player_indices = tuple(viewer_player_indices)
+    public_state, private_players, variant_config, trade_draft = (
+        _build_public_state(game, game_state)
+    )
+    player_count = len(public_state["players"])
+    for viewer_player_index in viewer_player_indices:
+        _validated_viewer_player_index(viewer_player_index, player_count)
+    _validated_nonnegative_integer(
+        revision,
+        label="同期revision",
+        maximum=MAX_SAFE_JSON_INTEGER,
+    )
+    board_manifest = build_board_manifest(game)
+    viewer_player_indices = tuple(dict.fromkeys(viewer_player_indices))
+    return {
+        viewer_player_index: {
+            "type": "state_snapshot",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "revision": revision,
+            "viewer_player_index": viewer_player_index,
+            "board_manifest": board_manifest,
+            "state": _viewer_state(
+                game,
+                public_state,
+                private_players,
+                variant_config,
+                trade_draft,
+                viewer_player_index,
+            ),
+        }
+        for viewer_player_index in viewer_player_indices
+    }
+
+
+def build_state_snapshot(game, *, viewer_player_index=None, revision=0):
+    """Build a viewer-specific state without leaking other players' private cards."""
+    return build_state_snapshots(
+        game,
+        viewer_player_indices=(viewer_player_index,),
+        revision=revision,
+    )[viewer_player_index]
+
+
+_STATE_DELTA_HEADER_FIELDS = frozenset(("type", "protocol_version", "revision"))
+_STATE_DELTA_FIELDS = frozenset(
+    (
+        "type",
+        "protocol_version",
+        "revision",
+        "base_revision",
+        "viewer_player_index",
+        "operations",
+    )
+)
+_STATE_DELTA_OPERATION_FIELDS = {
+    "add": frozenset(("op", "path", "value")),
+    "replace": frozenset(("op", "path", "value")),
+    "remove": frozenset(("op", "path")),
+    "splice": frozenset(("op", "path", "index", "remove", "values")),
+}
+
+
+class _StateDeltaTooLarge(Exception):
+    pass
+
+
+def _same_json(previous, current):
+    # ``==`` treats 1, 1.0 and True as equal, also inside containers, while a
+    # client sees different JSON.  It still prunes unequal subtrees in C;
+    # equal containers are then only walked for the types of their leaves.
+    if previous is current:
+        return True
+    kind = type(previous)
+    if kind is not type(current) or previous != current:
+        return False
+    if kind is dict or kind is list:
+        return _same_leaf_types(previous, current)
+    return kind is not float or _same_float_sign(previous, current)
+
+
+def _same_leaf_types(previous, current):
+    """Compare leaf types of two containers already known to be ``==``."""
+
+    if type(previous) is dict:
+        pairs = zip(previous.values(), map(current.__getitem__, previous))
+    else:
+        pairs = zip(previous, current)
+    for value, other in pairs:
+        if value is other:
+            continue
+        kind = type(value)
+        if kind is not type(other):
+            return False
+        if kind is dict or kind is list:
+            if not _same_leaf_types(value, other):
+                return False
+        elif kind is float and not _same_float_sign(value, other):
+            return False
+    return True
+
+
+def _same_float_sign(previous, current):
+    # 0.0 == -0.0, but they encode differently.
+    return math.copysign(1.0, previous) == math.copysign(1.0, current)
+
+
+def _append_delta_operation(operations, operation):
+    if len(operations) >= MAX_STATE_DELTA_OPERATIONS:
+        raise _StateDeltaTooLarge
+    operations.append(operation)
+
+
+def _diff_json(previous, current, path, operations):
+    # Deep equality runs in C and prunes every unchanged subtree before the
+    # Python-level walk descends into it.
+    if _same_json(previous, current):
+        return
+    if type(previous) is dict and type(current) is dict:
+        for key in previous:
+            if key not in current:
+                _append_delta_operation(
+                    operations,
+                    {"op": "remove", "path": [*path, key]},
+                )
+        for key, value in current.items():
+            if key in previous:
+                _diff_json(previous[key], value, [*path, key], operations)
+            else:
+                _append_delta_operation(
+                    operations,
+                    {"op": "add", "path": [*path, key], "value": value},
+                )
+        return
+    if type(previous) is list and type(current) is list:
+        _diff_list(previous, current, path, operations)
+        return
+    _append_delta_operation(
+        operations,
+        {"op": "replace", "path": path, "value": current},
+    )
+
+
+def _window_shift(previous, current):
+    """Return how many items a bounded log dropped from its front, if any."""
+
+    if not current:
+        return None
+    first = current[0]
+    for dropped in range(1, len(previous)):
+        kept = len(previous) - dropped
+        if (
+            kept <= len(current)
+            and _same_json(previous[dropped], first)
+            and _same_json(previous[dropped:], current[:kept])
+        ):
+            return dropped
+    return None
+
+
+def _diff_list(previous, current, path, operations):
+    if len(previous) == len(current) and (
+        not previous or _same_json(previous[0], current[0])
+    ):
+        for index, (old, new) in enumerate(zip(previous, current)):
+            _diff_json(old, new, [*path, index], operations)
+        return
+    dropped = _window_shift(previous, current)
+    if dropped is None and len(previous) == len(current):
+        for index, (old, new) in enumerate(zip(previous, current)):
+            _diff_json(old, new, [*path, index], operations)
+        return
+    if dropped is not None:
+        # Live logs and metric events are bounded tails: the oldest entries
+        # fall off the front while new ones are appended.
+        kept = len(previous) - dropped
+        _append_delta_operation(
+            operations,
+            {"op": "splice", "path": path, "index": 0, "remove": dropped, "values": []},
+        )
+        if len(current) > kept:
+            _append_delta_operation(
+                operations,
+                {
+                    "op": "splice",
+                    "path": path,
+                    "index": kept,
+                    "remove": 0,
+                    "values": current[kept:],
+                },
+            )
+        return
+    prefix = 0
+    limit = min(len(previous), len(current))
+    while prefix < limit and _same_json(previous[prefix], current[prefix]):
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and _same_json(previous[-1 - suffix], current[-1 - suffix])
+    ):
+        suffix += 1
+    _append_delta_operation(
+        operations,
+        {
+            "op": "splice",
+            "path": path,
+            "index": prefix,
+            "remove": len(previous) - prefix - suffix,
+            "values": current[prefix:len(current) - suffix],
+        },
+    )
+
+
+def build_state_delta(previous, snapshot):
+    """Return a ``state_delta`` turning ``previous`` into ``snapshot``.
+
+    Operations are JSON-patch style edits addressed by key/index paths.
+    ``None`` means a full snapshot must be sent instead: there is no usable
+    baseline, the viewer changed, or the edit list would be too large.
+    """
+
+    if (
+        not isinstance(previous, dict)
+        or previous.get("type") != "state_snapshot"
+        or snapshot.get("type") != "state_snapshot"
+        or previous.get("viewer_player_index") != snapshot.get("viewer_player_index")
+        or type(previous.get("revision")) is not int
+        or previous["revision"] > snapshot["revision"]
+    ):
+        return None
+    operations = []
+    try:
+        for key in previous:
+            if key not in _STATE_DELTA_HEADER_FIELDS and key not in snapshot:
+                _append_delta_operation(operations, {"op": "remove", "path": [key]})
+        for key, value in snapshot.items():
+            if key in _STATE_DELTA_HEADER_FIELDS:
+                continue
+            if key in previous:
+                _diff_json(previous[key], value, [key], operations)
+            else:
+                _append_delta_operation(
+                    operations,
+                    {"op": "add", "path": [key], "value": value},
+                )
+    except _StateDeltaTooLarge:
+        return None
     return {
-        "type": "state_snapshot",
+        "type": "state_delta",
         "protocol_version": NETWORK_PROTOCOL_VERSION,
-        "revision": revision,
-        "viewer_player_index": viewer_player_index,
-        "board_manifest": build_board_manifest(game),
-        "state": state,
+        "revision": snapshot["revision"],
+        "base_revision": previous["revision"],
+        "viewer_player_index": snapshot.get("viewer_player_index"),
+        "operations": operations,
     }
 
 
+def _owned_container(parent, key, owned):
+    child = parent[key]
+    if id(child) in owned:
+        return child
+    if type(child) is dict:
+        child = dict(child)
+    elif type(child) is list:
+        child = list(child)
+    else:
+        raise NetworkProtocolError("差分の適用先が不正です。")
+    parent[key] = child
+    owned.add(id(child))
+    return child
+
+
+def _delta_slot(container, key):
+    if type(container) is dict:
+        if type(key) is not str:
+            raise NetworkProtocolError("差分のpathが不正です。")
+        return key in container
+    if type(key) is not int or not 0 <= key < len(container):
+        raise NetworkProtocolError("差分のpathが不正です。")
+    return True
+
+
+def apply_state_delta(snapshot, delta):
+    """Apply a ``state_delta`` to the snapshot it was built against.
+
+    The input snapshot is never mutated; containers along each edited path
+    are copied once, so unchanged branches stay shared with ``snapshot``.
+    """
+
+    if not isinstance(snapshot, Mapping) or snapshot.get("type") != "state_snapshot":
+        raise NetworkProtocolError("差分の基準snapshotがありません。")
+    if type(delta) is not dict or set(delta) != _STATE_DELTA_FIELDS:
+        raise NetworkProtocolError("state_deltaのfieldが不正です。")
+    if delta["type"] != "state_delta":
+        raise NetworkProtocolError("state_deltaではありません。")
+    if delta["protocol_version"] != NETWORK_PROTOCOL_VERSION:
+        raise NetworkProtocolError("通信versionが一致しません。")
+    revision = _validated_nonnegative_integer(
+        delta["revision"],
+        label="同期revision",
+        maximum=MAX_SAFE_JSON_INTEGER,
+    )
+    base_revision = _validated_nonnegative_integer(
+        delta["base_revision"],
+        label="差分の基準revision",
+        maximum=revision,
+    )
+    if (
+        snapshot.get("revision") != base_revision
+        or snapshot.get("viewer_player_index") != delta["viewer_player_index"]
+    ):
+        raise NetworkProtocolError("差分の基準revisionが一致しません。")
+    operations = delta["operations"]
+    if type(operations) is not list or len(operations) > MAX_STATE_DELTA_OPERATIONS:
+        raise NetworkProtocolError("差分の操作数が不正です。")
+
+    result = dict(snapshot)
+    owned = {id(result)}
+    for operation in operations:
+        if type(operation) is not dict:
+            raise NetworkProtocolError("差分の操作が不正です。")
+        fields = _STATE_DELTA_OPERATION_FIELDS.get(operation.get("op"))
+        if fields is None or set(operation) != fields:
+            raise NetworkProtocolError("差分の操作が不正です。")
+        path = operation["path"]
+        if (
+            type(path) is not list
+            or not 1 <= len(path) <= MAX_STATE_DELTA_PATH_DEPTH
+            or path[0] in _STATE_DELTA_HEADER_FIELDS
+        ):
+            raise NetworkProtocolError("差分のpathが不正です。")
+        container = result
+        for key in path[:-1]:
+            if not _delta_slot(container, key) or type(container[key]) not in (
+                dict,
+                list,
+            ):
+                raise NetworkProtocolError("差分のpathが不正です。")
+            container = _owned_container(container, key, owned)
+        key = path[-1]
+        op = operation["op"]
+        if op == "splice":
+            if not _delta_slot(container, key):
+                raise NetworkProtocolError("差分のpathが不正です。")
+            target = _owned_container(container, key, owned)
+            index = operation["index"]
+            remove = operation["remove"]
+            values = operation["values"]
+            if (
+                type(target) is not list
+                or type(values) is not list
+                or type(index) is not int
+                or type(remove) is not int
+                or not 0 <= index <= len(target)
+                or not 0 <= remove <= len(target) - index
+            ):
+                raise NetworkProtocolError("差分のspliceが不正です。")
+            target[index:index + remove] = values
+        elif op == "add":
+            if type(container) is not dict or _delta_slot(container, key):
+                raise NetworkProtocolError("差分のaddが不正です。")
+            container[key] = operation["value"]
+        elif op == "remove":
+            if type(container) is not dict or not _delta_slot(container, key):
+                raise NetworkProtocolError("差分のremoveが不正です。")
+            del container[key]
+        else:
+            if not _delta_slot(container, key):
+                raise NetworkProtocolError("差分のreplaceが不正です。")
+            container[key] = operation["value"]
+    result["revision"] = revision
+    return result
+
+
 def _public_variant_state_document(value, *, variant_config):
     """Return the canonical public-only runtime variant document.
 
@@ -778,16 +1388,37 @@ def build_game_command(*, sequence, expected_revision, command, args=None):
     }
 
 
+def _encode_json(value):
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
+
+
+def _encode_message(message):
+    """Encode a message, splicing in the cached bytes of its board manifest."""
+
+    manifest = message.get("board_manifest")
+    encoded_manifest = (
+        None if manifest is None else _encoded_board_manifest(manifest)
+    )
+    if encoded_manifest is None or not all(isinstance(key, str) for key in message):
+        return _encode_json(message)
+    return b"{" + b",".join(
+        _encode_json(key)
+        + b":"
+        + (encoded_manifest if value is manifest else _encode_json(value))
+        for key, value in message.items()
+    ) + b"}"
+
+
 def encode_frame(message):
     if not isinstance(message, dict):
         raise NetworkProtocolError("送信メッセージはJSON objectである必要があります。")
     try:
-        payload = json.dumps(
-            message,
-            ensure_ascii=False,
-            separators=(",", ":"),
-            allow_nan=False,
-        ).encode("utf-8")
+        payload = _encode_message(message)
     except (TypeError, ValueError, RecursionError) as exc:
         raise NetworkProtocolError(f"JSONへ変換できません: {exc}") from exc
     if len(payload) > MAX_FRAME_BYTES:
@@ -238,6 +238,9 @@ class NetworkReplayError(ValueError):
         super().__init__(message)
         self.code = code
 
+    def __reduce__(self):
+        return (NetworkReplayError, (self.code, str(self)))
+
 
 @dataclass
 class _NetworkFrame:
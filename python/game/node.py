@@ -2,6 +2,20 @@ class Node:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.building = None  # 建物がない場合は None
+        self._building = None  # 建物がない場合は None
         self.tiles = []       # このノードに接しているタイル (HexTile) のリスト
         self.harbors = []     # 接続している港(Harbor)のリスト
+        self.board = None     # 所属する GameBoard (建物の変更を索引へ通知)
+
+    @property
+    def building(self):
+        return self._building
+
+    @building.setter
+    def building(self, building):
+        previous = self._building
+        self._building = building
+        if building is not None:
+            building.node = self
+        if self.board is not None:
+            self.board.building_changed(self, previous, building)
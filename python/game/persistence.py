@@ -19,7 +19,7 @@ from game.constants import (
 from game.custom_map import CustomMapError, CustomMapSpec
 from game.development_cards import DevelopmentCardType
 from game.forecast_events import HARBOR_BLOCKADE_EVENT_ID
-from game.game_board import GameBoard
+from game.game_board import build_board
 from game.grand_campaign import GrandCampaignError, HarborBlockadePlan
 from game.house_rules import HouseRules
 from game.match_metrics import (
@@ -450,7 +450,10 @@ def serialize_game(game):
             "log_messages": list(game.log_messages),
             "latest_event": latest_event,
             "turn_summary_entries": list(game.turn_summary_entries),
-            "public_gain_history": game.public_gain_history,
+            "public_gain_history": {
+                name: [dict(entry) for entry in entries]
+                for name, entries in game.public_gain_history.items()
+            },
             "last_resource_distribution": {
                 name: _resource_map_to_json(bundle)
                 for name, bundle in game.last_resource_distribution.items()
@@ -550,19 +553,12 @@ def restore_game(game, data, *, runtime_side_effects=True):
     game.board_seed_text = str(game.board_seed)
     game.custom_map_spec = custom_map
     topology_id = _board_topology_for_variant(variant_config)
-    if custom_map is None:
-        game.board = GameBoard(
-            mode=game.board_mode,
-            seed=game.board_seed,
-            topology_id=topology_id,
-        )
-    else:
-        game.board = GameBoard(
-            mode=game.board_mode,
-            seed=game.board_seed,
-            custom_map=custom_map,
-            topology_id=topology_id,
-        )
+    game.board = build_board(
+        mode=game.board_mode,
+        seed=game.board_seed,
+        custom_map=custom_map,
+        topology_id=topology_id,
+    )
     game.get_board_rules().set_board(game.board)
 
     ai_data = data.get("ai", {})
@@ -574,9 +570,10 @@ def restore_game(game, data, *, runtime_side_effects=True):
         ai_data.get("personality_mode", "standard")
     )
     # Rebuilding the player objects creates a shuffled placeholder development
-    # deck.  A replay seek must not consume the process-wide RNG or arm the AI
+    # deck.  A replay seek must not consume the game's RNG or arm the AI
     # timer, because historical frames are strictly read-only.
-    random_state = random.getstate() if not runtime_side_effects else None
+    rng = getattr(game, "rng", None) or random
+    random_state = rng.getstate() if not runtime_side_effects else None
     try:
         game.configure_players(
             len(player_data),
@@ -586,7 +583,7 @@ def restore_game(game, data, *, runtime_side_effects=True):
         )
     finally:
         if random_state is not None:
-            random.setstate(random_state)
+            rng.setstate(random_state)
 
     for index, saved_player in enumerate(player_data):
         if not isinstance(saved_player, dict):
@@ -887,9 +884,15 @@ def restore_game(game, data, *, runtime_side_effects=True):
         game.latest_event["color"] = tuple(game.latest_event["color"])
     game.turn_summary_entries = list(history_data.get("turn_summary_entries", []))
     public_gain_history = history_data.get("public_gain_history", {})
-    if not isinstance(public_gain_history, dict):
+    if not isinstance(public_gain_history, dict) or not all(
+        isinstance(entries, list) and all(isinstance(entry, dict) for entry in entries)
+        for entries in public_gain_history.values()
+    ):
         raise SaveGameError("公開獲得履歴が不正です。")
-    game.public_gain_history = public_gain_history
+    game.public_gain_history = {
+        name: [dict(entry) for entry in entries]
+        for name, entries in public_gain_history.items()
+    }
     game.last_resource_distribution = {
         str(name): _resource_map_from_json(bundle, label="直前資源配布")
         for name, bundle in history_data.get("last_resource_distribution", {}).items()
@@ -13,13 +13,12 @@ from functools import lru_cache
 import math
 from typing import Sequence
 
-import pygame
-
 from game.assets import get_font
 from game.constants import COLORS
 from game.custom_map import CustomMapSpec
 from game.development_cards import DEVELOPMENT_CARD_LABELS, DevelopmentCardType
 from game.house_rules import HouseRules
+from game.lazy_modules import pygame
 from game.resources import ResourceType
 
 
@@ -7,14 +7,15 @@ the same result payload can later be produced by a LAN server or Web client.
 controller; no input handling is hidden inside the component.
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 
-import pygame
-
 from game.ai_personality import get_ai_personality_profile
 from game.assets import get_font
 from game.constants import COLORS
+from game.lazy_modules import pygame
 
 
 REPLAY_SELECTED_ACTION = "replay_selected_event"
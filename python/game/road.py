@@ -1,9 +1,8 @@
 import math
 
-import pygame
-
 from game.player import Player
 from game.node import Node
+from game.lazy_modules import pygame
 
 
 ROAD_OUTLINE_COLOR = (25, 28, 32)
@@ -0,0 +1,471 @@
+"""Monte-Carlo rollout search behind the ``rollout`` AI personality.
+
+When a rollout seat can afford a build, :class:`RolloutSearch` lists every
+city and settlement it could place, its best few roads, a development-card
+purchase, ending the turn, and whatever the standard heuristic would do.  Each
+candidate is scored by short simulated futures on a headless fork of the
+game in which every seat plays the standard heuristic.
+
+Each rollout first redeals what the searching seat cannot see: opponents'
+resource cards (per-opponent totals and the public bank stay fixed), their
+unplayed development cards, and the order of the development deck.  On
+frontier boards the terrain, number tokens and harbors of undiscovered tiles
+are redealt as well.  The forecast deck order is bound to the authority seed
+and cannot be redealt, so a rollout ends when the next forecast event would
+be announced.  All candidates in one round share the same redeal and dice
+seed, so they are compared on identical futures.
+
+Rollout seeds come from the game's generator state without drawing from it,
+so for a fixed rollout budget the chosen action does not depend on how many
+processes evaluated it.  A time budget trades that reproducibility for a
+bounded decision time.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import multiprocessing
+import os
+import pickle
+import random
+import time
+
+from game.ai_personality import ROLLOUT, STANDARD
+from game.bank import RESOURCE_TYPES
+from game.development_cards import DevelopmentCardType
+from game.game_state import DEVELOPMENT_CARD_TYPES, PIECE_FIELDS
+from game.resources import BUILD_COSTS, ResourceType
+
+
+__all__ = (
+    "DEFAULT_ROLLOUT_TURNS",
+    "DEFAULT_ROLLOUTS_PER_ACTION",
+    "RolloutConfig",
+    "RolloutSearch",
+    "apply_candidate",
+    "determinize_state",
+    "redeal_frontier",
+)
+
+
+DEFAULT_ROLLOUTS_PER_ACTION = 3
+DEFAULT_ROLLOUT_TURNS = 4
+MAX_ROAD_CANDIDATES = 3
+# Generous cap on AI steps per simulated turn; a rollout that stalls stops
+# early and is scored from the position it reached.
+_STEPS_PER_ROLLOUT_TURN = 40
+_VICTORY_POINT_SLOT = PIECE_FIELDS.index("victory_point_cards")
+
+HEURISTIC = ("heuristic",)
+END_TURN = ("end_turn",)
+BUY_DEVELOPMENT = ("development",)
+
+
+@dataclass(frozen=True)
+class RolloutConfig:
+    """Search budget for one rollout decision.
+
+    ``rollouts_per_action`` bounds the rounds of rollouts; ``time_budget``
+    (seconds) additionally stops after the first round that exceeds it.
+    ``workers`` above one evaluates rollouts on a pool of that many processes,
+    owned by the :class:`RolloutSearch` until it is closed; ``0`` and ``1``
+    evaluate in-process.  ``None`` uses one process per CPU core, except in
+    daemonic processes such as room shard workers, which cannot start a pool.
+    Self-play already runs a match per core and pins ``1`` instead.
+    """
+
+    rollouts_per_action: int = DEFAULT_ROLLOUTS_PER_ACTION
+    rollout_turns: int = DEFAULT_ROLLOUT_TURNS
+    time_budget: float | None = None
+    workers: int | None = None
+
+    def __post_init__(self):
+        for name in ("rollouts_per_action", "rollout_turns"):
+            value = getattr(self, name)
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"{name} must be an int")
+            if value <= 0:
+                raise ValueError(f"{name} must be positive")
+        if self.time_budget is not None:
+            if isinstance(self.time_budget, bool) or not isinstance(
+                self.time_budget, (int, float)
+            ):
+                raise TypeError("time_budget must be a number of seconds")
+            if not self.time_budget > 0:
+                raise ValueError("time_budget must be positive")
+        if self.workers is not None:
+            if isinstance(self.workers, bool) or not isinstance(self.workers, int):
+                raise TypeError("workers must be an int")
+            if self.workers < 0:
+                raise ValueError("workers must be zero or positive")
+
+    def resolved_workers(self) -> int:
+        if self.workers is not None:
+            return max(1, self.workers)
+        if multiprocessing.current_process().daemon:
+            return 1
+        return os.cpu_count() or 1
+
+
+def determinize_state(state, seat, rng):
+    """Return a copy of ``state`` with ``seat``'s hidden information redealt.
+
+    Opponents keep their resource totals and their counts of playable, new
+    and victory-point development cards; which cards those are, and the
+    deck order, are drawn again from everything ``seat`` cannot see.
+    """
+    state = state.copy()
+    opponents = [other for other in range(state.player_count) if other != seat]
+    resource_count = len(RESOURCE_TYPES)
+    if state.reservations is None:
+        cards = []
+        for other in opponents:
+            start = other * resource_count
+            for offset in range(resource_count):
+                cards.extend([offset] * state.hands[start + offset])
+        rng.shuffle(cards)
+        position = 0
+        for other in opponents:
+            start = other * resource_count
+            total = sum(state.hands[start:start + resource_count])
+            for offset in range(resource_count):
+                state.hands[start + offset] = 0
+            for offset in cards[position:position + total]:
+                state.hands[start + offset] += 1
+            position += total
+
+    card_count = len(DEVELOPMENT_CARD_TYPES)
+    piece_count = len(PIECE_FIELDS)
+    unseen = list(state.development_deck)
+    slots = []
+    for other in opponents:
+        start = other * card_count
+        playable = state.development_cards[start:start + card_count]
+        fresh = state.new_development_cards[start:start + card_count]
+        vp_index = other * piece_count + _VICTORY_POINT_SLOT
+        victory_points = state.pieces[vp_index]
+        for offset, card in enumerate(DEVELOPMENT_CARD_TYPES):
+            unseen.extend([card] * (playable[offset] + fresh[offset]))
+        unseen.extend([DevelopmentCardType.VICTORY_POINT] * victory_points)
+        slots.append((other, sum(playable) + victory_points, sum(fresh)))
+        for offset in range(card_count):
+            state.development_cards[start + offset] = 0
+            state.new_development_cards[start + offset] = 0
+        state.pieces[vp_index] = 0
+    rng.shuffle(unseen)
+    position = 0
+    for other, playable_count, fresh_count in slots:
+        for target, count in (
+            (state.development_cards, playable_count),
+            (state.new_development_cards, fresh_count),
+        ):
+            for card in unseen[position:position + count]:
+                if card == DevelopmentCardType.VICTORY_POINT:
+                    state.pieces[other * piece_count + _VICTORY_POINT_SLOT] += 1
+                else:
+                    offset = DEVELOPMENT_CARD_TYPES.index(card)
+                    target[other * card_count + offset] += 1
+            position += count
+    state.development_deck = tuple(unseen[position:])
+    return state
+
+
+def _frontier_hidden_layout(game):
+    """Return what a redeal of undiscovered frontier tiles draws from.
+
+    The result holds the hidden tile and harbor indices and, sorted so the
+    redeal does not depend on the current assignment, their terrains, number
+    tokens and harbor kinds.  ``None`` means nothing on the board is hidden.
+    """
+    if not game.is_frontier_variant():
+        return None
+    board = game.board
+    tile_ids = tuple(
+        index
+        for index, tile in enumerate(board.tiles)
+        if not game.is_frontier_tile_revealed(tile)
+    )
+    harbor_ids = tuple(
+        index
+        for index, harbor in enumerate(board.harbors)
+        if not game.is_frontier_harbor_revealed(harbor)
+    )
+    if not tile_ids and not harbor_ids:
+        return None
+    tiles = [board.tiles[index] for index in tile_ids]
+    harbors = [board.harbors[index] for index in harbor_ids]
+    return (
+        tile_ids,
+        tuple(sorted((tile.resource_type for tile in tiles), key=_resource_key)),
+        tuple(sorted(tile.number for tile in tiles if tile.number is not None)),
+        harbor_ids,
+        tuple(
+            sorted(
+                ((harbor.trade_rate, harbor.resource_type) for harbor in harbors),
+                key=lambda kind: (kind[0], _resource_key(kind[1])),
+            )
+        ),
+    )
+
+
+def _resource_key(resource_type):
+    return "" if resource_type is None else resource_type.name
+
+
+def redeal_frontier(board, hidden, rng):
+    """Shuffle the undiscovered terrain, numbers and harbors on ``board``."""
+    tile_ids, terrains, numbers, harbor_ids, harbor_kinds = hidden
+    terrains = list(terrains)
+    numbers = list(numbers)
+    harbor_kinds = list(harbor_kinds)
+    rng.shuffle(terrains)
+    rng.shuffle(numbers)
+    rng.shuffle(harbor_kinds)
+    for index, terrain in zip(tile_ids, terrains):
+        tile = board.tiles[index]
+        tile.resource_type = terrain
+        # Assigning the number also drops the board's production index.
+        tile.number = None if terrain == ResourceType.DESERT else numbers.pop()
+    for index, (trade_rate, resource_type) in zip(harbor_ids, harbor_kinds):
+        harbor = board.harbors[index]
+        harbor.trade_rate = trade_rate
+        harbor.resource_type = resource_type
+
+
+def _candidate_actions(game, player, ai):
+    """Return the build alternatives for ``player``, heuristic choice first."""
+    topology = game.board.topology
+    candidates = [HEURISTIC]
+    for node in game.get_buildable_city_nodes(player):
+        candidates.append(("city", topology.node_ids[node]))
+    for node in game.get_buildable_settlement_nodes(player):
+        candidates.append(("settlement", topology.node_ids[node]))
+    edges = sorted(
+        game.get_buildable_road_edges(player),
+        key=lambda edge: ai._edge_score(game, edge, player),
+        reverse=True,
+    )
+    for node1, node2 in edges[:MAX_ROAD_CANDIDATES]:
+        candidates.append(("road", topology.edge_id(node1, node2)))
+    if game.development_deck and player.can_afford(BUILD_COSTS["development"]):
+        candidates.append(BUY_DEVELOPMENT)
+    if len(candidates) > 1:
+        candidates.append(END_TURN)
+    return candidates
+
+
+def apply_candidate(game, candidate, ai):
+    """Carry out one candidate action; ``HEURISTIC`` takes one standard step."""
+    kind = candidate[0]
+    topology = game.board.topology
+    if kind == "heuristic":
+        ai.step(game)
+    elif kind == "end_turn":
+        game.finish_current_turn()
+    elif kind == "development":
+        game.buy_development_card()
+    elif kind == "road":
+        game.build_road(ai._edge_midpoint(topology.edges[candidate[1]]))
+    else:
+        node = topology.nodes[candidate[1]]
+        if kind == "city":
+            game.build_city((node.x, node.y))
+        else:
+            game.build_settlement((node.x, node.y))
+
+
+def _position_value(game, seat):
+    players = game.players
+    if game.winner is not None:
+        return 1.0 if game.winner is players[seat] else 0.0
+    points = [game.get_player_victory_points(player) for player in players]
+    mine = points[seat]
+    best_other = max(points[:seat] + points[seat + 1:])
+    spread = (mine - best_other) / (2 * game.victory_point_target)
+    return min(1.0, max(0.0, 0.5 + spread))
+
+
+def _rollout(game, root, hidden, seat, candidate, seed, turns):
+    rng = random.Random(seed)
+    game.restore_state(determinize_state(root, seat, rng))
+    if hidden is not None:
+        redeal_frontier(game.board, hidden, rng)
+    # Compact states leave presentation history alone; clear it so the
+    # scratch game's score checkpoints do not grow with every rollout.
+    game.reset_match_metrics()
+    game.public_gain_history = {player.name: [] for player in game.players}
+    game.rng.seed(rng.getrandbits(64))
+    forecast = game.get_next_forecast_event_id()
+    apply_candidate(game, candidate, game.ai)
+    finished_turns = 0
+    current = game.current_player_index
+    for _ in range(turns * _STEPS_PER_ROLLOUT_TURN):
+        if game.winner is not None or finished_turns >= turns:
+            break
+        if game.get_next_forecast_event_id() != forecast:
+            # The newly announced event came from the authority's deck.
+            break
+        if not game.ai.step(game):
+            break
+        if game.current_player_index != current:
+            current = game.current_player_index
+            finished_turns += 1
+    return _position_value(game, seat)
+
+
+def _evaluate(game, root, hidden, seat, tasks, turns):
+    return [
+        (index, _rollout(game, root, hidden, seat, candidate, seed, turns))
+        for index, candidate, seed in tasks
+    ]
+
+
+def _prepare_scratch(game):
+    """Fork ``game`` so every seat plays the standard heuristic."""
+    scratch = game.fork(rng=random.Random(0))
+    for player in scratch.players:
+        player.is_ai = True
+        if player.ai_personality == ROLLOUT:
+            player.ai_personality = STANDARD
+    return scratch
+
+
+_WORKER_SCRATCH = (None, None)
+
+
+def _evaluate_in_worker(
+    context_key, scratch_blob, root, hidden, seat, tasks, turns
+):
+    """Run ``tasks`` on this process's scratch game for ``context_key``.
+
+    Only a decision's first round carries ``scratch_blob``; a process that
+    has not seen the decision yet returns ``None`` so the caller resends it.
+    """
+    global _WORKER_SCRATCH
+    key, scratch = _WORKER_SCRATCH
+    if key != context_key:
+        if scratch_blob is None:
+            return None
+        scratch = pickle.loads(scratch_blob)
+        _WORKER_SCRATCH = (context_key, scratch)
+    return _evaluate(scratch, root, hidden, seat, tasks, turns)
+
+
+class RolloutSearch:
+    """Choose among build candidates by simulated outcome.
+
+    A search configured with more than one worker starts its process pool on
+    first use and keeps it warm between decisions; :meth:`close` (or leaving
+    a ``with`` block) shuts it down.  The scratch game crosses to the pool
+    with a decision's first round only; later rounds send just its key.
+    """
+
+    def __init__(self, config=None):
+        self.config = RolloutConfig() if config is None else config
+        self.decisions = 0
+        self.rollouts = 0
+        self.last_choice = None
+        self._pool = None
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def _worker_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.config.resolved_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def _evaluate_on_pool(self, context_key, sent, blob, position, batches, turns):
+        """Evaluate task batches on the pool, resending ``blob`` on a miss."""
+        pool = self._worker_pool()
+        futures = [
+            pool.submit(
+                _evaluate_in_worker, context_key, sent, *position, batch, turns
+            )
+            for batch in batches
+        ]
+        results = []
+        for batch, future in zip(batches, futures):
+            batch_results = future.result()
+            if batch_results is None:
+                batch_results = pool.submit(
+                    _evaluate_in_worker, context_key, blob, *position, batch, turns
+                ).result()
+            results.extend(batch_results)
+        return results
+
+    def choose(self, game, player, ai):
+        """Return the best candidate for ``player``, or ``HEURISTIC``."""
+        candidates = _candidate_actions(game, player, ai)
+        if len(candidates) == 1:
+            return HEURISTIC
+        seat = game.players.index(player)
+        root = game.capture_state()
+        hidden = _frontier_hidden_layout(game)
+        scratch = _prepare_scratch(game)
+        config = self.config
+        workers = min(config.resolved_workers(), len(candidates))
+        # Seed from the generator state without advancing it, so searching
+        # never changes the dice the live game rolls next.
+        base_seed = hash(game.rng.getstate()[1])
+        totals = [0.0] * len(candidates)
+        counts = [0] * len(candidates)
+        started = time.perf_counter()
+        self.decisions += 1
+        blob = context_key = None
+        if workers > 1:
+            blob = pickle.dumps(scratch, protocol=pickle.HIGHEST_PROTOCOL)
+            context_key = (os.getpid(), id(self), self.decisions)
+        round_size = (
+            1 if config.time_budget is not None else config.rollouts_per_action
+        )
+        for first_round in range(0, config.rollouts_per_action, round_size):
+            tasks = [
+                (index, candidate, base_seed + rollout)
+                for rollout in range(
+                    first_round,
+                    min(first_round + round_size, config.rollouts_per_action),
+                )
+                for index, candidate in enumerate(candidates)
+            ]
+            if workers > 1:
+                results = self._evaluate_on_pool(
+                    context_key,
+                    blob if first_round == 0 else None,
+                    blob,
+                    (root, hidden, seat),
+                    [tasks[offset::workers] for offset in range(workers)],
+                    config.rollout_turns,
+                )
+            else:
+                results = _evaluate(
+                    scratch, root, hidden, seat, tasks, config.rollout_turns
+                )
+            for index, value in results:
+                totals[index] += value
+                counts[index] += 1
+            self.rollouts += len(results)
+            if (
+                config.time_budget is not None
+                and time.perf_counter() - started >= config.time_budget
+            ):
+                break
+        best = max(
+            range(len(candidates)),
+            key=lambda index: (totals[index] / counts[index], -index),
+        )
+        self.last_choice = (candidates[best], counts[best])
+        return candidates[best]
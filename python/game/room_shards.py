@@ -0,0 +1,601 @@
+"""Host rooms across worker processes partitioned by room code.
+
+``LanServerController`` keeps every room in one process, so a heavy room such
+as an AI-only spectator match or a replay export delays every other room.
+:class:`ShardedLanServerController` exposes the controller surface used by
+``WebGateway`` and ``LanServerRuntime`` and forwards each call over a pipe to
+the worker process that owns the room.  Each worker runs an ordinary
+controller restricted to its share of room codes.  Durable authority is
+shared through one ``SQLiteRoomAuthorityStore`` file, whose WAL journal and
+immediate transactions already serialize writers across processes.
+
+Calls for rooms on different shards run in parallel, and ``tick`` advances
+every shard at once, so AI-heavy hosting scales with the available cores.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import partial
+import multiprocessing
+from multiprocessing.connection import Connection
+import pickle
+import signal
+import threading
+from typing import Any, Mapping
+import zlib
+
+from game.lan_controller import (
+    LanControllerError,
+    LanServerController,
+    OutboundMessage,
+)
+from game.network_protocol import NETWORK_PROTOCOL_VERSION
+from game.network_replay_store import SQLiteNetworkReplayStore
+from game.server_state import SQLiteRoomAuthorityStore
+
+
+MAX_ROOM_SHARDS = 32
+DEFAULT_SHARD_START_TIMEOUT_SECONDS = 60.0
+SHARD_STOP_TIMEOUT_SECONDS = 5.0
+
+# Methods keyed by the calling connection.  The worker reports whether the
+# connection is still seated in one of its rooms after each call, which keeps
+# the parent's routing table exact across joins, leaves and disconnects.
+_CONNECTION_METHODS = frozenset(
+    {
+        "handle",
+        "disconnect",
+        "snapshot_for_connection",
+        "replay_frame_for_connection",
+        "match_result_for_connection",
+        "issue_friend_invitation",
+        "list_friend_invitations",
+        "revoke_friend_invitation",
+        "revoke_all_friend_invitations",
+        "join_room_with_friend_invitation",
+        "join_room_with_friend_claim",
+        "confirm_reconnect_token",
+    }
+)
+_ROOM_METHODS = frozenset(
+    {
+        "inspect_friend_invitation",
+        "begin_friend_invitation_claim",
+        "inspect_friend_invitation_claim",
+        "release_friend_invitation_claim",
+    }
+)
+_SHARD_METHODS = _CONNECTION_METHODS | _ROOM_METHODS | {"tick", "room_codes"}
+_WORKER_MANAGED_OPTIONS = frozenset({"state_store", "replay_store", "room_code_filter"})
+
+
+class RoomShardError(LanControllerError):
+    """Raised when a room shard worker cannot be started or reached."""
+
+    def __init__(self, message: str):
+        super().__init__("internal_error", message)
+
+
+def room_shard_index(room_code: str, shard_count: int) -> int:
+    """Return the shard that owns ``room_code`` among ``shard_count`` workers."""
+
+    return zlib.crc32(room_code.encode("utf-8")) % shard_count
+
+
+def _owns_room_code(shard_index: int, shard_count: int, room_code: str) -> bool:
+    return room_shard_index(room_code, shard_count) == shard_index
+
+
+@dataclass(frozen=True)
+class _ShardSettings:
+    shard_index: int
+    shard_count: int
+    state_db: str | None = None
+    state_key: str | None = None
+    replay_db: str | None = None
+    replay_key: str | None = None
+    controller_options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Shard:
+    index: int
+    process: Any
+    connection: Connection
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    alive: bool = True
+
+
+def _portable_exception(exc: BaseException) -> BaseException:
+    """Return ``exc`` if it survives the pipe, otherwise a plain summary."""
+
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _shard_main(connection: Connection, settings: _ShardSettings) -> None:
+    """Serve one shard's controller until the parent closes the pipe."""
+
+    # The parent owns shutdown; a terminal Ctrl-C must not kill rooms mid-step.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    stores: list[Any] = []
+    try:
+        options = dict(settings.controller_options)
+        if settings.state_db is not None:
+            state_store = SQLiteRoomAuthorityStore(
+                settings.state_db,
+                key_path=settings.state_key,
+            )
+            stores.append(state_store)
+            options["state_store"] = state_store
+        if settings.replay_db is not None:
+            replay_store = SQLiteNetworkReplayStore(
+                settings.replay_db,
+                key_path=settings.replay_key,
+            )
+            stores.append(replay_store)
+            options["replay_store"] = replay_store
+        controller = LanServerController(
+            room_code_filter=partial(
+                _owns_room_code,
+                settings.shard_index,
+                settings.shard_count,
+            ),
+            **options,
+        )
+    except Exception as exc:
+        connection.send(("error", _portable_exception(exc), False))
+        for store in stores:
+            store.close()
+        connection.close()
+        return
+
+    connection.send(("ok", None, False))
+    try:
+        while True:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                break
+            if request is None:
+                break
+            method, args, kwargs = request
+            try:
+                if method not in _SHARD_METHODS:
+                    raise RuntimeError(f"unsupported shard method: {method}")
+                if method == "room_codes":
+                    result = controller.room_codes
+                else:
+                    result = getattr(controller, method)(*args, **kwargs)
+            except Exception as exc:
+                reply = ("error", _portable_exception(exc))
+            else:
+                reply = ("ok", result)
+            attached = method in _CONNECTION_METHODS and controller.has_session(args[0])
+            connection.send((*reply, attached))
+    finally:
+        for store in stores:
+            store.close()
+        connection.close()
+
+
+class ShardedLanServerController:
+    """Route controller calls to worker processes that each own some rooms.
+
+    ``controller_options`` are passed to every worker's
+    ``LanServerController`` and must be picklable; ``room_limit`` applies per
+    shard.  Stores are opened by the workers from ``state_db``/``replay_db``
+    paths because SQLite connections cannot cross a process boundary.
+    """
+
+    def __init__(
+        self,
+        *,
+        shard_count: int,
+        state_db: str | None = None,
+        state_key: str | None = None,
+        replay_db: str | None = None,
+        replay_key: str | None = None,
+        controller_options: Mapping[str, Any] | None = None,
+        start_timeout_seconds: float = DEFAULT_SHARD_START_TIMEOUT_SECONDS,
+    ) -> None:
+        if type(shard_count) is not int or not 1 <= shard_count <= MAX_ROOM_SHARDS:
+            raise ValueError(f"shard_count must be 1..{MAX_ROOM_SHARDS}")
+        if state_key is not None and state_db is None:
+            raise ValueError("state_key requires state_db")
+        if replay_key is not None and replay_db is None:
+            raise ValueError("replay_key requires replay_db")
+        options = dict(controller_options or {})
+        if _WORKER_MANAGED_OPTIONS & options.keys():
+            raise ValueError("stores and room ownership are configured per shard")
+        if (
+            isinstance(start_timeout_seconds, bool)
+            or not isinstance(start_timeout_seconds, (int, float))
+            or not 0 < start_timeout_seconds <= 600
+        ):
+            raise ValueError("start_timeout_seconds must be within (0, 600]")
+        # Create each database and key once so workers never race to do it.
+        if state_db is not None:
+            SQLiteRoomAuthorityStore(state_db, key_path=state_key).close()
+        if replay_db is not None:
+            SQLiteNetworkReplayStore(replay_db, key_path=replay_key).close()
+
+        self._shards: list[_Shard] = []
+        self._connection_shards: dict[str, int] = {}
+        self._routing_lock = threading.Lock()
+        self._next_create_shard = 0
+        context = multiprocessing.get_context("spawn")
+        try:
+            for index in range(shard_count):
+                parent_end, child_end = context.Pipe()
+                settings = _ShardSettings(
+                    shard_index=index,
+                    shard_count=shard_count,
+                    state_db=None if state_db is None else str(state_db),
+                    state_key=None if state_key is None else str(state_key),
+                    replay_db=None if replay_db is None else str(replay_db),
+                    replay_key=None if replay_key is None else str(replay_key),
+                    controller_options=options,
+                )
+                process = context.Process(
+                    target=_shard_main,
+                    args=(child_end, settings),
+                    name=f"catan-room-shard-{index}",
+                    daemon=True,
+                )
+                process.start()
+                child_end.close()
+                self._shards.append(_Shard(index, process, parent_end))
+            for shard in self._shards:
+                if not shard.connection.poll(float(start_timeout_seconds)):
+                    raise RoomShardError("部屋の処理workerが起動しませんでした。")
+                reply = self._receive(shard)
+                if reply is None:
+                    raise RoomShardError("部屋の処理workerが起動しませんでした。")
+                status, payload, _attached = reply
+                if status != "ok":
+                    raise RoomShardError(
+                        "部屋の処理workerを初期化できませんでした。"
+                    ) from payload
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def room_codes(self) -> tuple[str, ...]:
+        codes: list[str] = []
+        for shard in self._shards:
+            try:
+                codes.extend(self._call(shard.index, "room_codes"))
+            except RoomShardError:
+                continue
+        return tuple(sorted(codes))
+
+    def handle(
+        self,
+        connection_id: str | int,
+        message: Mapping[str, Any],
+        *,
+        protected_room_access_allowed: bool = False,
+        rotate_reconnect_token: bool = False,
+        shard: int | None = None,
+    ) -> tuple[OutboundMessage, ...]:
+        """Forward one request to the shard owning its room.
+
+        ``shard`` pins the request to an index returned by
+        :meth:`route_message`, so a caller that orders work per shard and the
+        call itself agree even for round-robin room creation.
+        """
+
+        if shard is None:
+            index = self.route_message(connection_id, message)
+        elif type(shard) is int and 0 <= shard < len(self._shards):
+            index = shard
+        else:
+            raise ValueError("shard must be an index returned by route_message")
+        try:
+            return self._call(
+                index,
+                "handle",
+                connection_id,
+                message,
+                protected_room_access_allowed=protected_room_access_allowed,
+                rotate_reconnect_token=rotate_reconnect_token,
+            )
+        except RoomShardError as exc:
+            return (
+                OutboundMessage(
+                    str(connection_id),
+                    {
+                        "type": "request_error",
+                        "protocol_version": NETWORK_PROTOCOL_VERSION,
+                        "code": exc.code,
+                        "message": str(exc),
+                    },
+                ),
+            )
+
+    def disconnect(self, connection_id: str | int) -> tuple[OutboundMessage, ...]:
+        index = self._connection_shard(connection_id)
+        if index is None:
+            return ()
+        try:
+            return self._call(index, "disconnect", connection_id)
+        except RoomShardError:
+            self._forget_connection(connection_id)
+            return ()
+
+    def tick(self) -> tuple[OutboundMessage, ...]:
+        """Tick every shard concurrently and merge their outbound messages."""
+
+        pending: list[_Shard] = []
+        for shard in self._shards:
+            shard.lock.acquire()
+            if not self._send(shard, ("tick", (), {})):
+                shard.lock.release()
+                continue
+            pending.append(shard)
+        outbound: list[OutboundMessage] = []
+        for shard in pending:
+            try:
+                reply = self._receive(shard)
+            finally:
+                shard.lock.release()
+            if reply is not None and reply[0] == "ok":
+                outbound.extend(reply[1])
+        return tuple(outbound)
+
+    def snapshot_for_connection(self, connection_id: str | int) -> dict[str, Any]:
+        return self._call_for_connection("snapshot_for_connection", connection_id)
+
+    def replay_frame_for_connection(
+        self,
+        connection_id: str | int,
+        frame_index: int,
+    ) -> dict[str, Any]:
+        return self._call_for_connection(
+            "replay_frame_for_connection",
+            connection_id,
+            frame_index,
+        )
+
+    def match_result_for_connection(self, connection_id: str | int) -> dict[str, Any]:
+        return self._call_for_connection("match_result_for_connection", connection_id)
+
+    def issue_friend_invitation(self, connection_id: str | int, **kwargs: Any) -> Any:
+        return self._call_for_connection(
+            "issue_friend_invitation",
+            connection_id,
+            **kwargs,
+        )
+
+    def list_friend_invitations(self, connection_id: str | int) -> Any:
+        return self._call_for_connection("list_friend_invitations", connection_id)
+
+    def revoke_friend_invitation(self, connection_id: str | int, **kwargs: Any) -> Any:
+        return self._call_for_connection(
+            "revoke_friend_invitation",
+            connection_id,
+            **kwargs,
+        )
+
+    def revoke_all_friend_invitations(self, connection_id: str | int) -> int:
+        return self._call_for_connection(
+            "revoke_all_friend_invitations",
+            connection_id,
+        )
+
+    def join_room_with_friend_invitation(
+        self,
+        connection_id: str | int,
+        *,
+        room_code: str,
+        **kwargs: Any,
+    ) -> tuple[OutboundMessage, ...]:
+        return self._call(
+            self._room_or_connection_shard(connection_id, room_code),
+            "join_room_with_friend_invitation",
+            connection_id,
+            room_code=room_code,
+            **kwargs,
+        )
+
+    def join_room_with_friend_claim(
+        self,
+        connection_id: str | int,
+        *,
+        room_code: str,
+        **kwargs: Any,
+    ) -> tuple[OutboundMessage, ...]:
+        return self._call(
+            self._room_or_connection_shard(connection_id, room_code),
+            "join_room_with_friend_claim",
+            connection_id,
+            room_code=room_code,
+            **kwargs,
+        )
+
+    def confirm_reconnect_token(
+        self,
+        connection_id: str | int,
+        room_code: str,
+        reconnect_token: str,
+    ) -> tuple[OutboundMessage, ...]:
+        return self._call(
+            self._room_or_connection_shard(connection_id, room_code),
+            "confirm_reconnect_token",
+            connection_id,
+            room_code,
+            reconnect_token,
+        )
+
+    def inspect_friend_invitation(self, room_code: str, invite_token: object) -> Any:
+        return self._call_for_room("inspect_friend_invitation", room_code, invite_token)
+
+    def begin_friend_invitation_claim(
+        self,
+        room_code: str,
+        invite_token: object,
+    ) -> Any:
+        return self._call_for_room(
+            "begin_friend_invitation_claim",
+            room_code,
+            invite_token,
+        )
+
+    def inspect_friend_invitation_claim(
+        self,
+        room_code: str,
+        claim_token: object,
+    ) -> Any:
+        return self._call_for_room(
+            "inspect_friend_invitation_claim",
+            room_code,
+            claim_token,
+        )
+
+    def release_friend_invitation_claim(
+        self,
+        room_code: str,
+        claim_token: object,
+    ) -> Any:
+        return self._call_for_room(
+            "release_friend_invitation_claim",
+            room_code,
+            claim_token,
+        )
+
+    def close(self) -> None:
+        """Stop every worker; rooms remain in the state store if configured."""
+
+        for shard in self._shards:
+            with shard.lock:
+                if shard.alive:
+                    self._send(shard, None)
+                    shard.alive = False
+                shard.connection.close()
+        for shard in self._shards:
+            shard.process.join(SHARD_STOP_TIMEOUT_SECONDS)
+            if shard.process.is_alive():
+                shard.process.terminate()
+                shard.process.join(SHARD_STOP_TIMEOUT_SECONDS)
+
+    def __enter__(self) -> ShardedLanServerController:
+        return self
+
+    def __exit__(self, _exc_type, _exc, _traceback) -> None:
+        self.close()
+
+    def route_message(self, connection_id: Any, message: Any) -> int:
+        """Return the shard index that ``handle`` sends ``message`` to."""
+
+        index = self._connection_shard(connection_id)
+        if index is not None:
+            return index
+        if type(message) is dict:
+            message_type = message.get("type")
+            room_code = message.get("room_code")
+            if message_type in ("join_room", "reconnect_room") and type(room_code) is str:
+                return room_shard_index(room_code, len(self._shards))
+            if message_type == "create_room":
+                with self._routing_lock:
+                    index = self._next_create_shard
+                    self._next_create_shard = (index + 1) % len(self._shards)
+                return index
+        return self._fallback_shard(connection_id)
+
+    def _room_or_connection_shard(self, connection_id: Any, room_code: Any) -> int:
+        index = self._connection_shard(connection_id)
+        if index is not None:
+            return index
+        if type(room_code) is str:
+            return room_shard_index(room_code, len(self._shards))
+        return self._fallback_shard(connection_id)
+
+    def _call_for_connection(
+        self,
+        method: str,
+        connection_id: str | int,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        index = self._connection_shard(connection_id)
+        if index is None:
+            # An unseated connection gets the controller's own error reply.
+            index = self._fallback_shard(connection_id)
+        return self._call(index, method, connection_id, *args, **kwargs)
+
+    def _call_for_room(self, method: str, room_code: Any, *args: Any) -> Any:
+        index = (
+            room_shard_index(room_code, len(self._shards))
+            if type(room_code) is str
+            else 0
+        )
+        return self._call(index, method, room_code, *args)
+
+    def _call(self, index: int, method: str, *args: Any, **kwargs: Any) -> Any:
+        shard = self._shards[index]
+        with shard.lock:
+            reply = (
+                self._receive(shard)
+                if self._send(shard, (method, args, kwargs))
+                else None
+            )
+        if reply is None:
+            if method in _CONNECTION_METHODS:
+                self._forget_connection(args[0])
+            raise RoomShardError("部屋を担当する処理workerが応答しません。")
+        status, payload, attached = reply
+        if method in _CONNECTION_METHODS:
+            if attached:
+                with self._routing_lock:
+                    self._connection_shards[str(args[0])] = index
+            else:
+                self._forget_connection(args[0])
+        if status != "ok":
+            raise payload
+        return payload
+
+    @staticmethod
+    def _send(shard: _Shard, request: Any) -> bool:
+        if not shard.alive:
+            return False
+        try:
+            shard.connection.send(request)
+        except (OSError, ValueError):
+            shard.alive = False
+            return False
+        return True
+
+    @staticmethod
+    def _receive(shard: _Shard) -> tuple[str, Any, bool] | None:
+        try:
+            return shard.connection.recv()
+        except (EOFError, OSError):
+            shard.alive = False
+            return None
+
+    def _connection_shard(self, connection_id: Any) -> int | None:
+        if isinstance(connection_id, bool) or not isinstance(connection_id, (str, int)):
+            return None
+        with self._routing_lock:
+            return self._connection_shards.get(str(connection_id))
+
+    def _forget_connection(self, connection_id: Any) -> None:
+        if isinstance(connection_id, bool) or not isinstance(connection_id, (str, int)):
+            return
+        with self._routing_lock:
+            self._connection_shards.pop(str(connection_id), None)
+
+    def _fallback_shard(self, connection_id: Any) -> int:
+        if isinstance(connection_id, bool) or not isinstance(connection_id, (str, int)):
+            return 0
+        return room_shard_index(str(connection_id), len(self._shards))
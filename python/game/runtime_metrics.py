@@ -0,0 +1,316 @@
+"""Opt-in latency histograms and counters for the server hot paths.
+
+Instrumentation is off until :func:`enable_metrics` installs a registry.
+While it is off, :func:`metric_timer` returns one shared no-op context and
+:func:`increment_metric` returns after a single global lookup, so
+instrumented code pays next to nothing in ordinary play, tests and
+self-play.
+
+Only the metrics named in :data:`METRIC_DEFINITIONS` can be recorded, and
+label values come from closed vocabularies (command names, phases, fixed
+outcomes) so that a client cannot grow the registry.  With ``--room-shards``
+the controller runs in worker processes whose registries are not exported;
+only gateway metrics are then visible on ``/metrics``.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Any, Mapping
+
+
+__all__ = (
+    "DEFAULT_LATENCY_BUCKETS",
+    "METRIC_DEFINITIONS",
+    "PROMETHEUS_CONTENT_TYPE",
+    "MetricDefinition",
+    "MetricsRegistry",
+    "active_registry",
+    "disable_metrics",
+    "enable_metrics",
+    "increment_metric",
+    "metric_timer",
+)
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a cheap rules call to a slow SQLite write.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+@dataclass(frozen=True)
+class MetricDefinition:
+    kind: str
+    help: str
+    labels: tuple[str, ...] = ()
+
+
+METRIC_DEFINITIONS: Mapping[str, MetricDefinition] = {
+    "catan_game_command_seconds": MetricDefinition(
+        "histogram",
+        "Time spent validating and applying one network game command.",
+        ("command", "outcome"),
+    ),
+    "catan_ai_decision_seconds": MetricDefinition(
+        "histogram",
+        "Time spent choosing and applying one AI decision.",
+        ("phase", "outcome"),
+    ),
+    "catan_controller_ai_advance_seconds": MetricDefinition(
+        "histogram",
+        "Time spent in one controller AI slice, including snapshots and "
+        "persistence.",
+        ("outcome",),
+    ),
+    "catan_controller_ai_decisions_total": MetricDefinition(
+        "counter",
+        "AI decisions committed by the controller.",
+    ),
+    "catan_room_persist_seconds": MetricDefinition(
+        "histogram",
+        "Time spent writing one room authority update.",
+        ("outcome",),
+    ),
+    "catan_replay_capture_seconds": MetricDefinition(
+        "histogram",
+        "Time spent capturing one network replay frame.",
+        ("outcome",),
+    ),
+    "catan_replay_capture_failures_total": MetricDefinition(
+        "counter",
+        "Replay captures that raised and were dropped.",
+    ),
+    "catan_web_gateway_seconds": MetricDefinition(
+        "histogram",
+        "Time spent in one Web gateway call, including the lock wait.",
+        ("operation", "outcome"),
+    ),
+}
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe storage for the metrics in :data:`METRIC_DEFINITIONS`."""
+
+    def __init__(
+        self,
+        *,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or any(
+            not math.isfinite(bound) or bound <= 0 for bound in bounds
+        ):
+            raise ValueError("buckets must be positive finite numbers")
+        if list(bounds) != sorted(set(bounds)):
+            raise ValueError("buckets must be strictly increasing")
+        self.buckets = bounds
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple[str, ...]], float] = {}
+        # (name, label values) -> [per-bucket counts..., +Inf count, sum]
+        self._histograms: dict[tuple[str, tuple[str, ...]], list[float]] = {}
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = self._key(name, "counter", labels)
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = self._key(name, "histogram", labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        key = self._key(name, "counter", labels)
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def histogram_count(self, name: str, **labels: Any) -> int:
+        key = self._key(name, "histogram", labels)
+        with self._lock:
+            series = self._histograms.get(key)
+            return 0 if series is None else int(sum(series[:-1]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Return every recorded series in the Prometheus text format."""
+
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+        lines: list[str] = []
+        for name, definition in METRIC_DEFINITIONS.items():
+            source = counters if definition.kind == "counter" else histograms
+            series_keys = sorted(key for key in source if key[0] == name)
+            if not series_keys:
+                continue
+            lines.append(f"# HELP {name} {definition.help}")
+            lines.append(f"# TYPE {name} {definition.kind}")
+            for key in series_keys:
+                label_values = key[1]
+                if definition.kind == "counter":
+                    labels = _format_labels(definition.labels, label_values)
+                    lines.append(f"{name}{labels} {_format_number(counters[key])}")
+                    continue
+                series = histograms[key]
+                names = (*definition.labels, "le")
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), series[:-1]):
+                    cumulative += count
+                    labels = _format_labels(
+                        names, (*label_values, _format_number(bound))
+                    )
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(definition.labels, label_values)
+                lines.append(f"{name}_sum{labels} {_format_number(series[-1])}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    @staticmethod
+    def _key(
+        name: str,
+        kind: str,
+        labels: Mapping[str, Any],
+    ) -> tuple[str, tuple[str, ...]]:
+        definition = METRIC_DEFINITIONS.get(name)
+        if definition is None or definition.kind != kind:
+            raise ValueError(f"unknown {kind}: {name}")
+        if set(labels) != set(definition.labels):
+            raise ValueError(
+                f"{name} requires labels {', '.join(definition.labels) or '(none)'}"
+            )
+        return name, tuple(str(labels[label]) for label in definition.labels)
+
+
+class _Timer:
+    """Observe the wall time of a ``with`` block into one histogram.
+
+    ``outcome`` defaults to ``ok``, or ``error`` when the block raises; the
+    instrumented code may overwrite it (or any other label) before exit.
+    """
+
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry: MetricsRegistry, name: str, labels: dict) -> None:
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> _Timer:
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, _exc, _traceback) -> None:
+        elapsed = time.perf_counter() - self.started
+        labels = self.labels
+        if "outcome" not in labels:
+            labels["outcome"] = "ok" if exc_type is None else "error"
+        self.registry.observe(self.name, elapsed, **labels)
+
+    def label(self, **labels: Any) -> None:
+        self.labels.update(labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullTimer:
+        return self
+
+    def __exit__(self, _exc_type, _exc, _traceback) -> None:
+        return None
+
+    def label(self, **_labels: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+_active: MetricsRegistry | None = None
+
+
+def enable_metrics(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """Start recording into ``registry`` (a new one by default) and return it."""
+
+    global _active
+    if registry is None:
+        registry = MetricsRegistry()
+    elif not isinstance(registry, MetricsRegistry):
+        raise TypeError("registry must be a MetricsRegistry")
+    _active = registry
+    return registry
+
+
+def disable_metrics() -> None:
+    global _active
+    _active = None
+
+
+def active_registry() -> MetricsRegistry | None:
+    return _active
+
+
+def metric_timer(name: str, **labels: Any) -> _Timer | _NullTimer:
+    """Return a context that times its block into histogram ``name``."""
+
+    registry = _active
+    if registry is None:
+        return _NULL_TIMER
+    return _Timer(registry, name, labels)
+
+
+def increment_metric(name: str, amount: float = 1, **labels: Any) -> None:
+    registry = _active
+    if registry is not None:
+        registry.increment(name, amount, **labels)
@@ -12,15 +12,17 @@ game turns; the initial order rolls are excluded.
 from __future__ import annotations
 
 import argparse
+import collections
 import concurrent.futures
+import itertools
 import json
 import multiprocessing
 import os
 import random
-import threading
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, field, fields, replace
+from pathlib import Path
 from statistics import fmean
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator, Mapping
 
 os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 
@@ -32,6 +34,7 @@ from game.constants import MAX_VICTORY_POINT_TARGET, MIN_VICTORY_POINT_TARGET
 from game.hex_tile import get_token_pip_count
 from game.resource_ledger import ResourceLedgerError
 from game.resources import ResourceType
+from game.rollout_ai import RolloutConfig
 from game.variant import VariantConfig
 
 
@@ -40,6 +43,16 @@ DEFAULT_MAX_TURNS = 1_000
 DEFAULT_MAX_ACTION_STEPS = 50_000
 AUTO_WORKER_CAP = 8
 MAX_WORKERS = 32
+RESULT_LOG_FORMAT = "catan-self-play-log"
+RESULT_LOG_VERSION = 1
+# Chunks queued per worker process.  Enough to keep every worker busy while
+# the parent consumes results in order, without materialising a whole sweep.
+_PENDING_CHUNKS_PER_WORKER = 2
+# Pool chunks aim for about this many game turns of work per round trip.
+_TARGET_CHUNK_TURNS = 400
+_MAX_CHUNK_JOBS = 64
+# Rough first-chunk estimate before any match length has been observed.
+_ESTIMATED_TURNS_PER_VICTORY_POINT = 8
 SUPPORTED_PLAYER_COUNTS = (2, 3, 4)
 SUPPORTED_BOARD_MODES = ("constrained", "fully_random")
 SUPPORTED_AI_PERSONALITIES = AI_PERSONALITY_KEYS
@@ -51,8 +64,6 @@ ACTION_COUNT_KEYS = (
     "knights_used",
 )
 
-_RUN_LOCK = threading.RLock()
-
 
 class _HeadlessCatanGame(game_module.CatanGame):
     """Production game with only presentation/timing side effects removed."""
@@ -269,6 +280,8 @@ class MatchResult:
     dice_counts: dict[int, int]
     players: tuple[PlayerResult, ...]
     validation_errors: tuple[str, ...]
+    ai_cache_hits: int = 0
+    ai_cache_misses: int = 0
 
     def to_dict(self) -> dict:
         return {
@@ -288,6 +301,10 @@ class MatchResult:
             "dice_counts": dict(self.dice_counts),
             "players": [player.to_dict() for player in self.players],
             "validation_errors": list(self.validation_errors),
+            "ai_evaluation_cache": {
+                "hits": self.ai_cache_hits,
+                "misses": self.ai_cache_misses,
+            },
         }
 
 
@@ -304,6 +321,7 @@ class _MatchJob:
     max_turns: int
     max_action_steps: int
     personalities: tuple[str, ...]
+    rollout_config: RolloutConfig | None = None
 
 
 class SelfPlayWorkerError(RuntimeError):
@@ -340,6 +358,14 @@ class BatchResult:
     average_turns: float
     worker_count: int = 1
 
+    @property
+    def ai_evaluation_cache(self) -> dict[str, int]:
+        """Summed per-decision AI cache counters across the batch."""
+        return {
+            "hits": sum(match.ai_cache_hits for match in self.matches),
+            "misses": sum(match.ai_cache_misses for match in self.matches),
+        }
+
     def to_dict(self) -> dict:
         return {
             "game_count": self.game_count,
@@ -352,10 +378,86 @@ class BatchResult:
             "win_counts": dict(self.win_counts),
             "average_turns": self.average_turns,
             "worker_count": self.worker_count,
+            "ai_evaluation_cache": self.ai_evaluation_cache,
             "matches": [match.to_dict() for match in self.matches],
         }
 
 
+@dataclass(frozen=True)
+class StreamedBatchResult:
+    """Aggregate-only result of a batch whose matches live in a result log."""
+
+    result_log: str
+    game_count: int
+    completed_games: int
+    resumed_games: int
+    board_seed: int | None
+    board_mode: str
+    victory_target: int
+    player_count: int
+    personality_lineup: tuple[str, ...]
+    win_counts: dict[int, int]
+    average_turns: float
+    ai_cache_hits: int
+    ai_cache_misses: int
+    worker_count: int = 1
+
+    @property
+    def ai_evaluation_cache(self) -> dict[str, int]:
+        """Summed per-decision AI cache counters across the whole log."""
+        return {"hits": self.ai_cache_hits, "misses": self.ai_cache_misses}
+
+    def to_dict(self) -> dict:
+        return {
+            "result_log": self.result_log,
+            "game_count": self.game_count,
+            "completed_games": self.completed_games,
+            "resumed_games": self.resumed_games,
+            "board_seed": self.board_seed,
+            "board_mode": self.board_mode,
+            "victory_target": self.victory_target,
+            "player_count": self.player_count,
+            "personality_lineup": list(self.personality_lineup),
+            "win_counts": dict(self.win_counts),
+            "average_turns": self.average_turns,
+            "worker_count": self.worker_count,
+            "ai_evaluation_cache": self.ai_evaluation_cache,
+        }
+
+
+@dataclass
+class _BatchTotals:
+    """Running batch aggregates fed from serialised match records."""
+
+    player_count: int
+    game_count: int = 0
+    completed_games: int = 0
+    completed_turns: int = 0
+    ai_cache_hits: int = 0
+    ai_cache_misses: int = 0
+    win_counts: dict[int, int] = field(init=False)
+
+    def __post_init__(self):
+        self.win_counts = {seat: 0 for seat in range(1, self.player_count + 1)}
+
+    def add(self, record: Mapping) -> None:
+        self.game_count += 1
+        cache = record.get("ai_evaluation_cache") or {}
+        self.ai_cache_hits += int(cache.get("hits", 0))
+        self.ai_cache_misses += int(cache.get("misses", 0))
+        if not record["completed"]:
+            return
+        self.completed_games += 1
+        self.completed_turns += record["turns"]
+        self.win_counts[record["winner_seat"]] += 1
+
+    @property
+    def average_turns(self) -> float:
+        if not self.completed_games:
+            return 0.0
+        return self.completed_turns / self.completed_games
+
+
 def _validate_options(
     *,
     board_mode: str,
@@ -392,8 +494,9 @@ def normalise_personalities(
 ) -> tuple[str, ...]:
     """Validate a seat-ordered personality lineup.
 
-    An omitted lineup uses each available personality once in a four-player
-    match.  Smaller matches use the same stable prefix.  Duplicate values are
+    An omitted lineup uses each heuristic personality once in a four-player
+    match; the slower ``rollout`` search only plays when named.  Smaller
+    matches use the same stable prefix.  Duplicate values are
     accepted intentionally so callers can run mirror matches.
     """
     if player_count not in SUPPORTED_PLAYER_COUNTS:
@@ -439,16 +542,26 @@ def _prepare_game(
     victory_target: int,
     personalities: Iterable[str] | None = None,
     variant_config: VariantConfig | None = None,
+    rollout_config: RolloutConfig | None = None,
 ) -> _HeadlessCatanGame:
     personality_lineup = normalise_personalities(personalities, player_count)
-    random.seed(match_seed)
+    # Each match owns its generator, so concurrent in-process simulations
+    # neither serialize on nor disturb the module-level ``random`` state.
     game = _HeadlessCatanGame(
         board_mode=board_mode,
         board_seed=board_seed,
         ai_player_count=0,
         ai_action_delay_ms=0,
         variant_config=variant_config,
+        rng=random.Random(match_seed),
     )
+    # Batches already run one match per core, so rollout seats search
+    # in-process unless a rollout pool was requested explicitly.
+    if rollout_config is None:
+        rollout_config = RolloutConfig(workers=1)
+    elif rollout_config.workers is None:
+        rollout_config = replace(rollout_config, workers=1)
+    game.ai.rollout_config = rollout_config
     game.ai_player_count = max(0, player_count - 1)
     game.configure_players(
         player_count,
@@ -570,6 +683,8 @@ def _build_match_result(
         dice_counts=dict(game.self_play_dice_counts),
         players=_player_results(game),
         validation_errors=validation_errors,
+        ai_cache_hits=game.ai.evaluation_cache_hits,
+        ai_cache_misses=game.ai.evaluation_cache_misses,
     )
 
 
@@ -647,12 +762,16 @@ def run_match(
     max_action_steps: int = DEFAULT_MAX_ACTION_STEPS,
     personalities: Iterable[str] | None = None,
     variant_config: VariantConfig | None = None,
+    rollout_config: RolloutConfig | None = None,
 ) -> MatchResult:
     """Run one deterministic AI-only match with no presentation delays.
 
     ``match_seed`` controls dice, stealing, and the development deck.
     ``board_seed`` controls the board independently and defaults to the match
-    seed.  Python's process-global random state is restored before returning.
+    seed.  The match draws from its own ``random.Random``, leaving Python's
+    process-global random state untouched.  ``rollout_config`` sets the
+    search budget of ``rollout`` seats; a time budget makes their choices
+    depend on machine speed.
     """
     if isinstance(match_seed, bool) or not isinstance(match_seed, int):
         raise TypeError("match_seed must be an int")
@@ -670,52 +789,49 @@ def run_match(
     personality_lineup = normalise_personalities(personalities, player_count)
     if variant_config is not None and not isinstance(variant_config, VariantConfig):
         raise TypeError("variant_config must be a VariantConfig")
+    _validate_rollout_config(rollout_config)
 
-    # Game rules currently use the stdlib random module for dice, stealing,
-    # and the development deck.  Serialize simulations and restore caller
-    # state so reproducibility does not leak side effects into the app/tests.
-    with _RUN_LOCK:
-        caller_random_state = random.getstate()
-        try:
-            game = _prepare_game(
-                match_seed=match_seed,
-                board_seed=board_seed,
-                board_mode=board_mode,
-                player_count=player_count,
-                victory_target=victory_target,
-                personalities=personality_lineup,
-                variant_config=variant_config,
-            )
-            action_steps = 0
-            reason = "stalled"
-            while game.winner is None:
-                if game.self_play_turns >= max_turns:
-                    reason = "turn_limit"
-                    break
-                if action_steps >= max_action_steps:
-                    reason = "action_limit"
-                    break
-                action_steps += 1
-                if not game.ai.step(game):
-                    reason = "stalled"
-                    break
-            if game.winner is not None:
-                reason = "victory"
-            validation_errors = _validate_completed_state(game)
-            if validation_errors:
-                reason = "integrity_error"
-            return _build_match_result(
-                game,
-                match_seed=match_seed,
-                board_seed=board_seed,
-                board_mode=board_mode,
-                victory_target=victory_target,
-                action_steps=action_steps,
-                reason=reason,
-                validation_errors=validation_errors,
-            )
-        finally:
-            random.setstate(caller_random_state)
+    game = _prepare_game(
+        match_seed=match_seed,
+        board_seed=board_seed,
+        board_mode=board_mode,
+        player_count=player_count,
+        victory_target=victory_target,
+        personalities=personality_lineup,
+        variant_config=variant_config,
+        rollout_config=rollout_config,
+    )
+    action_steps = 0
+    reason = "stalled"
+    try:
+        while game.winner is None:
+            if game.self_play_turns >= max_turns:
+                reason = "turn_limit"
+                break
+            if action_steps >= max_action_steps:
+                reason = "action_limit"
+                break
+            action_steps += 1
+            if not game.ai.step(game):
+                reason = "stalled"
+                break
+    finally:
+        game.ai.close()
+    if game.winner is not None:
+        reason = "victory"
+    validation_errors = _validate_completed_state(game)
+    if validation_errors:
+        reason = "integrity_error"
+    return _build_match_result(
+        game,
+        match_seed=match_seed,
+        board_seed=board_seed,
+        board_mode=board_mode,
+        victory_target=victory_target,
+        action_steps=action_steps,
+        reason=reason,
+        validation_errors=validation_errors,
+    )
 
 
 def _run_match_job(job: _MatchJob) -> MatchResult:
@@ -730,6 +846,7 @@ def _run_match_job(job: _MatchJob) -> MatchResult:
             max_turns=job.max_turns,
             max_action_steps=job.max_action_steps,
             personalities=job.personalities,
+            rollout_config=job.rollout_config,
         )
     except KeyboardInterrupt:
         # Ctrl-C must remain an interrupt rather than becoming a match error.
@@ -752,28 +869,107 @@ def _resolve_worker_count(workers: int, game_count: int) -> int:
     return max(1, min(requested, game_count))
 
 
-def run_batch(
-    *,
-    game_count: int = DEFAULT_GAME_COUNT,
-    match_seed_start: int = 0,
-    match_seeds: Iterable[int] | None = None,
-    board_seed: int | None = None,
-    board_mode: str = "constrained",
-    player_count: int = 4,
-    victory_target: int = 10,
-    max_turns: int = DEFAULT_MAX_TURNS,
-    max_action_steps: int = DEFAULT_MAX_ACTION_STEPS,
-    personalities: Iterable[str] | None = None,
-    progress: Callable[[int, int, MatchResult], None] | None = None,
-    workers: int = 1,
-) -> BatchResult:
-    """Run an ordered batch, optionally using isolated worker processes.
+@dataclass(frozen=True)
+class _BatchPlan:
+    """Validated batch options from which match jobs are derived lazily."""
 
-    ``workers=0`` chooses a conservative automatic count (at most eight),
-    while ``workers=1`` preserves the original in-process execution path.
-    Seeds, personality rotation, result order, and progress callback order are
-    resolved by the parent and therefore do not depend on scheduling.
-    """
+    seeds: tuple[int, ...] | range
+    board_seed: int | None
+    board_mode: str
+    player_count: int
+    victory_target: int
+    max_turns: int
+    max_action_steps: int
+    personality_lineup: tuple[str, ...]
+    rollout_config: RolloutConfig | None = None
+
+    @property
+    def game_count(self) -> int:
+        return len(self.seeds)
+
+    def iter_jobs(self, start: int = 0) -> Iterator[_MatchJob]:
+        for match_offset in range(start, len(self.seeds)):
+            match_seed = self.seeds[match_offset]
+            # Rotate the exact lineup across seats.  Over a multiple of the
+            # player count every personality receives equal exposure to every
+            # seat, while remaining deterministic for the same ordered seeds.
+            rotation = match_offset % self.player_count
+            yield _MatchJob(
+                index=match_offset + 1,
+                match_seed=match_seed,
+                board_seed=match_seed if self.board_seed is None else self.board_seed,
+                board_mode=self.board_mode,
+                player_count=self.player_count,
+                victory_target=self.victory_target,
+                max_turns=self.max_turns,
+                max_action_steps=self.max_action_steps,
+                personalities=(
+                    self.personality_lineup[rotation:]
+                    + self.personality_lineup[:rotation]
+                ),
+                rollout_config=self.rollout_config,
+            )
+
+    def log_header(self) -> dict:
+        header = {
+            "format": RESULT_LOG_FORMAT,
+            "version": RESULT_LOG_VERSION,
+            "game_count": self.game_count,
+            "board_seed": self.board_seed,
+            "board_mode": self.board_mode,
+            "victory_target": self.victory_target,
+            "player_count": self.player_count,
+            "personality_lineup": list(self.personality_lineup),
+            "max_turns": self.max_turns,
+            "max_action_steps": self.max_action_steps,
+        }
+        if self.rollout_config is not None:
+            # Only budgets that change results; the worker count does not.
+            header["rollout"] = {
+                "rollouts_per_action": self.rollout_config.rollouts_per_action,
+                "rollout_turns": self.rollout_config.rollout_turns,
+                "time_budget": self.rollout_config.time_budget,
+            }
+        return header
+
+
+def _validate_rollout_config(rollout_config: RolloutConfig | None) -> None:
+    if rollout_config is not None and not isinstance(rollout_config, RolloutConfig):
+        raise TypeError("rollout_config must be a RolloutConfig")
+
+
+def rollout_config_from_options(
+    rollouts: int | None = None,
+    time_budget: float | None = None,
+    workers: int | None = None,
+) -> RolloutConfig | None:
+    """Build a rollout budget from CLI options; ``None`` keeps the default."""
+    options = {
+        name: value
+        for name, value in (
+            ("rollouts_per_action", rollouts),
+            ("time_budget", time_budget),
+            ("workers", workers),
+        )
+        if value is not None
+    }
+    return RolloutConfig(**options) if options else None
+
+
+def _plan_batch(
+    *,
+    game_count: int,
+    match_seed_start: int,
+    match_seeds: Iterable[int] | None,
+    board_seed: int | None,
+    board_mode: str,
+    player_count: int,
+    victory_target: int,
+    max_turns: int,
+    max_action_steps: int,
+    personalities: Iterable[str] | None,
+    rollout_config: RolloutConfig | None = None,
+) -> _BatchPlan:
     if match_seeds is None:
         if (
             isinstance(game_count, bool)
@@ -783,14 +979,13 @@ def run_batch(
             raise ValueError("game_count must be positive")
         if isinstance(match_seed_start, bool) or not isinstance(match_seed_start, int):
             raise TypeError("match_seed_start must be an int")
-        seeds = tuple(range(match_seed_start, match_seed_start + game_count))
+        seeds = range(match_seed_start, match_seed_start + game_count)
     else:
         seeds = tuple(match_seeds)
         if not seeds:
             raise ValueError("match_seeds must not be empty")
         if any(isinstance(seed, bool) or not isinstance(seed, int) for seed in seeds):
             raise TypeError("all match_seeds must be ints")
-        game_count = len(seeds)
 
     if board_seed is not None and (
         isinstance(board_seed, bool) or not isinstance(board_seed, int)
@@ -803,55 +998,245 @@ def run_batch(
         max_turns=max_turns,
         max_action_steps=max_action_steps,
     )
-    personality_lineup = normalise_personalities(personalities, player_count)
-    worker_count = _resolve_worker_count(workers, game_count)
-    jobs = []
-    for match_offset, match_seed in enumerate(seeds):
-        # Rotate the exact lineup across seats.  Over a multiple of the player
-        # count every personality receives equal exposure to every seat, while
-        # remaining deterministic for the same ordered seed list.
-        rotation = match_offset % player_count
-        match_personalities = (
-            personality_lineup[rotation:] + personality_lineup[:rotation]
+    _validate_rollout_config(rollout_config)
+    return _BatchPlan(
+        seeds=seeds,
+        board_seed=board_seed,
+        board_mode=board_mode,
+        player_count=player_count,
+        victory_target=victory_target,
+        max_turns=max_turns,
+        max_action_steps=max_action_steps,
+        personality_lineup=normalise_personalities(personalities, player_count),
+        rollout_config=rollout_config,
+    )
+
+
+_MATCH_FIELDS = tuple(item.name for item in fields(MatchResult))
+
+
+def _match_to_row(match: MatchResult) -> tuple:
+    """Flatten a result to plain nested tuples for a cheap pickle round trip."""
+    return astuple(match)
+
+
+def _match_from_row(row: tuple) -> MatchResult:
+    values = dict(zip(_MATCH_FIELDS, row))
+    values["players"] = tuple(PlayerResult(*player) for player in values["players"])
+    return MatchResult(**values)
+
+
+def _initialise_worker() -> None:
+    """Warm a fresh worker so its first real match pays no import or setup cost."""
+    run_match(
+        match_seed=0,
+        player_count=2,
+        victory_target=MIN_VICTORY_POINT_TARGET,
+        max_turns=1,
+    )
+
+
+def _run_match_chunk(jobs: tuple[_MatchJob, ...]) -> tuple[tuple, ...]:
+    return tuple(_match_to_row(_run_match_job(job)) for job in jobs)
+
+
+class _ChunkScheduler:
+    """Size job chunks from the observed match length of earlier chunks.
+
+    Long matches get small chunks and short matches are batched so each round
+    trip carries roughly ``_TARGET_CHUNK_TURNS`` of work.  Chunks also shrink
+    as the batch drains, so the final chunks are spread over every idle
+    worker instead of leaving one worker with a long tail.
+    """
+
+    def __init__(self, worker_count: int, job_count: int, estimated_turns: int):
+        self.worker_count = worker_count
+        self.remaining = job_count
+        self.observed_matches = 0
+        self.observed_turns = 0
+        self.estimated_turns = max(1, estimated_turns)
+
+    def next_size(self) -> int:
+        if self.observed_matches:
+            turns_per_match = max(1.0, self.observed_turns / self.observed_matches)
+        else:
+            turns_per_match = self.estimated_turns
+        by_length = int(_TARGET_CHUNK_TURNS // turns_per_match)
+        by_tail = -(-self.remaining // (2 * self.worker_count))
+        return max(1, min(by_length, by_tail, _MAX_CHUNK_JOBS))
+
+    def observe(self, matches: Iterable[MatchResult]) -> None:
+        for match in matches:
+            self.observed_matches += 1
+            self.observed_turns += match.turns
+
+
+class SelfPlayPool:
+    """Long-lived, pre-warmed spawn worker pool for consecutive batches.
+
+    Pass one pool to several :func:`run_batch` calls (for example a parameter
+    sweep in a notebook) to keep its workers, their imports, and their warm
+    caches alive between batches.  Close it, or use it as a context manager,
+    when the sweep is done.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.worker_count = _resolve_worker_count(workers, MAX_WORKERS)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialise_worker,
         )
-        jobs.append(
-            _MatchJob(
-                index=match_offset + 1,
-                match_seed=match_seed,
-                board_seed=match_seed if board_seed is None else board_seed,
-                board_mode=board_mode,
-                player_count=player_count,
-                victory_target=victory_target,
-                max_turns=max_turns,
-                max_action_steps=max_action_steps,
-                personalities=match_personalities,
-            )
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> SelfPlayPool:
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def iter_results(
+        self,
+        jobs: Iterable[_MatchJob],
+        job_count: int,
+    ) -> Iterator[tuple[_MatchJob, MatchResult]]:
+        """Yield ``(job, result)`` pairs in job order.
+
+        Chunks go to a shared queue that idle workers pull from, so a worker
+        that finishes early simply takes the next chunk.  Only a small window
+        of chunks is queued at once and results are consumed strictly in
+        submission order, keeping output and callbacks independent of
+        scheduling.
+        """
+        if self._closed:
+            raise ValueError("self-play pool is closed")
+        jobs = iter(jobs)
+        first_job = next(jobs, None)
+        if first_job is None:
+            return
+        jobs = itertools.chain((first_job,), jobs)
+        scheduler = _ChunkScheduler(
+            self.worker_count,
+            job_count,
+            min(
+                first_job.max_turns,
+                _ESTIMATED_TURNS_PER_VICTORY_POINT * first_job.victory_target,
+            ),
         )
+        pending = collections.deque()
+
+        def submit_next_chunk() -> bool:
+            chunk = tuple(itertools.islice(jobs, scheduler.next_size()))
+            if not chunk:
+                return False
+            scheduler.remaining -= len(chunk)
+            pending.append((chunk, self._executor.submit(_run_match_chunk, chunk)))
+            return True
+
+        for _ in range(self.worker_count * _PENDING_CHUNKS_PER_WORKER):
+            if not submit_next_chunk():
+                break
+        try:
+            while pending:
+                chunk, future = pending.popleft()
+                matches = [_match_from_row(row) for row in future.result()]
+                scheduler.observe(matches)
+                submit_next_chunk()
+                yield from zip(chunk, matches)
+        finally:
+            for _chunk, future in pending:
+                future.cancel()
+
+
+def _batch_worker_count(
+    workers: int,
+    game_count: int,
+    pool: SelfPlayPool | None,
+) -> int:
+    if pool is None:
+        return _resolve_worker_count(workers, game_count)
+    if not isinstance(pool, SelfPlayPool):
+        raise TypeError("pool must be a SelfPlayPool")
+    return max(1, min(pool.worker_count, game_count))
+
+
+def _iter_ordered_results(
+    jobs: Iterable[_MatchJob],
+    job_count: int,
+    worker_count: int,
+    pool: SelfPlayPool | None = None,
+) -> Iterator[tuple[_MatchJob, MatchResult]]:
+    """Yield ``(job, result)`` pairs in job order, in process or on a pool."""
+    if pool is not None:
+        yield from pool.iter_results(jobs, job_count)
+    elif worker_count == 1:
+        for job in jobs:
+            yield job, _run_match_job(job)
+    else:
+        with SelfPlayPool(worker_count) as temporary_pool:
+            yield from temporary_pool.iter_results(jobs, job_count)
+
+
+def run_batch(
+    *,
+    game_count: int = DEFAULT_GAME_COUNT,
+    match_seed_start: int = 0,
+    match_seeds: Iterable[int] | None = None,
+    board_seed: int | None = None,
+    board_mode: str = "constrained",
+    player_count: int = 4,
+    victory_target: int = 10,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    max_action_steps: int = DEFAULT_MAX_ACTION_STEPS,
+    personalities: Iterable[str] | None = None,
+    progress: Callable[[int, int, MatchResult], None] | None = None,
+    workers: int = 1,
+    pool: SelfPlayPool | None = None,
+    rollout_config: RolloutConfig | None = None,
+) -> BatchResult:
+    """Run an ordered batch, optionally using isolated worker processes.
+
+    ``workers=0`` chooses a conservative automatic count (at most eight),
+    while ``workers=1`` preserves the original in-process execution path.
+    A :class:`SelfPlayPool` passed as ``pool`` runs the batch on its warm
+    workers instead, and ``workers`` is then ignored.  ``rollout_config``
+    is handed to every match (see :func:`run_match`).
+    Seeds, personality rotation, result order, and progress callback order are
+    resolved by the parent and therefore do not depend on scheduling.
+    """
+    plan = _plan_batch(
+        game_count=game_count,
+        match_seed_start=match_seed_start,
+        match_seeds=match_seeds,
+        board_seed=board_seed,
+        board_mode=board_mode,
+        player_count=player_count,
+        victory_target=victory_target,
+        max_turns=max_turns,
+        max_action_steps=max_action_steps,
+        personalities=personalities,
+        rollout_config=rollout_config,
+    )
+    game_count = plan.game_count
+    worker_count = _batch_worker_count(workers, game_count, pool)
 
     matches = []
-    caller_random_state = random.getstate()
-    try:
-        if worker_count == 1:
-            ordered_results = map(_run_match_job, jobs)
-            for job, match in zip(jobs, ordered_results):
-                matches.append(match)
-                if progress is not None:
-                    progress(job.index, game_count, match)
-        else:
-            spawn_context = multiprocessing.get_context("spawn")
-            with concurrent.futures.ProcessPoolExecutor(
-                max_workers=worker_count,
-                mp_context=spawn_context,
-            ) as executor:
-                # executor.map yields in input order even when later matches
-                # finish first, keeping results and callback delivery stable.
-                ordered_results = executor.map(_run_match_job, jobs, chunksize=1)
-                for job, match in zip(jobs, ordered_results):
-                    matches.append(match)
-                    if progress is not None:
-                        progress(job.index, game_count, match)
-    finally:
-        random.setstate(caller_random_state)
+    for job, match in _iter_ordered_results(
+        plan.iter_jobs(), game_count, worker_count, pool
+    ):
+        matches.append(match)
+        if progress is not None:
+            progress(job.index, game_count, match)
 
     completed = [match for match in matches if match.completed]
     win_counts = {seat: 0 for seat in range(1, player_count + 1)}
@@ -865,7 +1250,7 @@ def run_batch(
         board_mode=matches[0].board_mode,
         victory_target=victory_target,
         player_count=player_count,
-        personality_lineup=personality_lineup,
+        personality_lineup=plan.personality_lineup,
         win_counts=win_counts,
         average_turns=(
             fmean(match.turns for match in completed)
@@ -876,6 +1261,148 @@ def run_batch(
     )
 
 
+def _encode_log_record(record: Mapping) -> bytes:
+    return (
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def _recover_result_log(path: Path, plan: _BatchPlan, totals: _BatchTotals) -> int:
+    """Validate an existing log, fold its matches into ``totals``, and
+    return how many leading matches it already holds.
+
+    A trailing record without a newline was cut off mid-write by a crash or
+    interrupt; it is truncated so the next append starts on a clean line.
+    """
+    with path.open("r+b") as handle:
+        header_line = handle.readline()
+        if not header_line:
+            handle.write(_encode_log_record(plan.log_header()))
+            return 0
+        if not header_line.endswith(b"\n"):
+            handle.seek(0)
+            handle.truncate()
+            handle.write(_encode_log_record(plan.log_header()))
+            return 0
+        try:
+            header = json.loads(header_line)
+        except ValueError as exc:
+            raise ValueError(f"result log header is not valid JSON: {path}") from exc
+        if header != plan.log_header():
+            raise ValueError(
+                f"result log was written for different batch options: {path}"
+            )
+
+        completed = 0
+        valid_end = handle.tell()
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(
+                    f"result log record {completed + 1} is not valid JSON: {path}"
+                ) from exc
+            if completed >= plan.game_count:
+                raise ValueError(f"result log holds more matches than the batch: {path}")
+            expected_seed = plan.seeds[completed]
+            if (
+                not isinstance(record, dict)
+                or record.get("index") != completed + 1
+                or record.get("match_seed") != expected_seed
+            ):
+                raise ValueError(
+                    f"result log record {completed + 1} does not match seed "
+                    f"{expected_seed}: {path}"
+                )
+            totals.add(record)
+            completed += 1
+            valid_end = handle.tell()
+        handle.seek(valid_end)
+        handle.truncate()
+    return completed
+
+
+def run_batch_to_log(
+    result_log: os.PathLike[str] | str,
+    *,
+    game_count: int = DEFAULT_GAME_COUNT,
+    match_seed_start: int = 0,
+    match_seeds: Iterable[int] | None = None,
+    board_seed: int | None = None,
+    board_mode: str = "constrained",
+    player_count: int = 4,
+    victory_target: int = 10,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    max_action_steps: int = DEFAULT_MAX_ACTION_STEPS,
+    personalities: Iterable[str] | None = None,
+    progress: Callable[[int, int, MatchResult], None] | None = None,
+    workers: int = 1,
+    pool: SelfPlayPool | None = None,
+    rollout_config: RolloutConfig | None = None,
+) -> StreamedBatchResult:
+    """Run a batch while appending each match to an append-only JSONL log.
+
+    The first line records the batch options and every further line is one
+    ``MatchResult.to_dict()`` record with its one-based ``index``.  Only running
+    aggregates stay in memory.  When ``result_log`` already holds a prefix of
+    the same batch, that prefix is kept and the batch resumes after its last
+    completed seed; a log written for different options is rejected.
+    """
+    plan = _plan_batch(
+        game_count=game_count,
+        match_seed_start=match_seed_start,
+        match_seeds=match_seeds,
+        board_seed=board_seed,
+        board_mode=board_mode,
+        player_count=player_count,
+        victory_target=victory_target,
+        max_turns=max_turns,
+        max_action_steps=max_action_steps,
+        personalities=personalities,
+        rollout_config=rollout_config,
+    )
+    path = Path(result_log)
+    path.touch(exist_ok=True)
+    totals = _BatchTotals(player_count=plan.player_count)
+    resumed_games = _recover_result_log(path, plan, totals)
+    remaining_games = plan.game_count - resumed_games
+    worker_count = _batch_worker_count(workers, max(1, remaining_games), pool)
+
+    with path.open("ab") as handle:
+        jobs = plan.iter_jobs(resumed_games)
+        for job, match in _iter_ordered_results(
+            jobs, remaining_games, worker_count, pool
+        ):
+            record = {"index": job.index, **match.to_dict()}
+            handle.write(_encode_log_record(record))
+            # Flush per match so an interrupt loses at most the match that
+            # was still running.
+            handle.flush()
+            totals.add(record)
+            if progress is not None:
+                progress(job.index, plan.game_count, match)
+        os.fsync(handle.fileno())
+
+    return StreamedBatchResult(
+        result_log=str(path),
+        game_count=totals.game_count,
+        completed_games=totals.completed_games,
+        resumed_games=resumed_games,
+        board_seed=plan.board_seed,
+        board_mode=plan.board_mode,
+        victory_target=plan.victory_target,
+        player_count=plan.player_count,
+        personality_lineup=plan.personality_lineup,
+        win_counts=dict(totals.win_counts),
+        average_turns=totals.average_turns,
+        ai_cache_hits=totals.ai_cache_hits,
+        ai_cache_misses=totals.ai_cache_misses,
+        worker_count=worker_count,
+    )
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="カタン風ゲーム AI自己対戦シミュレーター")
     parser.add_argument("--games", type=int, default=DEFAULT_GAME_COUNT)
@@ -906,6 +1433,30 @@ def _build_parser() -> argparse.ArgumentParser:
         default=1,
         help="並列プロセス数。0で自動（最大8）、1で逐次実行",
     )
+    parser.add_argument(
+        "--rollouts",
+        type=int,
+        default=None,
+        help="rollout AIが候補ごとに試行する回数",
+    )
+    parser.add_argument(
+        "--rollout-time",
+        type=float,
+        default=None,
+        help="rollout AIの1判断あたりの時間予算（秒）",
+    )
+    parser.add_argument(
+        "--rollout-workers",
+        type=int,
+        default=None,
+        help="rollout AIの試行に使うプロセス数（省略時は試合プロセス内で実行）",
+    )
+    parser.add_argument(
+        "--result-log",
+        type=Path,
+        default=None,
+        help="試合ごとに追記するJSONL結果ログ。既存ログは最後の完了試合から再開",
+    )
     parser.add_argument("--pretty", action="store_true")
     return parser
 
@@ -913,20 +1464,27 @@ def _build_parser() -> argparse.ArgumentParser:
 def main(argv: list[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
+    options = {
+        "game_count": args.games,
+        "match_seed_start": args.match_seed,
+        "board_seed": args.board_seed,
+        "board_mode": args.mode,
+        "player_count": args.players,
+        "victory_target": args.target,
+        "max_turns": args.max_turns,
+        "max_action_steps": args.max_actions,
+        "personalities": args.personalities,
+        "workers": args.workers,
+    }
     try:
-        result = run_batch(
-            game_count=args.games,
-            match_seed_start=args.match_seed,
-            board_seed=args.board_seed,
-            board_mode=args.mode,
-            player_count=args.players,
-            victory_target=args.target,
-            max_turns=args.max_turns,
-            max_action_steps=args.max_actions,
-            personalities=args.personalities,
-            workers=args.workers,
+        options["rollout_config"] = rollout_config_from_options(
+            args.rollouts, args.rollout_time, args.rollout_workers
         )
-    except (TypeError, ValueError) as exc:
+        if args.result_log is None:
+            result = run_batch(**options)
+        else:
+            result = run_batch_to_log(args.result_log, **options)
+    except (OSError, TypeError, ValueError) as exc:
         parser.error(str(exc))
     print(
         json.dumps(
@@ -10,7 +10,8 @@ without a network connection.
 from __future__ import annotations
 
 import argparse
-from collections import Counter, defaultdict
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timezone
 import html
@@ -19,21 +20,27 @@ import math
 import os
 from pathlib import Path
 import re
-import statistics
 import tempfile
-from typing import Any, Iterable, Mapping, Optional, Sequence
+from typing import Any, Optional
 import unicodedata
 
 
 __all__ = (
     "DICE_WEIGHTS",
     "MAX_REPORT_MATCHES",
+    "MatchLog",
+    "ReportAggregator",
     "ReportError",
     "ReportPaths",
+    "aggregate_matches",
     "build_report_data",
+    "build_report_from_parts",
+    "read_match_log",
     "render_html_dashboard",
+    "render_html_match_page",
     "render_terminal_summary",
     "write_report",
+    "write_report_data",
 )
 
 
@@ -42,6 +49,8 @@ MAX_REPORT_MATCHES = 100_000
 MAX_HTML_MATCH_ROWS = 1_000
 MAX_HTML_BOARD_ROWS = 200
 MAX_INPUT_BYTES = 64 * 1024 * 1024
+MATCH_LOG_FORMAT = "catan-self-play-log"
+MATCH_LOG_VERSION = 1
 _SAFE_BASENAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,79}$")
 _MISSING = object()
 _ACTION_METRIC_KEYS = (
@@ -59,6 +68,7 @@ _PERSONALITY_DISPLAY_LABELS = {
     "trader": "交渉重視",
     "disruptor": "妨害重視",
     "blocker": "妨害重視",
+    "rollout": "探索型",
 }
 _PERSONALITY_ALIASES = {
     "standard": "standard",
@@ -68,8 +78,56 @@ _PERSONALITY_ALIASES = {
     "trader": "trader",
     "disruptor": "disruptor",
     "blocker": "disruptor",
+    "rollout": "rollout",
 }
 _BUILD_METRIC_KEYS = ("roads", "settlements", "cities")
+_NORMALISED_PERSONALITIES: dict[str, Optional[str]] = {}
+_DASHBOARD_CSS = """\
+    :root { color-scheme: dark; --bg:#07111d; --panel:#111f30; --line:#2e4964;
+      --ink:#f4f0df; --muted:#a8b9c9; --gold:#efc878; --sea:#55b6c9;
+      --green:#69c493; --red:#e97869; }
+    * { box-sizing:border-box; }
+    body { margin:0; background:radial-gradient(circle at 50% 0,#153753 0,var(--bg) 45%);
+      color:var(--ink); font-family:-apple-system,BlinkMacSystemFont,"Noto Sans JP",sans-serif;
+      line-height:1.55; }
+    main { width:min(1180px,calc(100% - 28px)); margin:0 auto; padding:34px 0 60px; }
+    h1 { margin:0; font-size:clamp(1.55rem,4vw,2.45rem); letter-spacing:.02em; }
+    h2 { margin:0 0 14px; font-size:1.16rem; }
+    .lead { color:var(--muted); margin:.35rem 0 1rem; }
+    .chips { display:flex; flex-wrap:wrap; gap:8px; }
+    .chip { border:1px solid var(--line); background:#0a1826; border-radius:999px;
+      padding:5px 11px; color:var(--muted); font-size:.86rem; }
+    .grid { display:grid; grid-template-columns:repeat(auto-fit,minmax(170px,1fr)); gap:12px; margin:22px 0; }
+    .card,.panel { border:1px solid var(--line); background:rgba(17,31,48,.94);
+      box-shadow:0 10px 30px #0004; border-radius:15px; }
+    .card { padding:16px; } .card small { color:var(--muted); }
+    .value { display:block; margin:4px 0 2px; color:var(--gold); font-size:1.65rem; font-weight:750; }
+    .layout { display:grid; grid-template-columns:1fr 1fr; gap:14px; }
+    .panel { min-width:0; padding:18px; overflow:hidden; } .wide { grid-column:1/-1; }
+    .scroll { max-width:100%; overflow:auto; border-radius:9px; }
+    table { width:100%; border-collapse:collapse; font-variant-numeric:tabular-nums; }
+    th,td { border-bottom:1px solid #294158; padding:9px 8px; text-align:right; white-space:nowrap; }
+    th:first-child,td:first-child { text-align:left; } th { color:var(--muted); font-size:.8rem; }
+    tbody tr:last-child td { border-bottom:0; }
+    .bar-track { min-width:100px; height:8px; border-radius:99px; background:#07111d; overflow:hidden; }
+    .bar { height:100%; border-radius:inherit; background:linear-gradient(90deg,var(--sea),var(--green)); }
+    .seat-stats { min-width:250px; white-space:normal; line-height:1.45; }
+    .seat-line { display:block; }
+    .positive { color:var(--green); } .negative { color:var(--red); } .muted { color:var(--muted); }
+    .empty { color:var(--muted); margin:0; }
+    .notice { border-left:3px solid var(--gold); background:#182435; color:var(--muted);
+      border-radius:0 9px 9px 0; padding:9px 12px; margin:14px 0 0; }
+    details summary { cursor:pointer; color:var(--gold); margin-bottom:12px; }
+    .pager { display:flex; flex-wrap:wrap; gap:6px; margin:0 0 12px; font-size:.84rem; }
+    .pager a,.pager span { border:1px solid var(--line); border-radius:7px; padding:3px 8px; }
+    .pager a { color:var(--sea); text-decoration:none; }
+    .pager span { color:var(--ink); background:#0a1826; }
+    footer { margin-top:18px; color:var(--muted); font-size:.82rem; text-align:center; }
+    @media(max-width:820px) { .grid { grid-template-columns:1fr 1fr; } .layout { grid-template-columns:1fr; }
+      .wide { grid-column:auto; } }
+    @media(max-width:480px) { main { width:min(100% - 18px,1180px); padding-top:22px; }
+      .grid { grid-template-columns:1fr; } .panel { padding:14px; } }
+"""
 
 
 class ReportError(ValueError):
@@ -80,6 +138,37 @@ class ReportError(ValueError):
 class ReportPaths:
     json_path: Path
     html_path: Path
+    match_page_paths: tuple[Path, ...] = ()
+
+
+@dataclass(frozen=True)
+class MatchLog:
+    """Lazily read view of a streamed JSONL self-play result log.
+
+    Iterating reopens the file and yields one match mapping per line, so the
+    raw log is never held in memory.  A final line without a newline is a
+    record that was still being written when the batch stopped and is skipped.
+    """
+
+    path: Path
+    metadata: Mapping[str, Any]
+
+    def __iter__(self):
+        try:
+            with self.path.open("rb") as handle:
+                handle.readline()
+                for line_number, line in enumerate(handle, start=2):
+                    if not line.endswith(b"\n"):
+                        return
+                    try:
+                        record = json.loads(line)
+                    except (UnicodeError, json.JSONDecodeError) as exc:
+                        raise ReportError(
+                            f"結果ログ{line_number}行目を読み込めませんでした: {self.path}"
+                        ) from exc
+                    yield record
+        except OSError as exc:
+            raise ReportError(f"結果ログを読み込めませんでした: {self.path}") from exc
 
 
 def build_report_data(
@@ -90,78 +179,79 @@ def build_report_data(
 ) -> dict[str, Any]:
     """Normalise a self-play batch and calculate dashboard statistics.
 
-    ``source`` may be a sequence of match mappings/dataclasses or a batch
-    mapping/dataclass containing ``matches``.  The canonical match fields are
+    ``source`` may be a sequence of match mappings/dataclasses, a batch
+    mapping/dataclass containing ``matches``, or a :class:`MatchLog`.  The canonical match fields are
     documented in ``docs/self-play-report.md``; a few conservative aliases are
     accepted to keep the report decoupled from the simulation runner.
     """
 
     raw_matches, source_metadata = _extract_batch(source)
-    if len(raw_matches) > MAX_REPORT_MATCHES:
-        raise ReportError(f"1レポートは最大 {MAX_REPORT_MATCHES:,} 試合です。")
-
-    matches = [_normalise_match(match, index) for index, match in enumerate(raw_matches)]
     combined_metadata = dict(source_metadata)
     if metadata is not None:
         combined_metadata.update(_as_mapping(metadata, "metadata"))
+    return build_report_from_parts(
+        (aggregate_matches(raw_matches),),
+        metadata=combined_metadata,
+        generated_at=generated_at,
+    )
 
-    total = len(matches)
-    completed = sum(bool(match["completed"]) for match in matches)
-    winner_known = sum(match["winner_seat"] is not None for match in matches)
-    turns = [
-        match["turns"]
-        for match in matches
-        if match["completed"] and match["turns"] is not None
-    ]
 
-    seat_rows = _seat_statistics(matches)
-    personality_rows = _personality_statistics(matches)
-    personality_seat_rows = _personality_seat_statistics(matches)
-    personality_matchup_rows = _personality_matchup_statistics(matches)
-    starting_seat_rows = _starting_seat_statistics(matches)
-    turn_position_rows = _turn_position_statistics(matches)
-    initial_placement_rows = _initial_placement_statistics(matches)
-    initial_pip_rows = _initial_pip_statistics(matches)
-    dice_rows, total_rolls, dice_gap = _dice_statistics(matches)
-    board_fairness_overview, board_fairness_rows = _board_fairness_statistics(matches)
-    integrity_failures = sum(bool(match["validation_errors"]) for match in matches)
-
-    summary: dict[str, Any] = {
-        "matches": total,
-        "completed": completed,
-        "completion_rate": _ratio(completed, total),
-        "winner_known": winner_known,
-        "integrity_failures": integrity_failures,
-        "integrity_rate": _ratio(total - integrity_failures, total),
-        "average_turns": _mean_or_none(turns),
-        "median_turns": _median_or_none(turns),
-        "total_rolls": total_rolls,
-        "dice_total_variation": dice_gap,
-        "seat_statistics": seat_rows,
-        "personality_statistics": personality_rows,
-        "personality_seat_statistics": personality_seat_rows,
-        "personality_matchup_statistics": personality_matchup_rows,
-        "starting_seat_statistics": starting_seat_rows,
-        "turn_position_statistics": turn_position_rows,
-        "initial_placement_statistics": initial_placement_rows,
-        "initial_pip_statistics": initial_pip_rows,
-        "dice_statistics": dice_rows,
-        "board_fairness_overview": board_fairness_overview,
-        "board_fairness_statistics": board_fairness_rows,
-    }
+def aggregate_matches(
+    raw_matches: Iterable[Any],
+    *,
+    start: int = 0,
+) -> tuple[list[dict[str, Any]], ReportAggregator]:
+    """Normalise matches and fold them into a fresh :class:`ReportAggregator`.
 
-    report: dict[str, Any] = {
+    ``start`` is the batch index of the first match, so that a slice handled
+    by a worker keeps the batch-wide match numbers and error labels.  The
+    returned pair is one part for :func:`build_report_from_parts`.
+    """
+
+    if not isinstance(start, int) or isinstance(start, bool) or start < 0:
+        raise ReportError("startは0以上の整数にしてください。")
+    aggregator = ReportAggregator()
+    matches = []
+    for index, raw in enumerate(raw_matches, start=start):
+        if index >= MAX_REPORT_MATCHES:
+            raise ReportError(f"1レポートは最大 {MAX_REPORT_MATCHES:,} 試合です。")
+        match = _normalise_match(raw, index)
+        aggregator.add(match)
+        matches.append(match)
+    return matches, aggregator
+
+
+def build_report_from_parts(
+    parts: Iterable[tuple[Sequence[Mapping[str, Any]], ReportAggregator]],
+    *,
+    metadata: Optional[Mapping[str, Any]] = None,
+    generated_at: Optional[str] = None,
+) -> dict[str, Any]:
+    """Merge consecutive :func:`aggregate_matches` parts into one report."""
+
+    combined_metadata = {} if metadata is None else dict(_as_mapping(metadata, "metadata"))
+    aggregator = ReportAggregator()
+    matches: list[Mapping[str, Any]] = []
+    for part_matches, part in parts:
+        if len(part_matches) != part.matches:
+            raise ReportError("集計パートの試合数が一致しません。")
+        if part_matches and part_matches[0].get("match_number") != len(matches) + 1:
+            raise ReportError("集計パートは試合順に連続させてください。")
+        aggregator.merge(part)
+        matches.extend(part_matches)
+    if len(matches) > MAX_REPORT_MATCHES:
+        raise ReportError(f"1レポートは最大 {MAX_REPORT_MATCHES:,} 試合です。")
+
+    # Matches are JSON-safe by construction and the metadata is checked here,
+    # so the payload is not re-encoded just to validate it.
+    return {
         "format": "catan-self-play-report",
         "version": 1,
         "generated_at": generated_at or datetime.now(timezone.utc).isoformat(),
         "metadata": _json_safe(combined_metadata, "metadata"),
-        "summary": summary,
+        "summary": aggregator.summary(),
         "matches": matches,
     }
-    # Validate the exact payload now, rather than failing halfway through an
-    # atomic file write later.
-    _encode_json(report)
-    return report
 
 
 def render_terminal_summary(report: Mapping[str, Any]) -> str:
@@ -239,14 +329,26 @@ def render_terminal_summary(report: Mapping[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def render_html_dashboard(report: Mapping[str, Any]) -> str:
-    """Render a responsive, script-free, offline HTML dashboard."""
+def render_html_dashboard(
+    report: Mapping[str, Any],
+    *,
+    match_pages_basename: Optional[str] = None,
+) -> str:
+    """Render a responsive, script-free, offline HTML dashboard.
+
+    The dashboard embeds the summary tables and the first
+    :data:`MAX_HTML_MATCH_ROWS` matches.  With ``match_pages_basename`` it
+    links the remaining matches on the pages written by
+    :func:`write_report_data`; otherwise it points to the JSON for them.
+    """
 
     summary = _report_summary(report)
     metadata = report.get("metadata", {})
     matches = report.get("matches", [])
     if not isinstance(metadata, Mapping) or not isinstance(matches, Sequence):
         raise ReportError("レポートのmetadataまたはmatchesが不正です。")
+    if match_pages_basename is not None:
+        _check_basename(match_pages_basename)
 
     title = "CATAN風 AI自己対戦ダッシュボード"
     meta_chips = []
@@ -261,6 +363,7 @@ def render_html_dashboard(report: Mapping[str, Any]) -> str:
         ("personality_lineup", "AI性格"),
         ("workers_requested", "並列指定"),
         ("workers_used", "並列数"),
+        ("resumed_games", "ログから再開"),
         ("duration_seconds", "実行秒"),
     )
     for key, label in metadata_labels:
@@ -334,12 +437,15 @@ def render_html_dashboard(report: Mapping[str, Any]) -> str:
     dice_table = _dice_table(summary.get("dice_statistics", []))
     displayed_matches = matches[:MAX_HTML_MATCH_ROWS]
     match_table = _match_table(displayed_matches)
-    match_limit_note = (
-        f'<p class="notice">個別表は先頭{MAX_HTML_MATCH_ROWS:,}試合まで表示します。'
-        "全結果はJSONに保存されています。</p>"
-        if len(matches) > MAX_HTML_MATCH_ROWS
-        else ""
-    )
+    if len(matches) <= MAX_HTML_MATCH_ROWS:
+        match_limit_note = ""
+    elif match_pages_basename is None:
+        match_limit_note = (
+            f'<p class="notice">個別表は先頭{MAX_HTML_MATCH_ROWS:,}試合まで表示します。'
+            "全結果はJSONに保存されています。</p>"
+        )
+    else:
+        match_limit_note = _match_page_nav(report, 1, match_pages_basename)
 
     sample_notice = (
         '<p class="notice">全体100戦未満、または各比較行20出場未満の勝率は振れ幅が大きいため、傾向把握用として見てください。</p>'
@@ -347,60 +453,7 @@ def render_html_dashboard(report: Mapping[str, Any]) -> str:
         else ""
     )
 
-    return f"""<!doctype html>
-<html lang="ja">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <meta name="referrer" content="no-referrer">
-  <meta http-equiv="Content-Security-Policy" content="default-src 'none'; style-src 'unsafe-inline'; img-src data:; base-uri 'none'; form-action 'none'">
-  <title>{_h(title)}</title>
-  <style>
-    :root {{ color-scheme: dark; --bg:#07111d; --panel:#111f30; --line:#2e4964;
-      --ink:#f4f0df; --muted:#a8b9c9; --gold:#efc878; --sea:#55b6c9;
-      --green:#69c493; --red:#e97869; }}
-    * {{ box-sizing:border-box; }}
-    body {{ margin:0; background:radial-gradient(circle at 50% 0,#153753 0,var(--bg) 45%);
-      color:var(--ink); font-family:-apple-system,BlinkMacSystemFont,"Noto Sans JP",sans-serif;
-      line-height:1.55; }}
-    main {{ width:min(1180px,calc(100% - 28px)); margin:0 auto; padding:34px 0 60px; }}
-    h1 {{ margin:0; font-size:clamp(1.55rem,4vw,2.45rem); letter-spacing:.02em; }}
-    h2 {{ margin:0 0 14px; font-size:1.16rem; }}
-    .lead {{ color:var(--muted); margin:.35rem 0 1rem; }}
-    .chips {{ display:flex; flex-wrap:wrap; gap:8px; }}
-    .chip {{ border:1px solid var(--line); background:#0a1826; border-radius:999px;
-      padding:5px 11px; color:var(--muted); font-size:.86rem; }}
-    .grid {{ display:grid; grid-template-columns:repeat(auto-fit,minmax(170px,1fr)); gap:12px; margin:22px 0; }}
-    .card,.panel {{ border:1px solid var(--line); background:rgba(17,31,48,.94);
-      box-shadow:0 10px 30px #0004; border-radius:15px; }}
-    .card {{ padding:16px; }} .card small {{ color:var(--muted); }}
-    .value {{ display:block; margin:4px 0 2px; color:var(--gold); font-size:1.65rem; font-weight:750; }}
-    .layout {{ display:grid; grid-template-columns:1fr 1fr; gap:14px; }}
-    .panel {{ min-width:0; padding:18px; overflow:hidden; }} .wide {{ grid-column:1/-1; }}
-    .scroll {{ max-width:100%; overflow:auto; border-radius:9px; }}
-    table {{ width:100%; border-collapse:collapse; font-variant-numeric:tabular-nums; }}
-    th,td {{ border-bottom:1px solid #294158; padding:9px 8px; text-align:right; white-space:nowrap; }}
-    th:first-child,td:first-child {{ text-align:left; }} th {{ color:var(--muted); font-size:.8rem; }}
-    tbody tr:last-child td {{ border-bottom:0; }}
-    .bar-track {{ min-width:100px; height:8px; border-radius:99px; background:#07111d; overflow:hidden; }}
-    .bar {{ height:100%; border-radius:inherit; background:linear-gradient(90deg,var(--sea),var(--green)); }}
-    .seat-stats {{ min-width:250px; white-space:normal; line-height:1.45; }}
-    .seat-line {{ display:block; }}
-    .positive {{ color:var(--green); }} .negative {{ color:var(--red); }} .muted {{ color:var(--muted); }}
-    .empty {{ color:var(--muted); margin:0; }}
-    .notice {{ border-left:3px solid var(--gold); background:#182435; color:var(--muted);
-      border-radius:0 9px 9px 0; padding:9px 12px; margin:14px 0 0; }}
-    details summary {{ cursor:pointer; color:var(--gold); margin-bottom:12px; }}
-    footer {{ margin-top:18px; color:var(--muted); font-size:.82rem; text-align:center; }}
-    @media(max-width:820px) {{ .grid {{ grid-template-columns:1fr 1fr; }} .layout {{ grid-template-columns:1fr; }}
-      .wide {{ grid-column:auto; }} }}
-    @media(max-width:480px) {{ main {{ width:min(100% - 18px,1180px); padding-top:22px; }}
-      .grid {{ grid-template-columns:1fr; }} .panel {{ padding:14px; }} }}
-  </style>
-</head>
-<body>
-<main>
-  <header>
+    body = f"""  <header>
     <h1>{_h(title)}</h1>
     <p class="lead">seed付き自己対戦の結果を、席順・AI性格・ダイス分布から確認できます。</p>
     <div class="chips">{''.join(meta_chips)}</div>
@@ -420,13 +473,83 @@ def render_html_dashboard(report: Mapping[str, Any]) -> str:
     <section class="panel wide"><h2>盤面公平性</h2>{board_fairness_table}</section>
     <section class="panel wide"><details open><summary>個別試合 {len(displayed_matches)} / {len(matches)}件</summary>{match_limit_note}{match_table}</details></section>
   </div>
-  <footer>完全ローカルHTML · 外部通信、JavaScript、トラッキングなし · {_h(report.get('generated_at', ''))}</footer>
+"""
+    return _html_document(title, body, report.get("generated_at", ""))
+
+
+def render_html_match_page(
+    report: Mapping[str, Any],
+    page: int,
+    *,
+    basename: str,
+) -> str:
+    """Render one numbered page of the match list linked from the dashboard.
+
+    Page 1 is the dashboard itself, so ``page`` starts at 2.
+    """
+
+    _check_basename(basename)
+    matches = report.get("matches", [])
+    if not isinstance(matches, Sequence):
+        raise ReportError("レポートのmatchesが不正です。")
+    page_count = _match_page_count(report)
+    if isinstance(page, bool) or not isinstance(page, int) or not 2 <= page <= page_count:
+        raise ReportError(f"個別試合ページは2〜{page_count}で指定してください。")
+
+    first = (page - 1) * MAX_HTML_MATCH_ROWS
+    displayed_matches = matches[first : first + MAX_HTML_MATCH_ROWS]
+    title = f"個別試合 {page} / {page_count}ページ"
+    body = f"""  <header>
+    <h1>{_h(title)}</h1>
+    <p class="lead">試合 {first + 1:,}〜{first + len(displayed_matches):,} / {len(matches):,}件</p>
+  </header>
+  <section class="panel">{_match_page_nav(report, page, basename)}{_match_table(displayed_matches)}</section>
+"""
+    return _html_document(title, body, report.get("generated_at", ""))
+
+
+def _html_document(title: str, body: str, generated_at: Any) -> str:
+    return f"""<!doctype html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <meta name="referrer" content="no-referrer">
+  <meta http-equiv="Content-Security-Policy" content="default-src 'none'; style-src 'unsafe-inline'; img-src data:; base-uri 'none'; form-action 'none'">
+  <title>{_h(title)}</title>
+  <style>
+{_DASHBOARD_CSS}  </style>
+</head>
+<body>
+<main>
+{body}  <footer>完全ローカルHTML · 外部通信、JavaScript、トラッキングなし · {_h(generated_at)}</footer>
 </main>
 </body>
 </html>
 """
 
 
+def _match_page_count(report: Mapping[str, Any]) -> int:
+    matches = report.get("matches", [])
+    return max(1, math.ceil(len(matches) / MAX_HTML_MATCH_ROWS))
+
+
+def _match_page_name(basename: str, page: int) -> str:
+    return f"{basename}.html" if page == 1 else f"{basename}-matches-{page}.html"
+
+
+def _match_page_nav(report: Mapping[str, Any], current: int, basename: str) -> str:
+    links = []
+    for page in range(1, _match_page_count(report) + 1):
+        first = (page - 1) * MAX_HTML_MATCH_ROWS + 1
+        label = f"{first:,}〜"
+        if page == current:
+            links.append(f'<span aria-current="page">{_h(label)}</span>')
+        else:
+            links.append(f'<a href="{_h(_match_page_name(basename, page))}">{_h(label)}</a>')
+    return f'<nav class="pager" aria-label="個別試合ページ">{"".join(links)}</nav>'
+
+
 def write_report(
     source: Any,
     output_dir: os.PathLike[str] | str,
@@ -437,24 +560,62 @@ def write_report(
 ) -> ReportPaths:
     """Atomically write JSON and HTML reports and return their paths."""
 
-    if not isinstance(basename, str) or not _SAFE_BASENAME.fullmatch(basename):
-        raise ReportError("basenameは英数字・点・ハイフン・下線（80文字以内）で指定してください。")
+    _check_basename(basename)
+    report = build_report_data(source, metadata=metadata, generated_at=generated_at)
+    return write_report_data(report, output_dir, basename=basename)
+
+
+def write_report_data(
+    report: Mapping[str, Any],
+    output_dir: os.PathLike[str] | str,
+    *,
+    basename: str = "self-play-report",
+) -> ReportPaths:
+    """Atomically write an already built report and return its paths.
+
+    Matches beyond the first :data:`MAX_HTML_MATCH_ROWS` go to numbered
+    ``<basename>-matches-<n>.html`` pages linked from the dashboard; pages
+    left over from an earlier, larger report are removed.
+    """
+
+    _check_basename(basename)
     directory = Path(output_dir).expanduser()
     directory.mkdir(parents=True, exist_ok=True)
     if not directory.is_dir():
         raise ReportError("レポート出力先がディレクトリではありません。")
 
-    report = build_report_data(source, metadata=metadata, generated_at=generated_at)
-    json_text = _encode_json(report) + "\n"
-    html_text = render_html_dashboard(report)
+    json_text = _encode_report(report)
+    html_text = render_html_dashboard(report, match_pages_basename=basename)
     json_path = directory / f"{basename}.json"
     html_path = directory / f"{basename}.html"
     _atomic_write_text(json_path, json_text)
+    page_paths = []
+    page_count = _match_page_count(report)
+    for page in range(2, page_count + 1):
+        page_path = directory / _match_page_name(basename, page)
+        _atomic_write_text(
+            page_path, render_html_match_page(report, page, basename=basename)
+        )
+        page_paths.append(page_path)
     _atomic_write_text(html_path, html_text)
-    return ReportPaths(json_path=json_path, html_path=html_path)
+    page_pattern = re.compile(rf"{re.escape(basename)}-matches-([0-9]+)\.html")
+    for stale in directory.glob(f"{basename}-matches-*.html"):
+        found = page_pattern.fullmatch(stale.name)
+        if found and not 2 <= int(found.group(1)) <= page_count:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return ReportPaths(
+        json_path=json_path,
+        html_path=html_path,
+        match_page_paths=tuple(page_paths),
+    )
 
 
-def _extract_batch(source: Any) -> tuple[list[Any], dict[str, Any]]:
+def _extract_batch(source: Any) -> tuple[Iterable[Any], dict[str, Any]]:
+    if isinstance(source, MatchLog):
+        return source, dict(source.metadata)
     if is_dataclass(source) and not isinstance(source, type):
         source = asdict(source)
     if isinstance(source, Mapping):
@@ -633,18 +794,17 @@ def _normalise_players(raw: Any, match_index: int) -> list[dict[str, Any]]:
     players = []
     seen_seats = set()
     for fallback_seat, value in enumerate(raw):
-        player = _as_mapping(value, f"matches[{match_index}].players[{fallback_seat}]")
+        where = f"matches[{match_index}].players[{fallback_seat}]"
+        player = _as_mapping(value, where)
         seat_from_index = "seat" not in player and "seat_index" in player
         seat = _non_negative_int(
             _first(player, "seat", "seat_index", default=fallback_seat + 1),
-            f"matches[{match_index}].players[{fallback_seat}].seat",
+            f"{where}.seat",
         )
         if seat_from_index:
             seat += 1
         elif seat == 0:
-            raise ReportError(
-                f"matches[{match_index}].players[{fallback_seat}].seatは1始まりです。"
-            )
+            raise ReportError(f"{where}.seatは1始まりです。")
         if seat in seen_seats:
             raise ReportError(f"matches[{match_index}].playersの席番号が重複しています。")
         seen_seats.add(seat)
@@ -654,14 +814,9 @@ def _normalise_players(raw: Any, match_index: int) -> list[dict[str, Any]]:
         if raw_resources is None:
             raw_resources = {}
         if not isinstance(raw_resources, Mapping):
-            raise ReportError(
-                f"matches[{match_index}].players[{fallback_seat}].resourcesは辞書にしてください。"
-            )
+            raise ReportError(f"{where}.resourcesは辞書にしてください。")
         resources = {
-            str(resource): _non_negative_int(
-                amount,
-                f"matches[{match_index}].players[{fallback_seat}].resources[{resource}]",
-            )
+            str(resource): _non_negative_int(amount, f"{where}.resources[{resource}]")
             for resource, amount in raw_resources.items()
         }
         action_counts = _normalise_action_counts(
@@ -675,59 +830,55 @@ def _normalise_players(raw: Any, match_index: int) -> list[dict[str, Any]]:
                 "name": str(_first(player, "name", default=f"Player{seat}")),
                 "personality": _normalise_personality(personality),
                 "action_counts": action_counts,
-                "vp": _optional_non_negative_int(
-                    vp, f"matches[{match_index}].players[{fallback_seat}].vp"
-                ),
+                "vp": _optional_non_negative_int(vp, f"{where}.vp"),
                 "public_vp": _optional_non_negative_int(
                     _first(player, "public_vp", "public_victory_points", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].public_vp",
+                    f"{where}.public_vp",
                 ),
                 "resources": resources,
                 "resource_cards": _optional_non_negative_int(
                     _first(player, "resource_cards", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].resource_cards",
+                    f"{where}.resource_cards",
                 ),
                 "roads": _optional_non_negative_int(
                     _first(player, "roads", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].roads",
+                    f"{where}.roads",
                 ),
                 "settlements": _optional_non_negative_int(
                     _first(player, "settlements", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].settlements",
+                    f"{where}.settlements",
                 ),
                 "cities": _optional_non_negative_int(
                     _first(player, "cities", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].cities",
+                    f"{where}.cities",
                 ),
                 "knights": _optional_non_negative_int(
                     _first(player, "knights", "played_knights", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].knights",
+                    f"{where}.knights",
                 ),
                 "initial_pips": _optional_non_negative_int(
                     _first(player, "initial_pips", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].initial_pips",
+                    f"{where}.initial_pips",
                 ),
                 "initial_high_probability_access": _optional_bool(
                     _first(player, "initial_high_probability_access", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}]"
-                    ".initial_high_probability_access",
+                    f"{where}.initial_high_probability_access",
                 ),
                 "initial_resource_diversity": _optional_non_negative_int(
                     _first(player, "initial_resource_diversity", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}]"
-                    ".initial_resource_diversity",
+                    f"{where}.initial_resource_diversity",
                 ),
                 "longest_road": _optional_bool(
                     _first(player, "longest_road", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].longest_road",
+                    f"{where}.longest_road",
                 ),
                 "largest_army": _optional_bool(
                     _first(player, "largest_army", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].largest_army",
+                    f"{where}.largest_army",
                 ),
                 "won": _optional_bool(
                     _first(player, "won", default=None),
-                    f"matches[{match_index}].players[{fallback_seat}].won",
+                    f"{where}.won",
                 ),
             }
         )
@@ -779,313 +930,494 @@ def _normalise_action_counts(
     return result
 
 
-def _seat_statistics(matches: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
-    seats = sorted(
-        {
-            player["seat"]
-            for match in matches
-            for player in match["players"]
-        }
-        | {
-            match["winner_seat"]
-            for match in matches
-            if match["winner_seat"] is not None
-        }
-    )
-    playerless_matches = [match for match in matches if not match["players"]]
-    rows = []
-    for seat in seats:
-        wins = sum(
-            match["completed"] and match["winner_seat"] == seat
-            for match in matches
-        )
-        vp_values = [
-            player["vp"]
-            for match in matches
-            for player in match["players"]
-            if match["completed"]
-            and player["seat"] == seat
-            and player["vp"] is not None
-        ]
-        appearances = sum(
-            any(player["seat"] == seat for player in match["players"])
-            for match in matches
-        ) + len(playerless_matches)
-        completed_appearances = sum(
-            match["completed"] and any(player["seat"] == seat for player in match["players"])
-            for match in matches
-        ) + sum(match["completed"] for match in playerless_matches)
-        rows.append(
-            {
-                "seat": seat,
-                "seat_label": f"席{seat}",
-                "appearances": appearances,
-                "completed_appearances": completed_appearances,
-                "wins": wins,
-                "win_rate": _ratio(wins, completed_appearances),
-                "average_vp": _mean_or_none(vp_values),
-            }
-        )
-    return rows
+class ReportAggregator:
+    """Mergeable running totals behind every report statistic.
 
+    :meth:`add` folds one normalised match into counters in a single pass, and
+    :meth:`merge` adds another aggregator's counters, so partial aggregates of
+    consecutive slices of a batch (for example one per worker process) combine
+    into exactly the statistics of the whole batch.  The state is plain
+    counters, lists and dicts, so it is cheap to pickle.
+    """
 
-def _personality_statistics(matches: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
-    appearances: Counter[str] = Counter()
-    completed_appearances: Counter[str] = Counter()
-    wins: Counter[str] = Counter()
-    vp_values: dict[str, list[int]] = defaultdict(list)
-    action_values: dict[str, dict[str, list[int]]] = {
-        key: defaultdict(list) for key in _ACTION_METRIC_KEYS
-    }
-    build_values: dict[str, dict[str, list[int]]] = {
-        key: defaultdict(list) for key in _BUILD_METRIC_KEYS
-    }
-    for match in matches:
-        for player in match["players"]:
-            personality = player["personality"]
-            if not personality:
-                continue
-            appearances[personality] += 1
-            if match["completed"]:
-                completed_appearances[personality] += 1
-            if match["completed"] and player["vp"] is not None:
-                vp_values[personality].append(player["vp"])
-            if match["completed"]:
-                for key in _ACTION_METRIC_KEYS:
-                    value = player["action_counts"].get(key)
-                    if value is not None:
-                        action_values[key][personality].append(value)
-                for key in _BUILD_METRIC_KEYS:
-                    value = player.get(key)
-                    if value is not None:
-                        build_values[key][personality].append(value)
-            if match["completed"] and match["winner_seat"] == player["seat"]:
-                wins[personality] += 1
-    return [
-        {
-            "personality": personality,
-            "appearances": appearances[personality],
-            "completed_appearances": completed_appearances[personality],
-            "wins": wins[personality],
-            "win_rate": _ratio(wins[personality], completed_appearances[personality]),
-            "average_vp": _mean_or_none(vp_values[personality]),
-            **{
-                f"average_{key}": (
-                    _mean_or_none(action_values[key][personality])
-                    if len(action_values[key][personality])
-                    == completed_appearances[personality]
-                    else None
-                )
-                for key in _ACTION_METRIC_KEYS
-            },
-            **{
-                f"average_{key}": (
-                    _mean_or_none(build_values[key][personality])
-                    if len(build_values[key][personality])
-                    == completed_appearances[personality]
-                    else None
-                )
-                for key in _BUILD_METRIC_KEYS
-            },
-        }
-        for personality in sorted(appearances)
-    ]
-
+    def __init__(self) -> None:
+        self.matches = 0
+        self.completed = 0
+        self.winner_known = 0
+        self.integrity_failures = 0
+        self.valid_completed = 0
+        self.completed_turns: Counter[int] = Counter()
+        self.dice_counts = [0] * len(DICE_WEIGHTS)
+        # Matches without a participant list count towards every seat.
+        self.playerless = [0, 0]
+        # seat -> [appearances, completed, wins, vp total, vp samples]
+        self.seats: dict[int, list[int]] = {}
+        # personality -> the seat tally, then (total, samples) per action
+        # metric and per build metric.
+        self.personalities: dict[str, list[int]] = {}
+        self.personality_seats: dict[tuple[str, int], list[int]] = {}
+        # (personality_a, personality_b) -> [comparisons, wins, ties, margin total]
+        self.matchups: dict[tuple[str, str], list[int]] = {}
+        # seat or position -> [appearances, completed, wins]
+        self.starting_seats: dict[int, list[int]] = {}
+        self.turn_positions: dict[int, list[int]] = {}
+        # access -> [appearances, completed, wins, pip total, pip samples,
+        #            diversity total, diversity samples]
+        self.initial_placement: dict[bool, list[int]] = {}
+        # initial pips -> the seat tally
+        self.initial_pips: dict[int, list[int]] = {}
+        # (mode, seed, player count) -> [matches, turn total, turn samples,
+        #                                {seat: [appearances, wins]}]
+        self.boards: dict[tuple[str, Any, int], list[Any]] = {}
+
+    def add(self, match: Mapping[str, Any]) -> None:
+        """Fold one match as returned by the report normaliser."""
+
+        completed = match["completed"]
+        winner = match["winner_seat"]
+        players = match["players"]
+        self.matches += 1
+        if completed:
+            self.completed += 1
+            if match["turns"] is not None:
+                self.completed_turns[match["turns"]] += 1
+        if winner is not None:
+            self.winner_known += 1
+        if match["validation_errors"]:
+            self.integrity_failures += 1
+        else:
+            dice_counts = match["dice_counts"]
+            for slot, total in enumerate(DICE_WEIGHTS):
+                self.dice_counts[slot] += dice_counts[str(total)]
 
-def _personality_seat_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> list[dict[str, Any]]:
-    observations: dict[tuple[str, int], list[tuple[Mapping[str, Any], Mapping[str, Any]]]] = (
-        defaultdict(list)
-    )
-    for match in matches:
-        for player in match["players"]:
+        if not players:
+            self.playerless[0] += 1
+            self.playerless[1] += completed
+        for player in players:
+            seat = player["seat"]
+            won = completed and winner == seat
+            vp = player["vp"] if completed else None
+            _tally(self.seats, seat, 5, completed, False, vp)
             personality = player["personality"]
             if personality:
-                observations[(personality, player["seat"])].append((match, player))
-
-    rows = []
-    for (personality, seat), entries in sorted(observations.items()):
-        completed = [entry for entry in entries if entry[0]["completed"]]
-        wins = sum(
-            match["winner_seat"] == player["seat"]
-            for match, player in completed
-        )
-        vp_values = [
-            player["vp"]
-            for _match, player in completed
-            if player["vp"] is not None
-        ]
-        rows.append(
-            {
-                "personality": personality,
-                "seat": seat,
-                "appearances": len(entries),
-                "completed_appearances": len(completed),
-                "wins": wins,
-                "win_rate": _ratio(wins, len(completed)),
-                "average_vp": _mean_or_none(vp_values),
-            }
-        )
-    return rows
-
-
-def _personality_matchup_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> list[dict[str, Any]]:
-    """Compare every different-personality player pair by final VP.
-
-    Each physical player pair contributes one comparison in each direction.
-    Storing both directions makes the JSON convenient for matrix consumers and
-    also guarantees that A-vs-B wins/margins are the inverse of B-vs-A.
-    """
+                tally = _tally(
+                    self.personalities,
+                    personality,
+                    5 + 2 * (len(_ACTION_METRIC_KEYS) + len(_BUILD_METRIC_KEYS)),
+                    completed,
+                    won,
+                    vp,
+                )
+                if completed:
+                    slot = 5
+                    action_counts = player["action_counts"]
+                    for key in _ACTION_METRIC_KEYS:
+                        value = action_counts.get(key)
+                        if value is not None:
+                            tally[slot] += value
+                            tally[slot + 1] += 1
+                        slot += 2
+                    for key in _BUILD_METRIC_KEYS:
+                        value = player.get(key)
+                        if value is not None:
+                            tally[slot] += value
+                            tally[slot + 1] += 1
+                        slot += 2
+                _tally(
+                    self.personality_seats, (personality, seat), 5, completed, won, vp
+                )
+            access = player["initial_high_probability_access"]
+            if access is not None:
+                tally = _tally(self.initial_placement, access, 7, completed, won, None)
+                if player["initial_pips"] is not None:
+                    tally[3] += player["initial_pips"]
+                    tally[4] += 1
+                if player["initial_resource_diversity"] is not None:
+                    tally[5] += player["initial_resource_diversity"]
+                    tally[6] += 1
+            if player["initial_pips"] is not None:
+                _tally(self.initial_pips, player["initial_pips"], 5, completed, won, vp)
+        if winner is not None and completed:
+            self.seats.setdefault(winner, [0] * 5)[2] += 1
+        elif winner is not None:
+            self.seats.setdefault(winner, [0] * 5)
+
+        starting_seat = match["starting_player_seat"]
+        if starting_seat is not None:
+            _tally(
+                self.starting_seats,
+                starting_seat,
+                3,
+                completed,
+                completed and winner == starting_seat,
+                None,
+            )
+        for position, seat in enumerate(match["turn_order"]):
+            _tally(
+                self.turn_positions,
+                position,
+                3,
+                completed,
+                completed and winner == seat,
+                None,
+            )
 
-    observations: dict[tuple[str, str], list[int]] = defaultdict(list)
-    for match in matches:
         if not _is_valid_completed_match(match):
-            continue
-        players = [
+            return
+        self.valid_completed += 1
+        compared = [
             player
-            for player in match["players"]
+            for player in players
             if player.get("personality") and player.get("vp") is not None
         ]
-        for left_index, left in enumerate(players):
-            for right in players[left_index + 1 :]:
+        for left_index, left in enumerate(compared):
+            for right in compared[left_index + 1 :]:
                 left_personality = left["personality"]
                 right_personality = right["personality"]
                 if left_personality == right_personality:
                     continue
                 margin = left["vp"] - right["vp"]
-                observations[(left_personality, right_personality)].append(margin)
-                observations[(right_personality, left_personality)].append(-margin)
-
-    rows = []
-    for (personality_a, personality_b), margins in sorted(observations.items()):
-        wins = sum(margin > 0 for margin in margins)
-        ties = sum(margin == 0 for margin in margins)
-        losses = len(margins) - wins - ties
-        comparison_points = wins + ties * 0.5
-        interval_low, interval_high = _wilson_interval(comparison_points, len(margins))
-        rows.append(
-            {
-                "personality_a": personality_a,
-                "personality_b": personality_b,
-                "comparisons": len(margins),
-                "wins": wins,
-                "ties": ties,
-                "losses": losses,
-                "score_rate": _ratio(comparison_points, len(margins)),
-                "score_rate_ci95": {
-                    "lower": interval_low,
-                    "upper": interval_high,
-                },
-                "average_vp_margin": _mean_or_none(margins),
-            }
-        )
-    return rows
-
-
-def _board_fairness_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> tuple[dict[str, Any], list[dict[str, Any]]]:
-    """Summarise repeated boards without emitting every one-off seed.
-
-    A board identity includes generation mode, seed and player count.  Only
-    completed, integrity-clean matches with a known seed and participant list
-    are eligible.  Single-match groups remain represented by the overview
-    counters, while detailed rows are reserved for boards played at least
-    twice.
-    """
+                for key, signed in (
+                    ((left_personality, right_personality), margin),
+                    ((right_personality, left_personality), -margin),
+                ):
+                    tally = self.matchups.get(key)
+                    if tally is None:
+                        tally = self.matchups[key] = [0, 0, 0, 0]
+                    tally[0] += 1
+                    tally[1] += signed > 0
+                    tally[2] += signed == 0
+                    tally[3] += signed
 
-    valid_completed = [match for match in matches if _is_valid_completed_match(match)]
-    grouped: dict[tuple[str, Any, int], list[Mapping[str, Any]]] = defaultdict(list)
-    for match in valid_completed:
         board_seed = match.get("board_seed")
-        player_count = len(match.get("players", []))
-        if board_seed is None or player_count <= 0:
-            continue
-        grouped[(str(match.get("board_mode", "")), board_seed, player_count)].append(match)
+        if board_seed is None or not players:
+            return
+        identity = (str(match.get("board_mode", "")), board_seed, len(players))
+        group = self.boards.get(identity)
+        if group is None:
+            group = self.boards[identity] = [0, 0, 0, {}]
+        group[0] += 1
+        if match.get("turns") is not None:
+            group[1] += match["turns"]
+            group[2] += 1
+        for player in players:
+            seat_tally = group[3].setdefault(player["seat"], [0, 0])
+            seat_tally[0] += 1
+            seat_tally[1] += winner == player["seat"]
+
+    def merge(self, other: ReportAggregator) -> ReportAggregator:
+        """Add ``other``'s totals into this aggregator and return it."""
+
+        if not isinstance(other, ReportAggregator):
+            raise TypeError("other must be a ReportAggregator")
+        self.matches += other.matches
+        self.completed += other.completed
+        self.winner_known += other.winner_known
+        self.integrity_failures += other.integrity_failures
+        self.valid_completed += other.valid_completed
+        self.completed_turns.update(other.completed_turns)
+        _add_into(self.dice_counts, other.dice_counts)
+        _add_into(self.playerless, other.playerless)
+        for name in (
+            "seats",
+            "personalities",
+            "personality_seats",
+            "matchups",
+            "starting_seats",
+            "turn_positions",
+            "initial_placement",
+            "initial_pips",
+        ):
+            mine = getattr(self, name)
+            for key, tally in getattr(other, name).items():
+                if key in mine:
+                    _add_into(mine[key], tally)
+                else:
+                    mine[key] = list(tally)
+        for identity, group in other.boards.items():
+            mine = self.boards.get(identity)
+            if mine is None:
+                mine = self.boards[identity] = [0, 0, 0, {}]
+            _add_into(mine, group[:3])
+            for seat, seat_tally in group[3].items():
+                _add_into(mine[3].setdefault(seat, [0, 0]), seat_tally)
+        return self
+
+    def summary(self) -> dict[str, Any]:
+        """Return the report ``summary`` for everything folded so far."""
+
+        total = self.matches
+        dice_rows, total_rolls, dice_gap = self._dice_statistics()
+        board_fairness_overview, board_fairness_rows = self._board_fairness_statistics()
+        return {
+            "matches": total,
+            "completed": self.completed,
+            "completion_rate": _ratio(self.completed, total),
+            "winner_known": self.winner_known,
+            "integrity_failures": self.integrity_failures,
+            "integrity_rate": _ratio(total - self.integrity_failures, total),
+            "average_turns": _mean_of(
+                sum(turns * count for turns, count in self.completed_turns.items()),
+                sum(self.completed_turns.values()),
+            ),
+            "median_turns": _median_of_counts(self.completed_turns),
+            "total_rolls": total_rolls,
+            "dice_total_variation": dice_gap,
+            "seat_statistics": self._seat_statistics(),
+            "personality_statistics": self._personality_statistics(),
+            "personality_seat_statistics": [
+                {
+                    "personality": personality,
+                    "seat": seat,
+                    **_win_row(tally),
+                    "average_vp": _mean_of(tally[3], tally[4]),
+                }
+                for (personality, seat), tally in sorted(self.personality_seats.items())
+            ],
+            "personality_matchup_statistics": self._personality_matchup_statistics(),
+            "starting_seat_statistics": [
+                {"seat": seat, **_win_row(tally)}
+                for seat, tally in sorted(self.starting_seats.items())
+            ],
+            "turn_position_statistics": [
+                {"position": position, **_win_row(tally)}
+                for position, tally in sorted(self.turn_positions.items())
+            ],
+            "initial_placement_statistics": [
+                {
+                    "label": label,
+                    **_win_row(tally),
+                    "average_pips": _mean_of(tally[3], tally[4]),
+                    "average_resource_diversity": _mean_of(tally[5], tally[6]),
+                }
+                for access, label in ((True, "6・8あり"), (False, "6・8なし"))
+                if (tally := self.initial_placement.get(access)) is not None
+            ],
+            "initial_pip_statistics": [
+                {
+                    "pips": pips,
+                    **_win_row(tally),
+                    "average_vp": _mean_of(tally[3], tally[4]),
+                }
+                for pips, tally in sorted(self.initial_pips.items())
+            ],
+            "dice_statistics": dice_rows,
+            "board_fairness_overview": board_fairness_overview,
+            "board_fairness_statistics": board_fairness_rows,
+        }
 
-    repeated_groups = {
-        identity: entries for identity, entries in grouped.items() if len(entries) >= 2
-    }
-    single_match_groups = len(grouped) - len(repeated_groups)
-    overview = {
-        "valid_completed_matches": len(valid_completed),
-        "eligible_matches": sum(len(entries) for entries in grouped.values()),
-        "ungrouped_matches": len(valid_completed) - sum(
-            len(entries) for entries in grouped.values()
-        ),
-        "board_groups": len(grouped),
-        "repeated_board_groups": len(repeated_groups),
-        "repeated_board_matches": sum(len(entries) for entries in repeated_groups.values()),
-        "single_match_board_groups": single_match_groups,
-        "single_match_matches": single_match_groups,
-    }
+    def _seat_statistics(self) -> list[dict[str, Any]]:
+        playerless, playerless_completed = self.playerless
+        rows = []
+        for seat, tally in sorted(self.seats.items()):
+            completed_appearances = tally[1] + playerless_completed
+            rows.append(
+                {
+                    "seat": seat,
+                    "seat_label": f"席{seat}",
+                    "appearances": tally[0] + playerless,
+                    "completed_appearances": completed_appearances,
+                    "wins": tally[2],
+                    "win_rate": _ratio(tally[2], completed_appearances),
+                    "average_vp": _mean_of(tally[3], tally[4]),
+                }
+            )
+        return rows
 
-    rows = []
-    ordered_groups = sorted(
-        repeated_groups.items(),
-        key=lambda item: (
-            str(item[0][0]).casefold(),
-            str(item[0][1]),
-            item[0][2],
-        ),
-    )
-    for (board_mode, board_seed, player_count), entries in ordered_groups:
-        seats = sorted(
-            {
-                player["seat"]
-                for match in entries
-                for player in match.get("players", [])
+    def _personality_statistics(self) -> list[dict[str, Any]]:
+        rows = []
+        for personality, tally in sorted(self.personalities.items()):
+            completed = tally[1]
+            row = {
+                "personality": personality,
+                **_win_row(tally),
+                "average_vp": _mean_of(tally[3], tally[4]),
             }
-        )
-        seat_rows = []
-        rates = []
-        win_counts = []
-        for seat in seats:
-            appearances = sum(
-                any(player["seat"] == seat for player in match.get("players", []))
-                for match in entries
-            )
-            wins = sum(match.get("winner_seat") == seat for match in entries)
-            rate = _ratio(wins, appearances)
-            interval_low, interval_high = _wilson_interval(wins, appearances)
-            seat_rows.append(
+            # A metric older logs lack for some players is not averaged over
+            # a partial sample.
+            slot = 5
+            for key in (*_ACTION_METRIC_KEYS, *_BUILD_METRIC_KEYS):
+                samples = tally[slot + 1]
+                row[f"average_{key}"] = (
+                    _mean_of(tally[slot], samples) if samples == completed else None
+                )
+                slot += 2
+            rows.append(row)
+        return rows
+
+    def _personality_matchup_statistics(self) -> list[dict[str, Any]]:
+        """Compare every different-personality player pair by final VP.
+
+        Each physical player pair contributes one comparison in each direction.
+        Storing both directions makes the JSON convenient for matrix consumers
+        and also guarantees that A-vs-B wins/margins are the inverse of B-vs-A.
+        """
+
+        rows = []
+        for (personality_a, personality_b), tally in sorted(self.matchups.items()):
+            comparisons, wins, ties, margin_total = tally
+            comparison_points = wins + ties * 0.5
+            interval_low, interval_high = _wilson_interval(comparison_points, comparisons)
+            rows.append(
                 {
-                    "seat": seat,
-                    "appearances": appearances,
+                    "personality_a": personality_a,
+                    "personality_b": personality_b,
+                    "comparisons": comparisons,
                     "wins": wins,
-                    "win_rate": rate,
-                    "win_rate_ci95": {
+                    "ties": ties,
+                    "losses": comparisons - wins - ties,
+                    "score_rate": _ratio(comparison_points, comparisons),
+                    "score_rate_ci95": {
                         "lower": interval_low,
                         "upper": interval_high,
                     },
+                    "average_vp_margin": _mean_of(margin_total, comparisons),
                 }
             )
-            if rate is not None:
-                rates.append(rate)
-            win_counts.append(wins)
+        return rows
+
+    def _board_fairness_statistics(
+        self,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Summarise repeated boards without emitting every one-off seed.
+
+        A board identity includes generation mode, seed and player count.  Only
+        completed, integrity-clean matches with a known seed and participant
+        list are eligible.  Single-match groups remain represented by the
+        overview counters, while detailed rows are reserved for boards played
+        at least twice.
+        """
+
+        eligible = sum(group[0] for group in self.boards.values())
+        repeated_groups = {
+            identity: group for identity, group in self.boards.items() if group[0] >= 2
+        }
+        single_match_groups = len(self.boards) - len(repeated_groups)
+        overview = {
+            "valid_completed_matches": self.valid_completed,
+            "eligible_matches": eligible,
+            "ungrouped_matches": self.valid_completed - eligible,
+            "board_groups": len(self.boards),
+            "repeated_board_groups": len(repeated_groups),
+            "repeated_board_matches": sum(group[0] for group in repeated_groups.values()),
+            "single_match_board_groups": single_match_groups,
+            "single_match_matches": single_match_groups,
+        }
 
-        turns = [match["turns"] for match in entries if match.get("turns") is not None]
-        rows.append(
-            {
-                "board_mode": board_mode,
-                "board_seed": board_seed,
-                "player_count": player_count,
-                "matches": len(entries),
-                "seat_statistics": seat_rows,
-                "max_seat_win_rate_gap": max(rates) - min(rates) if rates else None,
-                "normalized_winner_entropy": _normalised_entropy(win_counts),
-                "average_turns": _mean_or_none(turns),
-                "small_sample": len(entries) < 20,
-            }
+        rows = []
+        ordered_groups = sorted(
+            repeated_groups.items(),
+            key=lambda item: (
+                str(item[0][0]).casefold(),
+                str(item[0][1]),
+                item[0][2],
+            ),
+        )
+        for (board_mode, board_seed, player_count), group in ordered_groups:
+            matches, turn_total, turn_samples, seats = group
+            seat_rows = []
+            rates = []
+            win_counts = []
+            for seat, (appearances, wins) in sorted(seats.items()):
+                rate = _ratio(wins, appearances)
+                interval_low, interval_high = _wilson_interval(wins, appearances)
+                seat_rows.append(
+                    {
+                        "seat": seat,
+                        "appearances": appearances,
+                        "wins": wins,
+                        "win_rate": rate,
+                        "win_rate_ci95": {
+                            "lower": interval_low,
+                            "upper": interval_high,
+                        },
+                    }
+                )
+                if rate is not None:
+                    rates.append(rate)
+                win_counts.append(wins)
+            rows.append(
+                {
+                    "board_mode": board_mode,
+                    "board_seed": board_seed,
+                    "player_count": player_count,
+                    "matches": matches,
+                    "seat_statistics": seat_rows,
+                    "max_seat_win_rate_gap": max(rates) - min(rates) if rates else None,
+                    "normalized_winner_entropy": _normalised_entropy(win_counts),
+                    "average_turns": _mean_of(turn_total, turn_samples),
+                    "small_sample": matches < 20,
+                }
+            )
+
+        overview["small_sample_repeated_board_groups"] = sum(
+            bool(row["small_sample"]) for row in rows
         )
+        return overview, rows
+
+    def _dice_statistics(self) -> tuple[list[dict[str, Any]], int, Optional[float]]:
+        total_rolls = sum(self.dice_counts)
+        rows = []
+        absolute_delta = 0.0
+        for count, (total, weight) in zip(self.dice_counts, DICE_WEIGHTS.items()):
+            actual = _ratio(count, total_rolls)
+            expected = weight / 36
+            delta = None if actual is None else actual - expected
+            if delta is not None:
+                absolute_delta += abs(delta)
+            rows.append(
+                {
+                    "total": total,
+                    "count": count,
+                    "actual_rate": actual,
+                    "expected_rate": expected,
+                    "delta": delta,
+                }
+            )
+        variation = None if not total_rolls else absolute_delta / 2
+        return rows, total_rolls, variation
+
+
+def _tally(
+    tallies: dict[Any, list[int]],
+    key: Any,
+    width: int,
+    completed: bool,
+    won: bool,
+    vp: Optional[int],
+) -> list[int]:
+    """Count one appearance in ``tallies[key]`` and return that tally.
+
+    The first five slots are always appearances, completed appearances,
+    wins, and the total and sample count of completed-match VP.
+    """
 
-    overview["small_sample_repeated_board_groups"] = sum(
-        bool(row["small_sample"]) for row in rows
-    )
-    return overview, rows
+    tally = tallies.get(key)
+    if tally is None:
+        tally = tallies[key] = [0] * width
+    tally[0] += 1
+    if completed:
+        tally[1] += 1
+        if won:
+            tally[2] += 1
+        if vp is not None and width >= 5:
+            tally[3] += vp
+            tally[4] += 1
+    return tally
+
+
+def _add_into(target: list[int], source: Sequence[int]) -> None:
+    for index, value in enumerate(source):
+        target[index] += value
+
+
+def _win_row(tally: Sequence[int]) -> dict[str, Any]:
+    return {
+        "appearances": tally[0],
+        "completed_appearances": tally[1],
+        "wins": tally[2],
+        "win_rate": _ratio(tally[2], tally[1]),
+    }
 
 
 def _is_valid_completed_match(match: Mapping[str, Any]) -> bool:
@@ -1135,168 +1467,6 @@ def _normalised_entropy(counts: Sequence[int]) -> Optional[float]:
     return entropy / math.log(len(counts))
 
 
-def _starting_seat_statistics(matches: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
-    seats = sorted(
-        {
-            match["starting_player_seat"]
-            for match in matches
-            if match["starting_player_seat"] is not None
-        }
-    )
-    rows = []
-    for seat in seats:
-        relevant = [match for match in matches if match["starting_player_seat"] == seat]
-        completed = [match for match in relevant if match["completed"]]
-        wins = sum(match["winner_seat"] == seat for match in completed)
-        rows.append(
-            {
-                "seat": seat,
-                "appearances": len(relevant),
-                "completed_appearances": len(completed),
-                "wins": wins,
-                "win_rate": _ratio(wins, len(completed)),
-            }
-        )
-    return rows
-
-
-def _turn_position_statistics(matches: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
-    positions = sorted(
-        {position for match in matches for position, _seat in enumerate(match["turn_order"])}
-    )
-    rows = []
-    for position in positions:
-        relevant = [match for match in matches if len(match["turn_order"]) > position]
-        completed = [match for match in relevant if match["completed"]]
-        wins = sum(
-            match["winner_seat"] == match["turn_order"][position] for match in completed
-        )
-        rows.append(
-            {
-                "position": position,
-                "appearances": len(relevant),
-                "completed_appearances": len(completed),
-                "wins": wins,
-                "win_rate": _ratio(wins, len(completed)),
-            }
-        )
-    return rows
-
-
-def _initial_placement_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> list[dict[str, Any]]:
-    rows = []
-    for has_access, label in ((True, "6・8あり"), (False, "6・8なし")):
-        observations = [
-            (match, player)
-            for match in matches
-            for player in match["players"]
-            if player["initial_high_probability_access"] is has_access
-        ]
-        if not observations:
-            continue
-        completed = [item for item in observations if item[0]["completed"]]
-        wins = sum(
-            match["winner_seat"] == player["seat"]
-            for match, player in completed
-        )
-        pips = [
-            player["initial_pips"]
-            for _match, player in observations
-            if player["initial_pips"] is not None
-        ]
-        diversity = [
-            player["initial_resource_diversity"]
-            for _match, player in observations
-            if player["initial_resource_diversity"] is not None
-        ]
-        rows.append(
-            {
-                "label": label,
-                "appearances": len(observations),
-                "completed_appearances": len(completed),
-                "wins": wins,
-                "win_rate": _ratio(wins, len(completed)),
-                "average_pips": _mean_or_none(pips),
-                "average_resource_diversity": _mean_or_none(diversity),
-            }
-        )
-    return rows
-
-
-def _initial_pip_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> list[dict[str, Any]]:
-    pip_values = sorted(
-        {
-            player["initial_pips"]
-            for match in matches
-            for player in match["players"]
-            if player["initial_pips"] is not None
-        }
-    )
-    rows = []
-    for pip_value in pip_values:
-        observations = [
-            (match, player)
-            for match in matches
-            for player in match["players"]
-            if player["initial_pips"] == pip_value
-        ]
-        completed = [item for item in observations if item[0]["completed"]]
-        wins = sum(
-            match["winner_seat"] == player["seat"]
-            for match, player in completed
-        )
-        vp_values = [
-            player["vp"]
-            for match, player in observations
-            if match["completed"] and player["vp"] is not None
-        ]
-        rows.append(
-            {
-                "pips": pip_value,
-                "appearances": len(observations),
-                "completed_appearances": len(completed),
-                "wins": wins,
-                "win_rate": _ratio(wins, len(completed)),
-                "average_vp": _mean_or_none(vp_values),
-            }
-        )
-    return rows
-
-
-def _dice_statistics(
-    matches: Sequence[Mapping[str, Any]],
-) -> tuple[list[dict[str, Any]], int, Optional[float]]:
-    valid_matches = [match for match in matches if not match["validation_errors"]]
-    counts = {
-        total: sum(match["dice_counts"][str(total)] for match in valid_matches)
-        for total in DICE_WEIGHTS
-    }
-    total_rolls = sum(counts.values())
-    rows = []
-    absolute_delta = 0.0
-    for total, weight in DICE_WEIGHTS.items():
-        actual = _ratio(counts[total], total_rolls)
-        expected = weight / 36
-        delta = None if actual is None else actual - expected
-        if delta is not None:
-            absolute_delta += abs(delta)
-        rows.append(
-            {
-                "total": total,
-                "count": counts[total],
-                "actual_rate": actual,
-                "expected_rate": expected,
-                "delta": delta,
-            }
-        )
-    variation = None if not total_rolls else absolute_delta / 2
-    return rows, total_rolls, variation
-
-
 def _personality_table(rows: Sequence[Mapping[str, Any]]) -> str:
     if not rows:
         return '<p class="empty">AI性格データがありません。</p>'
@@ -1730,6 +1900,31 @@ def _encode_json(value: Any) -> str:
         raise ReportError("レポートをJSONへ変換できません。") from exc
 
 
+def _encode_report(report: Mapping[str, Any]) -> str:
+    """Encode a report with one compact line per match.
+
+    Indenting every match would route the whole payload through the pure
+    Python encoder; keeping matches on single lines lets the C encoder handle
+    the bulk of a large batch while the summary stays readable.
+    """
+
+    keys = list(report)
+    matches = report.get("matches")
+    if not keys or keys[-1] != "matches" or not isinstance(matches, list):
+        return _encode_json(report) + "\n"
+    head = _encode_json({key: report[key] for key in keys[:-1]})
+    try:
+        lines = [
+            json.dumps(match, ensure_ascii=False, allow_nan=False) for match in matches
+        ]
+    except (TypeError, ValueError) as exc:
+        raise ReportError("レポートをJSONへ変換できません。") from exc
+    body = "[\n    " + ",\n    ".join(lines) + "\n  ]" if lines else "[]"
+    if head == "{}":
+        return f'{{\n  "matches": {body}\n}}\n'
+    return f'{head[:-2]},\n  "matches": {body}\n}}\n'
+
+
 def _report_summary(report: Mapping[str, Any]) -> Mapping[str, Any]:
     if not isinstance(report, Mapping) or not isinstance(report.get("summary"), Mapping):
         raise ReportError("集計済みレポートにsummaryがありません。")
@@ -1769,14 +1964,27 @@ def _ratio(numerator: float, denominator: int) -> Optional[float]:
     return None if denominator <= 0 else numerator / denominator
 
 
-def _mean_or_none(values: Iterable[int]) -> Optional[float]:
-    values = list(values)
-    return None if not values else statistics.fmean(values)
+def _mean_of(total: float, samples: int) -> Optional[float]:
+    return None if samples <= 0 else total / samples
 
 
-def _median_or_none(values: Iterable[int]) -> Optional[float]:
-    values = list(values)
-    return None if not values else float(statistics.median(values))
+def _median_of_counts(counts: Mapping[int, int]) -> Optional[float]:
+    """Return the median of a multiset given as ``{value: occurrences}``."""
+
+    size = sum(counts.values())
+    if not size:
+        return None
+    middle = [(size - 1) // 2, size // 2]
+    found: list[int] = []
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        while middle and middle[0] < seen:
+            middle.pop(0)
+            found.append(value)
+        if not middle:
+            break
+    return (found[0] + found[1]) / 2
 
 
 def _personality_display_label(value: Any) -> str:
@@ -1789,14 +1997,20 @@ def _normalise_personality(value: Any) -> Optional[str]:
 
     if value in (None, ""):
         return None
+    # A batch repeats a handful of lineup names, so remember string inputs.
+    if isinstance(value, str):
+        cached = _NORMALISED_PERSONALITIES.get(value, _MISSING)
+        if cached is not _MISSING:
+            return cached
     text = "".join(
         character
         for character in str(value).strip()
         if not unicodedata.category(character).startswith("C")
     )[:80]
-    if not text:
-        return None
-    return _PERSONALITY_ALIASES.get(text.casefold(), text)
+    result = _PERSONALITY_ALIASES.get(text.casefold(), text) if text else None
+    if isinstance(value, str) and len(_NORMALISED_PERSONALITIES) < 256:
+        _NORMALISED_PERSONALITIES[value] = result
+    return result
 
 
 def _metadata_display_value(key: str, value: Any) -> Any:
@@ -1867,6 +2081,11 @@ def _h(value: Any) -> str:
     return html.escape(str(value), quote=True)
 
 
+def _check_basename(basename: Any) -> None:
+    if not isinstance(basename, str) or not _SAFE_BASENAME.fullmatch(basename):
+        raise ReportError("basenameは英数字・点・ハイフン・下線（80文字以内）で指定してください。")
+
+
 def _atomic_write_text(path: Path, text: str) -> None:
     temporary_name: Optional[str] = None
     try:
@@ -1905,16 +2124,54 @@ def _load_json(path: Path) -> Any:
         raise ReportError(f"入力JSONを読み込めませんでした: {path}") from exc
 
 
+def read_match_log(path: os.PathLike[str] | str) -> MatchLog:
+    """Open a streamed self-play log, reading only its header line eagerly."""
+
+    log_path = Path(path).expanduser()
+    try:
+        with log_path.open("rb") as handle:
+            header = json.loads(handle.readline())
+    except OSError as exc:
+        raise ReportError(f"結果ログを読み込めませんでした: {log_path}") from exc
+    except (UnicodeError, json.JSONDecodeError) as exc:
+        raise ReportError(f"結果ログのヘッダーが不正です: {log_path}") from exc
+    if (
+        not isinstance(header, dict)
+        or header.get("format") != MATCH_LOG_FORMAT
+        or header.get("version") != MATCH_LOG_VERSION
+    ):
+        raise ReportError(f"対応していない結果ログ形式です: {log_path}")
+    metadata = {
+        key: header[key]
+        for key in (
+            "board_seed",
+            "board_mode",
+            "victory_target",
+            "player_count",
+            "personality_lineup",
+            "max_turns",
+            "max_action_steps",
+        )
+        if key in header
+    }
+    if "game_count" in header:
+        metadata["games_requested"] = header["game_count"]
+    return MatchLog(path=log_path, metadata=metadata)
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="AI自己対戦JSONから安全なローカルレポートを作成")
-    parser.add_argument("input", type=Path, help="自己対戦結果JSON")
+    parser.add_argument("input", type=Path, help="自己対戦結果JSON、またはJSONL結果ログ（.jsonl）")
     parser.add_argument("--output-dir", type=Path, default=Path("self-play-reports"))
     parser.add_argument("--basename", default="self-play-report")
     args = parser.parse_args(argv)
     try:
-        source = _load_json(args.input)
-        paths = write_report(source, args.output_dir, basename=args.basename)
+        if args.input.suffix == ".jsonl":
+            source = read_match_log(args.input)
+        else:
+            source = _load_json(args.input)
         report = build_report_data(source)
+        paths = write_report_data(report, args.output_dir, basename=args.basename)
     except ReportError as exc:
         parser.exit(2, f"error: {exc}\n")
     print(render_terminal_summary(report))
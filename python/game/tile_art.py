@@ -2,9 +2,8 @@ import math
 from functools import lru_cache
 from pathlib import Path
 
-import pygame
-
 from game.constants import HEX_RADIUS
+from game.lazy_modules import pygame
 from game.resources import ResourceType
 
 
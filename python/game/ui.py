@@ -1,9 +1,9 @@
+from __future__ import annotations
+
 import math
 from dataclasses import dataclass
 from functools import lru_cache
 
-import pygame
-
 from game.assets import get_font
 from game.constants import (
     BOARD_CENTER_X,
@@ -21,6 +21,7 @@ from game.constants import (
     SIDE_PANEL_WIDTH,
     SIDE_PANEL_X,
 )
+from game.lazy_modules import pygame
 from game.resources import ResourceType
 
 
@@ -0,0 +1,588 @@
+"""Single event-loop serving mode for many concurrent browser sockets.
+
+:class:`AsyncCatanWebServer` accepts connections on one asyncio loop instead
+of a thread per request and two per WebSocket.  Plain HTTP requests are read
+into memory and run through the unchanged :class:`CatanWebRequestHandler` on
+a small worker pool, so every route, Host/Origin check, cookie rule and the
+WebSocket handshake validation are shared with the threaded server.  Once
+``/api/socket`` has answered 101 the stream stays on the loop: frames are
+read with the same RFC 6455 codec, gateway calls run on one worker thread,
+and queued events wake the socket through :meth:`WebGateway.watch_session`.
+
+Memory stays bounded per connection: request heads and bodies have fixed
+limits, idle keep-alive connections and requests that stall mid-body are
+closed, and a socket whose peer stops reading is dropped once its send
+buffer passes a fixed size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from http import HTTPStatus
+import io
+from pathlib import Path
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from game.runtime_metrics import MetricsRegistry
+from game.web_gateway import (
+    WEB_API_VERSION,
+    WebGateway,
+    WebGatewayError,
+    encode_event_document,
+)
+from game.web_server import (
+    DEFAULT_WEB_HOST,
+    DEFAULT_WEB_PORT,
+    DEFAULT_WEB_STATIC_ROOT,
+    MAX_WEB_REQUEST_BYTES,
+    WEBSOCKET_IDLE_WAKE_SECONDS,
+    CatanWebRequestHandler,
+    CatanWebServer,
+)
+from game.websocket_transport import (
+    AsyncWebSocketConnection,
+    WebSocketEOF,
+    WebSocketProtocolError,
+)
+
+
+DEFAULT_MAX_ASYNC_CONNECTIONS = 1024
+DEFAULT_ASYNC_HTTP_WORKERS = 4
+MAX_HTTP_HEAD_BYTES = 64 * 1024
+HTTP_KEEP_ALIVE_SECONDS = 30.0
+TLS_HANDSHAKE_SECONDS = 10.0
+
+
+class _BufferedRequestHandler(CatanWebRequestHandler):
+    """Run one request already read by the loop through the shared routes."""
+
+    def __init__(
+        self,
+        raw_request: bytes,
+        client_address: tuple[Any, ...],
+        server: AsyncCatanWebServer,
+    ) -> None:
+        self.raw_request = raw_request
+        self.websocket_session: tuple[str, str] | None = None
+        super().__init__(None, client_address, server)
+
+    def setup(self) -> None:
+        self.rfile = io.BytesIO(self.raw_request)
+        self.wfile = io.BytesIO()
+
+    def handle(self) -> None:
+        self.close_connection = True
+        self.handle_one_request()
+
+    def finish(self) -> None:
+        return None
+
+    def _serve_websocket(self, token: str, client_key: str) -> None:
+        # The 101 response is already in ``wfile``; the loop takes the
+        # stream over once it has been written.
+        self.websocket_session = (token, client_key)
+
+
+class AsyncCatanWebServer(CatanWebServer):
+    """The Web server on one asyncio loop, for hundreds of open sockets.
+
+    Construction, exposure checks and routes are those of
+    :class:`CatanWebServer`; only :meth:`serve_forever` and
+    :meth:`shutdown` change.  The loop owns the active-socket table, and
+    ``_websocket_gate`` plays the part of the threaded server's socket lock.
+    """
+
+    request_queue_size = 128
+    # Bounds the wait for a whole request, head and body, including the idle
+    # keep-alive gap before it, so a peer that stalls mid-body is dropped.
+    request_timeout = HTTP_KEEP_ALIVE_SECONDS
+
+    def __init__(
+        self,
+        server_address: tuple[str, int] = (DEFAULT_WEB_HOST, DEFAULT_WEB_PORT),
+        *,
+        max_connections: int = DEFAULT_MAX_ASYNC_CONNECTIONS,
+        http_workers: int = DEFAULT_ASYNC_HTTP_WORKERS,
+        **options: Any,
+    ) -> None:
+        if type(max_connections) is not int or not 1 <= max_connections <= 65_536:
+            raise ValueError("max_connections must be 1..65536")
+        if type(http_workers) is not int or not 1 <= http_workers <= 64:
+            raise ValueError("http_workers must be 1..64")
+        super().__init__(server_address, **options)
+        if self._tls_context is not None and not hasattr(
+            asyncio.StreamWriter, "start_tls"
+        ):
+            self.server_close()
+            raise ValueError("asyncio serving with TLS requires Python 3.11+")
+        self.max_connections = max_connections
+        self.http_workers = http_workers
+        self._open_connections = 0
+        self._connection_tasks: set[asyncio.Task] = set()
+        self._socket_peers: dict[
+            str,
+            tuple[AsyncWebSocketConnection, asyncio.Event],
+        ] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_serving: asyncio.Event | None = None
+        self._shutdown_requested = False
+        self._serving_stopped = threading.Event()
+        self._serving_stopped.set()
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """Serve on a new event loop until :meth:`shutdown`.
+
+        ``poll_interval`` is the gateway maintenance period, matching the
+        threaded server's ``service_actions`` cadence.
+        """
+
+        self._serving_stopped.clear()
+        try:
+            asyncio.run(self.serve_async(maintenance_interval=poll_interval))
+        finally:
+            self._shutdown_requested = False
+            self._serving_stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever` from another thread and wait for it."""
+
+        self._shutdown_requested = True
+        loop, stop = self._loop, self._stop_serving
+        if loop is not None and stop is not None:
+            try:
+                loop.call_soon_threadsafe(stop.set)
+            except RuntimeError:
+                pass
+        self._serving_stopped.wait()
+
+    async def serve_async(self, *, maintenance_interval: float = 0.2) -> None:
+        self._gateway_executor = ThreadPoolExecutor(
+            1, thread_name_prefix="catan-web-gateway"
+        )
+        self._http_executor = ThreadPoolExecutor(
+            self.http_workers, thread_name_prefix="catan-web-http"
+        )
+        self._websocket_gate = asyncio.Lock()
+        self._stop_serving = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if self._shutdown_requested:
+            self._stop_serving.set()
+        listener = await asyncio.start_server(
+            self._accept,
+            sock=self.socket,
+            limit=MAX_HTTP_HEAD_BYTES,
+            backlog=self.request_queue_size,
+        )
+        maintenance = asyncio.create_task(
+            self._maintain_forever(maintenance_interval)
+        )
+        try:
+            await self._stop_serving.wait()
+        finally:
+            self._loop = None
+            self._stop_serving = None
+            listener.close()
+            pending = {maintenance, *self._connection_tasks}
+            while pending:
+                # Python 3.11's wait_for can swallow a cancellation that races
+                # with its inner future (for example a finished drain), so
+                # keep cancelling until every connection task has ended.
+                for task in pending:
+                    task.cancel()
+                _done, pending = await asyncio.wait(pending, timeout=0.1)
+            self._gateway_executor.shutdown(wait=True, cancel_futures=True)
+            self._http_executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _maintain_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self._call_gateway(self.service_actions)
+
+    async def _call_gateway(
+        self,
+        function: Callable[..., Any],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._gateway_executor,
+            functools.partial(function, *args, **kwargs),
+        )
+
+    async def _accept(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        task = asyncio.current_task()
+        self._connection_tasks.add(task)
+        try:
+            peer = writer.get_extra_info("peername")
+            if (
+                self._open_connections >= self.max_connections
+                or self.peer_rejection(str(peer[0])) is not None
+            ):
+                return
+            self._open_connections += 1
+            try:
+                if self._tls_context is not None:
+                    await writer.start_tls(
+                        self._tls_context,
+                        ssl_handshake_timeout=TLS_HANDSHAKE_SECONDS,
+                    )
+                await self._serve_connection(reader, writer, tuple(peer))
+            finally:
+                self._open_connections -= 1
+        except (
+            OSError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            asyncio.TimeoutError,
+        ):
+            return
+        except asyncio.CancelledError:
+            # Only shutdown cancels connection tasks.  Ending quietly keeps
+            # start_server's done callback (which calls task.exception() on
+            # Python 3.11) from logging every open socket.
+            return
+        finally:
+            self._connection_tasks.discard(task)
+            writer.close()
+
+    async def _serve_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        peer: tuple[Any, ...],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                head, body, reusable = await asyncio.wait_for(
+                    _read_request(reader),
+                    self.request_timeout,
+                )
+            except asyncio.TimeoutError:
+                return
+            try:
+                handler = await loop.run_in_executor(
+                    self._http_executor,
+                    _BufferedRequestHandler,
+                    head + body,
+                    peer,
+                    self,
+                )
+            except Exception:
+                return
+            writer.write(handler.wfile.getvalue())
+            await writer.drain()
+            if handler.websocket_session is not None:
+                token, client_key = handler.websocket_session
+                await self._serve_websocket(reader, writer, token, client_key)
+                return
+            if handler.close_connection or not reusable:
+                return
+
+    async def _serve_websocket(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        token: str,
+        client_key: str,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        connection = AsyncWebSocketConnection(reader, writer)
+        ready = asyncio.Event()
+
+        def events_queued() -> None:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                # The loop has already stopped; so has this socket.
+                pass
+
+        push_task = None
+        await self._activate_websocket(token, connection, ready)
+        try:
+            try:
+                await self._call_gateway(
+                    self.gateway.watch_session,
+                    token,
+                    events_queued,
+                    client_key=client_key,
+                )
+                events = await self._call_gateway(
+                    self.gateway.bootstrap,
+                    token,
+                    client_key=client_key,
+                )
+            except WebGatewayError as exc:
+                connection.send_json(self.websocket_error_document(exc))
+                return
+            connection.send_encoded_json(
+                encode_event_document(
+                    {"api_version": WEB_API_VERSION, "kind": "bootstrap"},
+                    events,
+                )
+            )
+            await connection.drain()
+            ready.set()
+            push_task = asyncio.create_task(
+                self._push_websocket_events(token, connection, ready, client_key)
+            )
+            await self._receive_websocket_messages(token, connection, client_key)
+        except (WebSocketEOF, OSError):
+            return
+        finally:
+            self._deactivate_websocket(token, connection)
+            if push_task is not None:
+                # Waking the push task as well as cancelling it stops it even
+                # when Python 3.11's wait_for swallows a cancellation that
+                # races with the event: the next push finds it inactive.
+                ready.set()
+                push_task.cancel()
+                await asyncio.gather(push_task, return_exceptions=True)
+            await self._call_gateway(
+                self.gateway.unwatch_session,
+                token,
+                events_queued,
+            )
+
+    async def _receive_websocket_messages(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        client_key: str,
+    ) -> None:
+        while True:
+            try:
+                event = await connection.receive()
+                if not self._websocket_is_active(token, connection):
+                    return
+                if event.kind != "message":
+                    if connection.handle_control(event):
+                        return
+                    await connection.drain()
+                    continue
+                if not await self._handle_websocket_message(
+                    token,
+                    connection,
+                    event.message or {},
+                    client_key,
+                ):
+                    return
+            except WebSocketProtocolError as exc:
+                connection.send_protocol_error(exc)
+                return
+            except WebGatewayError as exc:
+                if not await self._send_websocket_error(token, connection, exc):
+                    return
+                if exc.status == HTTPStatus.UNAUTHORIZED:
+                    return
+
+    async def _push_websocket_events(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        ready: asyncio.Event,
+        client_key: str,
+    ) -> None:
+        """Push queued events whenever the gateway's listener sets ``ready``."""
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(ready.wait(), WEBSOCKET_IDLE_WAKE_SECONDS)
+                except asyncio.TimeoutError:
+                    # A zero-length wait records activity for an idle socket,
+                    # as the threaded push loop's timed wait does.
+                    if not await self._call_gateway(
+                        self.gateway.wait_for_events,
+                        token,
+                        client_key=client_key,
+                        timeout=0,
+                    ):
+                        continue
+                ready.clear()
+                if not await self._push_pending(token, connection, client_key):
+                    return
+        except (WebGatewayError, WebSocketEOF, OSError):
+            return
+
+    async def _activate_websocket(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        ready: asyncio.Event,
+    ) -> None:
+        async with self._websocket_gate:
+            previous = self._socket_peers.get(token)
+            self._socket_peers[token] = (connection, ready)
+            if previous is None:
+                return
+            previous_connection, previous_ready = previous
+            previous_ready.set()
+            try:
+                previous_connection.send_close(1001, "superseded")
+            except (WebSocketEOF, OSError):
+                pass
+
+    def _deactivate_websocket(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+    ) -> None:
+        if self._websocket_is_active(token, connection):
+            self._socket_peers.pop(token, None)
+
+    def _websocket_is_active(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+    ) -> bool:
+        current = self._socket_peers.get(token)
+        return current is not None and current[0] is connection
+
+    async def _push_pending(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        client_key: str,
+    ) -> bool:
+        async with self._websocket_gate:
+            if not self._websocket_is_active(token, connection):
+                return False
+            events = await self._call_gateway(
+                self.gateway.poll,
+                token,
+                client_key=client_key,
+                maintain=False,
+            )
+            if events:
+                connection.send_encoded_json(
+                    encode_event_document(
+                        {"api_version": WEB_API_VERSION, "kind": "push"},
+                        events,
+                    )
+                )
+        await connection.drain()
+        return True
+
+    async def _handle_websocket_message(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        message: dict[str, Any],
+        client_key: str,
+    ) -> bool:
+        async with self._websocket_gate:
+            if not self._websocket_is_active(token, connection):
+                return False
+            events = await self._call_gateway(
+                self.websocket_gateway_events,
+                token,
+                message,
+                client_key,
+            )
+            connection.send_encoded_json(
+                encode_event_document(
+                    {"api_version": WEB_API_VERSION, "kind": "response"},
+                    events,
+                )
+            )
+        await connection.drain()
+        return True
+
+    async def _send_websocket_error(
+        self,
+        token: str,
+        connection: AsyncWebSocketConnection,
+        error: WebGatewayError,
+    ) -> bool:
+        async with self._websocket_gate:
+            if not self._websocket_is_active(token, connection):
+                return False
+            connection.send_json(self.websocket_error_document(error))
+        await connection.drain()
+        return True
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[bytes, bytes, bool]:
+    """Read one request head and its body; see :func:`_request_body_length`."""
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    body_length, reusable = _request_body_length(head)
+    body = await reader.readexactly(body_length) if body_length else b""
+    return head, body, reusable
+
+
+def _request_body_length(head: bytes) -> tuple[int, bool]:
+    """Return the body size after ``head`` and whether the stream is reusable.
+
+    Bodies the handler will reject (chunked, ambiguous or oversized) are not
+    read; the connection closes after the error response instead.
+    """
+
+    lengths: list[bytes] = []
+    for line in head.split(b"\r\n")[1:]:
+        name, separator, value = line.partition(b":")
+        if not separator:
+            continue
+        name = name.strip().lower()
+        if name == b"transfer-encoding":
+            return 0, False
+        if name == b"content-length":
+            lengths.append(value.strip())
+    if not lengths:
+        return 0, True
+    if len(lengths) != 1 or not lengths[0].isdigit():
+        return 0, False
+    length = int(lengths[0])
+    if length > MAX_WEB_REQUEST_BYTES:
+        return 0, False
+    return length, True
+
+
+def create_async_web_server(
+    host: str = DEFAULT_WEB_HOST,
+    port: int = DEFAULT_WEB_PORT,
+    *,
+    gateway: WebGateway | None = None,
+    static_root: str | Path = DEFAULT_WEB_STATIC_ROOT,
+    lan_mode: bool = False,
+    friends_vpn_mode: bool = False,
+    allowed_hosts: Iterable[str] = (),
+    tls_certfile: str | Path | None = None,
+    tls_keyfile: str | Path | None = None,
+    metrics: MetricsRegistry | None = None,
+    max_connections: int = DEFAULT_MAX_ASYNC_CONNECTIONS,
+    http_workers: int = DEFAULT_ASYNC_HTTP_WORKERS,
+) -> AsyncCatanWebServer:
+    return AsyncCatanWebServer(
+        (host, port),
+        gateway=gateway,
+        static_root=static_root,
+        lan_mode=lan_mode,
+        friends_vpn_mode=friends_vpn_mode,
+        allowed_hosts=allowed_hosts,
+        tls_certfile=tls_certfile,
+        tls_keyfile=tls_keyfile,
+        metrics=metrics,
+        max_connections=max_connections,
+        http_workers=http_workers,
+    )
+
+
+__all__ = (
+    "AsyncCatanWebServer",
+    "DEFAULT_ASYNC_HTTP_WORKERS",
+    "DEFAULT_MAX_ASYNC_CONNECTIONS",
+    "create_async_web_server",
+)
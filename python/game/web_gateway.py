@@ -9,21 +9,25 @@ handler can call the same :class:`WebGateway` methods.
 
 from __future__ import annotations
 
-from collections import deque
+from collections import OrderedDict, deque
 from copy import deepcopy
 from dataclasses import dataclass, field
+import json
 import math
 import secrets
 import threading
 import time
-from typing import Any, Callable, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 from game.lan_controller import (
     LanControllerError,
     LanServerController,
     OutboundMessage,
 )
+from game.network_protocol import build_state_delta
 from game.network_replay import NetworkReplayError
+from game.room_shards import ShardedLanServerController
+from game.runtime_metrics import metric_timer
 from game.shared_rate_limit import (
     RateLimitBucket,
     SharedRateLimitError,
@@ -32,6 +36,7 @@ from game.shared_rate_limit import (
 
 WEB_API_VERSION = 1
 MAX_WEB_SESSIONS = 64
+MAX_WEB_SESSION_LIMIT = 512
 MAX_PENDING_WEB_EVENTS = 48
 DEFAULT_WEB_SESSION_IDLE_SECONDS = 6 * 60 * 60
 DEFAULT_FRIEND_INVITATION_TTL_SECONDS = 60 * 60
@@ -44,6 +49,8 @@ _COALESCED_EVENT_TYPES = frozenset(
         "network_result_unavailable",
     }
 )
+# Deltas shared by browsers that hold the same baseline snapshot.
+_STATE_DELTA_CACHE_LIMIT = 64
 _BOOTSTRAP_EVENT_TYPES = (
     "session_welcome",
     "lobby_snapshot",
@@ -54,6 +61,76 @@ _BOOTSTRAP_EVENT_TYPES = (
 )
 
 
+class WebEvent(dict):
+    """One outbound browser event, frozen and JSON-encoded at most once.
+
+    The gateway routes a single instance to every browser that receives the
+    same controller message and keeps references to it in pending queues and
+    reload bootstrap state, so it must never change after construction.
+    Mutating methods raise :class:`TypeError`; nested values are shared with
+    the controller, which already treats sent snapshots as read-only.
+    Per-browser redaction builds a new event instead of editing this one.
+    """
+
+    __slots__ = ("_encoded",)
+
+    def __init__(self, message: Mapping[str, Any]) -> None:
+        super().__init__(message)
+        self._encoded: bytes | None = None
+
+    @property
+    def encoded(self) -> bytes:
+        """Compact UTF-8 JSON for this event, encoded on first use."""
+
+        if self._encoded is None:
+            self._encoded = json.dumps(
+                self,
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        return self._encoded
+
+    def _read_only(self, *_args: Any, **_kwargs: Any) -> None:
+        raise TypeError("WebEvent is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return deepcopy(dict(self), memo)
+
+    def __reduce_ex__(self, _protocol: Any) -> tuple[Any, ...]:
+        return dict, (dict(self),)
+
+
+def encode_event_document(
+    fields: Mapping[str, Any],
+    events: Iterable[Mapping[str, Any]],
+) -> bytes:
+    """Encode ``{**fields, "events": [...]}`` as compact UTF-8 JSON.
+
+    :class:`WebEvent` items contribute their cached bytes, so an event shared
+    by many browsers is serialized once however many responses carry it.
+    """
+
+    head = json.dumps(
+        dict(fields),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    )
+    encoded = b",".join(
+        (event if isinstance(event, WebEvent) else WebEvent(event)).encoded
+        for event in events
+    )
+    separator = "," if fields else ""
+    return f'{head[:-1]}{separator}"events":['.encode("utf-8") + encoded + b"]}"
+
+
 class WebGatewayError(ValueError):
     """Safe error exposed by the local Web transport."""
 
@@ -78,12 +155,25 @@ class _BrowserSession:
     client_key: str
     created_at: float
     last_seen_at: float
-    pending: deque[dict[str, Any]] = field(default_factory=deque)
-    latest: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Shares the gateway lock; notified whenever ``pending`` gains an event
+    # or the session closes, so push loops sleep until there is work.
+    events_ready: threading.Condition = field(repr=False)
+    # Optional non-blocking callback run alongside ``events_ready`` for an
+    # event-loop transport that cannot park a thread in a condition wait.
+    event_listener: Callable[[], None] | None = field(default=None, repr=False)
+    # Push loops currently parked in ``wait_for_events``.  A waiting or
+    # watched session has an open socket and is kept alive by maintenance.
+    event_waiters: int = 0
+    pending: deque[WebEvent] = field(default_factory=deque)
+    latest: dict[str, WebEvent] = field(default_factory=dict)
     message_times: deque[float] = field(default_factory=deque)
     heartbeat_times: deque[float] = field(default_factory=deque)
     room_resume: _RoomResumeCredential | None = None
     pending_friend_invitation: _PendingFriendInvitation | None = None
+    # The last state snapshot handed to the browser; opted-in browsers are
+    # sent later revisions as ``state_delta`` events against it.
+    state_deltas: bool = False
+    delivered_snapshot: WebEvent | None = field(default=None, repr=False)
 
 
 @dataclass(frozen=True)
@@ -168,9 +258,14 @@ class _RateLimitRule:
 class WebGateway:
     """Adapt browser cookies and event queues to ``LanServerController``.
 
-    All controller access is serialized under one re-entrant lock.  This is
-    required because ``ThreadingHTTPServer`` may handle two players at once,
-    while a room mutation and its viewer-specific snapshots must stay atomic.
+    Session state and event queues are guarded by one re-entrant lock.  A
+    single-process controller is also called under that lock, because
+    ``ThreadingHTTPServer`` may handle two players at once while a room
+    mutation and its viewer-specific snapshots must stay atomic.  A
+    :class:`ShardedLanServerController` is safe to call concurrently, so
+    ``handle`` releases the gateway lock for the shard call and instead holds
+    a per-shard lane lock until the resulting events are queued.  Requests to
+    other shards proceed meanwhile, and one shard's events keep their order.
     """
 
     def __init__(
@@ -184,8 +279,11 @@ class WebGateway:
         shared_rate_limit_store: Any | None = None,
         rate_limit_clock: Callable[[], float] | None = None,
     ) -> None:
-        if type(session_limit) is not int or not 1 <= session_limit <= 512:
-            raise ValueError("session_limit must be 1..512")
+        if (
+            type(session_limit) is not int
+            or not 1 <= session_limit <= MAX_WEB_SESSION_LIMIT
+        ):
+            raise ValueError(f"session_limit must be 1..{MAX_WEB_SESSION_LIMIT}")
         if (
             isinstance(idle_seconds, bool)
             or not isinstance(idle_seconds, (int, float))
@@ -216,6 +314,18 @@ class WebGateway:
         self._protected_room_attempt_times: dict[str, deque[float]] = {}
         self._protected_room_attempt_times_global: deque[float] = deque()
         self._lock = threading.RLock()
+        # Keyed by (id(baseline), id(snapshot)); each entry holds both
+        # snapshots so neither id can be reused while it is cached.
+        self._state_deltas: OrderedDict[
+            tuple[int, int],
+            tuple[WebEvent, WebEvent, WebEvent | None],
+        ] = OrderedDict()
+        # Lane locks are taken before, never while holding, ``_lock``.
+        self._lanes: tuple[threading.Lock, ...] | None = (
+            tuple(threading.Lock() for _ in range(self.controller.shard_count))
+            if isinstance(self.controller, ShardedLanServerController)
+            else None
+        )
         self._last_tick = float(clock())
 
     @property
@@ -267,6 +377,7 @@ class WebGateway:
                 client_key=normalized_client,
                 created_at=now,
                 last_seen_at=now,
+                events_ready=threading.Condition(self._lock),
             )
             self._sessions[token] = session
             self._connection_tokens[connection_id] = token
@@ -300,11 +411,7 @@ class WebGateway:
         with self._lock:
             session = self._require_session(token, client_key)
             session.last_seen_at = float(self._clock())
-            return tuple(
-                deepcopy(session.latest[event_type])
-                for event_type in _BOOTSTRAP_EVENT_TYPES
-                if event_type in session.latest
-            )
+            return self._latest_events(session)
 
     def room_resume_credential(
         self,
@@ -656,6 +763,28 @@ class WebGateway:
     ) -> tuple[dict[str, Any], ...]:
         """Apply one browser message and drain events for that browser."""
 
+        with metric_timer("catan_web_gateway_seconds", operation="handle") as timing:
+            try:
+                return self._handle_message(
+                    token,
+                    message,
+                    client_key=client_key,
+                    protected_room_access_allowed=protected_room_access_allowed,
+                    _rotate_reconnect_token=_rotate_reconnect_token,
+                )
+            except WebGatewayError:
+                timing.label(outcome="rejected")
+                raise
+
+    def _handle_message(
+        self,
+        token: str,
+        message: Mapping[str, Any],
+        *,
+        client_key: str | None,
+        protected_room_access_allowed: bool,
+        _rotate_reconnect_token: bool,
+    ) -> tuple[dict[str, Any], ...]:
         if not isinstance(message, Mapping):
             raise WebGatewayError(
                 "invalid_request", "messageはobjectで指定してください。"
@@ -704,79 +833,137 @@ class WebGateway:
                         "から再試行してください。"
                     ),
                 )
+            if message.get("type") == "state_sync":
+                self._state_sync(session, message)
+                return self._drain(session)
             if message.get("type") == "replay_frame_request":
                 self._validate_replay_frame_request(message)
-                try:
-                    frame = self.controller.replay_frame_for_connection(
-                        session.connection_id,
-                        message["index"],
+                if self._lanes is None:
+                    frame = self._replay_frame(session, message)
+                    return (*self._drain(session), frame)
+            else:
+                controller_message = self._prepare_controller_message(
+                    message,
+                    protected_room_access_allowed=protected_room_access_allowed,
+                )
+                controller_options: dict[str, Any] = {
+                    "protected_room_access_allowed": protected_room_access_allowed,
+                }
+                if _rotate_reconnect_token:
+                    controller_options["rotate_reconnect_token"] = True
+                pending_invitation = session.pending_friend_invitation
+                joining_with_invitation = (
+                    controller_message.get("type") == "join_room"
+                    and pending_invitation is not None
+                    and "role" not in controller_message
+                )
+                if (
+                    controller_message.get("type") == "join_room"
+                    and pending_invitation is not None
+                    and "role" in controller_message
+                ):
+                    # Supplying an ordinary role is an explicit return to the
+                    # existing room-code/passphrase flow.
+                    session.pending_friend_invitation = None
+                    pending_invitation = None
+                if self._lanes is None:
+                    outbound = self._call_controller(
+                        session,
+                        controller_message,
+                        controller_options,
+                        pending_invitation if joining_with_invitation else None,
                     )
-                except (LanControllerError, NetworkReplayError) as exc:
-                    code = exc.code
-                    raise WebGatewayError(code, str(exc)) from exc
-                except Exception as exc:
-                    raise WebGatewayError(
-                        "replay_unavailable",
-                        "リプレイを読み込めませんでした。",
-                    ) from exc
-                pending = self._drain(session)
-                return (*pending, deepcopy(frame))
-            controller_message = self._prepare_controller_message(
-                message,
-                protected_room_access_allowed=protected_room_access_allowed,
-            )
-            controller_options: dict[str, Any] = {
-                "protected_room_access_allowed": protected_room_access_allowed,
-            }
-            if _rotate_reconnect_token:
-                controller_options["rotate_reconnect_token"] = True
-            pending_invitation = session.pending_friend_invitation
-            joining_with_invitation = (
-                controller_message.get("type") == "join_room"
-                and pending_invitation is not None
-                and "role" not in controller_message
-            )
-            if (
-                controller_message.get("type") == "join_room"
-                and pending_invitation is not None
-                and "role" in controller_message
-            ):
-                # Supplying an ordinary role is an explicit return to the
-                # existing room-code/passphrase flow.
-                session.pending_friend_invitation = None
-                pending_invitation = None
-            if joining_with_invitation:
-                assert pending_invitation is not None
-                outbound = self._join_with_pending_friend_invitation(
-                    session,
-                    controller_message,
-                    pending_invitation,
+                    return self._deliver(
+                        session, message, outbound, joining_with_invitation
+                    )
+                controller_options["shard"] = self.controller.route_message(
+                    session.connection_id, controller_message
                 )
-            else:
-                outbound = self.controller.handle(
-                    session.connection_id,
-                    controller_message,
-                    **controller_options,
+
+        # Sharded controller: the gateway lock is released for the shard call.
+        if message.get("type") == "replay_frame_request":
+            frame = self._replay_frame(session, message)
+            with self._lock:
+                return (*self._drain(session), frame)
+        with self._lanes[controller_options["shard"]]:
+            outbound = self._call_controller(
+                session,
+                controller_message,
+                controller_options,
+                pending_invitation if joining_with_invitation else None,
+            )
+            with self._lock:
+                return self._deliver(
+                    session, message, outbound, joining_with_invitation
                 )
-            self._dispatch(outbound)
-            if joining_with_invitation and any(
-                item.connection_id == session.connection_id
-                and item.message.get("type") == "session_welcome"
-                for item in outbound
-            ):
-                session.pending_friend_invitation = None
-            if message.get("type") == "leave_room" and not any(
-                item.connection_id == session.connection_id
-                and item.message.get("type") == "request_error"
-                for item in outbound
-            ):
-                # A waiting-room departure intentionally has no direct reply.
-                # Forget durable snapshots so a later page refresh cannot
-                # resurrect the room the browser has just left.  Pending
-                # events are still drained below (including room_closed).
-                session.latest.clear()
-                session.room_resume = None
-            return self._drain(session)
+
+    def _replay_frame(
+        self,
+        session: _BrowserSession,
+        message: Mapping[str, Any],
+    ) -> WebEvent:
+        try:
+            frame = self.controller.replay_frame_for_connection(
+                session.connection_id,
+                message["index"],
+            )
+        except (LanControllerError, NetworkReplayError) as exc:
+            code = exc.code
+            raise WebGatewayError(code, str(exc)) from exc
+        except Exception as exc:
+            raise WebGatewayError(
+                "replay_unavailable",
+                "リプレイを読み込めませんでした。",
+            ) from exc
+        return WebEvent(frame)
+
+    def _call_controller(
+        self,
+        session: _BrowserSession,
+        controller_message: dict[str, Any],
+        controller_options: dict[str, Any],
+        pending_invitation: _PendingFriendInvitation | None,
+    ) -> tuple[OutboundMessage, ...]:
+        if pending_invitation is not None:
+            return self._join_with_pending_friend_invitation(
+                session,
+                controller_message,
+                pending_invitation,
+            )
+        return self.controller.handle(
+            session.connection_id,
+            controller_message,
+            **controller_options,
+        )
+
+    def _deliver(
+        self,
+        session: _BrowserSession,
+        message: Mapping[str, Any],
+        outbound: tuple[OutboundMessage, ...],
+        joining_with_invitation: bool,
+    ) -> tuple[dict[str, Any], ...]:
+        """Queue controller output and drain the requesting browser's events."""
+
+        self._dispatch(outbound)
+        if joining_with_invitation and any(
+            item.connection_id == session.connection_id
+            and item.message.get("type") == "session_welcome"
+            for item in outbound
+        ):
+            session.pending_friend_invitation = None
+        if message.get("type") == "leave_room" and not any(
+            item.connection_id == session.connection_id
+            and item.message.get("type") == "request_error"
+            for item in outbound
+        ):
+            # A waiting-room departure intentionally has no direct reply.
+            # Forget durable snapshots so a later page refresh cannot
+            # resurrect the room the browser has just left.  Pending
+            # events are still drained below (including room_closed).
+            session.latest.clear()
+            session.room_resume = None
+        return self._drain(session)
 
     @staticmethod
     def _prepare_controller_message(
@@ -899,7 +1086,8 @@ class WebGateway:
             )
         except LanControllerError as exc:
             if exc.code in {"authentication_failed", "room_not_found"}:
-                session.pending_friend_invitation = None
+                with self._lock:
+                    session.pending_friend_invitation = None
                 raise WebGatewayError(
                     "authentication_failed",
                     "招待情報を確認できませんでした。",
@@ -1035,11 +1223,7 @@ class WebGateway:
                 self._consume_shared_message_limits(session, limit_message)
             else:
                 self._consume_message_limit(session, limit_message, now)
-            return tuple(
-                deepcopy(session.latest[event_type])
-                for event_type in _BOOTSTRAP_EVENT_TYPES
-                if event_type in session.latest
-            )
+            return self._latest_events(session)
 
     def confirm_room_resume(
         self,
@@ -1080,15 +1264,95 @@ class WebGateway:
         token: str,
         *,
         client_key: str | None = None,
+        maintain: bool = True,
     ) -> tuple[dict[str, Any], ...]:
-        """Run maintenance and drain events queued for one browser."""
+        """Drain events queued for one browser, first running maintenance.
+
+        Push loops pass ``maintain=False``: they already run on every event
+        and leave expiry and AI ticks to the server's maintenance timer.
+        """
+
+        with metric_timer("catan_web_gateway_seconds", operation="poll") as timing:
+            try:
+                with self._lock:
+                    now = float(self._clock())
+                    if maintain:
+                        self._maintain(now)
+                    session = self._require_session(token, client_key)
+                    session.last_seen_at = now
+                    return self._drain(session)
+            except WebGatewayError:
+                timing.label(outcome="rejected")
+                raise
+
+    def wait_for_events(
+        self,
+        token: str,
+        *,
+        client_key: str | None = None,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> bool:
+        """Sleep until events are queued for one browser; do not drain them.
+
+        Returns whether events are pending.  The wait also ends early after
+        ``timeout`` seconds or when ``cancel`` is set and :meth:`wake_session`
+        is called.  An open wait counts as browser activity, and a session
+        that closes meanwhile raises ``session_expired``.
+        """
 
         with self._lock:
-            now = float(self._clock())
-            self._maintain(now)
             session = self._require_session(token, client_key)
-            session.last_seen_at = now
-            return self._drain(session)
+            session.event_waiters += 1
+            try:
+                session.events_ready.wait_for(
+                    lambda: bool(session.pending)
+                    or (cancel is not None and cancel.is_set())
+                    or self._sessions.get(token) is not session,
+                    timeout,
+                )
+            finally:
+                session.event_waiters -= 1
+            session = self._require_session(token, client_key)
+            session.last_seen_at = float(self._clock())
+            return bool(session.pending)
+
+    def wake_session(self, token: str) -> None:
+        """Make waits for ``token`` re-check their ``cancel`` event."""
+
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None:
+                session.events_ready.notify_all()
+
+    def watch_session(
+        self,
+        token: str,
+        listener: Callable[[], None],
+        *,
+        client_key: str | None = None,
+    ) -> None:
+        """Call ``listener`` whenever events are queued for ``token``.
+
+        The listener runs under the gateway lock on whichever thread queued
+        the event, so it must only schedule work and never block or raise.
+        It also runs once when the session closes.  A later watch replaces
+        the earlier listener.
+        """
+
+        if not callable(listener):
+            raise ValueError("listener must be callable")
+        with self._lock:
+            session = self._require_session(token, client_key)
+            session.event_listener = listener
+
+    def unwatch_session(self, token: str, listener: Callable[[], None]) -> None:
+        """Remove ``listener`` unless a newer watch has already replaced it."""
+
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None and session.event_listener is listener:
+                session.event_listener = None
 
     def maintain(self) -> None:
         """Advance expiry and AI work from the server loop, without a client poll."""
@@ -1119,11 +1383,17 @@ class WebGateway:
         session = self._sessions.pop(token, None)
         if session is None:
             return False
+        self._notify(session)
         self._connection_tokens.pop(session.connection_id, None)
         self._dispatch(self.controller.disconnect(session.connection_id))
         return True
 
     def _maintain(self, now: float) -> None:
+        for session in self._sessions.values():
+            # A silent but open WebSocket wakes its push loop only rarely;
+            # it must not expire while the socket is still connected.
+            if session.event_waiters or session.event_listener is not None:
+                session.last_seen_at = now
         expired = [
             token
             for token, session in self._sessions.items()
@@ -1132,11 +1402,42 @@ class WebGateway:
         for token in expired:
             self._close_session_unchecked(token)
         self._prune_client_limits(now)
-        if now - self._last_tick >= 1.0:
-            self._dispatch(self.controller.tick())
+        if now - self._last_tick >= 1.0 and self._try_acquire_lanes():
+            try:
+                self._dispatch(self.controller.tick())
+            finally:
+                self._release_lanes()
             self._last_tick = now
 
+    def _try_acquire_lanes(self) -> bool:
+        """Take every shard lane without blocking, or none of them.
+
+        Called with ``_lock`` held, so it must not wait: a request holding a
+        lane may be waiting for ``_lock`` to queue its events.  A busy lane
+        defers the tick to the next maintenance pass, which keeps tick events
+        from overtaking an in-flight request's older events.
+        """
+
+        if self._lanes is None:
+            return True
+        acquired = []
+        for lane in self._lanes:
+            if not lane.acquire(blocking=False):
+                for held in acquired:
+                    held.release()
+                return False
+            acquired.append(lane)
+        return True
+
+    def _release_lanes(self) -> None:
+        if self._lanes is not None:
+            for lane in self._lanes:
+                lane.release()
+
     def _dispatch(self, outbound: tuple[OutboundMessage, ...]) -> None:
+        # The controller hands one message object to every connection that
+        # shares a view, so each object is frozen once for all of them.
+        frozen: dict[int, WebEvent] = {}
         for item in outbound:
             token = self._connection_tokens.get(item.connection_id)
             if token is None:
@@ -1144,7 +1445,9 @@ class WebGateway:
             session = self._sessions.get(token)
             if session is None:
                 continue
-            message = deepcopy(item.message)
+            message = frozen.get(id(item.message))
+            if message is None:
+                message = frozen[id(item.message)] = WebEvent(item.message)
             self._enqueue(session, message)
             if (
                 message.get("type") == "state_snapshot"
@@ -1159,16 +1462,18 @@ class WebGateway:
                     # failure must never interrupt authoritative live state.
                     self._enqueue(
                         session,
-                        {
-                            "type": "network_result_unavailable",
-                            "protocol_version": WEB_API_VERSION,
-                            "message": "対局結果とリプレイを読み込めませんでした。",
-                        },
+                        WebEvent(
+                            {
+                                "type": "network_result_unavailable",
+                                "protocol_version": WEB_API_VERSION,
+                                "message": "対局結果とリプレイを読み込めませんでした。",
+                            }
+                        ),
                     )
                     continue
-                self._enqueue(session, deepcopy(result))
+                self._enqueue(session, WebEvent(result))
 
-    def _enqueue(self, session: _BrowserSession, message: dict[str, Any]) -> None:
+    def _enqueue(self, session: _BrowserSession, message: WebEvent) -> None:
         """Store one already-routed event with coalescing and bootstrap state."""
 
         message_type = message.get("type")
@@ -1186,10 +1491,11 @@ class WebGateway:
                 # to direct responses, pending events, WebSocket frames and
                 # reload bootstrap alike; only the HTTP cookie adapter may
                 # read the server-side copy captured above.
-                message["reconnect_token"] = None
+                message = WebEvent({**message, "reconnect_token": None})
                 # Joining a room starts a new durable browser view.  This
                 # also removes a room_closed event from an earlier match.
                 session.latest.clear()
+                session.delivered_snapshot = None
             if message_type == "network_match_result":
                 session.latest.pop("network_result_unavailable", None)
                 session.pending = deque(
@@ -1200,11 +1506,11 @@ class WebGateway:
             elif message_type == "network_result_unavailable":
                 session.latest.pop("network_match_result", None)
             if message_type in _BOOTSTRAP_EVENT_TYPES:
-                durable_message = deepcopy(message)
-                session.latest[message_type] = durable_message
+                session.latest[message_type] = message
             if message_type == "game_command_result":
                 self._advance_bootstrap_sequence(session, message)
             if message_type == "room_closed":
+                session.delivered_snapshot = None
                 session.latest.pop("lobby_snapshot", None)
                 session.latest.pop("state_snapshot", None)
                 session.latest.pop("network_match_result", None)
@@ -1215,6 +1521,14 @@ class WebGateway:
             )
         session.pending.append(message)
         self._bound_pending(session)
+        self._notify(session)
+
+    @staticmethod
+    def _notify(session: _BrowserSession) -> None:
+        with session.events_ready:
+            session.events_ready.notify_all()
+        if session.event_listener is not None:
+            session.event_listener()
 
     @staticmethod
     def _advance_bootstrap_sequence(
@@ -1225,7 +1539,7 @@ class WebGateway:
 
         welcome = session.latest.get("session_welcome")
         sequence = message.get("sequence")
-        if not isinstance(welcome, dict) or isinstance(sequence, bool) or not isinstance(
+        if welcome is None or isinstance(sequence, bool) or not isinstance(
             sequence, int
         ):
             return
@@ -1239,7 +1553,9 @@ class WebGateway:
         current = welcome.get("next_sequence", 0)
         if isinstance(current, bool) or not isinstance(current, int) or current < 0:
             current = 0
-        welcome["next_sequence"] = max(current, sequence + 1)
+        session.latest["session_welcome"] = WebEvent(
+            {**welcome, "next_sequence": max(current, sequence + 1)}
+        )
 
     @staticmethod
     def _validate_replay_frame_request(message: Mapping[str, Any]) -> None:
@@ -1277,11 +1593,83 @@ class WebGateway:
             )
             del session.pending[removable]
 
-    @staticmethod
-    def _drain(session: _BrowserSession) -> tuple[dict[str, Any], ...]:
-        events = tuple(deepcopy(event) for event in session.pending)
+    def _drain(self, session: _BrowserSession) -> tuple[WebEvent, ...]:
+        events = []
+        for event in session.pending:
+            if event.get("type") == "state_snapshot":
+                previous = session.delivered_snapshot
+                session.delivered_snapshot = event
+                if session.state_deltas and previous is not None:
+                    event = self._state_delta(previous, event) or event
+            events.append(event)
         session.pending.clear()
-        return events
+        return tuple(events)
+
+    def _state_delta(self, previous: WebEvent, event: WebEvent) -> WebEvent | None:
+        """Diff and freeze one delta per baseline, whoever drains it first."""
+
+        key = (id(previous), id(event))
+        cached = self._state_deltas.get(key)
+        if cached is not None:
+            self._state_deltas.move_to_end(key)
+            return cached[2]
+        delta = build_state_delta(previous, event)
+        delta_event = None if delta is None else WebEvent(delta)
+        self._state_deltas[key] = (previous, event, delta_event)
+        while len(self._state_deltas) > _STATE_DELTA_CACHE_LIMIT:
+            self._state_deltas.popitem(last=False)
+        return delta_event
+
+    @staticmethod
+    def _latest_events(session: _BrowserSession) -> tuple[WebEvent, ...]:
+        """Return durable events that replace all client state (page reload)."""
+
+        session.delivered_snapshot = session.latest.get("state_snapshot")
+        return tuple(
+            session.latest[event_type]
+            for event_type in _BOOTSTRAP_EVENT_TYPES
+            if event_type in session.latest
+        )
+
+    @staticmethod
+    def _state_sync(session: _BrowserSession, message: Mapping[str, Any]) -> None:
+        """Record the browser's delta preference and repair a revision gap."""
+
+        if type(message) is not dict or set(message) != {
+            "type",
+            "protocol_version",
+            "known_revision",
+            "accept_deltas",
+        }:
+            raise WebGatewayError("invalid_request", "state_syncが不正です。")
+        if message.get("protocol_version") != WEB_API_VERSION:
+            raise WebGatewayError(
+                "version_mismatch",
+                "通信versionが一致しません。",
+            )
+        accept_deltas = message["accept_deltas"]
+        known_revision = message["known_revision"]
+        if type(accept_deltas) is not bool or (
+            known_revision is not None
+            and (type(known_revision) is not int or known_revision < 0)
+        ):
+            raise WebGatewayError("invalid_request", "state_syncが不正です。")
+        session.state_deltas = accept_deltas
+        delivered = session.delivered_snapshot
+        if (
+            known_revision is not None
+            and delivered is not None
+            and delivered.get("revision") == known_revision
+        ):
+            return
+        # The browser missed or could not apply a delta.  Its next snapshot
+        # is sent in full and becomes the new baseline.
+        session.delivered_snapshot = None
+        latest = session.latest.get("state_snapshot")
+        if latest is not None and not any(
+            event.get("type") == "state_snapshot" for event in session.pending
+        ):
+            session.pending.append(latest)
 
     def _consume_session_creation_limit(self, client_key: str, now: float) -> None:
         code = "session_rate_limited"
@@ -1613,9 +2001,12 @@ __all__ = (
     "DEFAULT_FRIEND_INVITATION_TTL_SECONDS",
     "DEFAULT_WEB_SESSION_IDLE_SECONDS",
     "MAX_PENDING_WEB_EVENTS",
+    "MAX_WEB_SESSION_LIMIT",
     "MAX_WEB_SESSIONS",
     "WEB_API_VERSION",
+    "WebEvent",
     "WebGateway",
     "WebGatewayError",
     "WebRateLimits",
+    "encode_event_document",
 )
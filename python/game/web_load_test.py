@@ -0,0 +1,384 @@
+"""Open many local WebSocket clients against the Web server and time them.
+
+``python -m game.web_load_test`` starts an in-process server (the asyncio
+mode by default, or the threaded one with ``--server threaded``) on a
+loopback port, connects ``--clients`` browser-like sessions, and then has
+every client send ``--messages`` heartbeats once all of them are connected.
+It prints a JSON document with connect and round-trip latency percentiles,
+the peak thread count and the errors seen, so the two serving modes can be
+compared on the same machine.
+
+Clients and server share one process, so the numbers include the client's
+own scheduling and are useful for comparisons rather than as capacity
+figures.  The server's gateway is sized for the run (``session_limit`` and
+the per-client session-creation limit), since every client comes from
+127.0.0.1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.bench import BenchmarkResult
+from game.network_protocol import NETWORK_PROTOCOL_VERSION
+from game.web_async_server import create_async_web_server
+from game.web_gateway import MAX_WEB_SESSION_LIMIT, WebGateway, WebRateLimits
+from game.web_server import WEB_SESSION_COOKIE, create_web_server
+from game.websocket_transport import (
+    WebSocketOpcode,
+    encode_websocket_frame,
+    read_websocket_frame_async,
+)
+
+
+LOAD_TEST_FORMAT = "catan-web-load"
+LOAD_TEST_VERSION = 1
+SERVER_MODES = ("async", "threaded")
+DEFAULT_CLIENTS = 200
+DEFAULT_MESSAGES = 20
+DEFAULT_CONNECT_CONCURRENCY = 32
+DEFAULT_CLIENT_TIMEOUT = 60.0
+# Heartbeats are cheap for the gateway but still rate limited per session.
+MAX_MESSAGES = 1000
+
+
+@dataclass
+class LoadTestResults:
+    """Samples, in milliseconds, collected by every client of one run."""
+
+    connect: list[float] = field(default_factory=list)
+    round_trip: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    peak_threads: int = 0
+
+
+class _Arrivals:
+    """Release every client once all of them connected or gave up."""
+
+    def __init__(self, expected: int) -> None:
+        self.remaining = expected
+        self.done = asyncio.Event()
+
+    def arrive(self) -> None:
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.done.set()
+
+
+def _validate_options(
+    server: str,
+    clients: int,
+    messages: int,
+    connect_concurrency: int,
+    timeout: float,
+) -> None:
+    if server not in SERVER_MODES:
+        raise ValueError(f"server must be one of {', '.join(SERVER_MODES)}")
+    for name, value, upper in (
+        ("clients", clients, MAX_WEB_SESSION_LIMIT),
+        ("messages", messages, MAX_MESSAGES),
+        ("connect_concurrency", connect_concurrency, MAX_WEB_SESSION_LIMIT),
+    ):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f"{name} must be an int")
+        if not 1 <= value <= upper:
+            raise ValueError(f"{name} must be 1..{upper}")
+    if (
+        isinstance(timeout, bool)
+        or not isinstance(timeout, (int, float))
+        or not 0 < timeout <= 600
+    ):
+        raise ValueError("timeout must be 0..600 seconds")
+
+
+def _load_test_gateway(clients: int, messages: int) -> WebGateway:
+    return WebGateway(
+        session_limit=clients,
+        rate_limits=WebRateLimits(
+            session_creations_per_client=max(12, clients),
+            heartbeats_per_session=max(300, messages),
+        ),
+    )
+
+
+async def _http_exchange(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    request: str,
+) -> tuple[int, dict[str, str]]:
+    writer.write(request.encode("ascii"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status_line, *header_lines = head.split("\r\n")
+    headers: dict[str, str] = {}
+    for line in header_lines:
+        name, separator, value = line.partition(":")
+        if separator:
+            headers.setdefault(name.strip().lower(), value.strip())
+    length = int(headers.get("content-length", "0"))
+    if length:
+        await reader.readexactly(length)
+    return int(status_line.split(" ", 2)[1]), headers
+
+
+def _send_text(writer: asyncio.StreamWriter, document: dict) -> None:
+    writer.write(
+        encode_websocket_frame(
+            json.dumps(document, separators=(",", ":")).encode("utf-8"),
+            opcode=WebSocketOpcode.TEXT,
+            masking_key=os.urandom(4),
+        )
+    )
+
+
+async def _receive_response(reader: asyncio.StreamReader) -> dict:
+    while True:
+        frame = await read_websocket_frame_async(reader, require_mask=False)
+        if frame.opcode is WebSocketOpcode.CLOSE:
+            raise ConnectionError("server closed the WebSocket")
+        if frame.opcode is not WebSocketOpcode.TEXT:
+            continue
+        document = json.loads(frame.payload)
+        # Pushed events may arrive between a request and its response.
+        if document.get("kind") == "response":
+            return document
+
+
+async def _run_client(
+    index: int,
+    port: int,
+    messages: int,
+    results: LoadTestResults,
+    arrivals: _Arrivals,
+    connect_slots: asyncio.Semaphore,
+) -> None:
+    writer = None
+    arrived = False
+    host = f"127.0.0.1:{port}"
+    try:
+        async with connect_slots:
+            started = time.perf_counter()
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, headers = await _http_exchange(
+                reader,
+                writer,
+                "POST /api/session HTTP/1.1\r\n"
+                f"Host: {host}\r\n"
+                "Content-Length: 0\r\n\r\n",
+            )
+            cookie = headers.get("set-cookie", "").split(";", 1)[0]
+            if status != 200 or not cookie.startswith(f"{WEB_SESSION_COOKIE}="):
+                raise ConnectionError(f"session request failed with HTTP {status}")
+            status, _headers = await _http_exchange(
+                reader,
+                writer,
+                "GET /api/socket HTTP/1.1\r\n"
+                f"Host: {host}\r\n"
+                "Connection: Upgrade\r\n"
+                "Upgrade: websocket\r\n"
+                "Sec-WebSocket-Version: 13\r\n"
+                f"Sec-WebSocket-Key: {base64.b64encode(os.urandom(16)).decode()}\r\n"
+                f"Origin: http://{host}\r\n"
+                f"Cookie: {cookie}\r\n\r\n",
+            )
+            if status != 101:
+                raise ConnectionError(f"WebSocket upgrade failed with HTTP {status}")
+            bootstrap = await read_websocket_frame_async(reader, require_mask=False)
+            if json.loads(bootstrap.payload).get("kind") != "bootstrap":
+                raise ConnectionError("WebSocket did not start with a bootstrap")
+            results.connect.append((time.perf_counter() - started) * 1000)
+        arrived = True
+        arrivals.arrive()
+        await arrivals.done.wait()
+        results.peak_threads = max(results.peak_threads, threading.active_count())
+        for sequence in range(messages):
+            started = time.perf_counter()
+            _send_text(
+                writer,
+                {
+                    "type": "ping",
+                    "protocol_version": NETWORK_PROTOCOL_VERSION,
+                    "nonce": f"load-{index}-{sequence}",
+                },
+            )
+            await writer.drain()
+            document = await _receive_response(reader)
+            if "error" in document:
+                raise ConnectionError(document["error"].get("code", "error"))
+            results.round_trip.append((time.perf_counter() - started) * 1000)
+        writer.write(
+            encode_websocket_frame(
+                (1000).to_bytes(2, "big"),
+                opcode=WebSocketOpcode.CLOSE,
+                masking_key=os.urandom(4),
+            )
+        )
+    except Exception as exc:
+        results.errors[type(exc).__name__] += 1
+    finally:
+        if not arrived:
+            arrivals.arrive()
+        if writer is not None:
+            writer.close()
+
+
+async def _run_clients(
+    port: int,
+    clients: int,
+    messages: int,
+    connect_concurrency: int,
+    timeout: float,
+) -> LoadTestResults:
+    results = LoadTestResults()
+    arrivals = _Arrivals(clients)
+    connect_slots = asyncio.Semaphore(connect_concurrency)
+    tasks = [
+        asyncio.create_task(
+            _run_client(index, port, messages, results, arrivals, connect_slots)
+        )
+        for index in range(clients)
+    ]
+    _done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+        results.errors["Timeout"] += 1
+    await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+
+def run_load_test(
+    *,
+    server: str = "async",
+    clients: int = DEFAULT_CLIENTS,
+    messages: int = DEFAULT_MESSAGES,
+    connect_concurrency: int = DEFAULT_CONNECT_CONCURRENCY,
+    timeout: float = DEFAULT_CLIENT_TIMEOUT,
+) -> dict:
+    """Run one load test against a fresh local server and return a document."""
+    _validate_options(server, clients, messages, connect_concurrency, timeout)
+    factory = create_async_web_server if server == "async" else create_web_server
+    web_server = factory(
+        "127.0.0.1", 0, gateway=_load_test_gateway(clients, messages)
+    )
+    thread = threading.Thread(target=web_server.serve_forever, daemon=True)
+    thread.start()
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(
+            _run_clients(
+                web_server.server_port,
+                clients,
+                messages,
+                connect_concurrency,
+                timeout,
+            )
+        )
+    finally:
+        elapsed = time.perf_counter() - started
+        web_server.shutdown()
+        web_server.server_close()
+        thread.join(timeout=5)
+    latencies = {}
+    for name, samples in (
+        ("connect", results.connect),
+        ("round_trip", results.round_trip),
+    ):
+        if samples:
+            latencies[name] = BenchmarkResult(name, tuple(samples)).to_dict()
+    return {
+        "format": LOAD_TEST_FORMAT,
+        "version": LOAD_TEST_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": server,
+        "clients": clients,
+        "messages": messages,
+        "connected": len(results.connect),
+        "elapsed_seconds": round(elapsed, 3),
+        "peak_threads": results.peak_threads,
+        "errors": dict(sorted(results.errors.items())),
+        "results": latencies,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="カタン風ゲーム Webサーバー負荷試験")
+    parser.add_argument(
+        "--server",
+        choices=SERVER_MODES,
+        default="async",
+        help="試験するサーバー方式（既定async）",
+    )
+    parser.add_argument(
+        "--clients",
+        type=int,
+        default=DEFAULT_CLIENTS,
+        help=f"同時に接続するWebSocketクライアント数（1..{MAX_WEB_SESSION_LIMIT}）",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=DEFAULT_MESSAGES,
+        help="全員の接続後に各クライアントが送るheartbeat数",
+    )
+    parser.add_argument(
+        "--connect-concurrency",
+        type=int,
+        default=DEFAULT_CONNECT_CONCURRENCY,
+        help="同時に接続処理を行うクライアント数",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_CLIENT_TIMEOUT,
+        help="試験全体の制限秒数",
+    )
+    parser.add_argument("--pretty", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        document = run_load_test(
+            server=args.server,
+            clients=args.clients,
+            messages=args.messages,
+            connect_concurrency=args.connect_concurrency,
+            timeout=args.timeout,
+        )
+    except (OSError, TypeError, ValueError) as exc:
+        parser.error(str(exc))
+    print(
+        json.dumps(
+            document,
+            ensure_ascii=False,
+            indent=2 if args.pretty else None,
+            sort_keys=args.pretty,
+        )
+    )
+    if document["errors"]:
+        print(
+            f"LOAD TEST ERRORS: {sum(document['errors'].values())} client(s) failed",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
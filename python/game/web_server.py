@@ -17,7 +17,13 @@ from collections.abc import Iterable
 from typing import Any
 from urllib.parse import urlsplit
 
-from game.web_gateway import WEB_API_VERSION, WebGateway, WebGatewayError
+from game.runtime_metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+from game.web_gateway import (
+    WEB_API_VERSION,
+    WebGateway,
+    WebGatewayError,
+    encode_event_document,
+)
 from game.websocket_transport import (
     WebSocketConnection,
     WebSocketEOF,
@@ -35,7 +41,9 @@ WEB_ROOM_RESUME_COOKIE = "catan_room_resume"
 WEB_FRIEND_CLAIM_COOKIE = "catan_friend_claim"
 WEB_ROOM_RESUME_COOKIE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
 MAX_WEB_COOKIE_HEADER_BYTES = 8 * 1024
-WEBSOCKET_EVENT_PUSH_SECONDS = 0.2
+# An idle socket's push thread wakes this rarely, only to keep its browser
+# session from expiring; queued events wake it immediately.
+WEBSOCKET_IDLE_WAKE_SECONDS = 60.0
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_WEB_STATIC_ROOT = _PROJECT_ROOT / "web"
@@ -150,8 +158,11 @@ class CatanWebServer(ThreadingHTTPServer):
         allowed_hosts: Iterable[str] = (),
         tls_certfile: str | Path | None = None,
         tls_keyfile: str | Path | None = None,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         host, port = server_address
+        if metrics is not None and not isinstance(metrics, MetricsRegistry):
+            raise ValueError("metrics must be a MetricsRegistry")
         if type(lan_mode) is not bool:
             raise ValueError("lan_mode must be a boolean")
         if type(friends_vpn_mode) is not bool:
@@ -180,6 +191,7 @@ class CatanWebServer(ThreadingHTTPServer):
         self.lan_mode = lan_mode
         self.friends_vpn_mode = friends_vpn_mode
         self.allowed_hosts = canonical_allowed_hosts
+        self.metrics = metrics
         self.tls_enabled = tls_context is not None
         self.transport_scheme = "https" if self.tls_enabled else "http"
         self.websocket_scheme = "wss" if self.tls_enabled else "ws"
@@ -201,13 +213,10 @@ class CatanWebServer(ThreadingHTTPServer):
         """Reject peers outside the selected network before the TLS handshake."""
 
         connection, client_address = super().get_request()
-        peer = str(client_address[0])
-        if self.friends_vpn_mode and not _is_tailscale_peer(peer):
-            connection.close()
-            raise OSError("connection source is outside the friends VPN boundary")
-        if self.lan_mode and not _is_trusted_lan_peer(peer):
+        rejection = self.peer_rejection(str(client_address[0]))
+        if rejection is not None:
             connection.close()
-            raise OSError("connection source is outside the trusted LAN boundary")
+            raise OSError(rejection)
         if self._tls_context is not None:
             try:
                 connection = self._tls_context.wrap_socket(
@@ -219,6 +228,15 @@ class CatanWebServer(ThreadingHTTPServer):
                 raise
         return connection, client_address
 
+    def peer_rejection(self, peer: str) -> str | None:
+        """Return why a TCP peer is outside the selected network, if it is."""
+
+        if self.friends_vpn_mode and not _is_tailscale_peer(peer):
+            return "connection source is outside the friends VPN boundary"
+        if self.lan_mode and not _is_trusted_lan_peer(peer):
+            return "connection source is outside the trusted LAN boundary"
+        return None
+
     def service_actions(self) -> None:
         """Keep authoritative AI moving even when browser timers are throttled."""
 
@@ -244,6 +262,7 @@ class CatanWebServer(ThreadingHTTPServer):
                 return
             previous_connection, previous_stop = previous
             previous_stop.set()
+            self.gateway.wake_session(token)
             try:
                 previous_connection.send_close(1001, "superseded")
             except (WebSocketEOF, OSError):
@@ -281,14 +300,13 @@ class CatanWebServer(ThreadingHTTPServer):
         with self._websocket_lock:
             if not self.websocket_is_active(token, connection):
                 return False
-            events = self.gateway.poll(token, client_key=client_key)
+            events = self.gateway.poll(token, client_key=client_key, maintain=False)
             if events:
-                connection.send_json(
-                    {
-                        "api_version": WEB_API_VERSION,
-                        "kind": "push",
-                        "events": list(events),
-                    }
+                connection.send_encoded_json(
+                    encode_event_document(
+                        {"api_version": WEB_API_VERSION, "kind": "push"},
+                        events,
+                    )
                 )
             return True
 
@@ -304,29 +322,45 @@ class CatanWebServer(ThreadingHTTPServer):
         with self._websocket_lock:
             if not self.websocket_is_active(token, connection):
                 return False
-            if message.get("type") in _WEBSOCKET_FORBIDDEN_MEMBERSHIP_MESSAGES:
-                raise WebGatewayError(
-                    "http_required",
-                    "部屋の作成・参加・退出は安全なHTTP経路で実行してください。",
-                    status=409,
+            events = self.websocket_gateway_events(token, message, client_key)
+            connection.send_encoded_json(
+                encode_event_document(
+                    {"api_version": WEB_API_VERSION, "kind": "response"},
+                    events,
                 )
-            events = self.gateway.handle(
-                token,
-                message,
-                client_key=client_key,
-                protected_room_access_allowed=(
-                    self.protected_room_access_allowed(client_key)
-                ),
-            )
-            connection.send_json(
-                {
-                    "api_version": WEB_API_VERSION,
-                    "kind": "response",
-                    "events": list(events),
-                }
             )
             return True
 
+    def websocket_gateway_events(
+        self,
+        token: str,
+        message: dict[str, Any],
+        client_key: str,
+    ) -> tuple[dict[str, Any], ...]:
+        """Apply one socket message; membership changes stay on HTTP."""
+
+        if message.get("type") in _WEBSOCKET_FORBIDDEN_MEMBERSHIP_MESSAGES:
+            raise WebGatewayError(
+                "http_required",
+                "部屋の作成・参加・退出は安全なHTTP経路で実行してください。",
+                status=409,
+            )
+        return self.gateway.handle(
+            token,
+            message,
+            client_key=client_key,
+            protected_room_access_allowed=(
+                self.protected_room_access_allowed(client_key)
+            ),
+        )
+
+    def websocket_error_document(self, error: WebGatewayError) -> dict[str, Any]:
+        return {
+            "api_version": WEB_API_VERSION,
+            "kind": "response",
+            "error": self.public_error_document(error),
+        }
+
     def send_websocket_error(
         self,
         token: str,
@@ -336,13 +370,7 @@ class CatanWebServer(ThreadingHTTPServer):
         with self._websocket_lock:
             if not self.websocket_is_active(token, connection):
                 return False
-            connection.send_json(
-                {
-                    "api_version": WEB_API_VERSION,
-                    "kind": "response",
-                    "error": self.public_error_document(error),
-                }
-            )
+            connection.send_json(self.websocket_error_document(error))
             return True
 
     def protected_room_access_allowed(self, client_key: str) -> bool:
@@ -481,6 +509,13 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
                     },
                 )
                 return
+            if (
+                path == "/metrics"
+                and method == "GET"
+                and self.catan_server.metrics is not None
+            ):
+                self._serve_metrics()
+                return
             if path == "/api/socket" and method == "GET":
                 self._handle_websocket()
                 return
@@ -772,14 +807,7 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
                     ),
                 )
             )
-        self._json_response(
-            HTTPStatus.OK,
-            {
-                "api_version": WEB_API_VERSION,
-                "events": list(events),
-            },
-            extra_headers=extra_headers,
-        )
+        self._event_response(events, extra_headers=extra_headers)
 
     def _issue_friend_invitation(self) -> None:
         token = self._required_session_token()
@@ -1200,13 +1228,12 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
         public_events = [
             event for event in events if event.get("type") != "resume_confirmed"
         ]
-        self._json_response(
+        self._encoded_json_response(
             HTTPStatus.OK,
-            {
-                "api_version": WEB_API_VERSION,
-                "confirmed": confirmed,
-                "events": public_events,
-            },
+            encode_event_document(
+                {"api_version": WEB_API_VERSION, "confirmed": confirmed},
+                public_events,
+            ),
         )
 
     def _clear_room_resume(self) -> None:
@@ -1255,23 +1282,24 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
             self.send_header(key, value)
         self.end_headers()
         self.close_connection = True
+        self._serve_websocket(token, client_key)
+
+    def _serve_websocket(self, token: str, client_key: str) -> None:
+        """Run the upgraded socket until it closes or is superseded."""
 
         stop_push = threading.Event()
         socket_connection = WebSocketConnection(self.rfile, self.wfile)
         push_thread = None
         self.catan_server.activate_websocket(token, socket_connection, stop_push)
         try:
-            socket_connection.send_json(
-                {
-                    "api_version": WEB_API_VERSION,
-                    "kind": "bootstrap",
-                    "events": list(
-                        self.catan_server.gateway.bootstrap(
-                            token,
-                            client_key=client_key,
-                        )
+            socket_connection.send_encoded_json(
+                encode_event_document(
+                    {"api_version": WEB_API_VERSION, "kind": "bootstrap"},
+                    self.catan_server.gateway.bootstrap(
+                        token,
+                        client_key=client_key,
                     ),
-                }
+                )
             )
             push_thread = threading.Thread(
                 target=self._push_websocket_events,
@@ -1324,8 +1352,9 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
         finally:
             stop_push.set()
             self.catan_server.deactivate_websocket(token, socket_connection)
+            self.catan_server.gateway.wake_session(token)
             if push_thread is not None:
-                push_thread.join(timeout=WEBSOCKET_EVENT_PUSH_SECONDS * 2)
+                push_thread.join(timeout=1.0)
 
     def _push_websocket_events(
         self,
@@ -1334,11 +1363,25 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
         stop_push: threading.Event,
         client_key: str,
     ) -> None:
-        """Push queued AI/broadcast events without relying on browser timers."""
+        """Push AI/broadcast events as soon as the gateway queues them.
+
+        The thread sleeps on the session's condition rather than polling, so
+        an idle socket costs no CPU or gateway lock time.  Expiry and AI ticks
+        stay on the server's own maintenance timer (``service_actions``).
+        """
 
-        while not stop_push.wait(WEBSOCKET_EVENT_PUSH_SECONDS):
+        gateway = self.catan_server.gateway
+        while not stop_push.is_set():
             try:
-                if not self.catan_server.push_websocket_events(
+                ready = gateway.wait_for_events(
+                    token,
+                    client_key=client_key,
+                    timeout=WEBSOCKET_IDLE_WAKE_SECONDS,
+                    cancel=stop_push,
+                )
+                if stop_push.is_set():
+                    return
+                if ready and not self.catan_server.push_websocket_events(
                     token,
                     socket_connection,
                     client_key,
@@ -1394,6 +1437,29 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
             ),
         )
 
+    def _serve_metrics(self) -> None:
+        """Expose runtime metrics to a scraper on this host only.
+
+        The route exists only when the server was given a registry, and it
+        is refused to LAN and VPN peers even in those exposure modes.
+        """
+
+        if not _is_loopback_web_host(self._client_key()):
+            self._json_error(
+                HTTPStatus.FORBIDDEN,
+                "metrics_local_only",
+                "metricsは同一端末からだけ取得できます。",
+            )
+            return
+        payload = self.catan_server.metrics.render().encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self._security_headers()
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
     def _serve_static(self, path: str, *, head_only: bool) -> None:
         filename, content_type = _STATIC_ROUTES[path]
         payload = (self.catan_server.static_root / filename).read_bytes()
@@ -1412,9 +1478,9 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
         *,
         extra_headers: Iterable[tuple[str, str]] = (),
     ) -> None:
-        self._json_response(
+        self._encoded_json_response(
             HTTPStatus.OK,
-            {"api_version": WEB_API_VERSION, "events": list(events)},
+            encode_event_document({"api_version": WEB_API_VERSION}, events),
             extra_headers=extra_headers,
         )
 
@@ -1695,6 +1761,15 @@ class CatanWebRequestHandler(BaseHTTPRequestHandler):
             allow_nan=False,
             separators=(",", ":"),
         ).encode("utf-8")
+        self._encoded_json_response(status, payload, extra_headers=extra_headers)
+
+    def _encoded_json_response(
+        self,
+        status: int,
+        payload: bytes,
+        *,
+        extra_headers: Iterable[tuple[str, str]] = (),
+    ) -> None:
         self.send_response(status)
         self._security_headers()
         self.send_header("Content-Type", "application/json; charset=utf-8")
@@ -1993,6 +2068,7 @@ def create_web_server(
     allowed_hosts: Iterable[str] = (),
     tls_certfile: str | Path | None = None,
     tls_keyfile: str | Path | None = None,
+    metrics: MetricsRegistry | None = None,
 ) -> CatanWebServer:
     return CatanWebServer(
         (host, port),
@@ -2003,6 +2079,7 @@ def create_web_server(
         allowed_hosts=allowed_hosts,
         tls_certfile=tls_certfile,
         tls_keyfile=tls_keyfile,
+        metrics=metrics,
     )
 
 
@@ -21,13 +21,16 @@ from game.self_play import (
     SUPPORTED_BOARD_MODES,
     SUPPORTED_PLAYER_COUNTS,
     parse_personality_lineup,
+    rollout_config_from_options,
     run_batch,
+    run_batch_to_log,
 )
 from game.self_play_report import (
     ReportError,
     build_report_data,
+    read_match_log,
     render_terminal_summary,
-    write_report,
+    write_report_data,
 )
 
 
@@ -74,6 +77,33 @@ def _build_parser() -> argparse.ArgumentParser:
             "2〜32: 指定数で並列、既定: 0）"
         ),
     )
+    parser.add_argument(
+        "--rollouts",
+        type=int,
+        default=None,
+        help="rollout AIが候補ごとに試行する回数（既定: 3）",
+    )
+    parser.add_argument(
+        "--rollout-time",
+        type=float,
+        default=None,
+        help="rollout AIの1判断あたりの時間予算（秒、指定時は結果が実行速度に依存）",
+    )
+    parser.add_argument(
+        "--rollout-workers",
+        type=int,
+        default=None,
+        help="rollout AIの試行に使うプロセス数（省略時は試合プロセス内で実行）",
+    )
+    parser.add_argument(
+        "--result-log",
+        type=Path,
+        default=None,
+        help=(
+            "試合ごとに追記するJSONL結果ログ。既存ログは最後の完了試合から再開し、"
+            "レポートもログから読み込みます"
+        ),
+    )
     parser.add_argument("--output-dir", type=Path, default=Path("self-play-reports"))
     parser.add_argument("--basename", default="self-play-latest")
     parser.add_argument("--open", action="store_true", help="完了後にHTMLを既定ブラウザで開く")
@@ -104,20 +134,29 @@ def main(argv: list[str] | None = None) -> int:
             flush=True,
         )
 
+    options = {
+        "game_count": args.games,
+        "match_seed_start": args.seed,
+        "board_seed": args.board_seed,
+        "board_mode": args.mode,
+        "player_count": args.players,
+        "victory_target": args.target,
+        "max_turns": args.max_turns,
+        "max_action_steps": args.max_actions,
+        "personalities": args.personalities,
+        "progress": show_progress,
+        "workers": args.workers,
+    }
     try:
-        batch = run_batch(
-            game_count=args.games,
-            match_seed_start=args.seed,
-            board_seed=args.board_seed,
-            board_mode=args.mode,
-            player_count=args.players,
-            victory_target=args.target,
-            max_turns=args.max_turns,
-            max_action_steps=args.max_actions,
-            personalities=args.personalities,
-            progress=show_progress,
-            workers=args.workers,
+        options["rollout_config"] = rollout_config_from_options(
+            args.rollouts, args.rollout_time, args.rollout_workers
         )
+        if args.result_log is None:
+            batch = run_batch(**options)
+            source = batch
+        else:
+            batch = run_batch_to_log(args.result_log, **options)
+            source = read_match_log(args.result_log)
         duration = time.perf_counter() - started
         generated_at = datetime.now(timezone.utc).isoformat()
         metadata = {
@@ -136,18 +175,20 @@ def main(argv: list[str] | None = None) -> int:
             "max_turns": args.max_turns,
             "max_action_steps": args.max_actions,
         }
-        paths = write_report(
-            batch,
-            args.output_dir,
-            basename=args.basename,
-            metadata=metadata,
-            generated_at=generated_at,
-        )
+        if options["rollout_config"] is not None:
+            metadata["rollout_config"] = {
+                "rollouts_per_action": options["rollout_config"].rollouts_per_action,
+                "time_budget": options["rollout_config"].time_budget,
+                "workers": args.rollout_workers,
+            }
+        if args.result_log is not None:
+            metadata["resumed_games"] = batch.resumed_games
         report = build_report_data(
-            batch,
+            source,
             metadata=metadata,
             generated_at=generated_at,
         )
+        paths = write_report_data(report, args.output_dir, basename=args.basename)
     except (OSError, ReportError, TypeError, ValueError) as exc:
         if not args.quiet:
             print(file=sys.stderr)
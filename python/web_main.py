@@ -13,9 +13,12 @@ os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 
 from game.lan_controller import LanServerController
 from game.network_replay_store import SQLiteNetworkReplayStore
+from game.room_shards import MAX_ROOM_SHARDS, ShardedLanServerController
+from game.runtime_metrics import enable_metrics
 from game.server_state import SQLiteRoomAuthorityStore
 from game.shared_rate_limit import SQLiteSharedRateLimitStore
-from game.web_gateway import WebGateway
+from game.web_async_server import create_async_web_server
+from game.web_gateway import MAX_WEB_SESSION_LIMIT, MAX_WEB_SESSIONS, WebGateway
 from game.web_server import DEFAULT_WEB_HOST, DEFAULT_WEB_PORT, create_web_server
 
 
@@ -124,6 +127,41 @@ def build_parser() -> argparse.ArgumentParser:
             "指定します。省略時はDBと同じ場所に専用鍵を安全に作成します。"
         ),
     )
+    parser.add_argument(
+        "--room-shards",
+        type=int,
+        default=1,
+        metavar="COUNT",
+        help=(
+            "部屋をroom code単位でCOUNT個のworker processへ分散します。"
+            f"1..{MAX_ROOM_SHARDS}を指定し、既定の1は従来どおり単一processです。"
+        ),
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help=(
+            "操作・AI判断・保存・replay記録の処理時間を計測し、同一端末からだけ"
+            "取得できる/metricsにPrometheus形式で公開します。"
+        ),
+    )
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help=(
+            "HTTPとWebSocketを1本のasyncio event loopで処理します。"
+            "接続ごとにthreadを作らないため、多数のbrowserと観戦者を保持できます。"
+        ),
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        metavar="COUNT",
+        help=(
+            "同時に保持するbrowser session数の上限です。"
+            f"1..{MAX_WEB_SESSION_LIMIT}を指定し、省略時は{MAX_WEB_SESSIONS}です。"
+        ),
+    )
     return parser
 
 
@@ -156,6 +194,14 @@ def main(argv: list[str] | None = None) -> int:
         parser.error("--replay-keyは--replay-dbと一緒に指定してください。")
     if args.replay_db is not None and args.state_db is None:
         parser.error("--replay-dbは--state-dbと一緒に指定してください。")
+    if not 1 <= args.room_shards <= MAX_ROOM_SHARDS:
+        parser.error(f"--room-shardsは1..{MAX_ROOM_SHARDS}で指定してください。")
+    if args.max_sessions is not None and not (
+        1 <= args.max_sessions <= MAX_WEB_SESSION_LIMIT
+    ):
+        parser.error(
+            f"--max-sessionsは1..{MAX_WEB_SESSION_LIMIT}で指定してください。"
+        )
     if not _storage_paths_are_distinct(args):
         parser.error(
             "対局状態、network replay、共有回数制限のDB・鍵fileには、"
@@ -165,8 +211,38 @@ def main(argv: list[str] | None = None) -> int:
     state_store: SQLiteRoomAuthorityStore | None = None
     replay_store: SQLiteNetworkReplayStore | None = None
     rate_limit_store: SQLiteSharedRateLimitStore | None = None
+    room_shards: ShardedLanServerController | None = None
     gateway: WebGateway | None = None
-    if (
+    if args.room_shards > 1:
+        try:
+            # Each worker opens the stores itself; SQLite handles cannot be
+            # shared across processes.
+            room_shards = ShardedLanServerController(
+                shard_count=args.room_shards,
+                state_db=args.state_db,
+                state_key=args.state_key,
+                replay_db=args.replay_db,
+                replay_key=args.replay_key,
+            )
+            if args.rate_limit_db is not None:
+                rate_limit_store = SQLiteSharedRateLimitStore(
+                    args.rate_limit_db,
+                    key_path=args.rate_limit_key,
+                )
+            gateway_kwargs = {"controller": room_shards}
+            if args.max_sessions is not None:
+                gateway_kwargs["session_limit"] = args.max_sessions
+            if rate_limit_store is not None:
+                gateway_kwargs["shared_rate_limit_store"] = rate_limit_store
+            gateway = WebGateway(**gateway_kwargs)
+        except Exception:
+            _close_rate_limit_store(rate_limit_store)
+            _close_room_shards(room_shards)
+            parser.error(
+                "部屋のworker processまたは永続状態を初期化できませんでした。"
+                "保存先、権限、鍵fileを確認してください。"
+            )
+    elif (
         args.state_db is not None
         or args.replay_db is not None
         or args.rate_limit_db is not None
@@ -194,6 +270,8 @@ def main(argv: list[str] | None = None) -> int:
                 controller_kwargs["replay_store"] = replay_store
             controller = LanServerController(**controller_kwargs)
             gateway_kwargs = {"controller": controller}
+            if args.max_sessions is not None:
+                gateway_kwargs["session_limit"] = args.max_sessions
             if rate_limit_store is not None:
                 gateway_kwargs["shared_rate_limit_store"] = rate_limit_store
             gateway = WebGateway(**gateway_kwargs)
@@ -205,6 +283,8 @@ def main(argv: list[str] | None = None) -> int:
                 "永続状態を初期化できませんでした。network replayと共有回数制限を"
                 "含む保存先、権限、鍵fileを確認してください。"
             )
+    elif args.max_sessions is not None:
+        gateway = WebGateway(session_limit=args.max_sessions)
 
     server_kwargs = {
         "lan_mode": args.lan,
@@ -216,8 +296,11 @@ def main(argv: list[str] | None = None) -> int:
         server_kwargs["friends_vpn_mode"] = True
     if gateway is not None:
         server_kwargs["gateway"] = gateway
+    if args.metrics:
+        server_kwargs["metrics"] = enable_metrics()
+    create_server = create_async_web_server if args.asyncio else create_web_server
     try:
-        server = create_web_server(
+        server = create_server(
             args.host,
             args.port,
             **server_kwargs,
@@ -226,11 +309,13 @@ def main(argv: list[str] | None = None) -> int:
         _close_rate_limit_store(rate_limit_store)
         _close_replay_store(replay_store)
         _close_state_store(state_store)
+        _close_room_shards(room_shards)
         parser.error(str(exc))
     except BaseException:
         _close_rate_limit_store(rate_limit_store)
         _close_replay_store(replay_store)
         _close_state_store(state_store)
+        _close_room_shards(room_shards)
         raise
     host, port = server.server_address[:2]
     display_host = (
@@ -246,12 +331,21 @@ def main(argv: list[str] | None = None) -> int:
             "HTTPS / WSSを有効化しました。接続端末で証明書の発行元と"
             "接続先hostnameを確認してください。"
         )
-    if state_store is not None:
+    if state_store is not None or (room_shards is not None and args.state_db):
         print("対局状態の再起動復元を有効化しました。")
-    if replay_store is not None:
+    if replay_store is not None or (room_shards is not None and args.replay_db):
         print("ネットワークリプレイの再起動復元を有効化しました。")
+    if room_shards is not None:
+        print(f"部屋を{room_shards.shard_count}個のworker processへ分散します。")
     if rate_limit_store is not None:
         print("Webの共有回数制限を有効化しました。")
+    if args.asyncio:
+        print("全接続を1本のasyncio event loopで処理します。")
+    if args.metrics:
+        print(
+            "処理時間の計測を有効化しました。/metricsは同一端末からだけ"
+            "取得できます。"
+        )
     if args.friends_vpn:
         print(
             "友人VPN専用です。Tailscaleのaccess controlと期限付き招待を"
@@ -277,7 +371,10 @@ def main(argv: list[str] | None = None) -> int:
                 try:
                     _close_replay_store(replay_store)
                 finally:
-                    _close_state_store(state_store)
+                    try:
+                        _close_state_store(state_store)
+                    finally:
+                        _close_room_shards(room_shards)
     return 0
 
 
@@ -340,5 +437,14 @@ def _close_replay_store(store: SQLiteNetworkReplayStore | None) -> None:
         )
 
 
+def _close_room_shards(room_shards: ShardedLanServerController | None) -> None:
+    if room_shards is None:
+        return
+    try:
+        room_shards.close()
+    except Exception:
+        print("部屋のworker processを安全に終了できませんでした。", file=sys.stderr)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
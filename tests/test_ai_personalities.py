@@ -7,6 +7,7 @@ from game.ai_personality import (
     DISRUPTOR,
     EXPANSION,
     MIXED,
+    ROLLOUT,
     STANDARD,
     TRADER,
     get_ai_personality_profile,
@@ -34,7 +35,13 @@ def _player(name="CPU", personality=STANDARD):
 
 
 def test_personality_public_api_normalizes_aliases_and_safe_defaults():
-    assert AI_PERSONALITY_KEYS == (STANDARD, EXPANSION, TRADER, DISRUPTOR)
+    assert AI_PERSONALITY_KEYS == (
+        STANDARD,
+        EXPANSION,
+        TRADER,
+        DISRUPTOR,
+        ROLLOUT,
+    )
     assert AI_PERSONALITY_MODES == (STANDARD, MIXED, EXPANSION, TRADER, DISRUPTOR)
     assert normalize_ai_personality(" Builder ") == EXPANSION
     assert normalize_ai_personality("blocker") == DISRUPTOR
@@ -473,3 +480,32 @@ def test_personality_round_trip_and_legacy_save_defaults_are_compatible():
     restore_game(game, legacy, runtime_side_effects=False)
     assert game.ai_personality_mode == STANDARD
     assert all(player.ai_personality == STANDARD for player in game.players)
+
+
+def test_need_weights_are_memoized_only_within_one_decision(monkeypatch):
+    ai = SimpleAI()
+    player = _player()
+    board = SimpleNamespace(revision=1)
+    game = SimpleNamespace(
+        board=board,
+        get_player_public_victory_points=lambda _player: 2,
+    )
+    calls = []
+    monkeypatch.setattr(
+        ai,
+        "_resource_need_weights",
+        lambda _game, _player: calls.append(1) or {},
+    )
+
+    ai._cached_evaluation("_resource_need_weights", game, player)
+    ai._cached_evaluation("_resource_need_weights", game, player)
+    assert len(calls) == 2
+
+    ai._evaluation_cache = {}
+    ai._cached_evaluation("_resource_need_weights", game, player)
+    ai._cached_evaluation("_resource_need_weights", game, player)
+    assert len(calls) == 3
+    board.revision = 2
+    ai._cached_evaluation("_resource_need_weights", game, player)
+    assert len(calls) == 4
+    assert ai.get_evaluation_cache_stats() == {"hits": 1, "misses": 2}
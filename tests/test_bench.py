@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from game import bench
+
+
+def test_percentile_interpolates_between_sorted_samples():
+    assert bench.percentile([1.0], 99) == 1.0
+    assert bench.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert bench.percentile([0.0, 10.0], 90) == pytest.approx(9.0)
+    with pytest.raises(ValueError):
+        bench.percentile([], 50)
+
+
+def test_selected_benchmarks_report_percentiles_per_operation():
+    document = bench.run_benchmarks(
+        ["distribute_resources", "websocket_frames"], scale=1
+    )
+
+    assert document["format"] == bench.BENCH_FORMAT
+    assert set(document["results"]) == {
+        "distribute_resources",
+        "websocket_encode",
+        "websocket_decode_masked",
+    }
+    result = document["results"]["distribute_resources"]
+    assert result["samples"] == 200
+    assert result["min_ms"] <= result["p50_ms"] <= result["p90_ms"]
+    assert result["p90_ms"] <= result["p99_ms"] <= result["max_ms"]
+    with pytest.raises(ValueError):
+        bench.run_benchmarks(["missing"])
+    with pytest.raises(ValueError):
+        bench.run_benchmarks(scale=0)
+
+
+def test_regressions_compare_medians_against_the_baseline():
+    def document(**medians):
+        return {
+            "results": {name: {"p50_ms": value} for name, value in medians.items()}
+        }
+
+    regressions = bench.compare_results(
+        document(fast=1.2, slow=2.0, new=9.0),
+        document(fast=1.0, slow=1.0, removed=1.0),
+        tolerance=0.25,
+    )
+
+    assert [regression.name for regression in regressions] == ["slow"]
+    assert regressions[0].ratio == 2.0
+    assert "1.000ms -> 2.000ms" in regressions[0].describe()
+
+
+def test_cli_fails_loudly_only_when_asked(tmp_path, capsys):
+    baseline_path = tmp_path / "baseline.json"
+    arguments = ["--only", "websocket_frames"]
+    assert bench.main([*arguments, "--save-baseline", str(baseline_path)]) == 0
+    capsys.readouterr()
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    for result in baseline["results"].values():
+        result["p50_ms"] = result["p50_ms"] / 1000
+    baseline_path.write_text(json.dumps(baseline), encoding="utf-8")
+
+    assert bench.main([*arguments, "--baseline", str(baseline_path)]) == 0
+    output = capsys.readouterr()
+    assert "PERFORMANCE REGRESSION" in output.err
+    assert json.loads(output.out)["regressions"]
+
+    assert (
+        bench.main(
+            [*arguments, "--baseline", str(baseline_path), "--fail-on-regression"]
+        )
+        == 1
+    )
+
+    baseline_path.write_text("{}", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        bench.main([*arguments, "--baseline", str(baseline_path)])
@@ -0,0 +1,180 @@
+import math
+import random
+import threading
+
+import pytest
+
+from game.board_generation import BOARD_GENERATOR_VERSION, _shuffler
+from game.building import Building, BuildingType
+import game.game_board as game_board_module
+from game.custom_map import CustomMapSpec
+from game.game_board import (
+    BOARD_TEMPLATE_CACHE_SIZE,
+    OUTER_RING_TOPOLOGY_ID,
+    STANDARD_TOPOLOGY_ID,
+    GameBoard,
+    _BOARD_TEMPLATES,
+    build_board,
+    clear_board_templates,
+    generate_board_layouts,
+)
+from game.player import Player
+from game.resources import ResourceType
+from game.road import Road
+
+
+def test_generator_version_one_keeps_existing_seeded_layouts():
+    layout = GameBoard("constrained", 0).get_layout()
+
+    assert layout.version == BOARD_GENERATOR_VERSION == 1
+    assert layout.numbers == (
+        6, 12, 9, 4, None, 8, 4, 10, 8, 9, 3, 11, 2, 5, 11, 5, 3, 6, 10,
+    )
+    assert layout.resources[4] == ResourceType.DESERT
+    assert layout.harbors == (
+        ResourceType.ORE,
+        None,
+        ResourceType.SHEEP,
+        None,
+        None,
+        ResourceType.WHEAT,
+        None,
+        ResourceType.BRICK,
+        ResourceType.WOOD,
+    )
+
+
+@pytest.mark.parametrize("topology_id", [STANDARD_TOPOLOGY_ID, OUTER_RING_TOPOLOGY_ID])
+@pytest.mark.parametrize("mode", ["constrained", "fully_random"])
+def test_bulk_layouts_match_fully_built_boards(topology_id, mode):
+    seeds = [0, 1, 7, "tournament"]
+    layouts = list(
+        generate_board_layouts(seeds, mode=mode, topology_id=topology_id)
+    )
+
+    assert [layout.seed for layout in layouts] == seeds
+    for seed, layout in zip(seeds, layouts):
+        assert layout == GameBoard(mode, seed, topology_id=topology_id).get_layout()
+    assert layouts[0].to_dict()["numbers"] == list(layouts[0].numbers)
+
+
+def test_bulk_generation_rejects_boards_it_cannot_deal():
+    with pytest.raises(ValueError):
+        next(generate_board_layouts([1], mode="custom"))
+    with pytest.raises(ValueError):
+        next(generate_board_layouts([1], topology_id="unknown"))
+
+
+def test_inlined_shuffle_draws_exactly_like_random_shuffle():
+    for size in (2, 9, 18, 36):
+        reference = random.Random(size)
+        fast = random.Random(size)
+        shuffle = _shuffler(fast, size)
+        expected = list(range(size))
+        actual = list(range(size))
+        for _ in range(50):
+            reference.shuffle(expected)
+            shuffle(actual)
+            assert actual == expected
+        assert fast.getstate() == reference.getstate()
+
+
+def test_node_grid_merges_corners_like_a_full_scan():
+    board = GameBoard("fully_random", 3, topology_id=OUTER_RING_TOPOLOGY_ID)
+
+    assert len(board.nodes) == len({(round(n.x), round(n.y)) for n in board.nodes})
+    for tile in board.tiles:
+        for node, (x, y) in zip(
+            tile.corners, board._get_hex_corners(tile.x, tile.y, board.hex_radius)
+        ):
+            earliest = next(
+                candidate
+                for candidate in board.nodes
+                if math.hypot(candidate.x - x, candidate.y - y) < 4
+            )
+            assert node is earliest
+            assert board.find_or_create_node(x + 3, y - 1) is earliest
+            assert board.find_or_create_node(x, y, threshold=12) is earliest
+
+
+def test_build_board_returns_independent_copies_of_a_cached_template():
+    clear_board_templates()
+    first = build_board("constrained", 41)
+    player = Player("P1", (1, 2, 3))
+    first.nodes[0].building = Building(player, BuildingType.SETTLEMENT)
+    first.roads.append(Road(player, *first.edges[0]))
+    first.tiles[0].number = 12
+    first.move_robber_to(first.tiles[1])
+
+    second = build_board("balanced", 41)
+    fresh = GameBoard("constrained", 41)
+    assert second.get_layout() == fresh.get_layout()
+    assert second.robber_tile.resource_type == ResourceType.DESERT
+    assert all(node.building is None for node in second.nodes)
+    assert second.roads == []
+    assert all(node.board is second for node in second.nodes)
+    assert all(tile.board is second for tile in second.tiles)
+    assert {id(node) for node in second.nodes}.isdisjoint(
+        id(node) for node in first.nodes
+    )
+    assert second.rng.getstate() == fresh.rng.getstate()
+    assert second.topology.node_ids[second.nodes[5]] == 5
+
+
+def test_board_templates_survive_concurrent_rooms_evicting_each_other(monkeypatch):
+    clear_board_templates()
+    monkeypatch.setattr(game_board_module, "BOARD_TEMPLATE_CACHE_SIZE", 2)
+    seeds = range(5)
+    expected = {seed: GameBoard("fully_random", seed).get_layout() for seed in seeds}
+    start = threading.Barrier(6)
+    errors = []
+    layouts = []
+
+    def open_rooms(offset):
+        start.wait()
+        try:
+            for round_index in range(8):
+                seed = (offset + round_index) % len(seeds)
+                layouts.append((seed, build_board("fully_random", seed).get_layout()))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=open_rooms, args=(index,)) for index in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(layouts) == 48
+    assert all(layout == expected[seed] for seed, layout in layouts)
+    assert len(_BOARD_TEMPLATES) == 2
+    clear_board_templates()
+
+
+def test_board_templates_are_bounded_and_skip_unseeded_boards():
+    clear_board_templates()
+    for seed in range(BOARD_TEMPLATE_CACHE_SIZE + 3):
+        build_board("fully_random", seed)
+    build_board("fully_random", None)
+    build_board("fully_random", 0, topology_id=OUTER_RING_TOPOLOGY_ID)
+
+    keys = list(_BOARD_TEMPLATES)
+    assert len(keys) == BOARD_TEMPLATE_CACHE_SIZE
+    assert ("fully_random", 0, STANDARD_TOPOLOGY_ID, None) not in keys
+    assert keys[-1] == ("fully_random", 0, OUTER_RING_TOPOLOGY_ID, None)
+
+    custom_map = CustomMapSpec.from_board(GameBoard("constrained", 5))
+    board = build_board("custom", 5, custom_map=custom_map)
+    assert board.custom_map is custom_map
+    assert list(_BOARD_TEMPLATES)[-1] == (
+        "custom",
+        5,
+        STANDARD_TOPOLOGY_ID,
+        custom_map.fingerprint,
+    )
+    assert CustomMapSpec.from_board(board).fingerprint == custom_map.fingerprint
+    with pytest.raises(ValueError):
+        build_board("custom", 5, custom_map="not a map")
+    clear_board_templates()
+    assert not _BOARD_TEMPLATES
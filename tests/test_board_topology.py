@@ -0,0 +1,124 @@
+from game.board_rules import BoardRules
+from game.building import Building
+from game.game_board import GameBoard
+from game.player import Player
+from game.road import Road
+
+
+def brute_force_road_edges(rules, player):
+    return [
+        (node1, node2)
+        for node1, node2 in rules.board.edges
+        if rules.can_place_road(player, node1, node2)[0]
+    ]
+
+
+def test_topology_assigns_stable_integer_ids_and_neighbors():
+    board = GameBoard(seed=11)
+    topology = board.topology
+
+    assert len(topology.nodes) == 54
+    assert len(topology.edges) == len(board.edges) == 72
+    for edge_id, (node1, node2) in enumerate(board.edges):
+        assert topology.edge_id(node1, node2) == edge_id
+        assert topology.edge_id(node2, node1) == edge_id
+        assert node2 in topology.adjacent_nodes(node1)
+    for node in board.nodes:
+        neighbors = topology.adjacent_nodes(node)
+        assert 2 <= len(neighbors) <= 3
+        assert [(n.y, n.x) for n in neighbors] == sorted((n.y, n.x) for n in neighbors)
+
+
+def test_road_incidence_follows_direct_list_mutations():
+    board = GameBoard(seed=12)
+    rules = BoardRules(board)
+    player = Player("Builder", (255, 0, 0))
+    node1, node2 = board.edges[0]
+
+    board.roads.append(Road(player, node1, node2))
+    assert rules.road_exists_between(node2, node1)
+    assert rules.player_has_road_touching_node(player, node1)
+
+    board.roads.pop()
+    assert not rules.road_exists_between(node1, node2)
+    assert not rules.player_has_road_touching_node(player, node2)
+
+    board.roads = [Road(player, node1, node2)]
+    assert rules.road_exists_between(node1, node2)
+    board.roads.clear()
+    assert not rules.road_exists_between(node1, node2)
+
+
+def test_indexed_buildable_queries_match_full_scans():
+    board = GameBoard(seed=13)
+    rules = BoardRules(board)
+    red = Player("Red", (255, 0, 0))
+    blue = Player("Blue", (0, 0, 255))
+    red_home = board.nodes[10]
+    blue_home = board.nodes[30]
+    red_home.building = Building(red)
+    blue_home.building = Building(blue)
+    frontier = red_home
+    for _ in range(4):
+        next_node = next(
+            node
+            for node in rules.get_adjacent_nodes(frontier)
+            if not rules.road_exists_between(frontier, node)
+        )
+        board.roads.append(Road(red, frontier, next_node))
+        frontier = next_node
+
+    for player in (red, blue):
+        assert rules.get_buildable_road_edges(
+            player, require_affordability=False
+        ) == brute_force_road_edges(rules, player)
+
+    red.resources.update({resource: 5 for resource in red.resources})
+    assert rules.get_buildable_settlement_nodes(red) == [
+        node
+        for node in board.nodes
+        if rules.can_place_main_settlement(red, node)[0]
+    ]
+    assert rules.get_buildable_city_nodes(red) == [red_home]
+
+    red_home.building = None
+    assert rules.get_buildable_city_nodes(red) == []
+
+
+def brute_force_production(board, number):
+    return [
+        (tile, [node.building for node in tile.corners if node.building is not None])
+        for tile in board.tiles
+        if tile.number == number
+    ]
+
+
+def test_production_index_tracks_buildings_upgrades_and_numbers():
+    board = GameBoard(seed=14)
+    player = Player("Producer", (255, 0, 0))
+    tile = next(tile for tile in board.tiles if tile.number == 6)
+
+    assert [entry[1] for entry in board.get_production_entries(6)] == [(), ()]
+
+    tile.corners[2].building = Building(player)
+    tile.corners[4].building = Building(player)
+    entries = board.get_production_entries(6)
+    assert [(entry_tile, list(buildings)) for entry_tile, buildings in entries] == (
+        brute_force_production(board, 6)
+    )
+
+    tile.corners[2].building.upgrade_to_city()
+    assert sum(
+        building.resource_multiplier
+        for entry_tile, buildings in board.get_production_entries(6)
+        if entry_tile is tile
+        for building in buildings
+    ) == 3
+
+    tile.number = 11
+    assert tile not in board.get_tiles_with_number(6)
+    assert tile in board.get_tiles_with_number(11)
+    entries = board.get_production_entries(11)
+    assert [(entry_tile, list(buildings)) for entry_tile, buildings in entries] == (
+        brute_force_production(board, 11)
+    )
@@ -78,7 +78,7 @@ def test_headless_roll_keeps_exact_pair_for_remote_animation(monkeypatch):
     game = CatanGame(headless=True)
     try:
         game.start_main_phase()
-        monkeypatch.setattr("game.game.roll_two_dice", lambda: (2, 6))
+        monkeypatch.setattr("game.game.roll_two_dice", lambda rng=None: (2, 6))
 
         game.handle_roll_dice()
 
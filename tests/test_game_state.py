@@ -0,0 +1,172 @@
+import copy
+import random
+import time
+
+import pytest
+
+from game.game_state import CompactGameState
+from game.persistence import serialize_game
+from game.resources import ResourceType
+from game.self_play import _prepare_game
+from game.variant import VariantConfig
+
+
+def _position(document):
+    # Compact states carry the rules position only, not presentation history.
+    # Self-play resolves dice without recording the faces shown to clients.
+    position = {
+        key: value
+        for key, value in document.items()
+        if key not in ("history", "match_metrics", "ai", "ui")
+    }
+    position["phase"] = dict(position["phase"], last_dice_pair=None)
+    return position
+
+
+def _advance(game, steps):
+    for _ in range(steps):
+        if game.winner is not None or not game.ai.step(game):
+            return
+
+
+def _midgame(seed=7, steps=250):
+    game = _prepare_game(
+        match_seed=seed,
+        board_seed=seed,
+        board_mode="constrained",
+        player_count=4,
+        victory_target=10,
+    )
+    _advance(game, steps)
+    assert game.phase == "main" and game.winner is None
+    return game
+
+
+def test_restored_position_continues_exactly_like_the_original():
+    game = _midgame()
+    state = game.capture_state(include_rng=True)
+    before = _position(serialize_game(game))
+    _advance(game, 300)
+    after = _position(serialize_game(game))
+    assert after != before
+
+    game.restore_state(state)
+    assert _position(serialize_game(game)) == before
+    _advance(game, 300)
+    assert _position(serialize_game(game)) == after
+
+
+def test_fork_is_an_independent_headless_game_at_the_same_position():
+    game = _midgame(seed=11)
+    before = _position(serialize_game(game))
+    fork = game.fork()
+
+    assert fork.headless is True
+    assert fork.board is not game.board
+    assert all(node.board is fork.board for node in fork.board.nodes)
+    assert _position(serialize_game(fork)) == before
+
+    expected = game.capture_state(include_rng=True)
+    _advance(fork, 200)
+    assert _position(serialize_game(game)) == before
+    _advance(game, 200)
+    assert _position(serialize_game(game)) == _position(serialize_game(fork))
+    game.restore_state(expected)
+
+    other = game.fork(rng=random.Random(5))
+    assert other.rng is not game.rng
+    assert _position(serialize_game(other)) == before
+
+
+@pytest.mark.parametrize(
+    "variant_config",
+    [VariantConfig.frontier_expanded(), VariantConfig.composite_grand_campaign()],
+    ids=["frontier_expanded", "grand_campaign"],
+)
+def test_variant_fork_and_restore_after_the_robber_left_the_centre(variant_config):
+    game = _prepare_game(
+        match_seed=7,
+        board_seed=7,
+        board_mode="constrained",
+        player_count=4,
+        victory_target=10,
+        variant_config=variant_config,
+    )
+    centre = game.board.robber_tile
+    for _ in range(2000):
+        if game.phase == "main" and game.board.robber_tile is not centre:
+            break
+        assert game.winner is None and game.ai.step(game)
+    assert game.board.robber_tile is not centre
+    before = _position(serialize_game(game))
+
+    fork = game.fork()
+    assert fork.variant_state == game.variant_state
+    assert fork.board.robber_tile.axial == game.board.robber_tile.axial
+    assert _position(serialize_game(fork)) == before
+
+    state = game.capture_state(include_rng=True)
+    _advance(fork, 200)
+    _advance(game, 200)
+    assert _position(serialize_game(game)) == _position(serialize_game(fork))
+    game.restore_state(state)
+    assert _position(serialize_game(game)) == before
+
+
+def test_state_copies_do_not_share_mutable_arrays():
+    game = _midgame(seed=3)
+    state = game.capture_state()
+    clone = state.copy()
+
+    assert isinstance(clone, CompactGameState)
+    clone.hands[0] += 4
+    clone.building_owner[0] = 1
+    assert state.hand(0) == game.players[0].resources
+    assert clone.hand(0)[ResourceType.WOOD] == state.hand(0)[ResourceType.WOOD] + 4
+
+    seat_roads = [
+        road for road in game.board.roads if road.owner is game.players[0]
+    ]
+    mask = state.road_mask(0, game.board)
+    assert bin(mask).count("1") == len(seat_roads)
+    for road in seat_roads:
+        assert mask >> game.board.topology.edge_id(road.node1, road.node2) & 1
+
+
+def test_restoring_rebuilds_indices_without_growing_the_change_log():
+    game = _midgame(seed=5)
+    state = game.capture_state()
+    buildings = sum(node.building is not None for node in game.board.nodes)
+    revision = game.board.revision
+
+    for _ in range(50):
+        game.restore_state(state)
+
+    topology = game.board.topology
+    assert topology.building_log == []
+    assert game.board.revision > revision
+    assert sum(
+        len(nodes) for nodes in topology.building_nodes_by_owner.values()
+    ) == buildings
+    assert len(topology.roads_by_pair) == len(game.board.roads)
+
+
+def test_compact_state_forks_are_much_cheaper_than_deep_copies():
+    game = _midgame(seed=9)
+    before = _position(serialize_game(game))
+    state = game.capture_state()
+
+    started = time.perf_counter()
+    for _ in range(10):
+        copy.deepcopy(game)
+    deepcopy_seconds = (time.perf_counter() - started) / 10
+
+    started = time.perf_counter()
+    for _ in range(100):
+        game.restore_state(state.copy())
+        game.capture_state()
+    compact_seconds = (time.perf_counter() - started) / 100
+
+    assert _position(serialize_game(game)) == before
+    # Measured at roughly 25x; the wide margin keeps loaded runners green.
+    assert compact_seconds * 5 < deepcopy_seconds
@@ -1,3 +1,8 @@
+import os
+from pathlib import Path
+import subprocess
+import sys
+
 import pytest
 
 from game import game as game_module
@@ -46,3 +51,48 @@ def test_headless_game_rejects_interactive_loop_and_render():
         game.render()
     with pytest.raises(RuntimeError, match="対話ループ"):
         game.run()
+
+
+def _run_python(code):
+    project_root = Path(__file__).resolve().parents[1]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(project_root / "python")
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=False,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+def test_headless_engine_and_servers_never_load_pygame():
+    completed = _run_python(
+        "import sys\n"
+        "import web_main\n"
+        "from game.self_play import run_match\n"
+        "run_match(match_seed=7, player_count=2, victory_target=5, max_turns=3)\n"
+        "assert 'pygame.base' not in sys.modules, 'pygame was loaded'\n"
+    )
+
+    assert completed.returncode == 0, completed.stderr
+
+
+def test_headless_engine_runs_where_pygame_is_not_installed():
+    completed = _run_python(
+        "import sys\n"
+        "sys.modules['pygame'] = None\n"
+        "import web_main\n"
+        "from game.lazy_modules import pygame, pygame_available\n"
+        "from game.self_play import run_match\n"
+        "assert run_match(match_seed=7, victory_target=5).completed\n"
+        "assert pygame_available() is False\n"
+        "try:\n"
+        "    pygame.Rect\n"
+        "except ModuleNotFoundError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('missing pygame must fail on use')\n"
+    )
+
+    assert completed.returncode == 0, completed.stderr
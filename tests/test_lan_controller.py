@@ -8,9 +8,10 @@ from game.development_cards import DevelopmentCardType
 from game.game_board import GameBoard
 from game.house_rules import HouseRules
 from game.lan_controller import LanControllerError, LanServerController
-from game.network_actions import NetworkActionError
+from game.network_actions import NetworkActionError, apply_game_command
 from game.network_protocol import (
     NETWORK_PROTOCOL_VERSION,
+    apply_state_delta,
     build_game_command,
     build_state_snapshot,
 )
@@ -339,7 +340,7 @@ def test_failed_ai_step_rolls_back_game_room_rng_and_global_rng():
     def failing_ai_step(game):
         game.bank.resources[ResourceType.WOOD] -= 1
         game.players[1].resources[ResourceType.WOOD] += 1
-        random.random()
+        game.rng.random()
         raise RuntimeError("private AI failure")
 
     controller = LanServerController(ai_stepper=failing_ai_step)
@@ -365,9 +366,59 @@ def test_failed_ai_step_rolls_back_game_room_rng_and_global_rng():
     assert controller.tick() == ()
     assert controller.snapshot_for_connection("host") == snapshot_before
     assert controller._rooms[room_code].random_state == room_rng_before
+    assert controller._rooms[room_code].game.rng.getstate() == room_rng_before
     assert random.getstate() == caller_rng_before
 
 
+def test_steps_reuse_the_committed_checkpoint_instead_of_reserializing(monkeypatch):
+    import game.lan_controller as lan_controller
+
+    serialized = []
+    original_serialize = lan_controller.serialize_game
+    monkeypatch.setattr(
+        lan_controller,
+        "serialize_game",
+        lambda value: serialized.append(value) or original_serialize(value),
+    )
+    fail_next = False
+
+    def applier(game, seat, command, args):
+        result = apply_game_command(game, seat, command, args)
+        if fail_next:
+            raise RuntimeError("private failure after mutation")
+        return result
+
+    controller = LanServerController(command_applier=applier)
+    room_code, _host_token, _created = create_room(controller)
+    join_player(controller, room_code)
+    ready_and_start(controller, room_code)
+    context = controller._rooms[room_code]
+
+    serialized.clear()
+    controller.handle(
+        "host",
+        build_game_command(sequence=0, expected_revision=0, command="roll_dice"),
+    )
+    # Without a checkpoint yet, the step serializes both the state it may
+    # roll back to and the state it commits.
+    assert len(serialized) == 2
+    snapshot_before = controller.snapshot_for_connection("guest")
+    assert snapshot_before["command_options"] == [{"command": "roll_dice", "args": {}}]
+    serialized.clear()
+    fail_next = True
+    rejected = controller.handle(
+        "guest",
+        build_game_command(sequence=0, expected_revision=1, command="roll_dice"),
+    )
+
+    assert rejected[0].message["accepted"] is False
+    assert rejected[0].message["code"] == "internal_error"
+    assert context.game_revision == 1
+    assert controller.snapshot_for_connection("guest") == snapshot_before
+    # The rollback point came from the committed checkpoint.
+    assert serialized == []
+
+
 def test_custom_room_settings_reach_authority_and_public_board_identity():
     custom_map = CustomMapSpec.from_board(GameBoard(seed=8765))
     house_rules = HouseRules(
@@ -474,6 +525,59 @@ def test_command_options_follow_authoritative_actor_after_each_revision():
     assert guest_snapshot["command_options"] == [{"command": "roll_dice", "args": {}}]
 
 
+def test_state_sync_opts_into_deltas_and_repairs_revision_gaps():
+    controller = LanServerController()
+    room_code, _host_token, _created = create_room(controller)
+    join_player(controller, room_code)
+    started = ready_and_start(controller, room_code)
+    host_snapshot = next(
+        item.message
+        for item in started
+        if item.connection_id == "host" and item.message["type"] == "state_snapshot"
+    )
+
+    assert controller.handle(
+        "host",
+        message("state_sync", known_revision=0, accept_deltas=True),
+    ) == ()
+    (guest_sync,) = controller.handle(
+        "guest",
+        message("state_sync", known_revision=None, accept_deltas=True),
+    )
+    guest_snapshot = guest_sync.message
+    assert guest_snapshot["type"] == "state_snapshot"
+    assert guest_snapshot["revision"] == 0
+
+    outbound = controller.handle(
+        "host",
+        build_game_command(sequence=0, expected_revision=0, command="roll_dice"),
+    )
+    deltas = {
+        item.connection_id: item.message
+        for item in outbound
+        if item.message["type"] == "state_delta"
+    }
+    assert set(deltas) == {"host", "guest"}
+    assert not any(item.message["type"] == "state_snapshot" for item in outbound)
+    for connection, baseline in (("host", host_snapshot), ("guest", guest_snapshot)):
+        rebuilt = apply_state_delta(baseline, json.loads(json.dumps(deltas[connection])))
+        assert rebuilt == json.loads(
+            json.dumps(controller.snapshot_for_connection(connection))
+        )
+
+    (resync,) = controller.handle(
+        "host",
+        message("state_sync", known_revision=0, accept_deltas=True),
+    )
+    assert resync.message["type"] == "state_snapshot"
+    assert resync.message["revision"] == 1
+    invalid = controller.handle(
+        "host",
+        message("state_sync", known_revision=-1, accept_deltas=True),
+    )[0].message
+    assert invalid["code"] == "invalid_request"
+
+
 def test_only_host_can_start_and_all_seats_must_be_ready():
     controller = LanServerController()
     room_code, _token, _outbound = create_room(controller)
@@ -812,6 +916,42 @@ def test_match_rng_uses_private_entropy_instead_of_public_board_seed(monkeypatch
     assert random.getstate() == caller_rng_before
 
 
+def test_rooms_draw_from_private_generators_not_the_module_rng(monkeypatch):
+    monkeypatch.setattr(
+        "game.lan_controller.secrets.randbits",
+        lambda bits: (1 << 255) + 4_242 if bits == 256 else 0,
+    )
+    controllers = (LanServerController(), LanServerController())
+    for controller in controllers:
+        room_code, _token, _created = create_room(controller)
+        join_player(controller, room_code)
+        ready_and_start(controller, room_code)
+    contexts = [
+        controller._rooms[controller.room_codes[0]] for controller in controllers
+    ]
+    assert contexts[0].game.rng is not contexts[1].game.rng
+
+    snapshots = []
+    for index, controller in enumerate(controllers):
+        random.seed(index)
+        caller_rng_before = random.getstate()
+        roll = controller.handle(
+            "host",
+            build_game_command(
+                sequence=0,
+                expected_revision=0,
+                command="roll_dice",
+            ),
+        )
+        assert roll[0].message["accepted"] is True
+        assert random.getstate() == caller_rng_before
+        snapshots.append(controller.snapshot_for_connection("host"))
+
+    assert snapshots[0] == snapshots[1]
+    for context in contexts:
+        assert context.game.rng.getstate() == context.random_state
+
+
 def test_failed_started_spectator_join_is_atomic_and_retryable():
     fail_spectator_snapshot = False
 
@@ -1038,7 +1178,7 @@ def test_failed_command_rolls_back_game_and_room_rng(raised, expected_code):
     def mutating_applier(game, _seat, _command, _args):
         game.bank.resources[ResourceType.WOOD] -= 1
         game.players[0].resources[ResourceType.WOOD] += 1
-        random.random()
+        game.rng.random()
         raise raised
 
     controller = LanServerController(command_applier=mutating_applier)
@@ -1059,6 +1199,7 @@ def test_failed_command_rolls_back_game_and_room_rng(raised, expected_code):
     assert "private command failure" not in json.dumps(result)
     assert controller.snapshot_for_connection("host") == before
     assert controller._rooms[room_code].random_state == room_rng_before
+    assert controller._rooms[room_code].game.rng.getstate() == room_rng_before
     assert random.getstate() == caller_rng_before
 
 
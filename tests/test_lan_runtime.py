@@ -13,6 +13,7 @@ from game.network_protocol import (
     NETWORK_PROTOCOL_VERSION,
     FrameDecoder,
     build_game_command,
+    build_state_delta,
 )
 
 
@@ -374,6 +375,69 @@ def test_reconnect_blocks_commands_until_welcome_and_fresh_snapshot():
     assert session.send_game_command("roll_dice") == 1
 
 
+def test_delta_client_rebuilds_snapshots_and_requests_resync_after_a_gap():
+    class StubTransport:
+        def __init__(self):
+            self.incoming = []
+            self.sent = []
+            self.is_connected = True
+
+        def send(self, message):
+            self.sent.append(message)
+
+        def poll(self, *, limit=100):
+            result = self.incoming[:limit]
+            del self.incoming[:limit]
+            return result
+
+        def close(self):
+            self.is_connected = False
+
+    def snapshot(revision, log):
+        return {
+            "type": "state_snapshot",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "revision": revision,
+            "viewer_player_index": 0,
+            "state": {"log": log},
+        }
+
+    transport = StubTransport()
+    session = LanClientSession(transport=transport, state_deltas=True)
+    first = snapshot(3, ["a"])
+    second = snapshot(4, ["a", "b"])
+    third = snapshot(5, ["a", "b", "c"])
+
+    transport.incoming.append(LanTransportEvent("message", message=first))
+    session.poll()
+    assert transport.sent[-1] == {
+        "type": "state_sync",
+        "protocol_version": NETWORK_PROTOCOL_VERSION,
+        "known_revision": 3,
+        "accept_deltas": True,
+    }
+
+    transport.incoming.append(
+        LanTransportEvent("message", message=build_state_delta(first, second))
+    )
+    (event,) = session.poll()
+    assert event.message == second
+    assert session.game_revision == 4
+    assert session.game_snapshot == second
+    assert len(transport.sent) == 1
+
+    transport.incoming.append(
+        LanTransportEvent("message", message=build_state_delta(first, third))
+    )
+    session.poll()
+    assert session.game_revision == 4
+    assert transport.sent[-1]["known_revision"] is None
+    assert session.is_synchronized is False
+
+    with pytest.raises(ValueError):
+        LanClientSession(transport=StubTransport(), state_deltas=1)
+
+
 def test_spectator_session_cannot_enqueue_game_commands():
     session = LanClientSession()
     session.role = "spectator"
@@ -1,15 +1,24 @@
+import errno
+import logging
 import queue
+import socket
 import threading
 import time
 
 import pytest
 
 from game.lan_transport import (
+    RECEIVE_CHUNK_BYTES,
     LanClientTransport,
     LanServerTransport,
     LanTransportError,
 )
-from game.network_protocol import NETWORK_PROTOCOL_VERSION
+from game.network_protocol import (
+    MAX_FRAME_BYTES,
+    NETWORK_PROTOCOL_VERSION,
+    FrameDecoder,
+    encode_frame,
+)
 
 
 def _wait_for_event(transport, kind, *, timeout=2.0):
@@ -92,6 +101,159 @@ def test_server_broadcasts_to_a_stable_connection_snapshot():
         server.stop()
 
 
+def test_one_selector_thread_serves_many_clients():
+    baseline_threads = threading.active_count()
+    server = LanServerTransport("127.0.0.1", 0, max_connections=48)
+    peers = []
+    try:
+        server.start()
+        for _ in range(40):
+            peers.append(socket.create_connection(server.address, timeout=2))
+        connection_ids = {
+            _wait_for_event(server, "connected").connection_id for _ in peers
+        }
+        assert len(connection_ids) == 40
+        assert threading.active_count() == baseline_threads + 1
+
+        message = {
+            "type": "lobby_snapshot",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "revision": 9,
+        }
+        assert server.broadcast(message) == ()
+        for peer in peers:
+            decoder = FrameDecoder()
+            received = []
+            while not received:
+                received = decoder.feed(peer.recv(4096))
+            assert received == [message]
+    finally:
+        for peer in peers:
+            peer.close()
+        server.stop()
+    with pytest.raises(ValueError):
+        LanServerTransport("127.0.0.1", 0, max_connections=513)
+    with pytest.raises(ValueError):
+        LanServerTransport("127.0.0.1", 0, max_outbound_bytes=1024)
+
+
+def test_client_that_stops_reading_is_dropped_without_stalling_others():
+    server = LanServerTransport(
+        "127.0.0.1", 0, max_outbound_bytes=MAX_FRAME_BYTES + 4
+    )
+    reader = LanClientTransport()
+    stalled = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.start()
+        reader.connect(*server.address)
+        reader_id = _wait_for_event(server, "connected").connection_id
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        stalled.connect(server.address)
+        stalled_id = _wait_for_event(server, "connected").connection_id
+
+        message = {
+            "type": "lobby_snapshot",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "padding": "x" * (256 * 1024),
+        }
+        failed = ()
+        sent = 0
+        started = time.monotonic()
+        while stalled_id not in failed and sent < 200:
+            failed = server.broadcast(message)
+            assert reader_id not in failed
+            sent += 1
+            time.sleep(0.005)
+        assert failed == (stalled_id,)
+        # No broadcast waited for the stalled peer's socket to drain.
+        assert time.monotonic() - started < 0.005 * sent + 2
+
+        disconnected = _wait_for_event(server, "disconnected")
+        assert disconnected.connection_id == stalled_id
+        assert server.connection_ids == (reader_id,)
+        received = 0
+        deadline = time.monotonic() + 5
+        while received < sent and time.monotonic() < deadline:
+            received += len(
+                [event for event in reader.poll(limit=50) if event.kind == "message"]
+            )
+            time.sleep(0.005)
+        assert received == sent
+    finally:
+        stalled.close()
+        reader.close()
+        server.stop()
+
+
+def test_closing_a_connection_flushes_frames_already_queued():
+    server = LanServerTransport("127.0.0.1", 0)
+    peer = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        server.start()
+        peer.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        peer.connect(server.address)
+        connection_id = _wait_for_event(server, "connected").connection_id
+        message = {
+            "type": "lobby_snapshot",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "padding": "x" * (1024 * 1024),
+        }
+
+        # More than the loopback socket buffers hold, so most of it is
+        # still in the transport's own buffer when the close is requested.
+        for _ in range(3):
+            server.send(connection_id, message)
+        assert server.close_connection(connection_id)
+        assert server.connection_ids == ()
+        with pytest.raises(LanTransportError):
+            server.send(connection_id, message)
+
+        peer.settimeout(5)
+        decoder = FrameDecoder()
+        received = []
+        while True:
+            data = peer.recv(64 * 1024)
+            if not data:
+                break
+            received.extend(decoder.feed(data))
+        assert received == [message] * 3
+        peer.close()
+        disconnected = _wait_for_event(server, "disconnected")
+        assert disconnected.connection_id == connection_id
+    finally:
+        peer.close()
+        server.stop()
+
+
+def test_accept_errors_back_off_instead_of_spinning(monkeypatch, caplog):
+    original_accept = socket.socket.accept
+    failures = []
+
+    def exhausted_accept(sock):
+        # Out of descriptors for the first 0.3s; a spinning selector would
+        # fail thousands of times in that window.
+        if not failures or time.monotonic() < failures[0] + 0.3:
+            failures.append(time.monotonic())
+            raise OSError(errno.EMFILE, "Too many open files")
+        return original_accept(sock)
+
+    monkeypatch.setattr(socket.socket, "accept", exhausted_accept)
+    server = LanServerTransport("127.0.0.1", 0)
+    peer = None
+    try:
+        with caplog.at_level(logging.WARNING, logger="game.lan_transport"):
+            server.start()
+            peer = socket.create_connection(server.address, timeout=2)
+            connected = _wait_for_event(server, "connected", timeout=3)
+        assert connected.connection_id == 1
+        assert len(failures) <= 2
+        assert "could not accept" in caplog.text
+    finally:
+        if peer is not None:
+            peer.close()
+        server.stop()
+
+
 def test_invalid_protocol_frame_disconnects_only_that_client(loopback_pair):
     server, client, _connection_id = loopback_pair
 
@@ -104,6 +266,35 @@ def test_invalid_protocol_frame_disconnects_only_that_client(loopback_pair):
     _wait_for_event(client, "disconnected")
 
 
+def test_frames_read_before_a_malformed_one_are_still_delivered():
+    server = LanServerTransport("127.0.0.1", 0)
+    peer = None
+    try:
+        server.start()
+        peer = socket.create_connection(server.address, timeout=2)
+        _wait_for_event(server, "connected")
+        template = {
+            "type": "ping",
+            "protocol_version": NETWORK_PROTOCOL_VERSION,
+            "nonce": "",
+        }
+        # One frame filling a whole receive chunk, then a bad version in the
+        # same write, so the server reads both in a single batch.
+        template["nonce"] = "x" * (RECEIVE_CHUNK_BYTES - len(encode_frame(template)))
+        valid = encode_frame(template)
+        assert len(valid) == RECEIVE_CHUNK_BYTES
+        invalid = encode_frame({"type": "ping", "protocol_version": 999})
+        peer.sendall(valid + invalid)
+
+        received = _wait_for_event(server, "message")
+        assert received.message == template
+        assert "version" in _wait_for_event(server, "protocol_error").detail
+    finally:
+        if peer is not None:
+            peer.close()
+        server.stop()
+
+
 def test_server_reserves_disconnect_event_when_regular_queue_is_full():
     server = LanServerTransport(
         "127.0.0.1",
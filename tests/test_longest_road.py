@@ -0,0 +1,129 @@
+import random
+
+from game.board_rules import BoardRules
+from game.building import Building
+from game.game_board import GameBoard
+from game.longest_road import LongestRoadTracker, longest_trail_length
+from game.player import Player
+from game.road import Road
+
+
+def reference_longest_road(board, player):
+    """The original exhaustive search, kept as an oracle for the tracker."""
+    player_roads = [road for road in board.roads if road.owner == player]
+    adjacency = {}
+    for road in player_roads:
+        adjacency.setdefault(road.node1, []).append(road)
+        adjacency.setdefault(road.node2, []).append(road)
+
+    def dfs(node, used_road_ids):
+        if node.building is not None and node.building.owner != player:
+            return 0
+        best = 0
+        for road in adjacency.get(node, []):
+            if id(road) in used_road_ids:
+                continue
+            best = max(
+                best,
+                1 + dfs(road.other_node(node), used_road_ids | {id(road)}),
+            )
+        return best
+
+    best_length = 0
+    for road in player_roads:
+        best_length = max(best_length, 1 + dfs(road.node1, {id(road)}))
+        best_length = max(best_length, 1 + dfs(road.node2, {id(road)}))
+    return best_length
+
+
+def always_usable(_road):
+    return True
+
+
+def grow_network(board, rules, player, start, count, rng):
+    frontier = [start]
+    for road in board.roads:
+        if road.owner is player:
+            frontier.extend((road.node1, road.node2))
+    placed = 0
+    for _ in range(count * 50):
+        if placed == count:
+            return
+        node = rng.choice(frontier)
+        options = [
+            adjacent
+            for adjacent in rules.get_adjacent_nodes(node)
+            if not rules.road_exists_between(node, adjacent)
+        ]
+        if not options:
+            continue
+        adjacent = rng.choice(options)
+        board.roads.append(Road(player, node, adjacent))
+        frontier.append(adjacent)
+        placed += 1
+    assert placed == count, f"placed only {placed} of {count} roads"
+
+
+def test_tracker_matches_exhaustive_search_as_networks_grow_and_are_cut():
+    rng = random.Random(5)
+    board = GameBoard(seed=21)
+    rules = BoardRules(board)
+    red = Player("Red", (255, 0, 0))
+    blue = Player("Blue", (0, 0, 255))
+    tracker = LongestRoadTracker()
+
+    for step in range(12):
+        grow_network(board, rules, red, board.nodes[20], 1, rng)
+        grow_network(board, rules, blue, board.nodes[40], 1, rng)
+        if step % 4 == 3:
+            victim = rng.choice([road.node2 for road in board.roads if road.owner is red])
+            if victim.building is None:
+                victim.building = Building(blue)
+        for player in (red, blue):
+            assert tracker.get_length(board, player, always_usable) == (
+                reference_longest_road(board, player)
+            )
+
+
+def test_tracker_reuses_cached_lengths_until_a_relevant_change():
+    board = GameBoard(seed=22)
+    rules = BoardRules(board)
+    red = Player("Red", (255, 0, 0))
+    blue = Player("Blue", (0, 0, 255))
+    grow_network(board, rules, red, board.nodes[3], 6, random.Random(1))
+    grow_network(board, rules, blue, board.nodes[50], 4, random.Random(2))
+    tracker = LongestRoadTracker()
+
+    tracker.get_length(board, red, always_usable)
+    tracker.get_length(board, blue, always_usable)
+    searches = tracker.trail_searches
+    for _ in range(10):
+        tracker.get_length(board, red, always_usable)
+        tracker.get_length(board, blue, always_usable)
+    assert tracker.trail_searches == searches
+
+    grow_network(board, rules, blue, board.nodes[50], 1, random.Random(3))
+    tracker.get_length(board, red, always_usable)
+    tracker.get_length(board, blue, always_usable)
+    assert tracker.trail_searches == searches + 1
+
+    tracker.get_length(board, red, always_usable, usability_key=2)
+    assert tracker.trail_searches == searches + 2
+
+
+def test_long_network_lookups_match_the_exhaustive_search_and_stay_cached():
+    for seed in range(40):
+        board = GameBoard(seed=23 + seed)
+        rules = BoardRules(board)
+        player = Player("Long", (255, 0, 0))
+        rng = random.Random(seed)
+        grow_network(board, rules, player, rng.choice(board.nodes), 15, rng)
+        expected = reference_longest_road(board, player)
+
+        assert longest_trail_length(list(board.roads), player, always_usable) == expected
+
+        tracker = LongestRoadTracker()
+        assert tracker.get_length(board, player, always_usable) == expected
+        for _ in range(100):
+            assert tracker.get_length(board, player, always_usable) == expected
+        assert tracker.trail_searches == 1
@@ -20,12 +20,17 @@ from game.network_protocol import (
     MAX_FRAME_BYTES,
     MAX_LIVE_MATCH_EVENTS,
     MAX_SNAPSHOT_LOG_MESSAGES,
+    NETWORK_PROTOCOL_VERSION,
     FrameDecoder,
     NetworkProtocolError,
+    apply_state_delta,
     build_action_request,
+    build_board_manifest,
     build_board_reference_index,
     build_game_command,
     build_state_snapshot,
+    build_state_delta,
+    build_state_snapshots,
     encode_frame,
 )
 from game.network_replay import NetworkReplayStore
@@ -93,6 +98,49 @@ def test_spectator_snapshot_hides_every_players_private_cards(game):
     assert [player["resource_total"] for player in snapshot["state"]["players"]] == [2, 3, 0]
 
 
+def test_snapshot_fan_out_serializes_once_and_matches_single_viewer_builds(
+    game,
+    monkeypatch,
+):
+    game.phase = "main"
+    game.initial_dice_phase = False
+    game.dice_rolled = True
+    game.special_phase = "domestic_trade_edit"
+    game.domestic_trade_partner = game.players[1]
+    game.domestic_trade_editor = game.players[0]
+    game.domestic_trade_give[ResourceType.WOOD] = 1
+    viewers = (0, 1, 2, None)
+    expected = {
+        viewer: json.loads(
+            json.dumps(build_state_snapshot(game, viewer_player_index=viewer, revision=4))
+        )
+        for viewer in viewers
+    }
+    serialize_calls = []
+    original_serialize = network_protocol.serialize_game
+    monkeypatch.setattr(
+        network_protocol,
+        "serialize_game",
+        lambda value: serialize_calls.append(value) or original_serialize(value),
+    )
+
+    snapshots = build_state_snapshots(
+        game,
+        viewer_player_indices=[0, 1, 1, 2, None, None],
+        revision=4,
+    )
+
+    assert len(serialize_calls) == 1
+    assert list(snapshots) == list(viewers)
+    for viewer in viewers:
+        assert json.loads(json.dumps(snapshots[viewer])) == expected[viewer]
+    # Only the viewer's own entry is copied; public branches are shared.
+    assert snapshots[1]["state"]["board"] is snapshots[None]["state"]["board"]
+    assert snapshots[1]["state"]["players"][0] is snapshots[2]["state"]["players"][0]
+    with pytest.raises(NetworkProtocolError):
+        build_state_snapshots(game, viewer_player_indices=[0, 3])
+
+
 def test_mixed_ai_personalities_are_private_until_the_match_result():
     mixed_game = CatanGame(
         board_seed=9191,
@@ -464,6 +512,114 @@ def test_board_manifest_and_command_reference_index_share_the_same_ids(game):
     assert all(target_id == f"edge-{index}" for index, target_id in enumerate(references["edge"]))
 
 
+def test_board_manifest_is_cached_until_public_board_content_changes(game):
+    def uncached_manifest():
+        return network_protocol._build_board_manifest(
+            game,
+            network_protocol._board_geometry(game.board),
+        )
+
+    references = build_board_reference_index(game)
+    first = build_board_manifest(game)
+    assert build_board_manifest(game) is first
+    assert build_board_reference_index(game) is references
+
+    game.board.roads.append(Road(game.players[0], *game.board.edges[0]))
+    with_road = build_board_manifest(game)
+    assert with_road is not first
+    assert with_road == uncached_manifest()
+
+    game.board.nodes[0].building = Building(game.players[1])
+    game.board.nodes[0].building.upgrade_to_city()
+    with_city = build_board_manifest(game)
+    assert with_city is not with_road
+    assert with_city == uncached_manifest()
+
+    game.board.robber_tile = next(
+        tile for tile in game.board.tiles if tile is not game.board.robber_tile
+    )
+    moved_robber = build_board_manifest(game)
+    assert moved_robber is not with_city
+    assert moved_robber == uncached_manifest()
+    assert build_board_reference_index(game) is references
+
+    snapshot = build_state_snapshot(game, viewer_player_index=0, revision=3)
+    assert snapshot["board_manifest"] is moved_robber
+    payload = json.dumps(
+        snapshot,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
+    assert encode_frame(snapshot) == struct.pack("!I", len(payload)) + payload
+    assert encode_frame(snapshot) == struct.pack("!I", len(payload)) + payload
+
+
+def test_state_delta_round_trips_to_the_next_snapshot_and_is_smaller(game):
+    game.phase = "main"
+    game.log_messages = [
+        f"network-log-{index}" for index in range(MAX_SNAPSHOT_LOG_MESSAGES)
+    ]
+    previous = json.loads(
+        json.dumps(build_state_snapshot(game, viewer_player_index=0, revision=7))
+    )
+    frozen = deepcopy(previous)
+
+    game.log_messages.append("network-log-new")
+    game.board.roads.append(Road(game.players[0], *game.board.edges[3]))
+    assert game.bank.withdraw(ResourceType.BRICK, 1)
+    game.players[0].add_resource(ResourceType.BRICK, 1)
+    current = json.loads(
+        json.dumps(build_state_snapshot(game, viewer_player_index=0, revision=8))
+    )
+
+    delta = build_state_delta(previous, current)
+    assert delta["type"] == "state_delta"
+    assert (delta["base_revision"], delta["revision"]) == (7, 8)
+    assert len(encode_frame(delta)) * 5 < len(encode_frame(current))
+    decoder = FrameDecoder()
+    (received,) = decoder.feed(encode_frame(delta))
+    assert apply_state_delta(previous, received) == current
+    assert previous == frozen
+
+    assert build_state_delta(previous, previous)["operations"] == []
+    spectator = build_state_snapshot(game, viewer_player_index=None, revision=8)
+    assert build_state_delta(previous, spectator) is None
+    with pytest.raises(NetworkProtocolError):
+        apply_state_delta(current, delta)
+    tampered = deepcopy(delta)
+    tampered["operations"].append(
+        {"op": "replace", "path": ["state", "missing", "key"], "value": 1}
+    )
+    with pytest.raises(NetworkProtocolError):
+        apply_state_delta(previous, tampered)
+    tampered["operations"] = [{"op": "remove", "path": ["revision"]}]
+    with pytest.raises(NetworkProtocolError):
+        apply_state_delta(previous, tampered)
+
+
+def test_state_delta_keeps_numbers_and_booleans_apart():
+    previous = {
+        "type": "state_snapshot",
+        "protocol_version": NETWORK_PROTOCOL_VERSION,
+        "revision": 1,
+        "viewer_player_index": 0,
+        "state": {"scores": [1, 2], "flags": {"ready": 1}, "log": ["a", 1, 2]},
+    }
+    current = deepcopy(previous)
+    current["revision"] = 2
+    current["state"]["scores"][0] = 1.0
+    current["state"]["flags"]["ready"] = True
+    current["state"]["log"] = [True, 2, "b"]
+
+    delta = build_state_delta(previous, current)
+
+    assert delta["operations"]
+    assert json.dumps(apply_state_delta(previous, delta), sort_keys=True) == (
+        json.dumps(current, sort_keys=True)
+    )
+
+
 def test_game_command_is_semantic_bounded_and_defensively_copied():
     args = {"target_id": "edge-017", "options": [1, True, None]}
     command = build_game_command(
@@ -0,0 +1,254 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import os
+import random
+import time
+
+import pytest
+
+from game.ai_personality import ROLLOUT
+import game.rollout_ai as rollout_ai
+from game.game_state import PIECE_FIELDS
+from game.resources import ResourceType
+from game.rollout_ai import (
+    RolloutConfig,
+    RolloutSearch,
+    _candidate_actions,
+    _frontier_hidden_layout,
+    determinize_state,
+    redeal_frontier,
+)
+from game.self_play import _prepare_game, run_match
+from game.variant import VariantConfig
+
+
+def _decision_point(seed=7, variant_config=None):
+    game = _prepare_game(
+        match_seed=seed,
+        board_seed=seed,
+        board_mode="constrained",
+        player_count=4,
+        victory_target=10,
+        variant_config=variant_config,
+    )
+    for _ in range(2000):
+        if game.winner is not None:
+            break
+        player = game.players[game.current_player_index]
+        if (
+            game.phase == "main"
+            and game.dice_rolled
+            and game.special_phase is None
+            and len(_candidate_actions(game, player, game.ai)) > 2
+        ):
+            return game, player
+        game.ai.step(game)
+    pytest.fail("no build decision was reached")
+
+
+def test_determinize_keeps_public_counts_and_the_seat_hand():
+    game, player = _decision_point()
+    seat = game.players.index(player)
+    state = game.capture_state()
+    redealt = determinize_state(state, seat, random.Random(4))
+
+    resource_total = sum(state.hands)
+    assert sum(redealt.hands) == resource_total
+    for other in range(state.player_count):
+        assert sum(redealt.hand(other).values()) == sum(state.hand(other).values())
+    assert redealt.hand(seat) == state.hand(seat)
+
+    vp_slot = PIECE_FIELDS.index("victory_point_cards")
+    width = len(PIECE_FIELDS)
+
+    def hidden_cards(snapshot, other):
+        cards = len(snapshot.development_cards) // snapshot.player_count
+        start = other * cards
+        return (
+            sum(snapshot.development_cards[start:start + cards])
+            + snapshot.pieces[other * width + vp_slot],
+            sum(snapshot.new_development_cards[start:start + cards]),
+        )
+
+    for other in range(state.player_count):
+        assert hidden_cards(redealt, other) == hidden_cards(state, other)
+    assert len(redealt.development_deck) == len(state.development_deck)
+    assert state.hand(seat) == player.resources
+
+
+def test_rollout_config_validates_its_budget():
+    with pytest.raises(ValueError):
+        RolloutConfig(rollouts_per_action=0)
+    with pytest.raises(TypeError):
+        RolloutConfig(rollout_turns=2.5)
+    with pytest.raises(ValueError):
+        RolloutConfig(time_budget=0)
+    with pytest.raises(ValueError):
+        RolloutConfig(workers=-1)
+    assert RolloutConfig(workers=0).resolved_workers() == 1
+    assert RolloutConfig().resolved_workers() == (os.cpu_count() or 1)
+    # Self-play runs a match per core, so its rollout seats stay in-process.
+    game = _prepare_game(
+        match_seed=1,
+        board_seed=1,
+        board_mode="constrained",
+        player_count=2,
+        victory_target=5,
+        rollout_config=RolloutConfig(rollouts_per_action=2),
+    )
+    assert game.ai.rollout_config == RolloutConfig(rollouts_per_action=2, workers=1)
+
+
+def test_search_choice_does_not_depend_on_worker_count_or_touch_the_game():
+    game, player = _decision_point(seed=11)
+    before = game.capture_state(include_rng=True)
+    choices = []
+    for workers in (0, 2):
+        with RolloutSearch(
+            RolloutConfig(rollouts_per_action=2, rollout_turns=2, workers=workers)
+        ) as search:
+            choices.append(search.choose(game, player, game.ai))
+        assert search._pool is None
+        assert search.rollouts == 2 * len(_candidate_actions(game, player, game.ai))
+        after = game.capture_state(include_rng=True)
+        assert after.hands == before.hands
+        assert after.rng_state == before.rng_state
+
+    assert choices[0] == choices[1]
+    assert choices[0] in _candidate_actions(game, player, game.ai)
+
+
+def test_pool_rounds_send_the_scratch_game_once_per_decision(monkeypatch):
+    monkeypatch.setattr(rollout_ai, "_WORKER_SCRATCH", (None, None))
+    game, player = _decision_point(seed=11)
+    blobs = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def submit(self, function, context_key, blob, *args):
+            blobs.append(blob is not None)
+            return super().submit(function, context_key, blob, *args)
+
+    config = RolloutConfig(
+        rollouts_per_action=3, rollout_turns=2, time_budget=60, workers=2
+    )
+    expected = RolloutSearch(replace(config, workers=0))
+    expected.choose(game, player, game.ai)
+    # One thread stands in for the processes: they never share a scratch game.
+    with RolloutSearch(config) as search:
+        search._pool = RecordingPool(max_workers=1)
+        search.choose(game, player, game.ai)
+
+    # One round per rollout with a time budget; only the first carries it.
+    assert blobs == [True, True, False, False, False, False]
+    assert search.last_choice == expected.last_choice
+
+    class ForgetfulPool(RecordingPool):
+        def submit(self, function, context_key, blob, *args):
+            if blob is None:
+                # As if a process that never saw this decision picked it up.
+                rollout_ai._WORKER_SCRATCH = (None, None)
+            return super().submit(function, context_key, blob, *args)
+
+    blobs.clear()
+    with RolloutSearch(config) as search:
+        search._pool = ForgetfulPool(max_workers=1)
+        search.choose(game, player, game.ai)
+
+    assert blobs == [True, True] + [False, False, True, True] * 2
+    assert search.last_choice == expected.last_choice
+
+
+def test_rollout_personality_plays_a_self_play_match():
+    result = run_match(
+        match_seed=3,
+        board_seed=3,
+        board_mode="constrained",
+        player_count=2,
+        victory_target=5,
+        max_turns=40,
+        personalities=(ROLLOUT, "standard"),
+    )
+
+    assert [player.personality for player in result.players] == [
+        ROLLOUT,
+        "standard",
+    ]
+    assert result.turns > 0
+    assert result.validation_errors == ()
+
+
+def test_time_budget_stops_the_search_after_the_round_that_exceeds_it():
+    game, player = _decision_point(seed=5)
+    candidates = _candidate_actions(game, player, game.ai)
+    search = RolloutSearch(
+        RolloutConfig(rollouts_per_action=10_000, rollout_turns=2, time_budget=0.05)
+    )
+
+    started = time.perf_counter()
+    choice = search.choose(game, player, game.ai)
+    elapsed = time.perf_counter() - started
+
+    assert choice in candidates
+    # Each round runs every candidate once; the search stops after the first
+    # round past the budget instead of spending the full rollout count.
+    assert search.rollouts % len(candidates) == 0
+    assert len(candidates) <= search.rollouts < 10_000 * len(candidates)
+    assert elapsed < 10.0
+
+
+def test_frontier_redeal_shuffles_only_undiscovered_tiles_and_harbors():
+    game, _player = _decision_point(
+        seed=7, variant_config=VariantConfig.frontier_expanded()
+    )
+    hidden = _frontier_hidden_layout(game)
+    assert hidden is not None
+    tile_ids, terrains, numbers, harbor_ids, harbor_kinds = hidden
+    scratch = game.fork()
+    board = scratch.board
+
+    layouts = set()
+    for seed in range(5):
+        redeal_frontier(board, hidden, random.Random(seed))
+        tiles = [board.tiles[index] for index in tile_ids]
+        assert sorted(tile.resource_type.name for tile in tiles) == sorted(
+            terrain.name for terrain in terrains
+        )
+        assert sorted(t.number for t in tiles if t.number is not None) == list(numbers)
+        assert all(
+            (tile.number is None) == (tile.resource_type == ResourceType.DESERT)
+            for tile in tiles
+        )
+        harbors = [board.harbors[index] for index in harbor_ids]
+        assert sorted(
+            (harbor.trade_rate, getattr(harbor.resource_type, "name", ""))
+            for harbor in harbors
+        ) == sorted((rate, getattr(kind, "name", "")) for rate, kind in harbor_kinds)
+        layouts.add(tuple((tile.resource_type, tile.number) for tile in tiles))
+    assert len(layouts) > 1
+
+    for index, tile in enumerate(game.board.tiles):
+        if index not in tile_ids:
+            copy = board.tiles[index]
+            assert (copy.resource_type, copy.number) == (tile.resource_type, tile.number)
+
+
+@pytest.mark.parametrize(
+    "variant_config",
+    [VariantConfig.frontier_expanded(), VariantConfig.composite_grand_campaign()],
+    ids=["frontier_expanded", "grand_campaign"],
+)
+def test_rollout_seat_plays_hidden_information_variants(variant_config):
+    result = run_match(
+        match_seed=3,
+        board_seed=3,
+        board_mode="constrained",
+        player_count=2,
+        victory_target=5,
+        max_turns=30,
+        personalities=(ROLLOUT, "standard"),
+        variant_config=variant_config,
+        rollout_config=RolloutConfig(rollouts_per_action=1, rollout_turns=2),
+    )
+
+    assert result.turns > 0
+    assert result.validation_errors == ()
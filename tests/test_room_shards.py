@@ -0,0 +1,187 @@
+import threading
+
+import pytest
+
+from game.lan_controller import LanControllerError, LanServerController
+from game.network_protocol import NETWORK_PROTOCOL_VERSION, build_game_command
+from game.room_shards import (
+    ShardedLanServerController,
+    room_shard_index,
+)
+from game.server_state import SQLiteRoomAuthorityStore
+from game.web_gateway import WebGateway
+
+
+def message(message_type, **payload):
+    return {
+        "type": message_type,
+        "protocol_version": NETWORK_PROTOCOL_VERSION,
+        **payload,
+    }
+
+
+SETTINGS = {
+    "player_count": 2,
+    "victory_target": 10,
+    "board_mode": "constrained",
+    "board_seed": 86712347,
+    "ai_player_count": 0,
+}
+
+
+def create_room(controller, connection):
+    outbound = controller.handle(
+        connection,
+        message("create_room", display_name="Host", settings=SETTINGS),
+    )
+    return next(
+        item.message["room_code"]
+        for item in outbound
+        if item.message["type"] == "session_welcome"
+    )
+
+
+def test_room_code_filter_limits_generated_and_restored_rooms(tmp_path):
+    store = SQLiteRoomAuthorityStore(tmp_path / "rooms.sqlite3")
+    try:
+        owner = LanServerController(
+            state_store=store,
+            room_code_filter=lambda code: room_shard_index(code, 4) == 1,
+        )
+        codes = [create_room(owner, f"host-{index}") for index in range(6)]
+        assert all(room_shard_index(code, 4) == 1 for code in codes)
+        assert owner.has_session("host-0") is True
+        assert owner.has_session("nobody") is False
+        assert owner.has_session(True) is False
+
+        other = LanServerController(
+            state_store=store,
+            room_code_filter=lambda code: room_shard_index(code, 4) != 1,
+        )
+        assert other.room_codes == ()
+        restored = LanServerController(
+            state_store=store,
+            room_code_filter=lambda code: room_shard_index(code, 4) == 1,
+        )
+        assert restored.room_codes == tuple(sorted(codes))
+    finally:
+        store.close()
+
+
+def test_controller_errors_survive_a_process_boundary():
+    import pickle
+
+    error = pickle.loads(pickle.dumps(LanControllerError("room_not_found", "x")))
+
+    assert type(error) is LanControllerError
+    assert (error.code, str(error)) == ("room_not_found", "x")
+
+
+def test_sharded_rooms_play_through_their_owning_workers_and_persist(tmp_path):
+    state_db = tmp_path / "rooms.sqlite3"
+    with ShardedLanServerController(shard_count=2, state_db=state_db) as controller:
+        first = create_room(controller, "host-a")
+        second = create_room(controller, "host-b")
+        assert {room_shard_index(first, 2), room_shard_index(second, 2)} == {0, 1}
+        assert controller.room_codes == tuple(sorted((first, second)))
+
+        joined = controller.handle(
+            "guest-a",
+            message("join_room", room_code=first, display_name="Guest", role="player"),
+        )
+        assert any(item.message["type"] == "session_welcome" for item in joined)
+        controller.handle("host-a", message("set_ready", ready=True))
+        controller.handle("guest-a", message("set_ready", ready=True))
+        started = controller.handle("host-a", message("start_game"))
+        assert any(item.message["type"] == "state_snapshot" for item in started)
+        rolled = controller.handle(
+            "host-a",
+            build_game_command(sequence=0, expected_revision=0, command="roll_dice"),
+        )
+        assert rolled[0].message["accepted"] is True
+        assert controller.snapshot_for_connection("guest-a")["revision"] == 1
+
+        unseated = controller.handle("stranger", message("start_game"))
+        assert unseated[0].message["type"] == "request_error"
+        with pytest.raises(LanControllerError):
+            controller.snapshot_for_connection("stranger")
+
+        controller.tick()
+        assert controller.disconnect("guest-a")
+        assert controller.disconnect("guest-a") == ()
+
+    with ShardedLanServerController(shard_count=2, state_db=state_db) as restarted:
+        assert restarted.room_codes == tuple(sorted((first, second)))
+
+
+def test_web_gateway_routes_browser_rooms_through_shards():
+    with ShardedLanServerController(shard_count=2) as controller:
+        gateway = WebGateway(controller=controller)
+        tokens = [gateway.open_session() for _ in range(2)]
+        room_codes = []
+        for token in tokens:
+            events = gateway.handle(
+                token,
+                message("create_room", display_name="Host", settings=SETTINGS),
+            )
+            welcome = next(
+                event for event in events if event["type"] == "session_welcome"
+            )
+            room_codes.append(welcome["room_code"])
+
+        assert sorted(room_codes) == list(controller.room_codes)
+        # A closed browser keeps its seat reserved, exactly as without shards.
+        gateway.close_session(tokens[0])
+        assert controller.room_codes == tuple(sorted(room_codes))
+
+
+def test_web_gateway_serves_other_shards_while_one_shard_is_busy():
+    with ShardedLanServerController(shard_count=2) as controller:
+        gateway = WebGateway(controller=controller)
+        tokens = [gateway.open_session() for _ in range(2)]
+        for token in tokens:
+            gateway.handle(
+                token,
+                message("create_room", display_name="Host", settings=SETTINGS),
+            )
+        slow_connection = gateway._sessions[tokens[0]].connection_id
+        entered = threading.Event()
+        release = threading.Event()
+        forward = controller.handle
+
+        def handle(connection_id, request, **options):
+            if connection_id == slow_connection:
+                entered.set()
+                assert release.wait(10)
+            return forward(connection_id, request, **options)
+
+        controller.handle = handle
+        slow_events = []
+        slow = threading.Thread(
+            target=lambda: slow_events.extend(
+                gateway.handle(tokens[0], message("ping", nonce="slow"))
+            )
+        )
+        slow.start()
+        try:
+            assert entered.wait(10)
+            events = gateway.handle(tokens[1], message("ping", nonce="fast"))
+            assert [event["nonce"] for event in events if event["type"] == "pong"] == [
+                "fast"
+            ]
+        finally:
+            release.set()
+            slow.join(10)
+        assert [event["nonce"] for event in slow_events if event["type"] == "pong"] == [
+            "slow"
+        ]
+
+
+def test_sharded_controller_rejects_worker_managed_options():
+    with pytest.raises(ValueError):
+        ShardedLanServerController(shard_count=0)
+    with pytest.raises(ValueError):
+        ShardedLanServerController(
+            shard_count=2,
+            controller_options={"state_store": object()},
+        )
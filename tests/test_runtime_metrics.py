@@ -0,0 +1,206 @@
+from http.client import HTTPConnection
+import threading
+
+import pytest
+
+from game.lan_controller import LanServerController
+from game.network_actions import NetworkActionError, apply_game_command
+from game.network_protocol import NETWORK_PROTOCOL_VERSION, build_game_command
+from game.runtime_metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsRegistry,
+    active_registry,
+    disable_metrics,
+    enable_metrics,
+    increment_metric,
+    metric_timer,
+)
+from game.self_play import _prepare_game
+from game.web_gateway import WebGateway
+import game.web_server as web_server_module
+from game.web_server import create_web_server
+
+
+@pytest.fixture
+def registry():
+    registry = enable_metrics()
+    try:
+        yield registry
+    finally:
+        disable_metrics()
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def get(server, path):
+    connection = HTTPConnection("127.0.0.1", server.server_port, timeout=3)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response, response.read()
+    finally:
+        connection.close()
+
+
+def test_registry_renders_cumulative_histograms_and_counters():
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.observe("catan_room_persist_seconds", 0.005, outcome="ok")
+    registry.observe("catan_room_persist_seconds", 0.05, outcome="ok")
+    registry.observe("catan_room_persist_seconds", 3, outcome="ok")
+    registry.increment("catan_controller_ai_decisions_total", 2)
+    registry.observe(
+        "catan_game_command_seconds",
+        0.01,
+        command='say "hi"\\',
+        outcome="ok",
+    )
+
+    text = registry.render()
+
+    assert "# TYPE catan_room_persist_seconds histogram" in text
+    assert 'catan_room_persist_seconds_bucket{outcome="ok",le="0.01"} 1' in text
+    assert 'catan_room_persist_seconds_bucket{outcome="ok",le="0.1"} 2' in text
+    assert 'catan_room_persist_seconds_bucket{outcome="ok",le="+Inf"} 3' in text
+    assert 'catan_room_persist_seconds_sum{outcome="ok"} 3.055' in text
+    assert 'catan_room_persist_seconds_count{outcome="ok"} 3' in text
+    assert "catan_controller_ai_decisions_total 2\n" in text
+    assert 'command="say \\"hi\\"\\\\",outcome="ok",le="0.01"} 1' in text
+    assert "catan_replay_capture_seconds" not in text
+
+    with pytest.raises(ValueError):
+        registry.increment("catan_unknown_total")
+    with pytest.raises(ValueError):
+        registry.increment("catan_room_persist_seconds", outcome="ok")
+    with pytest.raises(ValueError):
+        registry.observe("catan_room_persist_seconds", 1.0)
+    with pytest.raises(ValueError):
+        MetricsRegistry(buckets=(0.1, 0.01))
+    registry.reset()
+    assert registry.render() == ""
+
+
+def test_disabled_metrics_share_a_no_op_timer():
+    disable_metrics()
+    assert active_registry() is None
+    assert metric_timer("catan_room_persist_seconds") is metric_timer(
+        "catan_ai_decision_seconds", phase="main"
+    )
+    increment_metric("catan_controller_ai_decisions_total")
+    with pytest.raises(TypeError):
+        enable_metrics(object())
+
+
+def test_commands_and_ai_decisions_are_timed_when_enabled(registry):
+    game = _prepare_game(
+        match_seed=5,
+        board_seed=5,
+        board_mode="constrained",
+        player_count=2,
+        victory_target=5,
+    )
+    assert game.ai.step(game) is True
+    with pytest.raises(NetworkActionError):
+        apply_game_command(game, 0, "teleport")
+
+    assert registry.histogram_count(
+        "catan_ai_decision_seconds", phase="initial", outcome="ok"
+    ) == 1
+    assert registry.histogram_count(
+        "catan_game_command_seconds", command="unsupported", outcome="rejected"
+    ) == 1
+
+
+def test_gateway_and_controller_ai_slices_are_timed(registry):
+    now = [100.0]
+
+    def finish_ai_turn(game):
+        game.phase = "finished"
+        game.winner = game.players[0]
+        return True
+
+    gateway = WebGateway(
+        controller=LanServerController(ai_stepper=finish_ai_turn),
+        clock=lambda: now[0],
+    )
+    host = gateway.open_session()
+
+    def send(message_type, **payload):
+        return gateway.handle(
+            host,
+            {
+                "type": message_type,
+                "protocol_version": NETWORK_PROTOCOL_VERSION,
+                **payload,
+            },
+        )
+
+    send(
+        "create_room",
+        display_name="Host",
+        settings={
+            "player_count": 2,
+            "ai_player_count": 1,
+            "victory_target": 5,
+            "board_mode": "constrained",
+            "board_seed": 4242,
+        },
+    )
+    send("set_ready", ready=True)
+    send("start_game")
+    gateway.handle(
+        host,
+        build_game_command(sequence=0, expected_revision=0, command="roll_dice"),
+    )
+    now[0] += 1.1
+    gateway.maintain()
+    gateway.poll(host)
+
+    assert registry.histogram_count(
+        "catan_game_command_seconds", command="roll_dice", outcome="ok"
+    ) == 1
+    assert registry.counter_value("catan_controller_ai_decisions_total") == 1
+    assert registry.histogram_count(
+        "catan_controller_ai_advance_seconds", outcome="ok"
+    ) >= 1
+    assert registry.histogram_count(
+        "catan_replay_capture_seconds", outcome="ok"
+    ) >= 2
+    assert registry.histogram_count(
+        "catan_web_gateway_seconds", operation="handle", outcome="ok"
+    ) == 4
+    assert registry.histogram_count(
+        "catan_web_gateway_seconds", operation="poll", outcome="ok"
+    ) == 1
+
+
+def test_metrics_endpoint_is_opt_in_and_loopback_only(registry, monkeypatch):
+    registry.increment("catan_controller_ai_decisions_total")
+    plain = create_web_server("127.0.0.1", 0)
+    instrumented = create_web_server("127.0.0.1", 0, metrics=registry)
+    threads = [serve(plain), serve(instrumented)]
+    try:
+        response, _payload = get(plain, "/metrics")
+        assert response.status == 404
+
+        response, payload = get(instrumented, "/metrics")
+        assert response.status == 200
+        assert response.getheader("Content-Type") == PROMETHEUS_CONTENT_TYPE
+        assert b"catan_controller_ai_decisions_total 1\n" in payload
+
+        monkeypatch.setattr(
+            web_server_module, "_is_loopback_web_host", lambda _host: False
+        )
+        response, payload = get(instrumented, "/metrics")
+        assert response.status == 403
+        assert b"metrics_local_only" in payload
+    finally:
+        for server, thread in zip((plain, instrumented), threads):
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=2)
+    with pytest.raises(ValueError):
+        create_web_server("127.0.0.1", 0, metrics=object())
@@ -9,7 +9,13 @@ import pytest
 
 from game.building import Building, BuildingType
 from game.game import CatanGame
-from game.persistence import SaveGameError, load_game, save_game, serialize_game
+from game.persistence import (
+    SaveGameError,
+    load_game,
+    restore_game,
+    save_game,
+    serialize_game,
+)
 from game.resources import ResourceType
 from game.road import Road
 
@@ -94,6 +100,21 @@ def test_complex_game_state_round_trips_through_json(game, tmp_path):
     assert not saved_path.with_suffix(".json.tmp").exists()
 
 
+def test_serialized_document_stays_detached_from_the_live_game(game):
+    prepare_complex_main_state(game)
+    document = serialize_game(game)
+    frozen = json.loads(json.dumps(document))
+    cpu = game.players[1]
+
+    game.record_public_gain(cpu, {ResourceType.ORE: 1}, "出目8")
+    game.add_log("保存後のログ")
+    assert document == frozen
+
+    restore_game(game, document, runtime_side_effects=False)
+    game.record_public_gain(cpu, {ResourceType.WOOD: 1}, "出目6")
+    assert document == frozen
+
+
 def test_quick_save_and_load_restore_resources_with_feedback(game, tmp_path):
     human = game.players[0]
     withdraw_to_player(game, human, ResourceType.WHEAT, 2)
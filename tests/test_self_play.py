@@ -8,17 +8,24 @@ import pytest
 from game.self_play import (
     ACTION_COUNT_KEYS,
     SUPPORTED_AI_PERSONALITIES,
+    SelfPlayPool,
     SelfPlayWorkerError,
+    _ChunkScheduler,
     _MatchJob,
+    _match_from_row,
+    _match_to_row,
     _prepare_game,
     _resolve_worker_count,
     _run_match_job,
     _validate_completed_state,
     normalise_personalities,
     parse_personality_lineup,
+    rollout_config_from_options,
     run_batch,
+    run_batch_to_log,
     run_match,
 )
+from game.rollout_ai import RolloutConfig, RolloutSearch
 
 
 def test_self_play_is_reproducible_and_returns_structured_results():
@@ -83,6 +90,21 @@ def test_self_play_restores_the_callers_global_random_state():
     assert [random.random() for _ in range(4)] == expected
 
 
+def test_concurrent_in_process_matches_match_sequential_results():
+    options = [
+        {"match_seed": seed, "board_seed": seed + 1, "victory_target": 5, "max_turns": 30}
+        for seed in (11, 12, 13)
+    ]
+    sequential = [run_match(**option).to_dict() for option in options]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        concurrent_results = list(
+            executor.map(lambda option: run_match(**option).to_dict(), options)
+        )
+
+    assert concurrent_results == sequential
+
+
 def test_self_play_reports_a_turn_limit_without_hanging():
     result = run_match(
         match_seed=99,
@@ -110,6 +132,21 @@ def test_batch_average_excludes_incomplete_matches():
     assert result.average_turns == 0.0
 
 
+def test_ai_evaluation_cache_counters_are_reported_per_match_and_batch():
+    result = run_batch(match_seeds=(7, 8), victory_target=5)
+
+    for match in result.matches:
+        assert match.ai_cache_hits > match.ai_cache_misses > 0
+        assert match.to_dict()["ai_evaluation_cache"] == {
+            "hits": match.ai_cache_hits,
+            "misses": match.ai_cache_misses,
+        }
+    assert result.to_dict()["ai_evaluation_cache"] == {
+        "hits": sum(match.ai_cache_hits for match in result.matches),
+        "misses": sum(match.ai_cache_misses for match in result.matches),
+    }
+
+
 def test_batch_can_hold_a_board_seed_fixed_across_match_seeds():
     progress = []
     result = run_batch(
@@ -158,7 +195,9 @@ def test_batch_rotates_personalities_across_seats_deterministically():
         ("disruptor", "standard", "expansion", "trader"),
     ]
     for seat in range(4):
-        assert {lineup[seat] for lineup in lineups} == set(SUPPORTED_AI_PERSONALITIES)
+        assert {lineup[seat] for lineup in lineups} == set(
+            SUPPORTED_AI_PERSONALITIES[:4]
+        )
 
 
 def test_custom_personality_lineup_allows_mirror_matches_and_rotates():
@@ -249,10 +288,12 @@ def test_parallel_batch_matches_sequential_order_and_preserves_parent_random_sta
         "victory_target": 10,
         "max_turns": 1,
     }
-    sequential = run_batch(**options, workers=1)
-    progress = []
     random.seed(24680)
     parent_state = random.getstate()
+    # In-process matches draw only from their own seeded generators.
+    sequential = run_batch(**options, workers=1)
+    assert random.getstate() == parent_state
+    progress = []
 
     parallel = run_batch(
         **options,
@@ -334,3 +375,154 @@ def test_spawn_worker_wraps_failure_with_match_identity():
     assert "unsupported board mode" in caught.value.detail
     assert "match 7" in str(caught.value)
     assert "seed=505" in str(caught.value)
+
+
+def test_streamed_batch_log_resumes_after_an_interrupt(tmp_path):
+    options = {
+        "match_seeds": (301, 302, 303),
+        "board_mode": "fully_random",
+        "player_count": 4,
+        "victory_target": 10,
+        "max_turns": 1,
+    }
+    in_memory = run_batch(**options)
+    log_path = tmp_path / "batch.jsonl"
+
+    def interrupt_after_first(index, _total, _match):
+        if index == 1:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch_to_log(log_path, **options, progress=interrupt_after_first)
+    # Simulate a record cut off by the interrupt mid-write.
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"index": 2, "match_')
+
+    progress = []
+    streamed = run_batch_to_log(
+        log_path,
+        **options,
+        progress=lambda index, total, match: progress.append((index, match.match_seed)),
+    )
+
+    assert progress == [(2, 302), (3, 303)]
+    assert streamed.resumed_games == 1
+    assert streamed.game_count == in_memory.game_count
+    assert streamed.completed_games == in_memory.completed_games
+    assert streamed.win_counts == in_memory.win_counts
+    assert streamed.average_turns == in_memory.average_turns
+    assert streamed.ai_evaluation_cache == in_memory.ai_evaluation_cache
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["format"] == "catan-self-play-log"
+    assert [json.loads(line) for line in lines[1:]] == [
+        {"index": index, **json.loads(json.dumps(match.to_dict()))}
+        for index, match in enumerate(in_memory.matches, start=1)
+    ]
+
+    finished = run_batch_to_log(log_path, **options)
+    assert finished.resumed_games == 3
+    assert finished.win_counts == in_memory.win_counts
+    with pytest.raises(ValueError):
+        run_batch_to_log(log_path, **{**options, "max_turns": 2})
+
+
+def test_rollout_budget_reaches_every_match_and_the_log_header(
+    tmp_path, monkeypatch
+):
+    import game.ai
+
+    seen = []
+
+    def recording_search(config=None):
+        seen.append(config)
+        return RolloutSearch(config)
+
+    monkeypatch.setattr(game.ai, "RolloutSearch", recording_search)
+    config = rollout_config_from_options(rollouts=1, workers=1)
+    assert config == RolloutConfig(rollouts_per_action=1, workers=1)
+    assert rollout_config_from_options() is None
+    options = {
+        "match_seeds": (5, 6),
+        "board_mode": "fully_random",
+        "player_count": 2,
+        "victory_target": 5,
+        "max_turns": 6,
+        "personalities": ("rollout", "standard"),
+        "rollout_config": config,
+    }
+
+    run_batch(**options)
+    assert seen == [config, config]
+    log_path = tmp_path / "rollout.jsonl"
+    run_batch_to_log(log_path, **options)
+    header = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+    assert header["rollout"] == {
+        "rollouts_per_action": 1,
+        "rollout_turns": config.rollout_turns,
+        "time_budget": None,
+    }
+    with pytest.raises(ValueError):
+        run_batch_to_log(log_path, **{**options, "rollout_config": None})
+    with pytest.raises(TypeError):
+        run_match(match_seed=1, rollout_config={"rollouts_per_action": 1})
+
+
+def test_warm_pool_is_reused_across_batches_and_matches_sequential_results():
+    options = {
+        "board_mode": "fully_random",
+        "player_count": 4,
+        "victory_target": 10,
+        "max_turns": 1,
+    }
+    sequential = [
+        run_batch(match_seeds=seeds, **options) for seeds in ((301, 302, 303), (304, 305))
+    ]
+
+    children_before = {child.pid for child in multiprocessing.active_children()}
+    with SelfPlayPool(workers=2) as pool:
+        first = run_batch(match_seeds=(301, 302, 303), **options, pool=pool)
+        worker_pids = {
+            child.pid for child in multiprocessing.active_children()
+        } - children_before
+        second = run_batch(match_seeds=(304, 305), **options, pool=pool)
+        assert pool.closed is False
+        assert {
+            child.pid for child in multiprocessing.active_children()
+        } - children_before == worker_pids
+
+    assert len(worker_pids) == 2
+    assert worker_pids.isdisjoint(
+        child.pid for child in multiprocessing.active_children()
+    )
+    assert first.matches == sequential[0].matches
+    assert second.matches == sequential[1].matches
+    assert first.worker_count == 2
+    assert pool.closed is True
+    with pytest.raises(ValueError):
+        run_batch(match_seeds=(301,), **options, pool=pool)
+
+
+def test_pool_results_round_trip_through_compact_rows():
+    match = run_match(match_seed=31415, board_seed=2718, victory_target=5)
+    row = _match_to_row(match)
+
+    assert isinstance(row, tuple)
+    assert all(isinstance(player, tuple) for player in row[_row_index("players")])
+    assert _match_from_row(row) == match
+
+
+def _row_index(name):
+    from game.self_play import _MATCH_FIELDS
+
+    return _MATCH_FIELDS.index(name)
+
+
+def test_chunk_scheduler_batches_short_matches_and_shrinks_for_the_tail():
+    scheduler = _ChunkScheduler(worker_count=2, job_count=1000, estimated_turns=80)
+    assert scheduler.next_size() == 5
+
+    scheduler.observe([type("Match", (), {"turns": 2})()] * 4)
+    assert scheduler.next_size() == 64
+
+    scheduler.remaining = 6
+    assert scheduler.next_size() == 2
@@ -1,16 +1,21 @@
 from dataclasses import dataclass
 import json
+import pickle
 
 import pytest
 
 from game import self_play_report as report_module
 from game.self_play_report import (
     ReportError,
+    aggregate_matches,
     build_report_data,
+    build_report_from_parts,
     main,
+    read_match_log,
     render_html_dashboard,
     render_terminal_summary,
     write_report,
+    write_report_data,
 )
 
 
@@ -406,6 +411,49 @@ def test_html_bounds_the_individual_match_table(monkeypatch):
     assert "交渉重視" in rendered
 
 
+def test_partial_aggregates_merge_into_the_whole_batch_report():
+    batch = _batch()
+    raw_matches = batch["matches"]
+    whole = build_report_data(raw_matches, generated_at="fixed")
+
+    first = aggregate_matches(raw_matches[:1])
+    second_matches, second = aggregate_matches(raw_matches[1:], start=1)
+    second = pickle.loads(pickle.dumps(second))
+    merged = build_report_from_parts(
+        [first, (second_matches, second)], generated_at="fixed"
+    )
+
+    assert merged == whole
+    assert second_matches[0]["match_number"] == 2
+    with pytest.raises(ReportError):
+        build_report_from_parts([(second_matches, second)])
+    with pytest.raises(ReportError):
+        aggregate_matches(raw_matches, start=report_module.MAX_REPORT_MATCHES - 1)
+
+
+def test_written_dashboard_pages_the_match_list(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_module, "MAX_HTML_MATCH_ROWS", 1)
+    stale = tmp_path / "batch-matches-9.html"
+    stale.write_text("old", encoding="utf-8")
+    report = build_report_data(_batch(), generated_at="fixed")
+
+    paths = write_report_data(report, tmp_path, basename="batch")
+
+    assert [path.name for path in paths.match_page_paths] == [
+        "batch-matches-2.html",
+        "batch-matches-3.html",
+    ]
+    assert not stale.exists()
+    dashboard = paths.html_path.read_text(encoding="utf-8")
+    assert 'href="batch-matches-3.html"' in dashboard
+    assert "全結果はJSONに保存" not in dashboard
+    last_page = paths.match_page_paths[-1].read_text(encoding="utf-8")
+    assert "個別試合 3 / 3ページ" in last_page
+    assert "<td>102</td>" in last_page
+    assert 'href="batch.html"' in last_page
+    assert json.loads(paths.json_path.read_text(encoding="utf-8")) == report
+
+
 def test_terminal_summary_and_cli_are_human_readable(tmp_path, capsys):
     source = tmp_path / "results.json"
     source.write_text(json.dumps(_batch(), ensure_ascii=False), encoding="utf-8")
@@ -643,3 +691,35 @@ def test_new_dashboard_sections_are_backward_compatible_with_old_report_payload(
 
     assert "AI性格相性データがありません。" in rendered
     assert "盤面seed付きの完走データがありません。" in rendered
+
+
+def test_streamed_result_log_is_read_lazily_and_skips_a_cut_off_record(tmp_path, capsys):
+    from game.self_play import run_batch, run_batch_to_log
+
+    options = {
+        "match_seeds": (20260713, 20260714),
+        "board_seed": 42,
+        "player_count": 2,
+        "victory_target": 5,
+    }
+    log_path = tmp_path / "batch.jsonl"
+    run_batch_to_log(log_path, **options)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"index": 3, "match_')
+
+    log = read_match_log(log_path)
+    from_log = build_report_data(log, generated_at="fixed")
+    in_memory = build_report_data(run_batch(**options), generated_at="fixed")
+
+    assert from_log["summary"] == in_memory["summary"]
+    assert from_log["matches"] == in_memory["matches"]
+    assert from_log["metadata"]["games_requested"] == 2
+    assert from_log["metadata"]["board_seed"] == 42
+
+    assert main([str(log_path), "--output-dir", str(tmp_path / "out")]) == 0
+    assert "AI自己対戦レポート" in capsys.readouterr().out
+
+    not_a_log = tmp_path / "other.jsonl"
+    not_a_log.write_text('{"format": "something-else"}\n', encoding="utf-8")
+    with pytest.raises(ReportError):
+        read_match_log(not_a_log)
@@ -87,3 +87,48 @@ def test_simulate_cli_rejects_invalid_worker_count(workers):
         main(["--workers", workers, "--quiet"])
 
     assert error.value.code == 2
+
+
+def test_simulate_cli_parses_and_validates_the_rollout_budget():
+    args = _build_parser().parse_args(
+        ["--rollouts", "2", "--rollout-time", "0.5", "--rollout-workers", "1"]
+    )
+    assert (args.rollouts, args.rollout_time, args.rollout_workers) == (2, 0.5, 1)
+
+    with pytest.raises(SystemExit) as error:
+        main(["--games", "1", "--rollouts", "0", "--quiet"])
+    assert error.value.code == 2
+
+
+def test_simulate_cli_resumes_from_a_result_log(tmp_path):
+    arguments = [
+        "--games",
+        "2",
+        "--seed",
+        "31",
+        "--board-seed",
+        "404",
+        "--target",
+        "5",
+        "--players",
+        "2",
+        "--workers",
+        "1",
+        "--result-log",
+        str(tmp_path / "batch.jsonl"),
+        "--output-dir",
+        str(tmp_path / "reports"),
+        "--basename",
+        "logged",
+        "--quiet",
+    ]
+
+    assert main(arguments) == 0
+    first = json.loads((tmp_path / "reports" / "logged.json").read_text(encoding="utf-8"))
+    assert main(arguments) == 0
+    resumed = json.loads((tmp_path / "reports" / "logged.json").read_text(encoding="utf-8"))
+
+    assert first["metadata"]["resumed_games"] == 0
+    assert resumed["metadata"]["resumed_games"] == 2
+    assert resumed["summary"] == first["summary"]
+    assert len((tmp_path / "batch.jsonl").read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,414 @@
+import asyncio
+from http.client import HTTPConnection
+from io import BytesIO
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from game.network_protocol import NETWORK_PROTOCOL_VERSION, build_game_command
+from game.web_async_server import _request_body_length, create_async_web_server
+from game.web_gateway import WebGateway, WebRateLimits
+from game.web_load_test import run_load_test
+from game.websocket_transport import (
+    AsyncWebSocketConnection,
+    WebSocketEOF,
+    WebSocketOpcode,
+    WebSocketProtocolError,
+    encode_websocket_frame,
+    read_websocket_frame,
+    read_websocket_frame_async,
+)
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def stop(server, thread):
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=3)
+    assert not thread.is_alive()
+
+
+@pytest.fixture
+def async_server():
+    server = create_async_web_server(
+        "127.0.0.1",
+        0,
+        gateway=WebGateway(
+            session_limit=128,
+            rate_limits=WebRateLimits(session_creations_per_client=500),
+        ),
+    )
+    thread = start(server)
+    try:
+        yield server
+    finally:
+        stop(server, thread)
+
+
+def session_cookie(server):
+    connection = HTTPConnection("127.0.0.1", server.server_port, timeout=3)
+    try:
+        connection.request("POST", "/api/session")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        return response.getheader("Set-Cookie").split(";", 1)[0]
+    finally:
+        connection.close()
+
+
+def open_socket(server, cookie, *, origin=None):
+    peer = socket.create_connection(("127.0.0.1", server.server_port), timeout=4)
+    reader = peer.makefile("rb")
+    peer.sendall(
+        (
+            "GET /api/socket HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{server.server_port}\r\n"
+            "Connection: Upgrade\r\n"
+            "Upgrade: websocket\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+            f"Origin: {origin or f'http://127.0.0.1:{server.server_port}'}\r\n"
+            f"Cookie: {cookie}\r\n\r\n"
+        ).encode("ascii")
+    )
+    status = reader.readline()
+    while reader.readline() != b"\r\n":
+        pass
+    return peer, reader, status
+
+
+def send(peer, document, mask=b"test"):
+    peer.sendall(
+        encode_websocket_frame(
+            json.dumps(document).encode("utf-8"),
+            opcode=WebSocketOpcode.TEXT,
+            masking_key=mask,
+        )
+    )
+
+
+def receive(reader):
+    return json.loads(read_websocket_frame(reader, require_mask=False).payload)
+
+
+def ping(nonce):
+    return {
+        "type": "ping",
+        "protocol_version": NETWORK_PROTOCOL_VERSION,
+        "nonce": nonce,
+    }
+
+
+def test_http_routes_share_the_threaded_handler_and_keep_alive(async_server):
+    connection = HTTPConnection("127.0.0.1", async_server.server_port, timeout=3)
+    try:
+        connection.request("GET", "/api/health")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())["status"] == "ok"
+        assert response.getheader("X-Frame-Options") == "DENY"
+
+        # The same TCP connection carries a second request with a body.
+        connection.request(
+            "POST",
+            "/api/message",
+            body=b"{}",
+            headers={"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        assert response.status == 401
+        assert json.loads(response.read())["error"]["code"] == "session_required"
+
+        connection.request("GET", "/api/health", headers={"Host": "evil.invalid"})
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read())["error"]["code"] == "invalid_host"
+    finally:
+        connection.close()
+
+    assert _request_body_length(b"POST / HTTP/1.1\r\nContent-Length: 12\r\n\r\n") == (
+        12,
+        True,
+    )
+    assert _request_body_length(b"GET / HTTP/1.1\r\n\r\n") == (0, True)
+    for head in (
+        b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n",
+        b"POST / HTTP/1.1\r\nContent-Length: 1\r\nContent-Length: 2\r\n\r\n",
+        b"POST / HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n",
+    ):
+        assert _request_body_length(head)[1] is False
+
+
+def test_socket_bootstrap_roundtrip_and_http_only_membership(async_server):
+    cookie = session_cookie(async_server)
+    peer, reader, status = open_socket(async_server, cookie)
+    try:
+        assert status.startswith(b"HTTP/1.1 101")
+        assert receive(reader) == {
+            "api_version": 1,
+            "kind": "bootstrap",
+            "events": [],
+        }
+        send(peer, ping("async-heartbeat"))
+        assert receive(reader)["events"] == [
+            {
+                "type": "pong",
+                "protocol_version": NETWORK_PROTOCOL_VERSION,
+                "nonce": "async-heartbeat",
+            }
+        ]
+        send(peer, {"type": "leave_room", "protocol_version": NETWORK_PROTOCOL_VERSION})
+        blocked = receive(reader)
+        assert blocked["error"]["code"] == "http_required"
+
+        peer.sendall(
+            encode_websocket_frame(
+                b"\x00\x01", opcode=WebSocketOpcode.BINARY, masking_key=b"mask"
+            )
+        )
+        close = read_websocket_frame(reader, require_mask=False)
+        assert close.opcode is WebSocketOpcode.CLOSE
+        assert int.from_bytes(close.payload[:2], "big") == 1003
+    finally:
+        reader.close()
+        peer.close()
+
+    peer, reader, status = open_socket(
+        async_server, cookie, origin="https://attacker.invalid"
+    )
+    try:
+        assert status.startswith(b"HTTP/1.1 403")
+    finally:
+        reader.close()
+        peer.close()
+
+
+def test_events_are_pushed_and_a_new_socket_supersedes_the_old(async_server):
+    cookie = session_cookie(async_server)
+    connection = HTTPConnection("127.0.0.1", async_server.server_port, timeout=3)
+    try:
+        connection.request(
+            "POST",
+            "/api/message",
+            body=json.dumps(
+                {
+                    "type": "create_room",
+                    "protocol_version": NETWORK_PROTOCOL_VERSION,
+                    "display_name": "Host",
+                    "settings": {
+                        "player_count": 2,
+                        "ai_player_count": 1,
+                        "victory_target": 10,
+                        "board_mode": "constrained",
+                        "board_seed": 4242,
+                    },
+                }
+            ),
+            headers={"Content-Type": "application/json", "Cookie": cookie},
+        )
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+    finally:
+        connection.close()
+
+    old_peer, old_reader, _status = open_socket(async_server, cookie)
+    assert receive(old_reader)["kind"] == "bootstrap"
+    peer, reader, _status = open_socket(async_server, cookie)
+    try:
+        bootstrap = receive(reader)
+        assert bootstrap["kind"] == "bootstrap"
+        assert any(event["type"] == "lobby_snapshot" for event in bootstrap["events"])
+        superseded = read_websocket_frame(old_reader, require_mask=False)
+        assert superseded.opcode is WebSocketOpcode.CLOSE
+
+        for document in (
+            {
+                "type": "set_ready",
+                "protocol_version": NETWORK_PROTOCOL_VERSION,
+                "ready": True,
+            },
+            {"type": "start_game", "protocol_version": NETWORK_PROTOCOL_VERSION},
+            build_game_command(sequence=0, expected_revision=0, command="roll_dice"),
+        ):
+            send(peer, document)
+            assert receive(reader)["kind"] == "response"
+
+        # No further client message: the AI's move arrives as a push.
+        pushed = receive(reader)
+        assert pushed["kind"] == "push"
+        assert max(
+            event["revision"]
+            for event in pushed["events"]
+            if event["type"] == "state_snapshot"
+        ) >= 2
+    finally:
+        for stream in (old_reader, old_peer, reader, peer):
+            stream.close()
+
+
+def test_connected_silent_socket_session_survives_maintenance():
+    now = [1_000.0]
+    gateway = WebGateway(clock=lambda: now[0], idle_seconds=30)
+    server = create_async_web_server("127.0.0.1", 0, gateway=gateway)
+    thread = start(server)
+    try:
+        cookie = session_cookie(server)
+        silent_http_cookie = session_cookie(server)
+        peer, reader, status = open_socket(server, cookie)
+        try:
+            assert status.startswith(b"HTTP/1.1 101")
+            assert receive(reader)["kind"] == "bootstrap"
+            token = cookie.split("=", 1)[1]
+            # The push loop parks itself right after the bootstrap is sent.
+            session = gateway._sessions[token]
+            deadline = time.monotonic() + 2
+            while (
+                not session.event_waiters
+                and session.event_listener is None
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.005)
+
+            now[0] += 31
+            server.service_actions()
+
+            assert gateway.has_session(token, client_key="127.0.0.1")
+            assert not gateway.has_session(
+                silent_http_cookie.split("=", 1)[1], client_key="127.0.0.1"
+            )
+            send(peer, ping("still-here"))
+            assert receive(reader)["events"][0]["nonce"] == "still-here"
+        finally:
+            reader.close()
+            peer.close()
+    finally:
+        stop(server, thread)
+
+
+def test_a_request_body_that_stalls_is_dropped_after_the_request_timeout(
+    async_server,
+):
+    async_server.request_timeout = 0.2
+    peer = socket.create_connection(("127.0.0.1", async_server.server_port), timeout=4)
+    try:
+        peer.sendall(
+            (
+                "POST /api/session HTTP/1.1\r\n"
+                f"Host: 127.0.0.1:{async_server.server_port}\r\n"
+                "Content-Length: 10\r\n\r\n{}"
+            ).encode("ascii")
+        )
+        assert peer.recv(1024) == b""
+    finally:
+        peer.close()
+
+
+def test_many_sockets_share_one_loop_without_a_thread_each(async_server):
+    baseline_threads = threading.active_count()
+    sockets = []
+    try:
+        for index in range(40):
+            peer, reader, status = open_socket(async_server, session_cookie(async_server))
+            assert status.startswith(b"HTTP/1.1 101")
+            assert receive(reader)["kind"] == "bootstrap"
+            sockets.append((peer, reader))
+        for index, (peer, _reader) in enumerate(sockets):
+            send(peer, ping(f"n{index}"))
+        for index, (_peer, reader) in enumerate(sockets):
+            assert receive(reader)["events"][0]["nonce"] == f"n{index}"
+        assert async_server._open_connections == 40
+        # Only the fixed gateway and HTTP worker pools may have started.
+        assert threading.active_count() <= baseline_threads + 1 + async_server.http_workers
+    finally:
+        for peer, reader in sockets:
+            reader.close()
+            peer.close()
+
+
+def test_async_frame_reader_matches_the_blocking_reader():
+    async def read_async(data, **options):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_websocket_frame_async(reader, **options)
+
+    good = encode_websocket_frame(
+        b"x" * 300, opcode=WebSocketOpcode.TEXT, masking_key=b"abcd"
+    )
+    frame = asyncio.run(read_async(good, require_mask=True))
+    assert frame.payload == b"x" * 300
+    assert frame.masked is True
+
+    for data, options in (
+        (b"\xc1\x80abcd", {}),
+        (b"\x81\x7e\x00\x10", {}),
+        (encode_websocket_frame(b"x" * 300, opcode=WebSocketOpcode.TEXT), {}),
+        (good, {"require_mask": True, "max_payload_bytes": 100}),
+    ):
+        options = {"require_mask": options.get("require_mask", True), **options}
+        with pytest.raises(WebSocketProtocolError) as expected:
+            read_websocket_frame(BytesIO(data), **options)
+        with pytest.raises(WebSocketProtocolError) as actual:
+            asyncio.run(read_async(data, **options))
+        assert actual.value.code == expected.value.code
+    with pytest.raises(WebSocketEOF):
+        asyncio.run(read_async(good[:10], require_mask=True))
+
+
+def test_async_connection_drops_a_peer_that_stops_reading():
+    class Transport:
+        aborted = False
+
+        def get_write_buffer_size(self):
+            return 10_000
+
+        def abort(self):
+            self.aborted = True
+
+    class Writer:
+        transport = Transport()
+
+        def write(self, _frame):
+            return None
+
+    async def overflow():
+        connection = AsyncWebSocketConnection(
+            asyncio.StreamReader(), Writer(), max_buffered_bytes=4096
+        )
+        connection.send_json({"kind": "push"})
+        await connection.drain()
+
+    with pytest.raises(WebSocketEOF):
+        asyncio.run(overflow())
+    assert Writer.transport.aborted is True
+    with pytest.raises(ValueError):
+        AsyncWebSocketConnection(None, Writer(), drain_timeout=0)
+    with pytest.raises(ValueError):
+        create_async_web_server("127.0.0.1", 0, max_connections=0)
+
+
+@pytest.mark.parametrize("server", ["async", "threaded"])
+def test_load_test_reports_latency_percentiles_for_both_modes(server):
+    document = run_load_test(server=server, clients=6, messages=3, timeout=30)
+
+    assert document["format"] == "catan-web-load"
+    assert document["errors"] == {}
+    assert document["connected"] == 6
+    assert document["results"]["connect"]["samples"] == 6
+    round_trip = document["results"]["round_trip"]
+    assert round_trip["samples"] == 18
+    assert round_trip["p50_ms"] <= round_trip["p99_ms"]
+    with pytest.raises(ValueError):
+        run_load_test(server="forking")
+    with pytest.raises(ValueError):
+        run_load_test(clients=513)
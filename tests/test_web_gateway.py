@@ -1,17 +1,25 @@
+import copy
 import json
 import threading
 
 import pytest
 
 import game.network_protocol as network_protocol
+import game.web_gateway as web_gateway_module
 from game.network_protocol import NETWORK_PROTOCOL_VERSION
 from game.lan_controller import LanServerController, OutboundMessage
-from game.network_protocol import build_game_command
+from game.network_protocol import (
+    apply_state_delta,
+    build_game_command,
+    build_state_delta,
+)
 from game.web_gateway import (
     MAX_PENDING_WEB_EVENTS,
+    WebEvent,
     WebGateway,
     WebGatewayError,
     WebRateLimits,
+    encode_event_document,
 )
 
 
@@ -1165,6 +1173,98 @@ def test_reload_bootstrap_keeps_the_consumed_game_command_sequence():
     assert welcome["next_sequence"] == 1
 
 
+def test_opted_in_browser_receives_state_deltas_and_can_resync():
+    gateway = WebGateway()
+    host = gateway.open_session()
+    guest = gateway.open_session()
+    room_code, _ = create_room(gateway, host)
+    join_room(gateway, guest, room_code)
+    gateway.poll(host)
+    gateway.poll(guest)
+    gateway.handle(host, message("set_ready", ready=True))
+    gateway.handle(guest, message("set_ready", ready=True))
+    started = gateway.handle(host, message("start_game"))
+    state = next(event for event in started if event["type"] == "state_snapshot")
+
+    assert gateway.handle(
+        host,
+        message("state_sync", known_revision=state["revision"], accept_deltas=True),
+    ) == ()
+    result = gateway.handle(
+        host,
+        build_game_command(
+            sequence=0,
+            expected_revision=state["revision"],
+            command="roll_dice",
+        ),
+    )
+    delta = next(event for event in result if event["type"] == "state_delta")
+    assert not any(event["type"] == "state_snapshot" for event in result)
+    latest = next(
+        event for event in gateway.bootstrap(host) if event["type"] == "state_snapshot"
+    )
+    # The browser applies the delta it decodes from the shared wire bytes.
+    assert apply_state_delta(state, json.loads(delta.encoded)) == latest
+    guest_events = gateway.poll(guest)
+    assert any(event["type"] == "state_snapshot" for event in guest_events)
+
+    resync = gateway.handle(
+        host,
+        message("state_sync", known_revision=None, accept_deltas=True),
+    )
+    assert [event["type"] for event in resync] == ["state_snapshot"]
+    assert resync[0] == latest
+    with pytest.raises(WebGatewayError) as invalid:
+        gateway.handle(
+            host,
+            message("state_sync", known_revision=0, accept_deltas="yes"),
+        )
+    assert invalid.value.code == "invalid_request"
+
+
+def test_spectators_on_one_baseline_share_a_single_state_delta(monkeypatch):
+    gateway = WebGateway()
+    host = gateway.open_session()
+    guest = gateway.open_session()
+    watchers = [gateway.open_session() for _ in range(3)]
+    room_code, _ = create_room(gateway, host)
+    join_room(gateway, guest, room_code)
+    for index, watcher in enumerate(watchers):
+        join_room(gateway, watcher, room_code, name=f"Watcher {index}", role="spectator")
+    gateway.handle(host, message("set_ready", ready=True))
+    gateway.handle(guest, message("set_ready", ready=True))
+    started = gateway.handle(host, message("start_game"))
+    state = next(event for event in started if event["type"] == "state_snapshot")
+    for watcher in watchers:
+        gateway.poll(watcher)
+        gateway.handle(
+            watcher,
+            message("state_sync", known_revision=state["revision"], accept_deltas=True),
+        )
+    diffs = []
+
+    def counting_delta(previous, snapshot):
+        diffs.append(snapshot)
+        return build_state_delta(previous, snapshot)
+
+    monkeypatch.setattr(web_gateway_module, "build_state_delta", counting_delta)
+    gateway.handle(
+        host,
+        build_game_command(
+            sequence=0,
+            expected_revision=state["revision"],
+            command="roll_dice",
+        ),
+    )
+
+    deltas = [
+        next(event for event in gateway.poll(watcher) if event["type"] == "state_delta")
+        for watcher in watchers
+    ]
+    assert len(diffs) == 1
+    assert all(delta is deltas[0] for delta in deltas)
+
+
 def test_web_ai_finish_emits_result_and_authenticated_replay_frames():
     now = [100.0]
 
@@ -1276,6 +1376,109 @@ def test_result_capture_failure_is_publicly_reported_without_internal_details(
     assert "private replay implementation detail" not in unavailable["message"]
 
 
+def test_web_events_are_read_only_and_encoded_once():
+    event = WebEvent({"type": "lobby_snapshot", "names": ["ホスト", "Guest"]})
+
+    assert event.encoded is event.encoded
+    assert json.loads(event.encoded) == event
+    for mutate in (
+        lambda: event.__setitem__("type", "room_closed"),
+        lambda: event.pop("type"),
+        lambda: event.update(type="room_closed"),
+        event.clear,
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    assert type(copy.deepcopy(event)) is dict
+    document = encode_event_document({"api_version": 1}, (event, {"type": "x"}))
+    assert document == json.dumps(
+        {"api_version": 1, "events": [event, {"type": "x"}]},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    assert encode_event_document({}, ()) == b'{"events":[]}'
+
+
+def test_one_controller_message_is_shared_by_every_recipient_session():
+    gateway = WebGateway()
+    tokens = [gateway.open_session() for _ in range(3)]
+    sessions = [gateway._sessions[token] for token in tokens]
+    shared = {"type": "lobby_snapshot", "protocol_version": 1, "members": []}
+    welcome = {
+        "type": "session_welcome",
+        "protocol_version": 1,
+        "room_code": "ABCD",
+        "reconnect_token": "bearer",
+    }
+
+    gateway._dispatch(
+        (
+            *(OutboundMessage(session.connection_id, shared) for session in sessions),
+            OutboundMessage(sessions[0].connection_id, welcome),
+        )
+    )
+
+    drained = [gateway.poll(token) for token in tokens]
+    assert drained[0][0] is drained[1][0] is drained[2][0]
+    assert gateway.bootstrap(tokens[1])[0] is drained[1][0]
+    assert drained[0][1]["reconnect_token"] is None
+    assert b"bearer" not in drained[0][1].encoded
+    assert welcome["reconnect_token"] == "bearer"
+    assert gateway.room_resume_credential(tokens[0]).reconnect_token == "bearer"
+
+
+def test_push_waits_sleep_until_an_event_is_queued_for_that_session():
+    gateway = WebGateway()
+    token = gateway.open_session()
+    other = gateway.open_session()
+    session = gateway._sessions[token]
+    lobby = {"type": "lobby_snapshot", "protocol_version": 1, "members": []}
+
+    assert gateway.wait_for_events(token, timeout=0.01) is False
+    waiting = []
+    waiter = threading.Thread(
+        target=lambda: waiting.append(gateway.wait_for_events(token, timeout=5)),
+    )
+    waiter.start()
+    gateway._dispatch(
+        (OutboundMessage(gateway._sessions[other].connection_id, lobby),)
+    )
+    waiter.join(timeout=0.2)
+    assert waiter.is_alive()
+    with gateway._lock:
+        gateway._dispatch((OutboundMessage(session.connection_id, lobby),))
+    waiter.join(timeout=2)
+    assert waiting == [True]
+    assert gateway.poll(token, maintain=False)[0] == lobby
+
+    cancel = threading.Event()
+    waiter = threading.Thread(
+        target=lambda: waiting.append(
+            gateway.wait_for_events(token, timeout=5, cancel=cancel)
+        ),
+    )
+    waiter.start()
+    cancel.set()
+    gateway.wake_session(token)
+    waiter.join(timeout=2)
+    assert waiting[-1] is False
+
+    failures = []
+
+    def wait_until_closed():
+        try:
+            gateway.wait_for_events(token, timeout=5)
+        except WebGatewayError as exc:
+            failures.append(exc.code)
+
+    waiter = threading.Thread(target=wait_until_closed)
+    waiter.start()
+    waiter.join(timeout=0.05)
+    gateway.close_session(token)
+    waiter.join(timeout=2)
+    assert failures == ["session_expired"]
+
+
 def test_successful_leave_forgets_bootstrap_but_errors_do_not():
     gateway = WebGateway()
     token = gateway.open_session()
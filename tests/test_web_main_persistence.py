@@ -977,3 +977,67 @@ def test_replay_close_failure_is_generic_and_does_not_skip_authority_close(
     error = capsys.readouterr().err
     assert "ネットワークリプレイを安全に終了できませんでした" in error
     assert secret not in error
+
+
+def test_room_shards_start_workers_with_store_paths_and_close_them(monkeypatch, capsys):
+    events = []
+    recorded = {}
+
+    class FakeShards:
+        shard_count = 3
+
+        def __init__(self, **kwargs):
+            recorded["shards"] = kwargs
+            events.append("shards.open")
+
+        def close(self):
+            events.append("shards.close")
+
+    class FakeGateway:
+        def __init__(self, *, controller):
+            recorded["gateway_controller"] = controller
+            events.append("gateway.open")
+
+    monkeypatch.setattr(
+        web_main_module,
+        "SQLiteRoomAuthorityStore",
+        lambda *_args, **_kwargs: pytest.fail("workers open their own store"),
+    )
+    monkeypatch.setattr(web_main_module, "ShardedLanServerController", FakeShards)
+    monkeypatch.setattr(web_main_module, "WebGateway", FakeGateway)
+    monkeypatch.setattr(
+        web_main_module,
+        "create_web_server",
+        lambda _host, _port, **_kwargs: FakeServer(events),
+    )
+
+    assert (
+        web_main_module.main(
+            ["--room-shards", "3", "--state-db", "authority.sqlite3"]
+        )
+        == 0
+    )
+    assert recorded["shards"] == {
+        "shard_count": 3,
+        "state_db": "authority.sqlite3",
+        "state_key": None,
+        "replay_db": None,
+        "replay_key": None,
+    }
+    assert isinstance(recorded["gateway_controller"], FakeShards)
+    assert events == [
+        "shards.open",
+        "gateway.open",
+        ("serve", 0.2),
+        "server.close",
+        "shards.close",
+    ]
+    assert "3個のworker process" in capsys.readouterr().out
+
+
+def test_room_shard_count_is_bounded(capsys):
+    with pytest.raises(SystemExit) as stopped:
+        web_main_module.main(["--room-shards", "0"])
+
+    assert stopped.value.code == 2
+    assert "--room-shardsは1..32" in capsys.readouterr().err
@@ -2,6 +2,7 @@ from http.client import HTTPConnection
 import json
 import socket
 import threading
+import time
 
 import pytest
 
@@ -2373,6 +2374,76 @@ def test_authenticated_websocket_bootstrap_and_gateway_roundtrip(web_server):
         peer.close()
 
 
+def test_connected_silent_websocket_session_survives_maintenance():
+    now = [1_000.0]
+    gateway = WebGateway(clock=lambda: now[0], idle_seconds=30)
+    server = create_web_server("127.0.0.1", 0, gateway=gateway)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    peer = reader = None
+    try:
+        cookie = session_cookie(server)
+        silent_http_cookie = session_cookie(server)
+        peer = socket.create_connection(("127.0.0.1", server.server_port), timeout=4)
+        reader = peer.makefile("rb")
+        peer.sendall(
+            (
+                "GET /api/socket HTTP/1.1\r\n"
+                f"Host: 127.0.0.1:{server.server_port}\r\n"
+                "Connection: Upgrade\r\n"
+                "Upgrade: websocket\r\n"
+                "Sec-WebSocket-Version: 13\r\n"
+                "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+                f"Origin: http://127.0.0.1:{server.server_port}\r\n"
+                f"Cookie: {cookie}\r\n\r\n"
+            ).encode("ascii")
+        )
+        while reader.readline() != b"\r\n":
+            pass
+        bootstrap = read_websocket_frame(reader, require_mask=False)
+        assert json.loads(bootstrap.payload)["kind"] == "bootstrap"
+        token = cookie.split("=", 1)[1]
+        # The push loop parks itself right after the bootstrap is sent.
+        session = gateway._sessions[token]
+        deadline = time.monotonic() + 2
+        while (
+            not session.event_waiters
+            and session.event_listener is None
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.005)
+
+        now[0] += 31
+        server.service_actions()
+
+        assert gateway.has_session(token, client_key="127.0.0.1")
+        assert not gateway.has_session(
+            silent_http_cookie.split("=", 1)[1], client_key="127.0.0.1"
+        )
+        peer.sendall(
+            encode_websocket_frame(
+                json.dumps(
+                    {
+                        "type": "ping",
+                        "protocol_version": NETWORK_PROTOCOL_VERSION,
+                        "nonce": "still-here",
+                    }
+                ).encode("utf-8"),
+                opcode=WebSocketOpcode.TEXT,
+                masking_key=b"test",
+            )
+        )
+        response = json.loads(read_websocket_frame(reader, require_mask=False).payload)
+        assert response["events"][0]["nonce"] == "still-here"
+    finally:
+        for stream in (reader, peer):
+            if stream is not None:
+                stream.close()
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=3)
+
+
 def test_websocket_pushes_ai_progress_without_client_heartbeat(web_server):
     cookie = session_cookie(web_server)
     create_http_room(
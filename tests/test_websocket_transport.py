@@ -217,3 +217,29 @@ def test_truncated_frame_and_invalid_close_payload_are_rejected():
     with pytest.raises(WebSocketProtocolError) as caught:
         read_client_event(BytesIO(client_frame(b"\x03", opcode=WebSocketOpcode.CLOSE)))
     assert caught.value.code == "invalid_close"
+
+
+class TrickleReader(BytesIO):
+    """Return at most three bytes per read, like a slow socket."""
+
+    def read(self, size=-1):
+        return super().read(3 if size < 0 else min(size, 3))
+
+
+@pytest.mark.parametrize("size", [0, 1, 3, 4, 5, 125, 126, 65_537])
+def test_masked_payloads_of_every_alignment_survive_short_reads(size):
+    payload = bytes((index * 7) % 256 for index in range(size))
+    frame = client_frame(payload)
+
+    masked = frame[-size:] if size else b""
+    assert masked == bytes(
+        byte ^ CLIENT_MASK[index % 4] for index, byte in enumerate(payload)
+    )
+    for reader in (BytesIO(frame), TrickleReader(frame)):
+        decoded = read_websocket_frame(
+            reader, require_mask=True, max_payload_bytes=70_000
+        )
+        assert decoded.payload == payload
+        assert type(decoded.payload) is bytes
+    with pytest.raises(WebSocketEOF):
+        read_websocket_frame(TrickleReader(frame[:-1]), require_mask=True)
@@ -131,6 +131,7 @@ function loadAnimationFunctions() {
   vm.runInContext(`${appSource}\n;globalThis.__animationTest = {
     state,
     processEvents,
+    applyStateDelta,
     queueLiveBoardAnimations,
     takePendingBoardAnimations,
     clearPendingBoardAnimations,
@@ -3160,6 +3161,53 @@ test("resource credit has a public responsive panel and an accessible private ed
   assert.match(appSource, /loan\.status === "delinquent"[\s\S]*remaining_cards/);
 });
 
+test("state deltas rebuild the next live snapshot without mutating the previous one", () => {
+  const app = loadAnimationFunctions();
+  const previous = {
+    type: "state_snapshot",
+    protocol_version: 1,
+    revision: 4,
+    viewer_player_index: 0,
+    state: { log: ["a", "b", "c"], players: [{ name: "Red", points: 2 }] },
+  };
+  const delta = {
+    type: "state_delta",
+    protocol_version: 1,
+    revision: 5,
+    base_revision: 4,
+    viewer_player_index: 0,
+    operations: [
+      { op: "splice", path: ["state", "log"], index: 0, remove: 1, values: [] },
+      { op: "splice", path: ["state", "log"], index: 2, remove: 0, values: ["d"] },
+      { op: "replace", path: ["state", "players", 0, "points"], value: 3 },
+      { op: "add", path: ["state", "winner"], value: null },
+    ],
+  };
+
+  const next = app.applyStateDelta(previous, delta);
+
+  assert.equal(next.revision, 5);
+  assert.deepEqual(Array.from(next.state.log), ["b", "c", "d"]);
+  assert.equal(next.state.players[0].points, 3);
+  assert.equal(next.state.winner, null);
+  assert.deepEqual(previous.state.log, ["a", "b", "c"]);
+  assert.equal(previous.state.players[0].points, 2);
+  assert.equal(app.applyStateDelta(next, delta), null);
+  assert.equal(
+    app.applyStateDelta(previous, {
+      ...delta,
+      operations: [{ op: "replace", path: ["state", "missing", 0], value: 1 }],
+    }),
+    null,
+  );
+
+  app.processEvents([previous]);
+  assert.equal(app.state.stateSyncRequested, true);
+  app.processEvents([delta]);
+  assert.equal(app.state.liveSnapshot.revision, 5);
+  assert.equal(app.state.liveSnapshot.state.players[0].points, 3);
+});
+
 test("unsolicited websocket pushes do not consume a pending command response", () => {
   assert.match(
     appSource,
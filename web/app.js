@@ -211,6 +211,7 @@ const state = {
   invitationListError: null,
   invitationListRequestId: 0,
   invitationMutationPending: false,
+  stateSyncRequested: false,
 };
 
 const elements = Object.fromEntries(
@@ -1905,10 +1906,112 @@ async function pollEvents() {
   }
 }
 
+function ownedDeltaContainer(parent, key, owned) {
+  const child = parent[key];
+  if (owned.has(child)) return child;
+  if (!child || typeof child !== "object") return null;
+  const copy = Array.isArray(child) ? [...child] : { ...child };
+  parent[key] = copy;
+  owned.add(copy);
+  return copy;
+}
+
+function hasDeltaSlot(container, key) {
+  if (Array.isArray(container)) {
+    return Number.isInteger(key) && key >= 0 && key < container.length;
+  }
+  return typeof key === "string" && Object.hasOwn(container, key);
+}
+
+function applyStateDelta(snapshot, delta) {
+  // Mirrors network_protocol.apply_state_delta.  Containers on edited paths
+  // are copied, so the previous live snapshot stays intact for animations.
+  if (
+    !snapshot
+    || snapshot.type !== "state_snapshot"
+    || snapshot.revision !== delta?.base_revision
+    || snapshot.viewer_player_index !== delta.viewer_player_index
+    || !Number.isInteger(delta.revision)
+    || !Array.isArray(delta.operations)
+  ) {
+    return null;
+  }
+  const result = { ...snapshot };
+  const owned = new Set([result]);
+  for (const operation of delta.operations) {
+    const path = operation?.path;
+    if (!Array.isArray(path) || path.length === 0) return null;
+    let container = result;
+    for (const key of path.slice(0, -1)) {
+      if (!hasDeltaSlot(container, key)) return null;
+      container = ownedDeltaContainer(container, key, owned);
+      if (!container) return null;
+    }
+    const key = path[path.length - 1];
+    switch (operation.op) {
+      case "splice": {
+        if (!hasDeltaSlot(container, key) || !Array.isArray(container[key])) return null;
+        const target = ownedDeltaContainer(container, key, owned);
+        const { index, remove, values } = operation;
+        if (
+          !Number.isInteger(index)
+          || !Number.isInteger(remove)
+          || !Array.isArray(values)
+          || index < 0
+          || remove < 0
+          || index + remove > target.length
+        ) {
+          return null;
+        }
+        target.splice(index, remove, ...values);
+        break;
+      }
+      case "add":
+        if (Array.isArray(container) || hasDeltaSlot(container, key)) return null;
+        container[key] = operation.value;
+        break;
+      case "remove":
+        if (Array.isArray(container) || !hasDeltaSlot(container, key)) return null;
+        delete container[key];
+        break;
+      case "replace":
+        if (!hasDeltaSlot(container, key)) return null;
+        container[key] = operation.value;
+        break;
+      default:
+        return null;
+    }
+  }
+  result.revision = delta.revision;
+  return result;
+}
+
+function requestStateSync(knownRevision) {
+  state.stateSyncRequested = true;
+  sendMessage(wireMessage("state_sync", {
+    known_revision: Number.isInteger(knownRevision) ? knownRevision : null,
+    accept_deltas: true,
+  })).catch(() => {
+    state.stateSyncRequested = false;
+  });
+}
+
+function expandStateDelta(event) {
+  if (event?.type !== "state_delta") return event;
+  const snapshot = applyStateDelta(state.liveSnapshot, event);
+  if (!snapshot) {
+    // A missed or unusable delta: ask the server for a full snapshot.
+    requestStateSync(null);
+    return null;
+  }
+  return snapshot;
+}
+
 function processEvents(events, { animateLive = true } = {}) {
   let dirty = false;
   let focusBoardAfterRender = false;
-  for (const event of events) {
+  for (const rawEvent of events) {
+    const event = expandStateDelta(rawEvent);
     if (!event || typeof event !== "object") continue;
     switch (event.type) {
       case "session_welcome":
@@ -1950,6 +2053,9 @@ function processEvents(events, { animateLive = true } = {}) {
               queueLiveBoardAnimations(previousLive, event);
             }
             state.liveSnapshot = event;
+            if (!state.stateSyncRequested) {
+              requestStateSync(event.revision);
+            }
           }
           if (
             state.replayIndex === null